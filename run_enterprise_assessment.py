@@ -40,6 +40,7 @@ from src.agents.models.situation_awareness_models import (
     SituationSeverity,
     TimeFrame,
 )
+from src.database.assessment_store import AssessmentStore
 
 logging.basicConfig(
     level=logging.INFO,
@@ -246,6 +247,9 @@ class EnterpriseAssessmentEngine:
         self.orchestrator = orchestrator
         self.registry_factory = registry_factory
         self.config = config
+        # Per-KPI results of the last run() — read by the assessments API route.
+        self.kpi_assessments: List[KPIAssessment] = []
+        self._store: Optional[AssessmentStore] = None
 
     # ------------------------------------------------------------------
     # Public entry point
@@ -253,7 +257,8 @@ class EnterpriseAssessmentEngine:
 
     async def run(self) -> AssessmentRun:
         """Full assessment loop. Returns completed AssessmentRun."""
-        run_id = str(uuid.uuid4())[:8]
+        # Full UUID: assessment_runs.id and kpi_assessments.run_id are UUID columns.
+        run_id = str(uuid.uuid4())
         run = AssessmentRun(
             id=run_id,
             started_at=datetime.utcnow(),
@@ -261,33 +266,40 @@ class EnterpriseAssessmentEngine:
             client_id=self.config.client_id,
         )
         logger.info(f"[{run_id}] Assessment started — config: {self.config}")
+        # Write the run row first — kpi_assessments.run_id references it.
+        await self._persist_run(run)
 
         kpis = await self._load_kpis()
         run.kpi_count = len(kpis)
         logger.info(f"[{run_id}] {len(kpis)} KPIs in scope")
 
-        for i, kpi in enumerate(kpis, 1):
-            kpi_label = getattr(kpi, "id", str(kpi))
-            logger.info(f"[{run_id}] KPI {i}/{len(kpis)}: {kpi_label}")
-            try:
-                ka = await self._assess_kpi(run_id, kpi)
-
-                if ka.status == KPIAssessmentStatus.DETECTED:
-                    # Flagged for principal review — DA is HITL, not automatic.
-                    run.kpis_escalated += 1
-                elif ka.status == KPIAssessmentStatus.MONITORING:
-                    run.kpis_monitored += 1
-                elif ka.status == KPIAssessmentStatus.BELOW_THRESHOLD:
-                    run.kpis_below_threshold += 1
-                elif ka.status == KPIAssessmentStatus.ERROR:
+        if self.config.batch:
+            assessments = await self._assess_kpis_batch(run_id, kpis)
+        else:
+            assessments = []
+            for i, kpi in enumerate(kpis, 1):
+                kpi_label = getattr(kpi, "id", str(kpi))
+                logger.info(f"[{run_id}] KPI {i}/{len(kpis)}: {kpi_label}")
+                try:
+                    assessments.append(await self._assess_kpi(run_id, kpi))
+                except Exception as e:
+                    logger.error(f"[{run_id}] KPI {kpi_label} ERROR: {e}", exc_info=True)
                     run.kpis_errored += 1
 
-                await self._persist_kpi_assessment(ka)
-
-            except Exception as e:
-                logger.error(f"[{run_id}] KPI {kpi_label} ERROR: {e}", exc_info=True)
+        for ka in assessments:
+            if ka.status == KPIAssessmentStatus.DETECTED:
+                # Flagged for principal review — DA is HITL, not automatic.
+                run.kpis_escalated += 1
+            elif ka.status == KPIAssessmentStatus.MONITORING:
+                run.kpis_monitored += 1
+            elif ka.status == KPIAssessmentStatus.BELOW_THRESHOLD:
+                run.kpis_below_threshold += 1
+            elif ka.status == KPIAssessmentStatus.ERROR:
                 run.kpis_errored += 1
 
+        self.kpi_assessments = assessments
+        await self._persist_kpi_assessments(assessments)
+
         run.status = AssessmentStatus.COMPLETE
         run.completed_at = datetime.utcnow()
         await self._persist_run(run)
@@ -317,173 +329,263 @@ class EnterpriseAssessmentEngine:
 
         return all_kpis
 
+    def _build_request(
+        self,
+        timeframe: TimeFrame,
+        business_processes: List[str],
+        client_id: Optional[str],
+        filters: dict,
+    ) -> SituationDetectionRequest:
+        """Build the system-principal SA request used by both assessment modes."""
+        principal_context = PrincipalContext(
+            principal_id="system",
+            role="system",
+            client_id=self.config.client_id,
+            business_processes=business_processes,
+            default_filters={},
+            decision_style="analytical",
+            communication_style="formal",
+            preferred_timeframes=[timeframe],
+        )
+        return SituationDetectionRequest(
+            request_id=str(uuid.uuid4()),
+            principal_context=principal_context,
+            business_processes=business_processes,
+            timeframe=timeframe,
+            comparison_type=ComparisonType.YEAR_OVER_YEAR,
+            client_id=client_id,
+            filters=filters,
+        )
+
+    @staticmethod
+    def _situations_from_result(raw_result) -> list:
+        # orchestrate_situation_detection returns a plain dict with "situations" key.
+        if isinstance(raw_result, dict):
+            return raw_result.get("situations", []) or []
+        return getattr(raw_result, "situations", []) or []
+
+    async def _assess_kpis_batch(self, run_id: str, kpis: list) -> List[KPIAssessment]:
+        """Batch mode: one SA pass per (client, timeframe, filters) group instead of one per KPI.
+
+        Most clients resolve to a single group, so SA scans the whole KPI set once and
+        each KPI's assessment is read off that scan's situations. Results are returned
+        in the order of ``kpis``.
+        """
+        groups: dict = {}
+        for kpi in kpis:
+            filters = getattr(kpi, "filters", None) or {}
+            key = (
+                getattr(kpi, "client_id", None) or self.config.client_id,
+                _timeframe_for_kpi(kpi),
+                json.dumps(filters, sort_keys=True, default=str),
+            )
+            groups.setdefault(key, []).append(kpi)
+
+        by_kpi: dict = {}
+        for (client_id, timeframe, filters_key), group in groups.items():
+            # SA derives relevant KPIs from business processes. A KPI without any
+            # would fall outside the union, so such groups scan the client's full set.
+            bp_lists = [getattr(k, "business_process_ids", []) or [] for k in group]
+            business_processes: List[str] = []
+            if all(bp_lists):
+                business_processes = sorted({bp for bps in bp_lists for bp in bps})
+            logger.info(
+                f"[{run_id}] Batch SA pass: {len(group)} KPIs, timeframe={timeframe.value}, "
+                f"{len(business_processes) or 'all'} business processes"
+            )
+            try:
+                request = self._build_request(
+                    timeframe,
+                    business_processes,
+                    client_id,
+                    json.loads(filters_key),
+                )
+                raw_result = await self.orchestrator.orchestrate_situation_detection(request)
+                situations = self._situations_from_result(raw_result)
+                for kpi in group:
+                    by_kpi[id(kpi)] = self._assessment_from_situations(run_id, kpi, situations)
+            except Exception as e:
+                logger.error(f"[{run_id}] Batch SA pass failed: {e}", exc_info=True)
+                for kpi in group:
+                    kpi_id = getattr(kpi, "id", str(kpi))
+                    by_kpi[id(kpi)] = KPIAssessment(
+                        id=str(uuid.uuid4()),
+                        run_id=run_id,
+                        kpi_id=kpi_id,
+                        kpi_name=getattr(kpi, "name", kpi_id),
+                        severity=None,
+                        confidence=None,
+                        status=KPIAssessmentStatus.ERROR,
+                        escalated_to_da=False,
+                        error_message=str(e),
+                    )
+
+        return [by_kpi[id(kpi)] for kpi in kpis]
+
     async def _assess_kpi(self, run_id: str, kpi) -> KPIAssessment:
         """Run SA detection for one KPI. Returns KPIAssessment with escalate_to_da set."""
         kpi_id = getattr(kpi, "id", str(kpi))
         kpi_name = getattr(kpi, "name", kpi_id)
 
+        try:
+            request = self._build_request(
+                _timeframe_for_kpi(kpi),
+                getattr(kpi, "business_process_ids", []) or [],
+                getattr(kpi, "client_id", None),
+                getattr(kpi, "filters", None) or {},
+            )
+            raw_result = await self.orchestrator.orchestrate_situation_detection(request)
+            return self._assessment_from_situations(
+                run_id, kpi, self._situations_from_result(raw_result)
+            )
+
+        except Exception as e:
+            logger.error(
+                f"[{run_id}] SA detection failed for KPI {kpi_id}: {e}", exc_info=True
+            )
+            return KPIAssessment(
+                id=str(uuid.uuid4()),
+                run_id=run_id,
+                kpi_id=kpi_id,
+                kpi_name=kpi_name,
+                severity=None,
+                confidence=None,
+                status=KPIAssessmentStatus.ERROR,
+                escalated_to_da=False,
+                error_message=str(e),
+            )
+
+    def _assessment_from_situations(self, run_id: str, kpi, situations: list) -> KPIAssessment:
+        """Classify one KPI against the situations of an SA pass."""
+        kpi_id = getattr(kpi, "id", str(kpi))
+        kpi_name = getattr(kpi, "name", kpi_id)
+
         # Retrieve per-KPI calibration overrides when available.
         monitoring_profile = getattr(kpi, "monitoring_profile", None)
-        volatility_band: float = (
-            getattr(monitoring_profile, "volatility_band", 0.05)
-            if monitoring_profile is not None
-            else 0.05
-        )
         confidence_floor: float = (
             getattr(monitoring_profile, "confidence_floor", 0.6)
             if monitoring_profile is not None
             else 0.6
         )
 
-        try:
-            timeframe = _timeframe_for_kpi(kpi)
-
-            principal_context = PrincipalContext(
-                principal_id="system",
-                role="system",
-                client_id=self.config.client_id,
-                business_processes=getattr(kpi, "business_process_ids", []) or [],
-                default_filters={},
-                decision_style="analytical",
-                communication_style="formal",
-                preferred_timeframes=[timeframe],
+        # Find the best-matching situation for this KPI.
+        matched = None
+        for s in situations:
+            s_kpi_name = getattr(s, "kpi_name", None) or (
+                s.get("kpi_name") if isinstance(s, dict) else None
             )
-
-            request = SituationDetectionRequest(
-                request_id=str(uuid.uuid4()),
-                principal_context=principal_context,
-                business_processes=getattr(kpi, "business_process_ids", []) or [],
-                timeframe=timeframe,
-                comparison_type=ComparisonType.YEAR_OVER_YEAR,
-                client_id=getattr(kpi, "client_id", None),
-                filters=getattr(kpi, "filters", None) or {},
+            if s_kpi_name and (
+                s_kpi_name.lower() == kpi_name.lower()
+                or s_kpi_name.lower() == kpi_id.lower()
+            ):
+                matched = s
+                break
+
+        if matched is None:
+            return KPIAssessment(
+                id=str(uuid.uuid4()),
+                run_id=run_id,
+                kpi_id=kpi_id,
+                kpi_name=kpi_name,
+                severity=None,
+                confidence=None,
+                status=KPIAssessmentStatus.BELOW_THRESHOLD,
+                escalated_to_da=False,
             )
 
-            raw_result = await self.orchestrator.orchestrate_situation_detection(request)
-
-            # orchestrate_situation_detection returns a plain dict with "situations" key.
-            if isinstance(raw_result, dict):
-                situations = raw_result.get("situations", [])
-            else:
-                situations = getattr(raw_result, "situations", [])
-
-            # Find the best-matching situation for this KPI.
-            matched = None
-            for s in situations:
-                s_kpi_name = getattr(s, "kpi_name", None) or (
-                    s.get("kpi_name") if isinstance(s, dict) else None
-                )
-                if s_kpi_name and (
-                    s_kpi_name.lower() == kpi_name.lower()
-                    or s_kpi_name.lower() == kpi_id.lower()
-                ):
-                    matched = s
-                    break
-
-            if matched is None:
-                return KPIAssessment(
-                    id=str(uuid.uuid4()),
-                    run_id=run_id,
-                    kpi_id=kpi_id,
-                    kpi_name=kpi_name,
-                    severity=None,
-                    confidence=None,
-                    status=KPIAssessmentStatus.BELOW_THRESHOLD,
-                    escalated_to_da=False,
-                )
-
-            # Resolve severity score.
-            raw_severity = (
-                matched.get("severity") if isinstance(matched, dict)
-                else getattr(matched, "severity", None)
-            )
-            if isinstance(raw_severity, SituationSeverity):
-                severity_score = _SEVERITY_SCORES.get(raw_severity, 0.0)
-            elif isinstance(raw_severity, str):
-                try:
-                    severity_score = _SEVERITY_SCORES.get(SituationSeverity(raw_severity), 0.0)
-                    raw_severity = SituationSeverity(raw_severity)
-                except ValueError:
-                    severity_score = 0.0
-                    raw_severity = None
-            else:
+        # Resolve severity score.
+        raw_severity = (
+            matched.get("severity") if isinstance(matched, dict)
+            else getattr(matched, "severity", None)
+        )
+        if isinstance(raw_severity, SituationSeverity):
+            severity_score = _SEVERITY_SCORES.get(raw_severity, 0.0)
+        elif isinstance(raw_severity, str):
+            try:
+                severity_score = _SEVERITY_SCORES.get(SituationSeverity(raw_severity), 0.0)
+                raw_severity = SituationSeverity(raw_severity)
+            except ValueError:
                 severity_score = 0.0
                 raw_severity = None
+        else:
+            severity_score = 0.0
+            raw_severity = None
 
-            if severity_score < self.config.severity_floor:
-                return KPIAssessment(
-                    id=str(uuid.uuid4()),
-                    run_id=run_id,
-                    kpi_id=kpi_id,
-                    kpi_name=kpi_name,
-                    severity=severity_score,
-                    confidence=None,
-                    status=KPIAssessmentStatus.BELOW_THRESHOLD,
-                    escalated_to_da=False,
-                )
-
-            # Resolve confidence score.
-            confidence = (
-                matched.get("confidence") if isinstance(matched, dict)
-                else getattr(matched, "confidence", None)
-            )
-            if confidence is None:
-                confidence = _DEFAULT_CONFIDENCE.get(raw_severity, 0.5) if raw_severity else 0.5
-
-            if confidence < confidence_floor:
-                return KPIAssessment(
-                    id=str(uuid.uuid4()),
-                    run_id=run_id,
-                    kpi_id=kpi_id,
-                    kpi_name=kpi_name,
-                    severity=severity_score,
-                    confidence=confidence,
-                    status=KPIAssessmentStatus.MONITORING,
-                    escalated_to_da=False,
-                )
-
+        if severity_score < self.config.severity_floor:
             return KPIAssessment(
                 id=str(uuid.uuid4()),
                 run_id=run_id,
                 kpi_id=kpi_id,
                 kpi_name=kpi_name,
                 severity=severity_score,
-                confidence=confidence,
-                status=KPIAssessmentStatus.DETECTED,
-                escalated_to_da=False,  # DA is HITL — principal decides from Decision Studio UI
+                confidence=None,
+                status=KPIAssessmentStatus.BELOW_THRESHOLD,
+                escalated_to_da=False,
             )
 
-        except Exception as e:
-            logger.error(
-                f"[{run_id}] SA detection failed for KPI {kpi_id}: {e}", exc_info=True
-            )
+        # Resolve confidence score.
+        confidence = (
+            matched.get("confidence") if isinstance(matched, dict)
+            else getattr(matched, "confidence", None)
+        )
+        if confidence is None:
+            confidence = _DEFAULT_CONFIDENCE.get(raw_severity, 0.5) if raw_severity else 0.5
+
+        if confidence < confidence_floor:
             return KPIAssessment(
                 id=str(uuid.uuid4()),
                 run_id=run_id,
                 kpi_id=kpi_id,
                 kpi_name=kpi_name,
-                severity=None,
-                confidence=None,
-                status=KPIAssessmentStatus.ERROR,
+                severity=severity_score,
+                confidence=confidence,
+                status=KPIAssessmentStatus.MONITORING,
                 escalated_to_da=False,
-                error_message=str(e),
             )
 
+        return KPIAssessment(
+            id=str(uuid.uuid4()),
+            run_id=run_id,
+            kpi_id=kpi_id,
+            kpi_name=kpi_name,
+            severity=severity_score,
+            confidence=confidence,
+            status=KPIAssessmentStatus.DETECTED,
+            escalated_to_da=False,  # DA is HITL — principal decides from Decision Studio UI
+        )
+
+    def _get_store(self) -> AssessmentStore:
+        if self._store is None:
+            self._store = AssessmentStore()
+        return self._store
+
     async def _persist_run(self, run: AssessmentRun) -> None:
-        """Log the run summary. Supabase persistence is a TODO."""
-        # TODO: Phase 9C — write to Supabase assessment_runs table.
+        """Upsert the run row (called at start and again on completion)."""
         logger.info(
             f"[{run.id}] PERSIST run — "
             + json.dumps(run.model_dump(), indent=None, default=str)
         )
-
-    async def _persist_kpi_assessment(self, ka: KPIAssessment) -> None:
-        """Log individual KPI assessment. Supabase persistence is a TODO."""
-        # TODO: Phase 9C — write to Supabase kpi_assessments table.
-        logger.info(
-            f"[{ka.run_id}] PERSIST kpi_assessment kpi={ka.kpi_id} "
-            f"status={ka.status} severity={ka.severity} confidence={ka.confidence}"
-        )
+        if self.config.dry_run:
+            return
+        await self._get_store().upsert_run(run)
+
+    async def _persist_kpi_assessments(self, assessments: List[KPIAssessment]) -> None:
+        """Persist all KPI assessments of a run with one chunked bulk upsert."""
+        if self.config.dry_run:
+            logger.info(f"dry_run — skipping persistence of {len(assessments)} KPI assessments")
+            return
+        store = self._get_store()
+        if not store.enabled or not assessments:
+            return
+        results = await store.upsert_kpi_assessments(assessments)
+        failed = [ka.kpi_id for ka, ok in zip(assessments, results) if not ok]
+        if failed:
+            logger.warning(
+                f"[{assessments[0].run_id}] {len(failed)}/{len(assessments)} KPI assessments "
+                f"not persisted: {', '.join(failed)}"
+            )
+        else:
+            logger.info(f"[{assessments[0].run_id}] Persisted {len(assessments)} KPI assessments")
 
 
 # ---------------------------------------------------------------------------
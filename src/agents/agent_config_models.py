@@ -30,6 +30,12 @@ def _default_api_key_env_var() -> str:
     return "ANTHROPIC_API_KEY" if p == "anthropic" else "OPENAI_API_KEY"
 
 
+def _default_llm_response_cache_path() -> Optional[str]:
+    """Read LLM_RESPONSE_CACHE_PATH; None keeps the LLM response cache in memory only."""
+    import os
+    return os.environ.get("LLM_RESPONSE_CACHE_PATH") or None
+
+
 class A9_LLM_Service_Agent_Config(BaseModel):
     """
     Configuration for the A9_LLM_Service_Agent.
@@ -78,6 +84,49 @@ class A9_LLM_Service_Agent_Config(BaseModel):
     log_all_requests: bool = Field(True, 
                                  description="Whether to log all LLM requests and responses")
     
+    # Response cache (src/llm_services/response_cache.py)
+    response_cache_enabled: bool = Field(
+        True, description="Serve repeated identical generate() calls from the response cache"
+    )
+    response_cache_max_temperature: float = Field(
+        0.3,
+        description=(
+            "Requests above this temperature are treated as non-deterministic and bypass the "
+            "cache unless they set cache=True; cache=False always bypasses it"
+        )
+    )
+    response_cache_max_entries: int = Field(2048, ge=1, description="Memory-tier LRU capacity")
+    response_cache_ttl_seconds: float = Field(86400.0, description="Default entry lifetime")
+    response_cache_operation_ttls: Dict[str, float] = Field(
+        default_factory=lambda: {"generate_sql": 7 * 86400.0, "analyze": 3600.0, "evaluate": 3600.0},
+        description="Per-operation TTL overrides in seconds; 0 disables caching for that operation"
+    )
+    response_cache_path: Optional[str] = Field(
+        default_factory=_default_llm_response_cache_path,
+        description=(
+            "SQLite file for the disk tier, shared across agents and restarts. "
+            "None (default; env LLM_RESPONSE_CACHE_PATH) keeps the cache in memory only."
+        )
+    )
+
+    # Provider-call scheduling (src/llm_services/scheduler.py)
+    llm_scheduler_enabled: bool = Field(
+        True, description="Admit provider calls through the shared rate-limit-aware scheduler"
+    )
+    llm_max_concurrency: int = Field(
+        16, ge=1, description="Provider calls in flight at once across every agent in the process"
+    )
+    llm_rate_limits: Dict[str, Dict[str, float]] = Field(
+        default_factory=dict,
+        description=(
+            "Starting {'rpm': ..., 'tpm': ...} per model prefix, e.g. {'claude-sonnet': {'rpm': 50}}. "
+            "Limits are re-learned from provider rate-limit headers either way."
+        )
+    )
+    llm_rate_limit_retries: int = Field(
+        2, ge=0, description="Times a 429 is re-queued behind the lane's backoff before it is returned as an error"
+    )
+
     # Environment settings
     use_mocks_in_test: bool = Field(True, 
                                    description="Whether to use mock responses in test environment")
@@ -237,7 +286,10 @@ class A9_Data_Product_Agent_Config(BaseModel):
     # Database settings
     database: Dict[str, Any] = Field(
         {"type": "duckdb", "path": "data/agent9-hermes.duckdb"},
-        description="Database configuration"
+        description=(
+            "Database configuration. Optional 'max_workers' caps the DuckDB query "
+            "executor (default 4); each worker reads through its own cursor."
+        )
     )
     
     # Registry settings
@@ -259,6 +311,60 @@ class A9_Data_Product_Agent_Config(BaseModel):
         True, 
         description="Whether to validate SQL statements for security (only SELECT allowed)"
     )
+
+    # Query result cache (execute_sql)
+    query_cache_enabled: bool = Field(
+        False,
+        description="Cache successful execute_sql results keyed by (SQL, data product, client, parameters)"
+    )
+    query_cache_ttl_seconds: float = Field(
+        300.0,
+        description="Default result TTL in seconds for sources without an entry in query_cache_source_ttls"
+    )
+    query_cache_source_ttls: Dict[str, float] = Field(
+        default_factory=lambda: {"duckdb": 60.0, "sqlserver": 300.0, "bigquery": 900.0, "snowflake": 900.0},
+        description="Per-backend result TTL in seconds; 0 disables caching for that backend"
+    )
+    query_cache_max_mb: float = Field(
+        64.0,
+        description="Approximate memory budget for cached results; least recently used entries are evicted"
+    )
+    query_single_flight: bool = Field(
+        True,
+        description="Coalesce concurrent identical execute_sql calls (same SQL, data product, client, parameters) into one execution"
+    )
+
+    # Schema inspection (onboarding) settings
+    inspection_concurrency: int = Field(
+        8,
+        ge=1,
+        description="Maximum number of tables inspect_source_schema profiles at once; 1 restores the sequential pass"
+    )
+    inspection_backend_limits: Dict[str, int] = Field(
+        default_factory=lambda: {"duckdb": 4, "sqlserver": 4},
+        description=(
+            "Per-backend cap on inspection_concurrency, keyed by source_system "
+            "(bigquery, snowflake, sqlserver, duckdb). Backends not listed are bounded "
+            "only by inspection_concurrency."
+        )
+    )
+    inspection_sample_rows: int = Field(
+        100_000,
+        ge=1,
+        description=(
+            "inspection_depth='fast': base tables with more rows than this have their "
+            "categorical values sampled from a TABLESAMPLE reading roughly this many rows"
+        )
+    )
+    inspection_profile_store_dir: Optional[str] = Field(
+        None,
+        description=(
+            "Directory for the schema profile store. When set, inspect_source_schema "
+            "re-profiles only tables whose catalog fingerprint (columns, types, row count, "
+            "last-modified) changed since the last run, and generate_contract_yaml reuses "
+            "their contract sections"
+        )
+    )
     # LLM SQL generation settings
     enable_llm_sql: bool = Field(
         False,
@@ -339,6 +445,44 @@ class A9_Situation_Awareness_Agent_Config(BaseModel):
         )
     )
 
+    # KPI scan concurrency
+    kpi_scan_concurrency: int = Field(
+        8,
+        ge=1,
+        description=(
+            "Maximum number of KPIs evaluated concurrently by detect_situations. "
+            "1 restores the sequential scan."
+        )
+    )
+    kpi_scan_backend_limits: Dict[str, int] = Field(
+        default_factory=dict,
+        description=(
+            "Per-backend cap on concurrently evaluated KPIs, keyed by data product "
+            "source_system (bigquery, snowflake, sqlserver, duckdb). Backends not listed "
+            "are bounded only by kpi_scan_concurrency."
+        )
+    )
+    kpi_scan_timeout_seconds: Optional[float] = Field(
+        120.0,
+        description="Per-KPI evaluation timeout; a KPI exceeding it is skipped. None disables the timeout."
+    )
+    kpi_bundle_sql: bool = Field(
+        True,
+        description=(
+            "Read current, comparison, monthly series and plan for BigQuery, SQL Server and "
+            "Snowflake KPIs in one bundled query; False issues one query per reading."
+        )
+    )
+    enrichment_batch_size: int = Field(
+        10,
+        ge=1,
+        description=(
+            "Detected situations enriched (key observations + trend note) per structured LLM "
+            "call after the scan; chunks run concurrently. 1 restores one observation call and "
+            "one trend-note call per situation."
+        )
+    )
+
     # Orchestration & logging
     require_orchestrator: bool = Field(
         True, description="All calls must be orchestrator-driven"
@@ -396,12 +540,36 @@ class A9_Deep_Analysis_Agent_Config(BaseModel):
             "is globally sorted by |delta| and cut to the top 5, and where_is[:5] feeds "
             "SCQA, so a wider search yields a better-selected top 5 rather than more of "
             "them. Solution Finder's evidence base is unchanged. Cost is ~1 extra query "
-            "per added dimension, run sequentially."
+            "per added dimension, bounded by level_concurrency."
         ),
     )
     max_groups_per_dim: int = Field(
         10, description="Maximum groups per dimension to materialize for summaries"
     )
+    dimension_sweep: bool = Field(
+        True,
+        description=(
+            "Fetch every dimension's breakdown for a comparison side in one GROUPING SETS "
+            "(or UNION ALL) query instead of one query per dimension and side."
+        ),
+    )
+    level_concurrency: int = Field(
+        4,
+        ge=1,
+        description=(
+            "Maximum number of warehouse queries execute_deep_analysis keeps in flight "
+            "while computing independent levels, sweep sides and ratio-bridge components. "
+            "1 restores the sequential pass."
+        ),
+    )
+    level_backend_limits: Dict[str, int] = Field(
+        default_factory=dict,
+        description=(
+            "Per-backend cap on level_concurrency, keyed by data product source_system "
+            "(bigquery, snowflake, sqlserver, duckdb). Backends not listed are bounded "
+            "only by level_concurrency."
+        ),
+    )
     enable_percent_growth: bool = Field(
         False, description="Include percent growth alongside delta comparisons when true"
     )
@@ -547,6 +715,25 @@ class A9_Solution_Finder_Agent_Config(BaseModel):
         "judge", description="Moderator rubric: 'judge' (implemented) or 'integrator' (designed, gated — falls back to judge)"
     )
 
+    # Anthropic prompt caching. Stage 1 prompts put the context every persona
+    # shares (problem, DA signals, business context, situation metrics, principal
+    # and causal sections) ahead of the persona-specific role/task, and mark that
+    # prefix with cache_control; synthesis marks its debate_spec prefix. A cache
+    # entry only becomes readable once the call that writes it is answered, so
+    # with stage1_cache_warmup the first persona runs alone and the rest fan out
+    # on the warm cache. Off by default: the Stage 1 model (Haiku) only caches
+    # prefixes of 4096+ tokens, which the shared context rarely reaches, so the
+    # warm-up usually serialises a persona for nothing. Enable it for contexts
+    # known to clear that minimum.
+    enable_prompt_caching: bool = Field(
+        True, description="Mark shared prompt prefixes with cache_control (anthropic provider)"
+    )
+    stage1_cache_warmup: bool = Field(
+        False,
+        description="Run the first Stage 1 persona before the others so they read its cached prefix "
+        "(only pays off when the shared prefix exceeds the model's minimum cacheable length)",
+    )
+
 
 class A9_KPI_Assistant_Agent_Config(BaseModel):
     """
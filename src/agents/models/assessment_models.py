@@ -116,6 +116,14 @@ class AssessmentConfig(BaseModel):
             "does not persist results or escalate to Deep Analysis."
         ),
     )
+    batch: bool = Field(
+        default=True,
+        description=(
+            "When True, Situation Awareness runs once over the client's KPI set "
+            "and results are fanned out per KPI. When False, one SA pass runs "
+            "per KPI (legacy mode, quadratic in KPI count)."
+        ),
+    )
 
 
 # ---------------------------------------------------------------------------
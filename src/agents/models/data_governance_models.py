@@ -257,6 +257,21 @@ class SliceValidityCheckRequest(BaseModel):
     version_filter: Optional[str] = Field(
         "Actual", description="version filter, or None to disable"
     )
+    batched: bool = Field(
+        True,
+        description=(
+            "Answer both checks for every dimension in one query "
+            "(profile_batched() in src/analysis/slice_validity.py), falling back "
+            "to one query per dimension if it fails. False always runs per dimension."
+        ),
+    )
+    approximate_distinct: bool = Field(
+        False,
+        description=(
+            "Batched mode only: use APPROX_COUNT_DISTINCT for the cross-component "
+            "counts where the backend always has it. Can blur degraded vs ok."
+        ),
+    )
 
 
 class SliceValidityDimensionResult(BaseModel):
@@ -56,6 +56,11 @@ class TableColumnProfile(A9AgentBaseModel):
         default_factory=dict,
         description="Numeric or categorical statistics (min, max, distinct_count, etc.)",
     )
+    error_bounds: Dict[str, float] = Field(
+        default_factory=dict,
+        description="Relative error of approximate statistics, keyed like statistics "
+        "(e.g. distinct_count from APPROX_COUNT_DISTINCT); statistics not listed are exact",
+    )
     semantic_tags: List[str] = Field(
         default_factory=list,
         description="Semantic hints (e.g., measure, dimension:region, date)",
@@ -69,6 +74,11 @@ class TableProfile(A9AgentBaseModel):
     row_count: Optional[int] = Field(
         None, description="Approximate row count reported by the source system"
     )
+    row_count_is_estimate: bool = Field(
+        False,
+        description="True when row_count comes from catalog metadata documented as approximate "
+        "(inspection_depth='fast') rather than a COUNT or exact table metadata",
+    )
     primary_keys: List[str] = Field(
         default_factory=list, description="List of columns serving as primary/business keys"
     )
@@ -90,6 +100,11 @@ class TableProfile(A9AgentBaseModel):
         None, description="SQL definition for views (extracted from INFORMATION_SCHEMA.VIEWS)"
     )
     notes: Optional[str] = Field(None, description="Additional metadata or caveats")
+    fingerprint: Optional[str] = Field(
+        None,
+        description="Catalog fingerprint (columns, types, row count, last-modified) the "
+        "profile was taken at; set when the schema profile store is enabled",
+    )
 
 
 class KPIProposal(A9AgentBaseModel):
@@ -146,11 +161,18 @@ class DataProductSchemaInspectionRequest(A9AgentBaseRequest):
     )
     inspection_depth: str = Field(
         "standard",
-        description="Depth of profiling (basic, standard, extended) influencing stats computation",
+        description="Depth of profiling (fast, basic, standard, extended) influencing stats computation. "
+        "'fast' uses metadata row counts, TABLESAMPLE value sampling and approximate distinct "
+        "counts; 'extended' adds exact distinct counts",
     )
     include_samples: bool = Field(
         False, description="Whether to pull sample values for each column (may be slower)"
     )
+    refresh_profiles: bool = Field(
+        False,
+        description="Re-profile every table even when the schema profile store has an "
+        "unchanged fingerprint for it",
+    )
     environment: str = Field(
         "dev", description="Execution environment (dev/test/prod) for connection routing"
     )
@@ -517,7 +539,7 @@ class DataProductOnboardingWorkflowRequest(A9AgentBaseRequest):
         False, description="Whether schema inspection should include sample values"
     )
     inspection_depth: str = Field(
-        "standard", description="Schema inspection depth hint (basic, standard, extended)"
+        "standard", description="Schema inspection depth hint (fast, basic, standard, extended)"
     )
     connection_overrides: Optional[Dict[str, Any]] = Field(
         None,
@@ -240,6 +240,7 @@ class KPIValue(BaseModel):
     percent_change: Optional[float] = Field(None, description="Percentage change vs comparison")
     monthly_values: Optional[List[Dict[str, Any]]] = Field(None, description="Monthly aggregated values for trend display. Each dict: {period: str, value: float}")
     inverse_logic: bool = Field(False, description="True for cost/expense KPIs where a positive change is bad (higher cost = worse)")
+    plan_value: Optional[float] = Field(None, description="Plan/budget value for the same window when it was read together with this value (bundled reads)")
     # What this number actually measured. Optional so existing callers/fixtures
     # are unaffected; consumers must treat absence as unknown, never as a match.
     context: Optional[MeasurementContext] = Field(
@@ -17,6 +17,7 @@ import logging
 import re
 from datetime import datetime, timezone
 from typing import Dict, List, Optional, Any, Set, Tuple, Union
+import numpy as np
 import yaml
 
 from pydantic import BaseModel, Field
@@ -62,12 +63,36 @@ from src.analysis.slice_validity import (
     check_completeness as _slice_validity_check_completeness,
     extract_components,
     profile as _slice_validity_profile,
+    profile_batched as _slice_validity_profile_batched,
 )
+from src.database.time_filter import TimeFilter
 
 # Setup logging
 logger = logging.getLogger(__name__)
 
 
+def _top3_shares(value_lists: List[List[float]]) -> List[float]:
+    """Top-3 share of the total for each list of group totals, in one NumPy pass.
+
+    The lists are NaN-padded into a matrix and sorted descending row by row; each
+    score is the sum of the top three over the row sum, with a zero sum counted as
+    1.0. An empty list scores 0.0.
+    """
+    if not value_lists:
+        return []
+    width = max(3, max(len(v) for v in value_lists))
+    matrix = np.full((len(value_lists), width), np.nan)
+    for i, values in enumerate(value_lists):
+        matrix[i, : len(values)] = values
+    descending = -np.sort(-matrix, axis=1)  # NaN padding sorts last
+    top3 = np.nansum(descending[:, :3], axis=1)
+    totals = np.nansum(matrix, axis=1)
+    totals[totals == 0.0] = 1.0
+    shares = top3 / totals
+    shares[np.array([len(v) == 0 for v in value_lists])] = 0.0
+    return [float(x) for x in shares]
+
+
 class A9_Data_Governance_Agent:
     """
     Agent9 Data Governance Agent
@@ -951,16 +976,25 @@ class A9_Data_Governance_Agent:
         # skipping it isn't a shortcut, it's the check correctly not claiming
         # to measure something it structurally can't.
         try:
-            completeness_verdicts = await _slice_validity_check_completeness(
-                _run_query, view, measure_column, components, dimensions,
-                request.value_column, request.version_filter, source_system,
-            )
-            cross_component_verdicts = []
-            if len(components) >= 2:
-                cross_component_verdicts = await _slice_validity_profile(
-                    _run_query, view, measure_column, components,
-                    dimensions, request.version_filter, source_system,
+            if request.batched:
+                # One query per KPI for both checks; profile_batched applies the
+                # same 2+ components rule and falls back to per-dimension queries.
+                completeness_verdicts, cross_component_verdicts = await _slice_validity_profile_batched(
+                    _run_query, view, measure_column, components, dimensions,
+                    request.value_column, request.version_filter, source_system,
+                    approximate=request.approximate_distinct,
+                )
+            else:
+                completeness_verdicts = await _slice_validity_check_completeness(
+                    _run_query, view, measure_column, components, dimensions,
+                    request.value_column, request.version_filter, source_system,
                 )
+                cross_component_verdicts = []
+                if len(components) >= 2:
+                    cross_component_verdicts = await _slice_validity_profile(
+                        _run_query, view, measure_column, components,
+                        dimensions, request.version_filter, source_system,
+                    )
         except Exception as exc:
             return _error(f"Slice-validity profiling failed: {exc}", components_used=components)
 
@@ -1235,6 +1269,9 @@ class A9_Data_Governance_Agent:
         timeframe: Optional[str] = None,
         max_dimensions_per_kpi: int = 5,
         enrichment_output_path: Optional[str] = None,
+        max_concurrent_kpis: int = 4,
+        refresh: bool = False,
+        score_cache_ttl_hours: float = 24.0,
     ) -> Dict[str, Any]:
         """
         Compute top "valuable" dimensions per KPI by executing grouped aggregates via the Data Product Agent
@@ -1245,11 +1282,21 @@ class A9_Data_Governance_Agent:
             <KPI Name>: "Dim A, Dim B, Dim C"
           dimension_scores:
             <KPI Name>: "{\"Dim A\": 0.62, \"Dim B\": 0.55}"
+          dimension_score_cache:
+            <KPI id>@<timeframe>[<start>..<end>]: {computed_at: <ISO>, scores: {<Dim A>: 0.62, ...}}
 
         Notes:
         - Uses a simple top-3 share metric (sum of top 3 group totals / sum of all groups) per dimension.
+        - Each KPI's candidate dimensions are fetched in one sweep query
+          (DPA.generate_sql_for_kpi_sweep), falling back to one grouped query per dimension.
+        - Up to max_concurrent_kpis KPIs are scored at once.
+        - Scores are cached per (KPI, timeframe, resolved date window) in the enrichment file
+          for score_cache_ttl_hours; a re-run only queries dimensions without a fresh cached
+          score unless refresh=True. Relative timeframes move their window as dates pass, and
+          the TTL bounds how long scores can lag the data within one window. Expired entries
+          and superseded windows of the run's timeframe are pruned on every write.
+        - NULL dimension members count as a group on both the sweep and the per-dimension path.
         - Does not modify the primary KPI registry; KPIProvider will merge this file on load.
-        - Keeps patterns simple and leverages existing agents.
         """
         try:
             if not data_product_agent:
@@ -1323,113 +1370,172 @@ class A9_Data_Governance_Agent:
 
             top_dimensions_map: Dict[str, str] = dict(existing.get("top_dimensions") or {})
             dimension_scores_map: Dict[str, str] = dict(existing.get("dimension_scores") or {})
+            score_cache: Dict[str, Dict[str, Any]] = dict(existing.get("dimension_score_cache") or {})
+
+            # Cache key window: the dates `timeframe` resolves to today, so "current_year" etc.
+            # never serve scores computed for an earlier window.
+            window_start, window_end = TimeFilter.date_range({"type": "date"}, timeframe)
+            key_suffix = f"[{window_start}..{window_end}]" if window_start else ""
+            now = datetime.now(timezone.utc)
+
+            def _fresh_scores(entry: Any) -> Dict[str, float]:
+                """Cached {dim: score} if the entry is within the TTL, else {} (stale or old format)."""
+                if not isinstance(entry, dict) or not isinstance(entry.get("scores"), dict):
+                    return {}
+                try:
+                    computed_at = datetime.fromisoformat(str(entry.get("computed_at")))
+                except ValueError:
+                    return {}
+                if computed_at.tzinfo is None:
+                    computed_at = computed_at.replace(tzinfo=timezone.utc)
+                if (now - computed_at).total_seconds() > float(score_cache_ttl_hours) * 3600.0:
+                    return {}
+                return dict(entry["scores"])
 
             # Candidate dimensions from contract; KPI metadata dims are additive when present
             contract_dim_candidates = _contract_dims()
 
-            def _score_dim(rows: List[List[Any]], columns: List[str]) -> float:
-                # Score by concentration: top-3 share of total
-                try:
-                    if not rows:
-                        return 0.0
-                    # determine measure column index
-                    mi = -1
-                    if columns:
-                        for idx, c in enumerate(columns):
-                            if str(c).strip().lower() == "total_value":
-                                mi = idx
-                                break
-                    if mi < 0:
-                        mi = 1 if (columns and len(columns) > 1) else 0
-                    vals: List[float] = []
-                    for r in rows:
-                        try:
-                            v = r[mi]
-                            vals.append(float(v) if v is not None else 0.0)
-                        except Exception:
-                            continue
-                    if not vals:
-                        return 0.0
-                    total = sum(vals) or 1.0
-                    vals.sort(reverse=True)
-                    top3 = sum(vals[:3])
-                    return float(top3) / float(total) if total else 0.0
-                except Exception:
-                    return 0.0
-
-            analyzed = 0
-            failures: List[str] = []
-
-            for kpi in all_kpis:
-                try:
-                    kpi_name = getattr(kpi, "name", None) or getattr(kpi, "id", None) or "unknown"
-                    # Compose candidate dims: contract dims + KPI metadata dims
-                    candidate_dims: List[str] = list(contract_dim_candidates)
+            def _breakdown_values(rows: List[Any], columns: List[str]) -> List[float]:
+                # Measure column of a per-dimension breakdown: total_value, else the second column
+                mi = -1
+                if columns:
+                    for idx, c in enumerate(columns):
+                        if str(c).strip().lower() == "total_value":
+                            mi = idx
+                            break
+                if mi < 0:
+                    mi = 1 if (columns and len(columns) > 1) else 0
+                vals: List[float] = []
+                for r in rows:
                     try:
-                        if hasattr(kpi, "dimensions") and isinstance(kpi.dimensions, list):
-                            for d in kpi.dimensions:
-                                if isinstance(d, dict) and d.get("name"):
-                                    candidate_dims.append(str(d.get("name")))
-                                elif isinstance(d, str):
-                                    candidate_dims.append(d)
+                        v = list(r.values())[mi] if isinstance(r, dict) else r[mi]
+                        vals.append(float(v) if v is not None else 0.0)
                     except Exception:
-                        pass
-                    # Deduplicate while preserving order
-                    seen: Set[str] = set()
-                    dims_unique: List[str] = []
-                    for d in candidate_dims:
-                        s = str(d).strip()
-                        if s and s not in seen:
-                            seen.add(s)
-                            dims_unique.append(s)
-
-                    if not dims_unique:
                         continue
+                return vals
 
-                    # Score each dimension by executing grouped KPI SQL via Data Product Agent
-                    dim_scores: Dict[str, float] = {}
-                    for dim in dims_unique:
-                        try:
-                            gen = await data_product_agent.generate_sql_for_kpi(
-                                kpi_definition=kpi,
-                                timeframe=timeframe,
-                                filters=None,
-                                breakdown=True,
-                                override_group_by=[dim]
-                            )
-                            if not gen.get("success"):
-                                continue
-                            exec_resp = await data_product_agent.execute_sql(gen.get("sql"))
-                            rows = exec_resp.get("rows") or []
-                            cols = exec_resp.get("columns") or []
-                            score = _score_dim(rows, cols)
-                            dim_scores[dim] = score
-                        except Exception:
-                            # Non-fatal per-dimension
+            async def _group_totals(kpi: Any, dims: List[str]) -> Dict[str, List[float]]:
+                """Group totals per dimension: one sweep query, else one grouped query per dimension."""
+                dp_id = getattr(kpi, "data_product_id", None)
+                sweep_sql = getattr(data_product_agent, "generate_sql_for_kpi_sweep", None)
+                if sweep_sql is not None and len(dims) >= 2:
+                    try:
+                        gen = await sweep_sql(kpi, dims, timeframe=timeframe)
+                        if gen.get("success"):
+                            resp = await data_product_agent.execute_sql(gen.get("sql"), data_product_id=dp_id)
+                            split = data_product_agent.split_sweep_result(resp, gen["dimensions"], gen["mode"])
+                            if isinstance(split, dict):
+                                return {d: list(split[d]["values"].values()) for d in dims if d in split}
+                    except Exception as e:
+                        self.logger.debug(f"top dimensions sweep failed for {getattr(kpi, 'name', kpi)}: {e}")
+                out: Dict[str, List[float]] = {}
+                for dim in dims:
+                    try:
+                        gen = await data_product_agent.generate_sql_for_kpi(
+                            kpi_definition=kpi,
+                            timeframe=timeframe,
+                            filters=None,
+                            breakdown=True,
+                            override_group_by=[dim]
+                        )
+                        if not gen.get("success"):
                             continue
+                        exec_resp = await data_product_agent.execute_sql(gen.get("sql"), data_product_id=dp_id)
+                        out[dim] = _breakdown_values(exec_resp.get("rows") or [], exec_resp.get("columns") or [])
+                    except Exception:
+                        # Non-fatal per-dimension
+                        continue
+                return out
 
-                    # Select top-N dimensions by score
-                    if dim_scores:
-                        top_sorted = sorted(dim_scores.items(), key=lambda kv: kv[1], reverse=True)
-                        top_list = [d for d, _ in top_sorted[: max(1, int(max_dimensions_per_kpi or 5))]]
-                        # Persist as comma-separated string for readability
-                        top_dimensions_map[kpi_name] = ", ".join(top_list)
-                        # Store scores as compact JSON string to preserve floats precisely
-                        try:
-                            dimension_scores_map[kpi_name] = json.dumps({k: round(v, 6) for k, v in dim_scores.items()})
-                        except Exception:
-                            # Fallback to YAML-native mapping
-                            dimension_scores_map[kpi_name] = {k: float(v) for k, v in dim_scores.items()}
-                        analyzed += 1
-                    else:
-                        failures.append(kpi_name)
+            kpi_slots = asyncio.Semaphore(max(1, int(max_concurrent_kpis or 1)))
+
+            async def _score_kpi(kpi: Any) -> Optional[Tuple[str, str, Dict[str, float], bool, str]]:
+                """(kpi_name, cache_key, {dim: score}, fully_cached, computed_at), or None when there is nothing to score."""
+                kpi_name = getattr(kpi, "name", None) or getattr(kpi, "id", None) or "unknown"
+                # Compose candidate dims: contract dims + KPI metadata dims
+                candidate_dims: List[str] = list(contract_dim_candidates)
+                try:
+                    if hasattr(kpi, "dimensions") and isinstance(kpi.dimensions, list):
+                        for d in kpi.dimensions:
+                            if isinstance(d, dict) and d.get("name"):
+                                candidate_dims.append(str(d.get("name")))
+                            elif isinstance(d, str):
+                                candidate_dims.append(d)
                 except Exception:
+                    pass
+                # Deduplicate while preserving order
+                seen: Set[str] = set()
+                dims_unique: List[str] = []
+                for d in candidate_dims:
+                    s = str(d).strip()
+                    if s and s not in seen:
+                        seen.add(s)
+                        dims_unique.append(s)
+
+                if not dims_unique:
+                    return None
+
+                cache_key = f"{getattr(kpi, 'id', None) or kpi_name}@{timeframe or ''}{key_suffix}"
+                entry = score_cache.get(cache_key)
+                cached = {} if refresh else _fresh_scores(entry)
+                # Topping up a fresh entry keeps its timestamp, so it expires as a whole
+                computed_at = entry["computed_at"] if cached else now.isoformat()
+                missing = [d for d in dims_unique if d not in cached]
+                if missing:
+                    async with kpi_slots:
+                        totals = await _group_totals(kpi, missing)
+                    scored = [d for d in missing if d in totals]
+                    cached.update(zip(scored, _top3_shares([totals[d] for d in scored])))
+                dim_scores = {d: cached[d] for d in dims_unique if d in cached}
+                return kpi_name, cache_key, dim_scores, not missing, computed_at
+
+            analyzed = 0
+            from_cache = 0
+            failures: List[str] = []
+
+            results = await asyncio.gather(*(_score_kpi(kpi) for kpi in all_kpis), return_exceptions=True)
+            for kpi, result in zip(all_kpis, results):
+                if result is None:
+                    continue
+                if isinstance(result, Exception):
                     failures.append(getattr(kpi, "name", "unknown"))
+                    continue
+                kpi_name, cache_key, dim_scores, fully_cached, computed_at = result
+                # Select top-N dimensions by score
+                if dim_scores:
+                    score_cache[cache_key] = {
+                        "computed_at": str(computed_at),
+                        "scores": {k: round(v, 6) for k, v in dim_scores.items()},
+                    }
+                    top_sorted = sorted(dim_scores.items(), key=lambda kv: kv[1], reverse=True)
+                    top_list = [d for d, _ in top_sorted[: max(1, int(max_dimensions_per_kpi or 5))]]
+                    # Persist as comma-separated string for readability
+                    top_dimensions_map[kpi_name] = ", ".join(top_list)
+                    # Store scores as compact JSON string to preserve floats precisely
+                    try:
+                        dimension_scores_map[kpi_name] = json.dumps({k: round(v, 6) for k, v in dim_scores.items()})
+                    except Exception:
+                        # Fallback to YAML-native mapping
+                        dimension_scores_map[kpi_name] = {k: float(v) for k, v in dim_scores.items()}
+                    analyzed += 1
+                    from_cache += int(fully_cached)
+                else:
+                    failures.append(kpi_name)
+
+            # Drop expired entries and, for this timeframe, windows it has moved past —
+            # rolling timeframes would otherwise add a key per KPI every time they move.
+            timeframe_tail = f"@{timeframe or ''}"
+            score_cache = {
+                key: entry for key, entry in score_cache.items()
+                if _fresh_scores(entry)
+                and not (key.split("[", 1)[0].endswith(timeframe_tail) and not key.endswith(key_suffix))
+            }
 
             # Write enrichment YAML (non-destructive merge)
             out_doc = dict(existing)
             out_doc["top_dimensions"] = top_dimensions_map
             out_doc["dimension_scores"] = dimension_scores_map
+            out_doc["dimension_score_cache"] = score_cache
 
             try:
                 os.makedirs(os.path.dirname(out_path), exist_ok=True)
@@ -1440,6 +1546,7 @@ class A9_Data_Governance_Agent:
                     "written": True,
                     "path": out_path,
                     "kpis_analyzed": analyzed,
+                    "kpis_from_cache": from_cache,
                     "kpis_total": len(all_kpis),
                     "failures": failures,
                 }
@@ -35,8 +35,12 @@ from src.agents.protocols.data_product_protocol import DataProductProtocol
 from src.agents.shared.a9_agent_base_model import A9AgentBaseModel
 from src.database.backends.duckdb_manager import DuckDBManager
 from src.database.manager_factory import DatabaseManagerFactory
+from src.database.query_result_cache import QueryResultCache, copy_result
+from src.database.schema_profile_store import SchemaProfileStore, table_fingerprint
+from src.database.single_flight import SingleFlight
 from src.database.time_filter import TimeFilter
 from src.registry.factory import RegistryFactory
+from src.registry.contract_cache import get_contract_cache
 from src.registry.providers.data_product_provider import DataProductProvider
 from src.registry.providers.kpi_provider import KPIProvider
 # Import shared SQL execution models
@@ -82,6 +86,16 @@ except Exception:
     # Non-fatal if dotenv is missing; env vars may still be set by the host
     pass
 
+# Relative error recorded with fast-mode APPROX_COUNT_DISTINCT results.
+# Snowflake documents an average relative error of 1.62338%; BigQuery publishes
+# no figure for its HLL++ estimate, so a conservative 1% is recorded. DuckDB is
+# local and always counts exactly. SQL Server only has APPROX_COUNT_DISTINCT
+# from 2019 on, so it counts exactly too (as slice_validity does).
+_APPROX_DISTINCT_RELATIVE_ERROR: Dict[str, float] = {
+    "snowflake": 0.0162338,
+    "bigquery": 0.01,
+}
+
 class A9_Data_Product_Agent(DataProductProtocol):
     """
     Data Product Agent - Implements DataProductProtocol
@@ -145,7 +159,10 @@ class A9_Data_Product_Agent(DataProductProtocol):
         self.logger.info(f"Initializing database connection with type: {db_type}, path: {self.db_path}")
         
         # Initialize database manager
-        self.db_manager = DuckDBManager({'type': db_type, 'path': self.db_path}, logger=self.logger)
+        self.db_manager = DuckDBManager(
+            {'type': db_type, 'path': self.db_path, 'max_workers': db_config.get('max_workers', 4)},
+            logger=self.logger,
+        )
         self.is_connected = False
         self.logger.info("Database connection initialized successfully")
         # Cached BigQuery manager — created on first BigQuery SQL execution
@@ -193,9 +210,20 @@ class A9_Data_Product_Agent(DataProductProtocol):
         except Exception:
             self.bypass_mcp = False
 
+        # Opt-in execute_sql result cache (config or env; see src/database/query_result_cache.py)
+        self._query_cache: Optional[QueryResultCache] = None
+        env_query_cache = str(os.environ.get('A9_QUERY_CACHE', 'false')).lower() in ('1','true','yes','y','on')
+        if self.config.query_cache_enabled or env_query_cache:
+            self._query_cache = QueryResultCache(
+                default_ttl_seconds=self.config.query_cache_ttl_seconds,
+                source_ttls=self.config.query_cache_source_ttls,
+                max_bytes=int(self.config.query_cache_max_mb * 1024 * 1024),
+            )
+
+        # Concurrent identical execute_sql calls share one backend execution
+        self._single_flight: Optional[SingleFlight] = SingleFlight() if self.config.query_single_flight else None
+
         # Registry will be loaded in _async_init after database connection is established
-        # Cache for exposed columns per view (to avoid repeated YAML reads)
-        self._view_exposed_columns_cache: Dict[str, Set[str]] = {}
     
     async def _async_init(self):
         """Initialize async resources."""
@@ -385,13 +413,11 @@ class A9_Data_Product_Agent(DataProductProtocol):
                                         
                                         # 2. Create Views
                                         # We need to peek into the contract to find view names
-                                        with open(contract_path, 'r') as cf:
-                                            c_data = yaml.safe_load(cf)
-                                            views = c_data.get('views', [])
-                                            for v in views:
-                                                v_name = v.get('name')
-                                                if v_name:
-                                                    await self.create_view_from_contract(contract_path, v_name)
+                                        contract = get_contract_cache().get(contract_path)
+                                        for v in (contract.views if contract else []):
+                                            v_name = v.get('name')
+                                            if v_name:
+                                                await self.create_view_from_contract(contract_path, v_name)
                                 except Exception as hydrate_err:
                                     self.logger.warning(f"Auto-hydration failed for {dp.get('product_id')}: {hydrate_err}")
 
@@ -735,18 +761,78 @@ class A9_Data_Product_Agent(DataProductProtocol):
                     inspection_metadata=inspection_metadata,
                 )
 
-            # Profile each table/view using the resolved backend
-            for table_name in table_names:
-                try:
-                    profile = await self._profile_table(
+            # Column metadata and row counts for the whole schema in bulk; tables
+            # missing from the catalog fall back to their own per-table queries.
+            # Fast mode prefetches even for one table to skip COUNT(1).
+            profile_store = self._schema_profile_store()
+            if len(table_names) > 1 or settings.get("inspection_depth") == "fast" or profile_store:
+                settings["catalog"] = await self._prefetch_inspection_catalog(
+                    inspection_manager, settings, table_names
+                )
+
+            # Tables whose catalog fingerprint matches the stored profile (taken
+            # at the same depth) are reused instead of re-profiled.
+            fingerprints: Dict[str, Optional[str]] = {}
+            reused: Dict[str, TableProfile] = {}
+            if profile_store:
+                stored = {} if request.refresh_profiles else profile_store.load_profiles(
+                    source_system, settings.get("project"), settings.get("schema")
+                )
+                for table_name in table_names:
+                    fingerprint = table_fingerprint((settings.get("catalog") or {}).get(table_name))
+                    fingerprints[table_name] = fingerprint
+                    prior = stored.get(table_name) or {}
+                    if (
+                        fingerprint
+                        and prior.get("fingerprint") == fingerprint
+                        and prior.get("inspection_depth") == settings.get("inspection_depth")
+                    ):
+                        try:
+                            reused[table_name] = TableProfile.model_validate(prior["profile"])
+                        except Exception as e:
+                            self.logger.debug(f"Stored profile for {table_name} unusable, re-profiling: {e}")
+
+            # Profile tables/views concurrently, bounded per backend, and keep
+            # the discovery order in the response.
+            profile_slots = asyncio.Semaphore(self._inspection_concurrency(source_system))
+
+            async def _profile_one(table_name: str) -> Optional[TableProfile]:
+                async with profile_slots:
+                    return await self._profile_table(
                         inspection_manager=inspection_manager,
                         table_name=table_name,
                         settings=settings,
                     )
-                    if profile:
-                        tables.append(profile)
-                except Exception as profile_err:
-                    warnings.append(f"Failed to profile {table_name}: {profile_err}")
+
+            to_profile = [t for t in table_names if t not in reused]
+            profiles = dict(zip(to_profile, await asyncio.gather(
+                *(_profile_one(t) for t in to_profile), return_exceptions=True
+            )))
+            profiles.update(reused)
+            store_entries: Dict[str, Any] = {}
+            for table_name in table_names:
+                profile = profiles[table_name]
+                if isinstance(profile, Exception):
+                    warnings.append(f"Failed to profile {table_name}: {profile}")
+                elif profile:
+                    profile.fingerprint = fingerprints.get(table_name)
+                    tables.append(profile)
+                    if profile.fingerprint and table_name not in reused:
+                        store_entries[table_name] = {
+                            "fingerprint": profile.fingerprint,
+                            "inspection_depth": settings.get("inspection_depth"),
+                            "profile": profile.model_dump(mode="json"),
+                        }
+            if profile_store:
+                inspection_metadata["reused_tables"] = [t for t in table_names if t in reused]
+                inspection_metadata["reprofiled_tables"] = to_profile
+                if store_entries:
+                    try:
+                        profile_store.save_profiles(
+                            source_system, settings.get("project"), settings.get("schema"), store_entries
+                        )
+                    except Exception as e:
+                        warnings.append(f"Could not persist schema profiles: {e}")
 
             # Infer KPI candidates from measures/dimensions heuristics
             inferred_kpis = self._infer_kpis_from_profiles(tables)
@@ -792,12 +878,25 @@ class A9_Data_Product_Agent(DataProductProtocol):
 
         request_id = request.request_id
         try:
+            profile_store = self._schema_profile_store()
+            fragments = (
+                profile_store.load_contract_fragments(request.data_product_id) if profile_store else {}
+            )
             contract_dict = self._build_contract_dict(
                 data_product_id=request.data_product_id,
                 schema_summary=request.schema_summary,
                 kpi_proposals=request.kpi_proposals,
                 overrides=request.contract_overrides,
+                previous_fragments=fragments,
             )
+            if profile_store:
+                try:
+                    profile_store.save_contract_fragments(
+                        request.data_product_id,
+                        self._contract_fragments(contract_dict, request.schema_summary),
+                    )
+                except Exception as e:
+                    self.logger.warning(f"Could not persist contract fragments: {e}")
             contract_yaml = yaml.safe_dump(
                 contract_dict, sort_keys=False, allow_unicode=True
             )
@@ -1109,6 +1208,8 @@ class A9_Data_Product_Agent(DataProductProtocol):
             "connection_config": {},
             "connection_params": {},
             "connection_overrides": {},
+            "inspection_depth": (request.inspection_depth or "standard").lower(),
+            "include_samples": request.include_samples,
         }
         
         # Start with request values
@@ -1377,7 +1478,181 @@ class A9_Data_Product_Agent(DataProductProtocol):
             return [row.get("table_name") or row.get("TABLE_NAME") for row in rows if row]
 
         return []
-    
+
+    def _schema_profile_store(self) -> Optional[SchemaProfileStore]:
+        """The schema profile store, or None when inspection_profile_store_dir is unset."""
+        store_dir = self.config.inspection_profile_store_dir
+        return SchemaProfileStore(store_dir) if store_dir else None
+
+    def _inspection_concurrency(self, source_system: str) -> int:
+        """How many tables inspect_source_schema profiles at once for this backend.
+
+        inspection_concurrency, lowered to the inspection_backend_limits entry
+        for the source system when one is configured.
+        """
+        limit = max(1, int(self.config.inspection_concurrency))
+        backend = (source_system or "duckdb").lower()
+        if backend in ("sql_server", "mssql"):
+            backend = "sqlserver"
+        cap = self.config.inspection_backend_limits.get(backend)
+        return max(1, min(limit, int(cap))) if cap else limit
+
+    @staticmethod
+    def _result_records(result: Any) -> List[Dict[str, Any]]:
+        """Rows of an inspection query as dicts with lower-cased keys.
+
+        Inspection managers return either a pandas DataFrame (BigQuery, SQL
+        Server, Snowflake — the latter with UPPERCASE unquoted aliases) or a
+        {"rows": [...]} dict (DuckDB).
+        """
+        if hasattr(result, "to_dict") and hasattr(result, "columns"):
+            rows = result.to_dict(orient="records")
+        elif isinstance(result, dict):
+            rows = result.get("rows", []) or []
+        else:
+            rows = []
+        return [{str(k).lower(): v for k, v in row.items()} for row in rows if row]
+
+    async def _prefetch_inspection_catalog(
+        self, inspection_manager, settings: Dict[str, Any], table_names: List[str]
+    ) -> Dict[str, Dict[str, Any]]:
+        """Column metadata and row counts for every inspected table in two queries.
+
+        Returns {table_name: {"columns": [row, ...], "row_count": int|None,
+        "row_count_exact": bool, "last_modified": str|None, "base_table": bool,
+        "tracks_changes": bool}}.
+        The per-table profilers use an entry in place of their own
+        INFORMATION_SCHEMA.COLUMNS and COUNT queries; a table absent from the
+        catalog (or a failed bulk query) is profiled exactly as before.
+
+        Row counts come from table metadata, so views never get one here and
+        keep base_table=False (table_fingerprint leaves them unfingerprinted):
+        BigQuery __TABLES__ and Snowflake TABLES.ROW_COUNT are exact for base
+        tables; SQL Server sys.partitions is documented as approximate and is
+        recorded with row_count_exact=False.
+
+        tracks_changes says whether last_modified moves on every data change.
+        BigQuery last_modified_time and Snowflake LAST_ALTERED do, so an unchanged
+        fingerprint means unchanged data. SQL Server's modify_date only moves on
+        DDL, and an UPDATE that keeps the row count changes nothing in the
+        catalog, so SQL Server entries are never fingerprinted (always re-profiled).
+        """
+        source_system = settings["source_system"]
+        schema = settings.get("schema")
+        if source_system == "bigquery":
+            project = settings.get("project")
+            columns_query = f"""
+                SELECT table_name, column_name, data_type, is_nullable
+                FROM `{project}.{schema}.INFORMATION_SCHEMA.COLUMNS`
+                ORDER BY table_name, ordinal_position
+            """
+            counts_query = f"""
+                SELECT table_id AS table_name, row_count, last_modified_time AS last_modified
+                FROM `{project}.{schema}.__TABLES__`
+                WHERE type = 1
+            """
+            counts_exact = True
+            tracks_changes = True
+        elif source_system in ("sqlserver", "sql_server", "mssql"):
+            db_schema = schema or settings.get("connection_config", {}).get("schema", "dbo")
+            columns_query = f"""
+                SELECT
+                    TABLE_NAME    AS table_name,
+                    COLUMN_NAME   AS column_name,
+                    DATA_TYPE     AS data_type,
+                    IS_NULLABLE   AS is_nullable
+                FROM INFORMATION_SCHEMA.COLUMNS
+                WHERE TABLE_SCHEMA = '{db_schema}'
+                ORDER BY TABLE_NAME, ORDINAL_POSITION
+            """
+            counts_query = f"""
+                SELECT t.name AS table_name, SUM(p.rows) AS row_count
+                FROM sys.tables t
+                JOIN sys.schemas s ON s.schema_id = t.schema_id
+                JOIN sys.partitions p ON p.object_id = t.object_id AND p.index_id IN (0, 1)
+                WHERE s.name = '{db_schema}'
+                GROUP BY t.name
+            """
+            counts_exact = False
+            tracks_changes = False
+        elif source_system == "snowflake":
+            sf_database = settings.get("project") or settings.get("connection_config", {}).get("database")
+            db_schema = schema or settings.get("connection_config", {}).get("schema")
+            columns_query = f"""
+                SELECT
+                    TABLE_NAME    AS table_name,
+                    COLUMN_NAME   AS column_name,
+                    DATA_TYPE     AS data_type,
+                    IS_NULLABLE   AS is_nullable
+                FROM {sf_database}.INFORMATION_SCHEMA.COLUMNS
+                WHERE TABLE_SCHEMA = '{db_schema}'
+                ORDER BY TABLE_NAME, ORDINAL_POSITION
+            """
+            counts_query = f"""
+                SELECT TABLE_NAME AS table_name, ROW_COUNT AS row_count, LAST_ALTERED AS last_modified
+                FROM {sf_database}.INFORMATION_SCHEMA.TABLES
+                WHERE TABLE_SCHEMA = '{db_schema}'
+                  AND TABLE_TYPE = 'BASE TABLE'
+            """
+            counts_exact = True
+            tracks_changes = True
+        else:
+            # DuckDB is local: per-table PRAGMA/COUNT is already cheap.
+            return {}
+
+        wanted = set(table_names)
+        catalog: Dict[str, Dict[str, Any]] = {}
+        try:
+            for row in self._result_records(await inspection_manager.execute_query(columns_query, {})):
+                name = row.get("table_name")
+                if name in wanted and row.get("column_name"):
+                    entry = catalog.setdefault(name, {
+                        "columns": [], "row_count": None, "row_count_exact": counts_exact,
+                        "last_modified": None, "base_table": False, "tracks_changes": tracks_changes,
+                    })
+                    entry["columns"].append(row)
+        except Exception as e:
+            self.logger.warning(f"Bulk column metadata unavailable, profiling tables individually: {e}")
+            return {}
+        try:
+            for row in self._result_records(await inspection_manager.execute_query(counts_query, {})):
+                entry = catalog.get(row.get("table_name"))
+                if entry is None:
+                    continue
+                entry["base_table"] = True
+                if row.get("row_count") is not None:
+                    entry["row_count"] = int(row["row_count"])
+                if row.get("last_modified") is not None:
+                    entry["last_modified"] = str(row["last_modified"])
+        except Exception as e:
+            self.logger.warning(f"Bulk row counts unavailable, counting tables individually: {e}")
+        return catalog
+
+    def _catalog_columns(self, catalog_entry: Dict[str, Any]) -> List[TableColumnProfile]:
+        """TableColumnProfile list from a _prefetch_inspection_catalog entry."""
+        columns = []
+        for row in catalog_entry.get("columns", []):
+            col_name = row.get("column_name")
+            col_type = row.get("data_type")
+            columns.append(TableColumnProfile(
+                name=col_name,
+                data_type=col_type or "UNKNOWN",
+                is_nullable=str(row.get("is_nullable") or "YES").upper() != "NO",
+                semantic_tags=self._infer_semantic_tags(col_name, col_type),
+            ))
+        return columns
+
+    def _catalog_row_count(
+        self, catalog_entry: Dict[str, Any], settings: Dict[str, Any]
+    ) -> Optional[int]:
+        """Row count from a catalog entry when it can stand in for COUNT(1):
+        always when exact, and in fast mode also when only an estimate."""
+        if catalog_entry.get("row_count") is None:
+            return None
+        if not catalog_entry.get("row_count_exact") and settings.get("inspection_depth") != "fast":
+            return None
+        return int(catalog_entry["row_count"])
+
     async def _profile_table(
         self, inspection_manager, table_name: str, settings: Dict[str, Any]
     ) -> Optional[TableProfile]:
@@ -1385,6 +1660,14 @@ class A9_Data_Product_Agent(DataProductProtocol):
         Profile a table/view using the appropriate backend method.
 
         Dispatches to _profile_table_duckdb or _profile_table_bigquery.
+
+        inspection_depth controls the statistics layered on top:
+        - basic/standard: columns, row count and categorical sample values
+        - extended: plus exact COUNT(DISTINCT) per categorical column
+        - fast: metadata row counts (estimates accepted), sample values drawn
+          from a TABLESAMPLE of large base tables, and APPROX_COUNT_DISTINCT
+          per categorical column with its relative error in
+          TableColumnProfile.error_bounds
         """
         source_system = settings["source_system"]
         include_samples = settings.get("include_samples", False)
@@ -1410,9 +1693,21 @@ class A9_Data_Product_Agent(DataProductProtocol):
             return None
 
         if profile is not None:
+            catalog_entry = (settings.get("catalog") or {}).get(table_name) or {}
+            if (
+                inspection_depth == "fast"
+                and catalog_entry.get("row_count") is not None
+                and not catalog_entry.get("row_count_exact")
+            ):
+                profile.row_count_is_estimate = True
             await self._populate_categorical_sample_values(
                 inspection_manager, source_system, profile, settings
             )
+            if inspection_depth in ("fast", "extended"):
+                await self._populate_distinct_counts(
+                    inspection_manager, source_system, profile, settings,
+                    approximate=inspection_depth == "fast",
+                )
         return profile
 
     def _is_categorical_candidate(
@@ -1428,6 +1723,65 @@ class A9_Data_Product_Agent(DataProductProtocol):
         dtype_lower = (column.data_type or "").lower()
         return any(t in dtype_lower for t in ("varchar", "char", "text", "string"))
 
+    @staticmethod
+    def _qualified_inspection_table(
+        source_system: str, table_name: str, settings: Dict[str, Any]
+    ) -> Optional[str]:
+        """Backend-quoted, schema-qualified table name for inspection queries."""
+        schema = settings.get("schema")
+        database = settings.get("project") or settings.get("connection_config", {}).get("database")
+        if source_system == "snowflake":
+            return f'"{schema}"."{table_name}"' if schema else f'"{table_name}"'
+        if source_system == "bigquery":
+            return f"`{database}.{schema}.{table_name}`" if database and schema else f"`{table_name}`"
+        if source_system in ("sqlserver", "sql_server", "mssql"):
+            return f"[{schema or 'dbo'}].[{table_name}]"
+        if source_system == "duckdb":
+            return f'"{table_name}"'
+        return None
+
+    @staticmethod
+    def _quote_inspection_column(source_system: str, column_name: str) -> str:
+        if source_system in ("snowflake", "duckdb"):
+            return f'"{column_name}"'
+        if source_system in ("sqlserver", "sql_server", "mssql"):
+            return f"[{column_name}]"
+        return column_name
+
+    @staticmethod
+    def _tablesample_clause(source_system: str, percent: Optional[float]) -> str:
+        """Block-sampling clause placed after the table name, or "" for a full read."""
+        if not percent:
+            return ""
+        if source_system in ("bigquery", "sqlserver", "sql_server", "mssql"):
+            return f" TABLESAMPLE SYSTEM ({percent:g} PERCENT)"
+        if source_system == "snowflake":
+            return f" TABLESAMPLE SYSTEM ({percent:g})"
+        if source_system == "duckdb":
+            return f" TABLESAMPLE {percent:g}%"
+        return ""
+
+    @classmethod
+    def _distinct_sample_query(
+        cls,
+        source_system: str,
+        table_name: str,
+        column_name: str,
+        settings: Dict[str, Any],
+        limit: int = 15,
+        sample_percent: Optional[float] = None,
+    ) -> Optional[str]:
+        """`SELECT DISTINCT <column> AS sample_value ... <top-N>` for one column,
+        optionally over a TABLESAMPLE, or None for an unsupported backend."""
+        qualified = cls._qualified_inspection_table(source_system, table_name, settings)
+        if qualified is None:
+            return None
+        source = qualified + cls._tablesample_clause(source_system, sample_percent)
+        column = cls._quote_inspection_column(source_system, column_name)
+        if source_system in ("sqlserver", "sql_server", "mssql"):
+            return f"SELECT DISTINCT TOP {limit} {column} AS sample_value FROM {source}"
+        return f"SELECT DISTINCT {column} AS sample_value FROM {source} LIMIT {limit}"
+
     async def _sample_distinct_values(
         self,
         inspection_manager,
@@ -1436,6 +1790,7 @@ class A9_Data_Product_Agent(DataProductProtocol):
         column_name: str,
         settings: Dict[str, Any],
         limit: int = 15,
+        sample_percent: Optional[float] = None,
     ) -> List[Any]:
         """Sample up to `limit` distinct values for a column.
 
@@ -1450,25 +1805,15 @@ class A9_Data_Product_Agent(DataProductProtocol):
 
         One shared implementation across all backends — only identifier
         quoting, qualified table naming, and top-N syntax vary, so a new
-        backend adds one branch here instead of a whole duplicated profiling
-        method (see _profile_table_duckdb/_bigquery/_sqlserver/_snowflake,
-        which already duplicate far more than this and are left as-is).
+        backend adds one branch to _distinct_sample_query instead of a whole
+        duplicated profiling method (see _profile_table_duckdb/_bigquery/
+        _sqlserver/_snowflake, which already duplicate far more than this and
+        are left as-is).
         """
-        schema = settings.get("schema")
-        database = settings.get("project") or settings.get("connection_config", {}).get("database")
-
-        if source_system == "snowflake":
-            qualified = f'"{schema}"."{table_name}"' if schema else f'"{table_name}"'
-            query = f'SELECT DISTINCT "{column_name}" AS sample_value FROM {qualified} LIMIT {limit}'
-        elif source_system == "bigquery":
-            qualified = f"`{database}.{schema}.{table_name}`" if database and schema else f"`{table_name}`"
-            query = f"SELECT DISTINCT {column_name} AS sample_value FROM {qualified} LIMIT {limit}"
-        elif source_system in ("sqlserver", "sql_server", "mssql"):
-            db_schema = schema or "dbo"
-            query = f"SELECT DISTINCT TOP {limit} [{column_name}] AS sample_value FROM [{db_schema}].[{table_name}]"
-        elif source_system == "duckdb":
-            query = f'SELECT DISTINCT "{column_name}" AS sample_value FROM "{table_name}" LIMIT {limit}'
-        else:
+        query = self._distinct_sample_query(
+            source_system, table_name, column_name, settings, limit, sample_percent
+        )
+        if query is None:
             return []
 
         try:
@@ -1495,13 +1840,149 @@ class A9_Data_Product_Agent(DataProductProtocol):
         """Fill in TableColumnProfile.sample_values for likely-categorical
         columns on an already-profiled table. Best-effort — a sampling
         failure for one column must not fail the whole profiling pass."""
-        fk_source_columns = {fk.source_column for fk in profile.foreign_keys}
-        for column in profile.columns:
-            if not self._is_categorical_candidate(column, profile.primary_keys, fk_source_columns):
-                continue
+        candidates = self._categorical_candidates(profile)
+        if not candidates:
+            return
+        sample_percent = self._inspection_sample_percent(profile, settings)
+        if len(candidates) > 1:
+            batched = await self._sample_distinct_values_batched(
+                inspection_manager, source_system, profile.name,
+                [column.name for column in candidates], settings,
+                sample_percent=sample_percent,
+            )
+            if batched is not None:
+                for column in candidates:
+                    column.sample_values = batched.get(column.name, [])
+                return
+        for column in candidates:
             column.sample_values = await self._sample_distinct_values(
-                inspection_manager, source_system, profile.name, column.name, settings
+                inspection_manager, source_system, profile.name, column.name, settings,
+                sample_percent=sample_percent,
             )
+
+    def _categorical_candidates(self, profile: TableProfile) -> List[TableColumnProfile]:
+        """Columns of a profiled table that _is_categorical_candidate accepts."""
+        fk_source_columns = {fk.source_column for fk in profile.foreign_keys}
+        return [
+            column for column in profile.columns
+            if self._is_categorical_candidate(column, profile.primary_keys, fk_source_columns)
+        ]
+
+    def _inspection_sample_percent(
+        self, profile: TableProfile, settings: Dict[str, Any]
+    ) -> Optional[float]:
+        """TABLESAMPLE percentage for fast-mode value sampling, or None to read
+        the whole table. Only base tables larger than inspection_sample_rows are
+        sampled (views can't be TABLESAMPLEd on BigQuery/SQL Server), at a rate
+        that reads roughly inspection_sample_rows rows."""
+        if settings.get("inspection_depth") != "fast" or profile.view_definition:
+            return None
+        target = int(self.config.inspection_sample_rows)
+        if not profile.row_count or profile.row_count <= target:
+            return None
+        return max(round(100.0 * target / profile.row_count, 4), 0.0001)
+
+    async def _populate_distinct_counts(
+        self,
+        inspection_manager,
+        source_system: str,
+        profile: TableProfile,
+        settings: Dict[str, Any],
+        approximate: bool,
+    ) -> None:
+        """Record statistics["distinct_count"] for the categorical columns of a
+        profiled table in one query.
+
+        approximate=True uses APPROX_COUNT_DISTINCT (one HyperLogLog pass,
+        no per-column sort/hash of the full table) and records the backend's
+        documented relative error in error_bounds["distinct_count"]; DuckDB and
+        SQL Server always count exactly. If the approximate query fails it is
+        retried once with exact counts. Best-effort like value sampling.
+        """
+        candidates = self._categorical_candidates(profile)
+        qualified = self._qualified_inspection_table(source_system, profile.name, settings)
+        if not candidates or qualified is None:
+            return
+        backend = "sqlserver" if source_system in ("sql_server", "mssql") else source_system
+        relative_error = _APPROX_DISTINCT_RELATIVE_ERROR.get(backend) if approximate else None
+        try:
+            try:
+                rows = await self._distinct_count_rows(
+                    inspection_manager, source_system, qualified, candidates, relative_error is not None
+                )
+            except Exception as e:
+                if relative_error is None:
+                    raise
+                self.logger.info(f"Approximate distinct counts failed for {profile.name} ({e}); counting exactly")
+                relative_error = None
+                rows = await self._distinct_count_rows(inspection_manager, source_system, qualified, candidates, False)
+            if not rows:
+                return
+            for idx, column in enumerate(candidates):
+                value = rows[0].get(f"d{idx}")
+                if value is None:
+                    continue
+                column.statistics["distinct_count"] = int(value)
+                if relative_error is not None:
+                    column.error_bounds["distinct_count"] = relative_error
+        except Exception as e:
+            self.logger.warning(f"Could not count distinct values for {profile.name}: {e}")
+
+    async def _distinct_count_rows(
+        self, inspection_manager, source_system: str, qualified: str, candidates, approximate: bool
+    ) -> List[Dict[str, Any]]:
+        """Row records of one SELECT counting each candidate column's distinct values as d<idx>."""
+        func = "APPROX_COUNT_DISTINCT({})" if approximate else "COUNT(DISTINCT {})"
+        select = ", ".join(
+            f"{func.format(self._quote_inspection_column(source_system, column.name))} AS d{idx}"
+            for idx, column in enumerate(candidates)
+        )
+        result = await inspection_manager.execute_query(f"SELECT {select} FROM {qualified}", {})
+        return self._result_records(result)
+
+    async def _sample_distinct_values_batched(
+        self,
+        inspection_manager,
+        source_system: str,
+        table_name: str,
+        column_names: List[str],
+        settings: Dict[str, Any],
+        limit: int = 15,
+        sample_percent: Optional[float] = None,
+    ) -> Optional[Dict[str, List[Any]]]:
+        """Sample distinct values for several columns of one table in one query.
+
+        Each column's _distinct_sample_query becomes a derived table tagged with
+        the column's position, and the derived tables are combined with UNION
+        ALL — one round trip per table instead of one per categorical column,
+        with the same top-N-per-column semantics. Returns None when the batched
+        query can't be built or fails, so the caller falls back to
+        _sample_distinct_values per column.
+        """
+        parts = []
+        for idx, column_name in enumerate(column_names):
+            sub = self._distinct_sample_query(
+                source_system, table_name, column_name, settings, limit, sample_percent
+            )
+            if sub is None:
+                return None
+            parts.append(f"SELECT {idx} AS col_idx, sample_value FROM ({sub}) s{idx}")
+        try:
+            result = await inspection_manager.execute_query("\nUNION ALL\n".join(parts), {})
+            samples: Dict[str, List[Any]] = {name: [] for name in column_names}
+            for row in self._result_records(result):
+                value = row.get("sample_value")
+                if value is None:
+                    continue
+                values = samples[column_names[int(row["col_idx"])]]
+                if len(values) < limit:
+                    values.append(value)
+            return samples
+        except Exception as e:
+            self.logger.warning(
+                f"Batched distinct-value sampling failed for {table_name}, sampling per column: {e}"
+            )
+            return None
     
     async def _profile_table_duckdb(
         self, inspection_manager, table_name: str, include_samples: bool, inspection_depth: str
@@ -1624,60 +2105,66 @@ class A9_Data_Product_Agent(DataProductProtocol):
             project = settings.get("project")
             schema = settings.get("schema")
             
-            # Get column metadata from INFORMATION_SCHEMA
-            columns_query = f"""
-                SELECT column_name, data_type, is_nullable
-                FROM `{project}.{schema}.INFORMATION_SCHEMA.COLUMNS`
-                WHERE table_name = @table_name
-                ORDER BY ordinal_position
-            """
-            columns_result = await inspection_manager.execute_query(
-                columns_query, 
-                {"table_name": table_name}
-            )
-            
-            columns = []
-            # Handle DataFrame response
-            if hasattr(columns_result, 'iterrows'):
-                for _, row in columns_result.iterrows():
-                    col_name = row.get("column_name")
-                    col_type = row.get("data_type")
-                    is_nullable = row.get("is_nullable", "YES") == "YES"
-                    if col_name:
-                        semantic_tags = self._infer_semantic_tags(col_name, col_type)
-                        columns.append(TableColumnProfile(
-                            name=col_name,
-                            data_type=col_type or "UNKNOWN",
-                            is_nullable=is_nullable,
-                            semantic_tags=semantic_tags,
-                        ))
+            catalog_entry = (settings.get("catalog") or {}).get(table_name) or {}
+            if catalog_entry.get("columns"):
+                columns = self._catalog_columns(catalog_entry)
             else:
-                # Fallback for dict format
-                column_rows = columns_result.get("rows", []) if isinstance(columns_result, dict) else []
-                for row in column_rows:
-                    col_name = row.get("column_name")
-                    col_type = row.get("data_type")
-                    is_nullable = row.get("is_nullable", "YES") == "YES"
-                    if col_name:
-                        semantic_tags = self._infer_semantic_tags(col_name, col_type)
-                        columns.append(TableColumnProfile(
-                            name=col_name,
-                            data_type=col_type or "UNKNOWN",
-                            is_nullable=is_nullable,
-                            semantic_tags=semantic_tags,
-                        ))
+                # Get column metadata from INFORMATION_SCHEMA
+                columns_query = f"""
+                    SELECT column_name, data_type, is_nullable
+                    FROM `{project}.{schema}.INFORMATION_SCHEMA.COLUMNS`
+                    WHERE table_name = @table_name
+                    ORDER BY ordinal_position
+                """
+                columns_result = await inspection_manager.execute_query(
+                    columns_query, 
+                    {"table_name": table_name}
+                )
             
-            # Get row count
-            count_query = f"SELECT COUNT(1) as row_count FROM `{project}.{schema}.{table_name}`"
-            count_result = await inspection_manager.execute_query(count_query, {})
+                columns = []
+                # Handle DataFrame response
+                if hasattr(columns_result, 'iterrows'):
+                    for _, row in columns_result.iterrows():
+                        col_name = row.get("column_name")
+                        col_type = row.get("data_type")
+                        is_nullable = row.get("is_nullable", "YES") == "YES"
+                        if col_name:
+                            semantic_tags = self._infer_semantic_tags(col_name, col_type)
+                            columns.append(TableColumnProfile(
+                                name=col_name,
+                                data_type=col_type or "UNKNOWN",
+                                is_nullable=is_nullable,
+                                semantic_tags=semantic_tags,
+                            ))
+                else:
+                    # Fallback for dict format
+                    column_rows = columns_result.get("rows", []) if isinstance(columns_result, dict) else []
+                    for row in column_rows:
+                        col_name = row.get("column_name")
+                        col_type = row.get("data_type")
+                        is_nullable = row.get("is_nullable", "YES") == "YES"
+                        if col_name:
+                            semantic_tags = self._infer_semantic_tags(col_name, col_type)
+                            columns.append(TableColumnProfile(
+                                name=col_name,
+                                data_type=col_type or "UNKNOWN",
+                                is_nullable=is_nullable,
+                                semantic_tags=semantic_tags,
+                            ))
             
-            # Handle DataFrame response
-            if hasattr(count_result, 'iloc'):
-                row_count = int(count_result.iloc[0]['row_count']) if not count_result.empty else 0
-            else:
-                # Fallback for dict format
-                count_rows = count_result.get("rows", []) if isinstance(count_result, dict) else []
-                row_count = count_rows[0].get("row_count", 0) if count_rows else 0
+            row_count = self._catalog_row_count(catalog_entry, settings)
+            if row_count is None:
+                # Get row count
+                count_query = f"SELECT COUNT(1) as row_count FROM `{project}.{schema}.{table_name}`"
+                count_result = await inspection_manager.execute_query(count_query, {})
+            
+                # Handle DataFrame response
+                if hasattr(count_result, 'iloc'):
+                    row_count = int(count_result.iloc[0]['row_count']) if not count_result.empty else 0
+                else:
+                    # Fallback for dict format
+                    count_rows = count_result.get("rows", []) if isinstance(count_result, dict) else []
+                    row_count = count_rows[0].get("row_count", 0) if count_rows else 0
             
             # Extract FK relationships from INFORMATION_SCHEMA (if available)
             foreign_keys = []
@@ -1794,56 +2281,62 @@ class A9_Data_Product_Agent(DataProductProtocol):
         try:
             db_schema = settings.get("schema") or settings.get("connection_config", {}).get("schema", "dbo")
 
-            # Get column metadata from INFORMATION_SCHEMA
-            columns_query = f"""
-                SELECT
-                    COLUMN_NAME   AS column_name,
-                    DATA_TYPE     AS data_type,
-                    IS_NULLABLE   AS is_nullable
-                FROM INFORMATION_SCHEMA.COLUMNS
-                WHERE TABLE_NAME   = '{table_name}'
-                  AND TABLE_SCHEMA = '{db_schema}'
-                ORDER BY ORDINAL_POSITION
-            """
-            columns_result = await inspection_manager.execute_query(columns_query, {})
-
-            columns = []
-            if hasattr(columns_result, 'iterrows'):
-                for _, row in columns_result.iterrows():
-                    col_name = row.get("column_name")
-                    col_type = row.get("data_type")
-                    is_nullable = str(row.get("is_nullable", "YES")).upper() != "NO"
-                    if col_name:
-                        semantic_tags = self._infer_semantic_tags(col_name, col_type)
-                        columns.append(TableColumnProfile(
-                            name=col_name,
-                            data_type=col_type or "UNKNOWN",
-                            is_nullable=is_nullable,
-                            semantic_tags=semantic_tags,
-                        ))
-            else:
-                column_rows = columns_result.get("rows", []) if isinstance(columns_result, dict) else []
-                for row in column_rows:
-                    col_name = row.get("column_name") or row.get("COLUMN_NAME")
-                    col_type = row.get("data_type") or row.get("DATA_TYPE")
-                    is_nullable = str(row.get("is_nullable", "YES")).upper() != "NO"
-                    if col_name:
-                        semantic_tags = self._infer_semantic_tags(col_name, col_type)
-                        columns.append(TableColumnProfile(
-                            name=col_name,
-                            data_type=col_type or "UNKNOWN",
-                            is_nullable=is_nullable,
-                            semantic_tags=semantic_tags,
-                        ))
-
-            # Get row count
-            count_query = f"SELECT COUNT(1) AS row_count FROM [{db_schema}].[{table_name}]"
-            count_result = await inspection_manager.execute_query(count_query, {})
-            if hasattr(count_result, 'iloc'):
-                row_count = int(count_result.iloc[0]['row_count']) if not count_result.empty else 0
+            catalog_entry = (settings.get("catalog") or {}).get(table_name) or {}
+            if catalog_entry.get("columns"):
+                columns = self._catalog_columns(catalog_entry)
             else:
-                count_rows = count_result.get("rows", []) if isinstance(count_result, dict) else []
-                row_count = count_rows[0].get("row_count", 0) if count_rows else 0
+                # Get column metadata from INFORMATION_SCHEMA
+                columns_query = f"""
+                    SELECT
+                        COLUMN_NAME   AS column_name,
+                        DATA_TYPE     AS data_type,
+                        IS_NULLABLE   AS is_nullable
+                    FROM INFORMATION_SCHEMA.COLUMNS
+                    WHERE TABLE_NAME   = '{table_name}'
+                      AND TABLE_SCHEMA = '{db_schema}'
+                    ORDER BY ORDINAL_POSITION
+                """
+                columns_result = await inspection_manager.execute_query(columns_query, {})
+
+                columns = []
+                if hasattr(columns_result, 'iterrows'):
+                    for _, row in columns_result.iterrows():
+                        col_name = row.get("column_name")
+                        col_type = row.get("data_type")
+                        is_nullable = str(row.get("is_nullable", "YES")).upper() != "NO"
+                        if col_name:
+                            semantic_tags = self._infer_semantic_tags(col_name, col_type)
+                            columns.append(TableColumnProfile(
+                                name=col_name,
+                                data_type=col_type or "UNKNOWN",
+                                is_nullable=is_nullable,
+                                semantic_tags=semantic_tags,
+                            ))
+                else:
+                    column_rows = columns_result.get("rows", []) if isinstance(columns_result, dict) else []
+                    for row in column_rows:
+                        col_name = row.get("column_name") or row.get("COLUMN_NAME")
+                        col_type = row.get("data_type") or row.get("DATA_TYPE")
+                        is_nullable = str(row.get("is_nullable", "YES")).upper() != "NO"
+                        if col_name:
+                            semantic_tags = self._infer_semantic_tags(col_name, col_type)
+                            columns.append(TableColumnProfile(
+                                name=col_name,
+                                data_type=col_type or "UNKNOWN",
+                                is_nullable=is_nullable,
+                                semantic_tags=semantic_tags,
+                            ))
+
+            row_count = self._catalog_row_count(catalog_entry, settings)
+            if row_count is None:
+                # Get row count
+                count_query = f"SELECT COUNT(1) AS row_count FROM [{db_schema}].[{table_name}]"
+                count_result = await inspection_manager.execute_query(count_query, {})
+                if hasattr(count_result, 'iloc'):
+                    row_count = int(count_result.iloc[0]['row_count']) if not count_result.empty else 0
+                else:
+                    count_rows = count_result.get("rows", []) if isinstance(count_result, dict) else []
+                    row_count = count_rows[0].get("row_count", 0) if count_rows else 0
 
             # Extract FK relationships from INFORMATION_SCHEMA
             foreign_keys = []
@@ -1957,62 +2450,68 @@ class A9_Data_Product_Agent(DataProductProtocol):
             sf_database = settings.get("project") or settings.get("connection_config", {}).get("database")
             db_schema = settings.get("schema") or settings.get("connection_config", {}).get("schema")
 
-            columns_query = f"""
-                SELECT
-                    COLUMN_NAME   AS column_name,
-                    DATA_TYPE     AS data_type,
-                    IS_NULLABLE   AS is_nullable
-                FROM {sf_database}.INFORMATION_SCHEMA.COLUMNS
-                WHERE TABLE_NAME   = '{table_name}'
-                  AND TABLE_SCHEMA = '{db_schema}'
-                ORDER BY ORDINAL_POSITION
-            """
-            columns_result = await inspection_manager.execute_query(columns_query, {})
-
-            columns = []
-            if hasattr(columns_result, 'iterrows'):
-                for _, row in columns_result.iterrows():
-                    col_name = row.get("column_name") if "column_name" in columns_result.columns else row.get("COLUMN_NAME")
-                    col_type = row.get("data_type") if "data_type" in columns_result.columns else row.get("DATA_TYPE")
-                    nullable_val = row.get("is_nullable") if "is_nullable" in columns_result.columns else row.get("IS_NULLABLE")
-                    is_nullable = str(nullable_val or "YES").upper() != "NO"
-                    if col_name:
-                        semantic_tags = self._infer_semantic_tags(col_name, col_type)
-                        columns.append(TableColumnProfile(
-                            name=col_name,
-                            data_type=col_type or "UNKNOWN",
-                            is_nullable=is_nullable,
-                            semantic_tags=semantic_tags,
-                        ))
+            catalog_entry = (settings.get("catalog") or {}).get(table_name) or {}
+            if catalog_entry.get("columns"):
+                columns = self._catalog_columns(catalog_entry)
             else:
-                column_rows = columns_result.get("rows", []) if isinstance(columns_result, dict) else []
-                for row in column_rows:
-                    col_name = row.get("column_name") or row.get("COLUMN_NAME")
-                    col_type = row.get("data_type") or row.get("DATA_TYPE")
-                    is_nullable = str(row.get("is_nullable", "YES")).upper() != "NO"
-                    if col_name:
-                        semantic_tags = self._infer_semantic_tags(col_name, col_type)
-                        columns.append(TableColumnProfile(
-                            name=col_name,
-                            data_type=col_type or "UNKNOWN",
-                            is_nullable=is_nullable,
-                            semantic_tags=semantic_tags,
-                        ))
+                columns_query = f"""
+                    SELECT
+                        COLUMN_NAME   AS column_name,
+                        DATA_TYPE     AS data_type,
+                        IS_NULLABLE   AS is_nullable
+                    FROM {sf_database}.INFORMATION_SCHEMA.COLUMNS
+                    WHERE TABLE_NAME   = '{table_name}'
+                      AND TABLE_SCHEMA = '{db_schema}'
+                    ORDER BY ORDINAL_POSITION
+                """
+                columns_result = await inspection_manager.execute_query(columns_query, {})
+
+                columns = []
+                if hasattr(columns_result, 'iterrows'):
+                    for _, row in columns_result.iterrows():
+                        col_name = row.get("column_name") if "column_name" in columns_result.columns else row.get("COLUMN_NAME")
+                        col_type = row.get("data_type") if "data_type" in columns_result.columns else row.get("DATA_TYPE")
+                        nullable_val = row.get("is_nullable") if "is_nullable" in columns_result.columns else row.get("IS_NULLABLE")
+                        is_nullable = str(nullable_val or "YES").upper() != "NO"
+                        if col_name:
+                            semantic_tags = self._infer_semantic_tags(col_name, col_type)
+                            columns.append(TableColumnProfile(
+                                name=col_name,
+                                data_type=col_type or "UNKNOWN",
+                                is_nullable=is_nullable,
+                                semantic_tags=semantic_tags,
+                            ))
+                else:
+                    column_rows = columns_result.get("rows", []) if isinstance(columns_result, dict) else []
+                    for row in column_rows:
+                        col_name = row.get("column_name") or row.get("COLUMN_NAME")
+                        col_type = row.get("data_type") or row.get("DATA_TYPE")
+                        is_nullable = str(row.get("is_nullable", "YES")).upper() != "NO"
+                        if col_name:
+                            semantic_tags = self._infer_semantic_tags(col_name, col_type)
+                            columns.append(TableColumnProfile(
+                                name=col_name,
+                                data_type=col_type or "UNKNOWN",
+                                is_nullable=is_nullable,
+                                semantic_tags=semantic_tags,
+                            ))
 
             # Get row count (double-quoted identifiers preserve case exactly as given)
-            row_count = 0
-            try:
-                count_query = f'SELECT COUNT(1) AS row_count FROM "{db_schema}"."{table_name}"'
-                count_result = await inspection_manager.execute_query(count_query, {})
-                if hasattr(count_result, 'iloc'):
-                    if not count_result.empty:
-                        col = 'row_count' if 'row_count' in count_result.columns else 'ROW_COUNT'
-                        row_count = int(count_result.iloc[0][col])
-                else:
-                    count_rows = count_result.get("rows", []) if isinstance(count_result, dict) else []
-                    row_count = count_rows[0].get("row_count", 0) if count_rows else 0
-            except Exception as count_error:
-                self.logger.warning(f"Could not get row count for {table_name}: {count_error}")
+            row_count = self._catalog_row_count(catalog_entry, settings)
+            if row_count is None:
+                row_count = 0
+                try:
+                    count_query = f'SELECT COUNT(1) AS row_count FROM "{db_schema}"."{table_name}"'
+                    count_result = await inspection_manager.execute_query(count_query, {})
+                    if hasattr(count_result, 'iloc'):
+                        if not count_result.empty:
+                            col = 'row_count' if 'row_count' in count_result.columns else 'ROW_COUNT'
+                            row_count = int(count_result.iloc[0][col])
+                    else:
+                        count_rows = count_result.get("rows", []) if isinstance(count_result, dict) else []
+                        row_count = count_rows[0].get("row_count", 0) if count_rows else 0
+                except Exception as count_error:
+                    self.logger.warning(f"Could not get row count for {table_name}: {count_error}")
 
             # FK relationships — Snowflake rarely declares/enforces these, but the
             # ANSI INFORMATION_SCHEMA views exist; query them best-effort.
@@ -2452,7 +2951,23 @@ class A9_Data_Product_Agent(DataProductProtocol):
         schema_summary: List[TableProfile],
         kpi_proposals: List[KPIProposal],
         overrides: Dict[str, Any],
+        previous_fragments: Optional[Dict[str, Any]] = None,
     ) -> Dict[str, Any]:
+        """Contract dict for the profiled tables.
+
+        previous_fragments ({table: {"fingerprint", "table", "view"}}, from the
+        schema profile store) supplies the table and default-view sections of
+        tables whose profile fingerprint is unchanged, so they carry over
+        verbatim instead of being rebuilt.
+        """
+        previous_fragments = previous_fragments or {}
+
+        def _reusable(profile: TableProfile, section: str) -> Optional[Dict[str, Any]]:
+            prior = previous_fragments.get(profile.name) or {}
+            if profile.fingerprint and prior.get("fingerprint") == profile.fingerprint and prior.get(section):
+                return dict(prior[section])
+            return None
+
         contract: Dict[str, Any] = {
             "metadata": {
                 "id": data_product_id,
@@ -2465,6 +2980,10 @@ class A9_Data_Product_Agent(DataProductProtocol):
         }
 
         for profile in schema_summary:
+            reused_table = _reusable(profile, "table")
+            if reused_table is not None:
+                contract["tables"].append(reused_table)
+                continue
             contract_table = {
                 "name": profile.name,
                 "columns": [
@@ -2486,6 +3005,10 @@ class A9_Data_Product_Agent(DataProductProtocol):
             contract["views"].extend(overrides["views"])
         else:
             for profile in schema_summary:
+                reused_view = _reusable(profile, "view")
+                if reused_view is not None:
+                    contract["views"].append(reused_view)
+                    continue
                 view_name = f"{data_product_id}_{profile.name.split('.')[-1]}_view"
                 columns = [col.name for col in profile.columns]
                 select_list = ", ".join(columns)
@@ -2513,6 +3036,23 @@ class A9_Data_Product_Agent(DataProductProtocol):
 
         return contract
 
+    @staticmethod
+    def _contract_fragments(
+        contract: Dict[str, Any], schema_summary: List[TableProfile]
+    ) -> Dict[str, Any]:
+        """Per-table contract sections keyed for the schema profile store."""
+        tables = {t.get("name"): t for t in contract.get("tables", [])}
+        views = {v.get("source_table"): v for v in contract.get("views", []) if isinstance(v, dict)}
+        return {
+            profile.name: {
+                "fingerprint": profile.fingerprint,
+                "table": tables.get(profile.name),
+                "view": views.get(profile.name),
+            }
+            for profile in schema_summary
+            if profile.fingerprint and profile.name in tables
+        }
+
     def _validate_contract_dict(self, contract: Dict[str, Any]) -> List[str]:
         messages: List[str] = []
         if "tables" in contract and not contract["tables"]:
@@ -2533,15 +3073,13 @@ class A9_Data_Product_Agent(DataProductProtocol):
         if not await self._ensure_db_connected():
             self.logger.warning(f"[TXN:{transaction_id}] Database not connected; cannot register tables from contract")
             return {"success": False, "message": "Database not connected", "registered": {}}
-        try:
-            with open(contract_path, "r") as f:
-                contract = yaml.safe_load(f)
-        except Exception as e:
-            msg = f"Failed to read contract at {contract_path}: {e}"
+        contract = get_contract_cache().get(contract_path, revalidate=True)
+        if contract is None:
+            msg = f"Failed to read contract at {contract_path}"
             self.logger.error(f"[TXN:{transaction_id}] {msg}")
             return {"success": False, "message": msg, "registered": {}}
 
-        tables = contract.get("tables", []) if isinstance(contract, dict) else []
+        tables = contract.tables
         results: Dict[str, bool] = {}
         success_count = 0
         total = len(tables)
@@ -2659,23 +3197,13 @@ class A9_Data_Product_Agent(DataProductProtocol):
         if not await self._ensure_db_connected():
             self.logger.warning(f"[TXN:{transaction_id}] Database not connected; cannot create view '{view_name}'")
             return {"success": False, "message": "Database not connected", "view_name": view_name}
-        try:
-            with open(contract_path, "r") as f:
-                contract = yaml.safe_load(f)
-        except Exception as e:
-            msg = f"Failed to read contract at {contract_path}: {e}"
+        contract = get_contract_cache().get(contract_path, revalidate=True)
+        if contract is None:
+            msg = f"Failed to read contract at {contract_path}"
             self.logger.error(f"[TXN:{transaction_id}] {msg}")
             return {"success": False, "message": msg}
 
-        views = contract.get("views", []) if isinstance(contract, dict) else []
-        target_sql = None
-        for v in views:
-            try:
-                if isinstance(v, dict) and v.get("name") == view_name:
-                    target_sql = v.get("sql")
-                    break
-            except Exception:
-                continue
+        target_sql = next((v.get("sql") for v in contract.views if v.get("name") == view_name), None)
 
         if not target_sql or not isinstance(target_sql, str):
             msg = f"View '{view_name}' not found in contract or has no SQL definition"
@@ -3385,15 +3913,8 @@ class A9_Data_Product_Agent(DataProductProtocol):
         This removes hardcoded FI_Star_Schema checks from SQL generation.
         """
         try:
-            cpath = self._contract_path()
-            if not os.path.exists(cpath):
-                return {}
-            with open(cpath, "r", encoding="utf-8") as f:
-                doc = yaml.safe_load(f)
-            aliases = (doc or {}).get("column_aliases", {})
-            if isinstance(aliases, dict):
-                return aliases
-            return {}
+            contract = get_contract_cache().get(self._contract_path())
+            return dict(contract.column_aliases) if contract else {}
         except Exception:
             return {}
 
@@ -3443,48 +3964,20 @@ class A9_Data_Product_Agent(DataProductProtocol):
     def _get_exposed_columns(self, view_name: Optional[str]) -> Optional[Set[str]]:
         """
         Return the set of exposed column labels for a given view from the contract.
-        Uses an in-memory cache keyed by lowercase view name.
+        Served from the shared contract cache's per-view index.
         """
         try:
             if not isinstance(view_name, str) or not view_name.strip():
                 return None
-            key = view_name.strip().lower()
-            if key in self._view_exposed_columns_cache:
-                return self._view_exposed_columns_cache.get(key)
-            cpath = self._contract_path()
-            if not os.path.exists(cpath):
+            contract = get_contract_cache().get(self._contract_path())
+            if contract is None:
                 return None
-            with open(cpath, "r", encoding="utf-8") as f:
-                doc = yaml.safe_load(f)
-            views = (doc or {}).get("views", [])
-            target = None
-            for v in views:
-                if isinstance(v, dict) and str(v.get("name", "")).strip().lower() == key:
-                    target = v
-                    break
+            key = view_name.strip().lower()
             # Fallback to FI_Star_View if the requested name isn't present
-            if target is None:
-                for v in views:
-                    if isinstance(v, dict) and v.get("name") == "FI_Star_View":
-                        target = v
-                        break
-            if not isinstance(target, dict):
-                return None
-            llm_profile = target.get("llm_profile", {}) or {}
-            cols = llm_profile.get("exposed_columns") or []
-            out: Set[str] = set()
-            for c in cols:
-                try:
-                    s = str(c).strip()
-                    # Normalize quotes for comparison/storage, but keep original label
-                    if s.startswith('"') and s.endswith('"') and len(s) > 1:
-                        s = s[1:-1]
-                    if s:
-                        out.add(s)
-                except Exception:
-                    continue
-            self._view_exposed_columns_cache[key] = out
-            return out
+            if key not in contract.exposed_columns:
+                key = "fi_star_view"
+            cols = contract.exposed_columns.get(key)
+            return set(cols) if cols is not None else None
         except Exception:
             return None
 
@@ -4510,6 +5003,68 @@ class A9_Data_Product_Agent(DataProductProtocol):
                     "data": []
                 }
 
+        # ── Query result cache (opt-in; after the access gate so hits stay governed) ──
+        _cache_key = None
+        _cache = getattr(self, "_query_cache", None)
+        if _cache is not None:
+            _cache_key = _cache.make_key(sql_query, data_product_id, _pc_client, parameters)
+            cached = _cache.get(_cache_key)
+            if cached is not None:
+                cached["transaction_id"] = transaction_id
+                cached["cached"] = True
+                self.logger.debug(f"[TXN:{transaction_id}] Query result cache hit (dp={data_product_id})")
+                return cached
+
+        async def _execute() -> Dict[str, Any]:
+            res = await self._dispatch_sql(sql_query, parameters, data_product_id, transaction_id)
+            if _cache_key is not None and res.get("success"):
+                _cache.put(_cache_key, res, source=self._query_source(sql_query, data_product_id))
+            return res
+
+        # ── Single-flight: concurrent identical queries share one execution ──
+        _flight = getattr(self, "_single_flight", None)
+        if _flight is None:
+            return await _execute()
+        _flight_key = _cache_key or QueryResultCache.make_key(sql_query, data_product_id, _pc_client, parameters)
+        result, shared = await _flight.do(_flight_key, _execute)
+        if shared:
+            result = copy_result(result)
+            result["transaction_id"] = transaction_id
+            result["coalesced"] = True
+        return result
+
+    def get_query_cache_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for the execute_sql result cache ({"enabled": False} when off)."""
+        cache = getattr(self, "_query_cache", None)
+        if cache is None:
+            return {"enabled": False}
+        return {"enabled": True, **cache.stats()}
+
+    def get_single_flight_stats(self) -> Dict[str, Any]:
+        """Executions vs. coalesced callers for concurrent identical execute_sql calls."""
+        flight = getattr(self, "_single_flight", None)
+        if flight is None:
+            return {"enabled": False}
+        return {"enabled": True, **flight.stats()}
+
+    def _query_source(self, sql_query: str, data_product_id: Optional[str]) -> str:
+        """Backend _dispatch_sql will route this query to (used to pick the cache TTL)."""
+        if data_product_id and self._resolve_source_system(data_product_id) == "snowflake":
+            return "snowflake"
+        if re.search(r'`[a-zA-Z0-9_-]+\.[a-zA-Z0-9_-]+\.[a-zA-Z0-9_.-]+`', sql_query):
+            return "bigquery"
+        if re.search(r'\[\w[\w\s]*\]', sql_query):
+            return "sqlserver"
+        return "duckdb"
+
+    async def _dispatch_sql(
+        self,
+        sql_query: str,
+        parameters: Optional[Dict[str, Any]],
+        data_product_id: Optional[str],
+        transaction_id: str,
+    ) -> Dict[str, Any]:
+        """Route a validated, access-checked SELECT to its backend and normalize the result."""
         try:
             # ── Source-system-based routing (when data_product_id is known) ─────
             _resolved_source = self._resolve_source_system(data_product_id) if data_product_id else None
@@ -5115,6 +5670,398 @@ class A9_Data_Product_Agent(DataProductProtocol):
             self.logger.warning(f"_build_databricks_dimensional_sql error: {ex}")
             return None
 
+    # ── Dimension sweep ──────────────────────────────────────────────────────
+    #
+    # Deep Analysis breaks a KPI down by every candidate dimension, once per
+    # comparison side (current, previous or budget). The sweep answers all the
+    # dimensions of one side with ONE query: GROUP BY GROUPING SETS ((d0), (d1),
+    # ..., ()) on the native backends, where GROUPING(dN) tells which set a row
+    # belongs to and the empty set carries the grand total (the same total
+    # ROLLUP gives the per-dimension queries). Generated DuckDB SQL can't be
+    # rewritten that way, so there the per-dimension queries are sent as one
+    # UNION ALL, tagged with the dimension's position.
+
+    _SWEEP_NATIVE = ("bigquery", "snowflake", "sqlserver", "databricks")
+
+    @staticmethod
+    def _sweep_ident(dim: str, dialect: str) -> str:
+        """Quote a dimension column the way that backend's dimensional builder does."""
+        if dialect == "bigquery":
+            return f"`{dim}`"
+        if dialect == "sqlserver":
+            return f"[{dim}]"
+        return f'"{dim}"' if re.search(r'[^a-zA-Z0-9_]', dim) else dim
+
+    def _build_grouping_sets_sql(
+        self,
+        raw_sql: str,
+        dimensions: List[str],
+        timeframe: Any,
+        comparison_period: bool,
+        time_spec: Optional[dict],
+        dialect: str,
+    ) -> Optional[str]:
+        """GROUPING SETS breakdown of 'SELECT <agg> AS value FROM ...' over plain-column dimensions."""
+        m = re.match(r'^SELECT\s+(.+?)\s+AS\s+value\s+(FROM\s+.+)', raw_sql.strip(), re.IGNORECASE | re.DOTALL)
+        if not m or not dimensions or any('(' in d for d in dimensions):
+            return None
+        agg_expr, from_clause = m.group(1).strip(), m.group(2)
+        _spec = time_spec or {"type": "date", "column": "transaction_date"}
+        cond = (
+            TimeFilter.previous_condition(_spec, timeframe, dialect=dialect)
+            if comparison_period
+            else TimeFilter.current_condition(_spec, timeframe, dialect=dialect)
+        )
+        cols = [self._sweep_ident(d, dialect) for d in dimensions]
+        select = ", ".join(
+            [f"{c} AS a9_d{i}" for i, c in enumerate(cols)]
+            + [f"GROUPING({c}) AS a9_g{i}" for i, c in enumerate(cols)]
+        )
+        base = f"SELECT {select}, {agg_expr} AS value {from_clause}"
+        sets = ", ".join(f"({c})" for c in cols)
+        return TimeFilter.append_condition(base, cond) + f" GROUP BY GROUPING SETS ({sets}, ())"
+
+    async def generate_sql_for_kpi_sweep(
+        self,
+        kpi_definition: Any,
+        dimensions: List[str],
+        timeframe: Any = None,
+        filters: Dict[str, Any] = None,
+        comparison_period: bool = False,
+    ) -> Dict[str, Any]:
+        """One query returning the KPI broken down by each of `dimensions`.
+
+        Returns {"sql", "dimensions", "mode", "success", "message"}; mode is
+        "grouping_sets" (native backends, includes the grand total) or
+        "union_all" (generated DuckDB SQL). Split the result with
+        split_sweep_result.
+        """
+        kpi_name = getattr(kpi_definition, "name", "unknown")
+        dims = [str(d) for d in dict.fromkeys(dimensions or []) if d]
+        fail = {"sql": "", "dimensions": dims, "mode": None, "success": False}
+        if not dims:
+            return {**fail, "message": "No dimensions to sweep"}
+        await self._refresh_data_product_registry()
+        try:
+            _raw_sql = (getattr(kpi_definition, "sql_query", "") or
+                        getattr(kpi_definition, "calculation", "") or "")
+            _dp_id = getattr(kpi_definition, "data_product_id", None)
+            _source_system = self._resolve_source_system(_dp_id)
+            if _source_system in ("sql_server", "mssql"):
+                _source_system = "sqlserver"
+
+            if _source_system in self._SWEEP_NATIVE:
+                sql = self._build_grouping_sets_sql(
+                    _raw_sql, dims, timeframe, comparison_period, self._resolve_time_spec(_dp_id), _source_system,
+                )
+                if not sql:
+                    return {**fail, "message": f"KPI SQL for {kpi_name} can't be swept"}
+                return {"sql": sql, "dimensions": dims, "mode": "grouping_sets", "success": True, "message": "ok"}
+
+            parts = []
+            for i, dim in enumerate(dims):
+                gen = await self.generate_sql_for_kpi(
+                    kpi_definition, timeframe=timeframe, filters=filters, breakdown=True,
+                    override_group_by=[dim], comparison_period=comparison_period,
+                )
+                if not gen.get("success") or not gen.get("sql"):
+                    return {**fail, "message": f"No breakdown SQL for {dim}: {gen.get('message')}"}
+                parts.append(f"SELECT {i} AS a9_dim, a9_u{i}.* FROM ({gen['sql'].strip().rstrip(';')}) AS a9_u{i}")
+            return {"sql": " UNION ALL ".join(parts), "dimensions": dims, "mode": "union_all", "success": True, "message": "ok"}
+        except Exception as ex:
+            self.logger.warning(f"generate_sql_for_kpi_sweep error for {kpi_name}: {ex}")
+            return {**fail, "message": str(ex)}
+
+    @staticmethod
+    def split_sweep_result(
+        response: Dict[str, Any], dimensions: List[str], mode: str, null_key: str = "\x00__null__"
+    ) -> Optional[Dict[str, Dict[str, Any]]]:
+        """Demultiplex a sweep result into {dimension: {"values": {key: float}, "total": float | None}}.
+
+        Values follow the per-dimension breakdown maps (NULL measure -> 0.0,
+        keys as str). NULL members are kept, as a GROUP BY keeps them, under
+        `null_key` (callers pass their own sentinel); "total" is the grand total
+        (grouping_sets mode only). None when the response can't be split.
+        """
+        if not isinstance(response, dict) or response.get("success") is False:
+            return None
+        cols = [str(c).lower() for c in (response.get("columns") or [])]
+        out: Dict[str, Dict[str, Any]] = {d: {"values": {}, "total": None} for d in dimensions}
+        n = len(dimensions)
+
+        def _num(v: Any) -> float:
+            return float(v) if v is not None else 0.0
+
+        for row in response.get("rows") or []:
+            if isinstance(row, dict):
+                vals = list(row.values())
+                row = {str(k).lower(): v for k, v in row.items()}
+            else:
+                vals = list(row)
+                row = dict(zip(cols, vals))
+            try:
+                if mode == "grouping_sets":
+                    grouped = [i for i in range(n) if row.get(f"a9_g{i}") == 0]
+                    if not grouped:
+                        total = _num(row.get("value"))
+                        for d in dimensions:
+                            out[d]["total"] = total
+                        continue
+                    i = grouped[0]
+                    key, value = row.get(f"a9_d{i}"), row.get("value")
+                else:
+                    i, key, value = int(vals[0]), vals[1], vals[2]
+                out[dimensions[i]]["values"][null_key if key is None else str(key)] = _num(value)
+            except (IndexError, KeyError, TypeError, ValueError):
+                continue
+        return out
+
+    # ── KPI bundle SQL ───────────────────────────────────────────────────────
+    #
+    # SA reads each KPI with up to four queries against the same view: current
+    # value, comparison value, a monthly series and (via _fetch_plan_value) the
+    # budget value. The bundle folds them into ONE scan: every source row is
+    # cross-joined to a small set of bucket labels, each bucket keeps only the
+    # rows its own predicate selects, and the KPI's registered aggregate runs
+    # once per (bucket, period) group. Because the aggregate itself is never
+    # rewritten, ratio KPIs (SUM(a)/SUM(b)) come out exactly as in the separate
+    # queries.
+
+    _BUNDLE_KPI_SQL = re.compile(
+        r'^\s*SELECT\s+(.+?)\s+AS\s+\w+\s+FROM\s+'
+        r'((?:`[^`]+`|"[^"]+"|\[[^\]]+\]|\w+)(?:\.(?:`[^`]+`|"[^"]+"|\[[^\]]+\]|\w+))*)'
+        r'\s*(.*?)\s*;?\s*$',
+        re.IGNORECASE | re.DOTALL,
+    )
+    _BUNDLE_UNSUPPORTED = re.compile(
+        r'\b(?:GROUP\s+BY|HAVING|ORDER\s+BY|LIMIT|JOIN|UNION|QUALIFY|OVER|SELECT|DISTINCT|TOP)\b',
+        re.IGNORECASE,
+    )
+    _BUNDLE_DIALECTS = ("bigquery", "snowflake", "sqlserver", "duckdb")
+
+    def _parse_bundle_kpi_sql(self, sql: str) -> Optional[Tuple[str, str, str]]:
+        """Split 'SELECT <agg> AS x FROM <table> [WHERE ...]' into (agg, table, where).
+
+        Returns None for any other shape (joins, grouping, subqueries,
+        qualified columns), which the bundle cannot fold safely.
+        """
+        m = self._BUNDLE_KPI_SQL.match(sql or "")
+        if not m:
+            return None
+        agg_expr, table_ref, rest = m.group(1).strip(), m.group(2).strip(), m.group(3).strip()
+        if self._BUNDLE_UNSUPPORTED.search(agg_expr) or re.search(r'[A-Za-z_`"\]]\.[A-Za-z_`"\[]', agg_expr):
+            return None
+        if rest and not re.match(r'WHERE\b', rest, re.IGNORECASE):
+            return None
+        where = rest[5:].strip() if rest else ""
+        if self._BUNDLE_UNSUPPORTED.search(where):
+            return None
+        return agg_expr, table_ref, where
+
+    @staticmethod
+    def _strip_date_range(where: str, date_col: str) -> str:
+        """Drop '<date_col> BETWEEN ..' / '<date_col> >= ..' conditions (monthly series: recency comes from the period window)."""
+        bare = re.escape(date_col.strip('"`[]'))
+        cleaned = re.sub(
+            rf'(?:\bAND\s+)?["`\[]?{bare}["`\]]?\s+'
+            rf'(?:BETWEEN\s+[\'"\d\-T]+\s+AND\s+[\'"\d\-T]+|[<>]=?\s*[\'"\d\-T]+)',
+            '',
+            where,
+            flags=re.IGNORECASE,
+        ).strip().lstrip(',').strip()
+        return re.sub(r'^AND\s+', '', cleaned, flags=re.IGNORECASE).strip()
+
+    def build_kpi_bundle_sql(
+        self,
+        kpi_sql: str,
+        dialect: str,
+        date_col: str,
+        current_window: Tuple[str, str],
+        comparison_window: Optional[Tuple[str, str]] = None,
+        plan_sql: Optional[str] = None,
+        monthly_spec: Optional[Dict[str, Any]] = None,
+    ) -> Optional[str]:
+        """Build one query returning (bucket, period, value) rows for a KPI.
+
+        Buckets: 'current' (current_window), 'comparison' (comparison_window),
+        'plan' (plan_sql's filters over current_window) and 'monthly' (one row
+        per period, all periods — callers keep the most recent N). Windows are
+        inclusive ISO date pairs applied as '<date_col> BETWEEN', the same
+        predicate SA appends to native KPI SQL.
+
+        monthly_spec: {"type": "date"} derives 'YYYY-MM' from date_col;
+        {"type": "fiscal_year_period", "year_column", "period_column"} builds
+        'YYYY-PP'. None omits the monthly bucket.
+
+        Returns None when the KPI SQL or dialect can't be bundled.
+        """
+        bundle = self._kpi_bundle(
+            kpi_sql, dialect, date_col, current_window, comparison_window, plan_sql, monthly_spec
+        )
+        return bundle[0] if bundle else None
+
+    def _kpi_bundle(
+        self,
+        kpi_sql: str,
+        dialect: str,
+        date_col: str,
+        current_window: Tuple[str, str],
+        comparison_window: Optional[Tuple[str, str]],
+        plan_sql: Optional[str],
+        monthly_spec: Optional[Dict[str, Any]],
+    ) -> Optional[Tuple[str, List[str]]]:
+        """build_kpi_bundle_sql plus the bucket labels the SQL actually contains."""
+        dialect = (dialect or "").lower()
+        if dialect in ("sql_server", "mssql"):
+            dialect = "sqlserver"
+        if dialect not in self._BUNDLE_DIALECTS:
+            return None
+        parsed = self._parse_bundle_kpi_sql(kpi_sql)
+        if not parsed:
+            return None
+        agg_expr, table_ref, where = parsed
+
+        def _and(*conds: str) -> str:
+            return " AND ".join(f"({c})" for c in conds if c)
+
+        def _window(window: Tuple[str, str]) -> str:
+            return f"{date_col} BETWEEN '{window[0]}' AND '{window[1]}'"
+
+        predicates: List[Tuple[str, str]] = [("current", _and(where, _window(current_window)))]
+        if comparison_window:
+            predicates.append(("comparison", _and(where, _window(comparison_window))))
+        if plan_sql:
+            plan_parsed = self._parse_bundle_kpi_sql(plan_sql)
+            if plan_parsed and plan_parsed[:2] == (agg_expr, table_ref):
+                predicates.append(("plan", _and(plan_parsed[2], _window(current_window))))
+
+        period_expr = None
+        if monthly_spec:
+            bare_date = date_col.strip('"`[]')
+            if monthly_spec.get("type") == "fiscal_year_period" and dialect in ("sqlserver", "snowflake"):
+                yr = monthly_spec.get("year_column") or "fiscal_year"
+                pr = monthly_spec.get("period_column") or "fiscal_period"
+                if dialect == "sqlserver":
+                    y, p = f"[{yr.strip('[]')}]", f"[{pr.strip('[]')}]"
+                    period_expr = f"CAST({y} AS VARCHAR(4)) + '-' + RIGHT('0' + CAST({p} AS VARCHAR(2)), 2)"
+                else:
+                    period_expr = f"CAST({yr} AS VARCHAR) || '-' || LPAD(CAST({pr} AS VARCHAR), 2, '0')"
+                monthly_where = where
+            else:
+                if dialect == "bigquery":
+                    period_expr = f"LEFT(CAST({bare_date} AS STRING), 7)"
+                elif dialect == "sqlserver":
+                    period_expr = f"CONVERT(VARCHAR(7), {date_col}, 23)"
+                else:
+                    period_expr = f"LEFT(CAST({date_col} AS VARCHAR), 7)"
+                monthly_where = self._strip_date_range(where, date_col)
+            predicates.append(("monthly", _and(monthly_where)))
+
+        labels = [name for name, _ in predicates]
+        if dialect == "bigquery":
+            bucket_join = "CROSS JOIN UNNEST([" + ", ".join(f"'{b}'" for b in labels) + "]) AS a9_bucket"
+            bucket_ref = "a9_bucket"
+        else:
+            bucket_join = (
+                "CROSS JOIN (VALUES " + ", ".join(f"('{b}')" for b in labels) + ") AS a9_b(a9_bucket)"
+            )
+            bucket_ref = "a9_b.a9_bucket"
+
+        bucket_filter = " OR ".join(
+            f"({bucket_ref} = '{name}' AND {pred})" if pred else f"{bucket_ref} = '{name}'"
+            for name, pred in predicates
+        )
+        period_sel = (
+            f"CASE WHEN {bucket_ref} = 'monthly' THEN {period_expr} END" if period_expr else "NULL"
+        )
+        sql = (
+            f"SELECT a9_bucket AS bucket, a9_period AS period, {agg_expr} AS value "
+            f"FROM (SELECT src.*, {bucket_ref} AS a9_bucket, {period_sel} AS a9_period "
+            f"FROM {table_ref} AS src {bucket_join} "
+            f"WHERE {bucket_filter}) AS a9_bundle "
+            f"GROUP BY a9_bucket, a9_period"
+        )
+        return sql, labels
+
+    async def generate_kpi_bundle_sql(
+        self,
+        kpi_sql: str,
+        dialect: str,
+        date_col: str,
+        current_window: Tuple[str, str],
+        comparison_window: Optional[Tuple[str, str]] = None,
+        plan_sql: Optional[str] = None,
+        monthly_spec: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """Protocol-style wrapper around build_kpi_bundle_sql.
+
+        Returns a dict with keys: sql, buckets, dialect, success, message.
+        """
+        try:
+            bundle = self._kpi_bundle(
+                kpi_sql, dialect, date_col, current_window, comparison_window, plan_sql, monthly_spec
+            )
+        except Exception as ex:
+            self.logger.warning(f"generate_kpi_bundle_sql error: {ex}")
+            bundle = None
+        if not bundle:
+            return {"sql": "", "buckets": [], "dialect": dialect, "success": False, "message": "KPI SQL shape or dialect not supported for bundling"}
+        return {"sql": bundle[0], "buckets": bundle[1], "dialect": dialect, "success": True, "message": "ok"}
+
+    @staticmethod
+    def parse_kpi_bundle_result(response: Dict[str, Any], num_months: int = 9) -> Optional[Dict[str, Any]]:
+        """Unpack execute_sql rows of a bundle query.
+
+        Returns {"current", "comparison", "plan": float | None,
+        "monthly": [{"period", "value"}] ascending (last num_months),
+        "monthly_dropped": int}, or None when the response isn't a bundle result.
+        Buckets with no matching rows come back as None.
+        """
+        if not isinstance(response, dict) or response.get("success") is False:
+            return None
+        rows = response.get("rows") or response.get("data") or []
+        scalars: Dict[str, Any] = {}
+        monthly: List[Tuple[str, Any]] = []
+        for row in rows:
+            if isinstance(row, dict):
+                row = {str(k).lower(): v for k, v in row.items()}
+                if "bucket" not in row:
+                    return None
+                bucket, period, value = row.get("bucket"), row.get("period"), row.get("value")
+            elif isinstance(row, (list, tuple)) and len(row) >= 3:
+                bucket, period, value = row[0], row[1], row[2]
+            else:
+                return None
+            if bucket == "monthly":
+                if period is not None:
+                    monthly.append((str(period), value))
+            else:
+                scalars[str(bucket)] = value
+
+        def _num(v: Any) -> Optional[float]:
+            try:
+                return float(v) if v is not None else None
+            except (TypeError, ValueError):
+                return None
+
+        series: List[Dict[str, Any]] = []
+        dropped = 0
+        for period, value in sorted(monthly)[-num_months:]:
+            if value is None:
+                continue
+            num = _num(value)
+            if num is None:
+                dropped += 1
+                continue
+            series.append({"period": period, "value": num})
+        return {
+            "current": _num(scalars.get("current")),
+            "comparison": _num(scalars.get("comparison")),
+            "plan": _num(scalars.get("plan")),
+            "monthly": series,
+            "monthly_dropped": dropped,
+        }
+
     async def generate_sql_for_kpi(self, kpi_definition: Any, timeframe: Any = None, filters: Dict[str, Any] = None, topn: Any = None, breakdown: bool = False, override_group_by: Optional[List[str]] = None, comparison_period: bool = False, include_total: bool = False) -> Dict[str, Any]:
         """
         Wrapper that generates SQL for a KPI definition using _generate_sql_for_kpi and returns
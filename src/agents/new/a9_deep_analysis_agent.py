@@ -8,12 +8,12 @@ A9 Deep Analysis Agent (MVP skeleton)
 # doc-sync-skip
 from __future__ import annotations
 
+import asyncio
 import logging
 import uuid
 import os
 import re
-from typing import Dict, Any, Optional, List, Tuple
-import yaml
+from typing import Awaitable, Dict, Any, Optional, List, Tuple
 
 from src.agents.shared.a9_agent_base_model import A9AgentBaseModel
 from src.agents.agent_config_models import A9_Deep_Analysis_Agent_Config
@@ -36,6 +36,7 @@ from src.agents.models.deep_analysis_models import (
 from src.agents.models.data_governance_models import KPIDataProductMappingRequest
 from src.agents.utils.data_quality_filter import DataQualityFilter, filter_anomalies
 from src.database.time_filter import TimeFilter
+from src.registry.contract_cache import get_contract_cache
 
 
 logger = logging.getLogger(__name__)
@@ -277,23 +278,14 @@ class A9_Deep_Analysis_Agent(DeepAnalysisProtocol):
             data_product_id = getattr(kpi_def, "data_product_id", None) if kpi_def else None
 
             if data_product_id:
-                # Scan contracts directory for a YAML whose metadata.id matches
-                import glob as _glob
+                # Find the contract YAML whose metadata.id matches (cached scan)
                 contracts_dir = self._CONTRACTS_DIR
                 if not os.path.isabs(contracts_dir) and not os.path.exists(contracts_dir):
                     here = os.path.dirname(__file__)
                     contracts_dir = os.path.abspath(os.path.join(here, "..", "..", "..", contracts_dir))
-                for fpath in _glob.glob(os.path.join(contracts_dir, "*.yaml")):
-                    try:
-                        with open(fpath, "r", encoding="utf-8") as f:
-                            doc = yaml.safe_load(f) or {}
-                        if (doc.get("metadata") or {}).get("id") == data_product_id:
-                            return fpath
-                    except Exception:
-                        continue
                 # No contract YAML found for this data product — return empty string so
                 # _dims_from_contract returns [] and the KPI registry fallback takes over.
-                return ""
+                return get_contract_cache().find_by_product_id(contracts_dir, data_product_id) or ""
         except Exception as e:
             self.logger.debug(f"_contract_path_for_kpi error: {e}")
         return self._contract_path()
@@ -318,22 +310,11 @@ class A9_Deep_Analysis_Agent(DeepAnalysisProtocol):
         """
         dims: List[str] = []
         try:
-            cpath = self._contract_path_for_kpi(kpi_name, client_id=client_id)
-            if not os.path.exists(cpath):
+            contract = get_contract_cache().get(self._contract_path_for_kpi(kpi_name, client_id=client_id))
+            # Use the first view with an llm_profile (contract may have only one view)
+            if contract is None or contract.profile_view is None:
                 return []
-            with open(cpath, "r", encoding="utf-8") as f:
-                doc = yaml.safe_load(f)
-            views = (doc or {}).get("views", [])
-            # Use the first view found (contract may have only one view)
-            target = None
-            for v in views:
-                if isinstance(v, dict) and v.get("llm_profile"):
-                    target = v
-                    break
-            if not isinstance(target, dict):
-                return []
-            llm_profile = target.get("llm_profile", {}) or {}
-            all_dims = llm_profile.get("dimension_semantics", []) or []
+            all_dims = contract.dimension_semantics
             def _keep(lbl: str) -> bool:
                 s = str(lbl or "").lower()
                 ban = ["flag", "hierarchy", "_id", "transaction_date", "transaction date",
@@ -352,6 +333,52 @@ class A9_Deep_Analysis_Agent(DeepAnalysisProtocol):
     def _prev_timeframe(self, timeframe: Optional[str]) -> Optional[str]:
         return TimeFilter.previous_period_name(timeframe)
 
+    # ── Level fan-out ────────────────────────────────────────────────────────────
+    def _level_query_limit(self, data_product_id: Optional[str]) -> int:
+        """How many warehouse queries one execute_deep_analysis run may have in flight.
+
+        level_concurrency, lowered to the level_backend_limits entry for the data
+        product's source_system when one is configured. The registry is only consulted
+        when there are backend limits to apply.
+        """
+        limit = max(1, int(self.config.level_concurrency))
+        if not self.config.level_backend_limits or not data_product_id:
+            return limit
+        backend = "duckdb"
+        try:
+            from src.registry.factory import RegistryFactory
+            _dp_provider = RegistryFactory().get_provider("data_product")
+            _dp_obj = _dp_provider.get(data_product_id) if _dp_provider else None
+            _ss = getattr(_dp_obj, "source_system", None)
+            if not _ss and isinstance(getattr(_dp_obj, "metadata", None), dict):
+                _ss = _dp_obj.metadata.get("source_system")
+            if _ss:
+                backend = str(_ss).lower()
+        except Exception as e:
+            self.logger.debug(f"_level_query_limit: source_system lookup failed for {data_product_id}: {e}")
+        if backend in ("sql_server", "mssql"):
+            backend = "sqlserver"
+        cap = self.config.level_backend_limits.get(backend)
+        return max(1, min(limit, int(cap))) if cap else limit
+
+    @staticmethod
+    async def _gather_ordered(aws: List[Awaitable[Any]], concurrent: bool) -> List[Any]:
+        """Await `aws` and return their results in input order.
+
+        An awaitable that raises yields its exception in place of a result, so callers
+        can re-raise at the point the sequential code would have. With `concurrent`
+        False they are awaited one after another.
+        """
+        if concurrent:
+            return list(await asyncio.gather(*aws, return_exceptions=True))
+        out: List[Any] = []
+        for aw in aws:
+            try:
+                out.append(await aw)
+            except Exception as exc:
+                out.append(exc)
+        return out
+
     # ── Phase 11I-D: alert-type-aware comparator selection ──────────────────────
     _TIME_BASED_ALERT_TYPES = {"threshold_breach"}
 
@@ -1050,30 +1077,128 @@ class A9_Deep_Analysis_Agent(DeepAnalysisProtocol):
                             return float(m.pop(_ROLLUP_TOTAL_KEY))
                         return None
 
+                    class _SqlProxy:
+                        """Thin KPI-like object carrying a substitute sql_query."""
+                        def __init__(self, base_kpi: Any, sql_override: str) -> None:
+                            self.sql_query = sql_override
+                            self.calculation = sql_override
+                            self.name = getattr(base_kpi, "name", "bridge")
+                            self.id = getattr(base_kpi, "id", "bridge")
+                            self.metadata = getattr(base_kpi, "metadata", {})
+                            self.unit = getattr(base_kpi, "unit", None)
+                            self.data_product_id = getattr(base_kpi, "data_product_id", None)
+
+                    def _compare_groups(level_label: str, m_a: Dict[str, float], m_b: Dict[str, float]) -> List[Dict[str, Any]]:
+                        """Per-key current vs previous/budget rows for one level."""
+                        out: List[Dict[str, Any]] = []
+                        for k in set(m_a.keys()) | set(m_b.keys()):
+                            c = float(m_a.get(k, 0.0))
+                            p = float(m_b.get(k, 0.0))
+                            d = c - p
+                            if p == 0.0:
+                                r = 0.0 if c == 0.0 else (1.0 if c > 0.0 else -1.0)
+                            else:
+                                r = d / abs(p)
+                            out.append({"dimension": level_label, "key": k, "current": c, "previous": p, "delta": d, "ratio": r})
+                        return out
+
+                    # ── Level fan-out ──
+                    # Levels, sweep sides and ratio-bridge components are independent
+                    # queries. They run together, with at most _level_limit warehouse
+                    # queries in flight (level_concurrency / level_backend_limits), and
+                    # every consumer reads the results back in the order it declared them.
+                    _level_limit = self._level_query_limit(dp_id)
+                    _query_slots = asyncio.Semaphore(_level_limit)
+
+                    async def _exec(sql: Any) -> Dict[str, Any]:
+                        async with _query_slots:
+                            return await self.data_product_agent.execute_sql(sql, data_product_id=dp_id)
+
+                    def _fan_out(aws: List[Awaitable[Any]]) -> Awaitable[List[Any]]:
+                        return self._gather_ordered(aws, _level_limit > 1)
+
+                    # ── Dimension sweep ──
+                    # One GROUPING SETS (or UNION ALL) query per comparison side covers
+                    # every level (DPA.generate_sql_for_kpi_sweep), instead of one query
+                    # per level and side. _maps_for_level and the flat loop read the
+                    # demultiplexed maps from here and fall back to per-level queries for
+                    # anything the sweep didn't cover.
+                    # (comparator, side) -> {dimension: {"values": {key: value}, "total": value}}
+                    _sweep: Dict[Tuple[str, str], Dict[str, Dict[str, Any]]] = {}
+
+                    def _sweep_sides(comparator: str, bridge: bool) -> List[Tuple[str, Any, bool]]:
+                        """(side, kpi-like, comparison_period) for each breakdown a level needs."""
+                        _md = getattr(kpi_def, "metadata", None) or {}
+                        if (
+                            bridge and isinstance(_md, dict) and _md.get("kpi_type") == "ratio"
+                            and comparator != "budget" and prev_tf
+                            and _md.get("bridge_numerator_sql") and _md.get("bridge_denominator_sql")
+                        ):
+                            _num = _SqlProxy(kpi_def, _md["bridge_numerator_sql"])
+                            _den = _SqlProxy(kpi_def, _md["bridge_denominator_sql"])
+                            return [("num_cur", _num, False), ("num_prev", _num, True),
+                                    ("den_cur", _den, False), ("den_prev", _den, True)]
+                        if comparator == "budget":
+                            _bud = self._budget_variant_kpi(kpi_def)
+                            return [("cur", kpi_def, False), ("prev", _bud, False)] if _bud is not None else []
+                        return [("cur", kpi_def, False), ("prev", kpi_def, True)] if prev_tf else []
+
+                    async def _sweep_levels(levels: List[Any], comparator: str, bridge: bool = True) -> None:
+                        levels = [str(lvl) for lvl in dict.fromkeys(levels) if lvl]
+                        sweep_sql = getattr(self.data_product_agent, "generate_sql_for_kpi_sweep", None)
+                        if not self.config.dimension_sweep or len(levels) < 2 or sweep_sql is None:
+                            return
+                        async def _sweep_side(side: str, kpi_like: Any, comparison_period: bool) -> Optional[Dict[str, Any]]:
+                            nonlocal queries_executed
+                            gen = await sweep_sql(
+                                kpi_like, levels, timeframe=cur_tf, filters=getattr(plan, "filters", None),
+                                comparison_period=comparison_period,
+                            )
+                            if not (isinstance(gen, dict) and gen.get("success")):
+                                self.logger.info(f"[SWEEP] {comparator}/{side} not swept: {(gen or {}).get('message') if isinstance(gen, dict) else gen}")
+                                return None
+                            resp = await _exec(gen["sql"])
+                            queries_executed += 1
+                            # NULL members under _as_map's sentinel, so swept maps match per-level ones
+                            return self.data_product_agent.split_sweep_result(
+                                resp, gen["dimensions"], gen["mode"], null_key=_ROLLUP_TOTAL_KEY
+                            )
+
+                        pending = [
+                            (side, kpi_like, comparison_period)
+                            for side, kpi_like, comparison_period in _sweep_sides(comparator, bridge)
+                            if not all(lvl in _sweep.get((comparator, side), {}) for lvl in levels)
+                        ]
+                        splits = await _fan_out([_sweep_side(*p) for p in pending])
+                        # Stored in side order up to the first failure, as the one-by-one pass did
+                        for (side, _, _), split in zip(pending, splits):
+                            if isinstance(split, Exception):
+                                self.logger.warning(f"[SWEEP] {comparator}/{side} failed, using per-level queries: {split}")
+                                return
+                            if not isinstance(split, dict):
+                                return
+                            _sweep.setdefault((comparator, side), {}).update(split)
+                        self.logger.info(f"[SWEEP] {comparator}: {len(levels)} level(s) in one query per side")
+
+                    def _swept_maps(level_label: Any, comparator: str, sides: Tuple[str, ...]) -> Optional[List[Tuple[Dict[str, float], Optional[float]]]]:
+                        """(values, total) per side for a swept level, or None if any side is missing."""
+                        found = []
+                        for side in sides:
+                            entry = _sweep.get((comparator, side), {}).get(str(level_label))
+                            if entry is None:
+                                return None
+                            found.append((dict(entry["values"]), entry["total"]))
+                        return found
+
                     # Helper: read dimension hierarchies from contract (if provided)
                     def _hierarchies_from_contract() -> Dict[str, List[str]]:
                         try:
-                            cpath = self._contract_path_for_kpi(getattr(plan, "kpi_name", None), client_id=getattr(plan, "client_id", None))
-                            if not os.path.exists(cpath):
-                                return {}
-                            with open(cpath, "r", encoding="utf-8") as f:
-                                doc = yaml.safe_load(f)
-                            views = (doc or {}).get("views", [])
-                            target = None
-                            for v in views:
-                                if isinstance(v, dict) and v.get("llm_profile"):
-                                    target = v
-                                    break
-                            if not isinstance(target, dict):
+                            contract = get_contract_cache().get(
+                                self._contract_path_for_kpi(getattr(plan, "kpi_name", None), client_id=getattr(plan, "client_id", None))
+                            )
+                            if contract is None:
                                 return {}
-                            llm_profile = target.get("llm_profile", {}) or {}
-                            hier = llm_profile.get("dimension_hierarchies") or {}
-                            out: Dict[str, List[str]] = {}
-                            if isinstance(hier, dict):
-                                for k, v in hier.items():
-                                    if isinstance(v, list):
-                                        out[str(k)] = [str(x) for x in v if x]
-                            return out
+                            return {k: list(v) for k, v in contract.hierarchies.items()}
                         except Exception:
                             return {}
 
@@ -1152,37 +1277,32 @@ class A9_Deep_Analysis_Agent(DeepAnalysisProtocol):
                                     if not prev_tf:
                                         raise ValueError("bridge: no prev_tf")
 
-                                    class _SqlProxy:
-                                        """Thin KPI-like object carrying a substitute sql_query."""
-                                        def __init__(self, base_kpi: Any, sql_override: str) -> None:
-                                            self.sql_query = sql_override
-                                            self.calculation = sql_override
-                                            self.name = getattr(base_kpi, "name", "bridge")
-                                            self.id = getattr(base_kpi, "id", "bridge")
-                                            self.metadata = getattr(base_kpi, "metadata", {})
-                                            self.unit = getattr(base_kpi, "unit", None)
-                                            self.data_product_id = getattr(base_kpi, "data_product_id", None)
-
                                     _num_proxy = _SqlProxy(kpi_def, _num_sql)
                                     _den_proxy = _SqlProxy(kpi_def, _den_sql)
                                     _base_f = getattr(plan, "filters", None)
 
-                                    _gen_nc = await self.data_product_agent.generate_sql_for_kpi(
-                                        _num_proxy, timeframe=cur_tf, filters=_base_f, breakdown=True, override_group_by=[level_label])
-                                    _gen_np = await self.data_product_agent.generate_sql_for_kpi(
-                                        _num_proxy, timeframe=cur_tf, filters=_base_f, breakdown=True, override_group_by=[level_label], comparison_period=True)
-                                    _gen_dc = await self.data_product_agent.generate_sql_for_kpi(
-                                        _den_proxy, timeframe=cur_tf, filters=_base_f, breakdown=True, override_group_by=[level_label])
-                                    _gen_dp = await self.data_product_agent.generate_sql_for_kpi(
-                                        _den_proxy, timeframe=cur_tf, filters=_base_f, breakdown=True, override_group_by=[level_label], comparison_period=True)
+                                    _swept = _swept_maps(level_label, comparator, ("num_cur", "num_prev", "den_cur", "den_prev"))
+                                    if _swept is not None:
+                                        _m_nc, _m_np, _m_dc, _m_dp = (m for m, _ in _swept)
+                                    else:
+                                        # num_cur, num_prev, den_cur, den_prev — generated and run together
+                                        _gens = await _fan_out([
+                                            self.data_product_agent.generate_sql_for_kpi(
+                                                _proxy, timeframe=cur_tf, filters=_base_f, breakdown=True,
+                                                override_group_by=[level_label], comparison_period=_cmp,
+                                            )
+                                            for _proxy in (_num_proxy, _den_proxy) for _cmp in (False, True)
+                                        ])
+                                        _gen_nc, _gen_np, _gen_dc, _gen_dp = _gens
 
-                                    if not all(g.get("success") for g in [_gen_nc, _gen_np, _gen_dc, _gen_dp]):
-                                        raise ValueError("bridge: SQL generation failed for one or more components")
+                                        if not all(isinstance(g, dict) and g.get("success") for g in _gens):
+                                            raise ValueError("bridge: SQL generation failed for one or more components")
 
-                                    _m_nc = _as_map(await self.data_product_agent.execute_sql(_gen_nc["sql"], data_product_id=dp_id))
-                                    _m_np = _as_map(await self.data_product_agent.execute_sql(_gen_np["sql"], data_product_id=dp_id))
-                                    _m_dc = _as_map(await self.data_product_agent.execute_sql(_gen_dc["sql"], data_product_id=dp_id))
-                                    _m_dp = _as_map(await self.data_product_agent.execute_sql(_gen_dp["sql"], data_product_id=dp_id))
+                                        _execs = await _fan_out([_exec(g["sql"]) for g in (_gen_nc, _gen_np, _gen_dc, _gen_dp)])
+                                        for _ex in _execs:
+                                            if isinstance(_ex, Exception):
+                                                raise _ex
+                                        _m_nc, _m_np, _m_dc, _m_dp = (_as_map(_ex) for _ex in _execs)
 
                                     _total_den_cur = sum(_m_dc.values()) or 1.0
 
@@ -1228,6 +1348,16 @@ class A9_Deep_Analysis_Agent(DeepAnalysisProtocol):
                         # --- End bridge analysis path ---
 
                         try:
+                            _swept = _swept_maps(level_label, comparator, ("cur", "prev"))
+                            if _swept is not None:
+                                (m_cur, _tot_cur), (m_prev, _tot_prev) = _swept
+                                # The per-level maps lose their NULL row to _pop_total; the
+                                # sweep's total is exact, so the NULL member is just dropped.
+                                m_cur.pop(_ROLLUP_TOTAL_KEY, None)
+                                m_prev.pop(_ROLLUP_TOTAL_KEY, None)
+                                _record_dimension_total(level_label, _tot_cur, _tot_prev)
+                                return _compare_groups(level_label, m_cur, m_prev)
+
                             # Current map
                             gen_cur = await self.data_product_agent.generate_sql_for_kpi(
                                 kpi_def, timeframe=cur_tf, filters=getattr(plan, "filters", None), breakdown=True, override_group_by=[level_label],
@@ -1235,7 +1365,7 @@ class A9_Deep_Analysis_Agent(DeepAnalysisProtocol):
                             )
                             if not gen_cur.get("success"):
                                 return []
-                            cur_exec = await self.data_product_agent.execute_sql(gen_cur.get("sql"), data_product_id=dp_id)
+                            cur_exec = await _exec(gen_cur.get("sql"))
                             m_cur = _as_map(cur_exec)
                             _tot_cur = _pop_total(m_cur)
 
@@ -1259,25 +1389,15 @@ class A9_Deep_Analysis_Agent(DeepAnalysisProtocol):
                                 )
                                 if not (gen_act.get("success") and gen_bud.get("success")):
                                     return []
-                                act_exec = await self.data_product_agent.execute_sql(gen_act.get("sql"), data_product_id=dp_id)
-                                bud_exec = await self.data_product_agent.execute_sql(gen_bud.get("sql"), data_product_id=dp_id)
+                                act_exec, bud_exec = await _fan_out([_exec(gen_act.get("sql")), _exec(gen_bud.get("sql"))])
+                                if isinstance(act_exec, Exception) or isinstance(bud_exec, Exception):
+                                    return []
                                 m_act = _as_map(act_exec)
                                 m_bud = _as_map(bud_exec)
                                 _tot_cur = _pop_total(m_act)
                                 _tot_prev = _pop_total(m_bud)
                                 _record_dimension_total(level_label, _tot_cur, _tot_prev)
-                                keys = set(m_act.keys()) | set(m_bud.keys())
-                                for k in keys:
-                                    c = float(m_act.get(k, 0.0))
-                                    b = float(m_bud.get(k, 0.0))
-                                    d = c - b
-                                    # ratio vs budget
-                                    if b == 0.0:
-                                        r = 0.0 if c == 0.0 else (1.0 if c > 0.0 else -1.0)
-                                    else:
-                                        r = d / abs(b)
-                                    groups.append({"dimension": level_label, "key": k, "current": c, "previous": b, "delta": d, "ratio": r})
-                                return groups
+                                return _compare_groups(level_label, m_act, m_bud)
                             else:
                                 # Previous timeframe comparator
                                 if not prev_tf:
@@ -1287,25 +1407,28 @@ class A9_Deep_Analysis_Agent(DeepAnalysisProtocol):
                                 )
                                 if not gen_prev.get("success"):
                                     return []
-                                prev_exec = await self.data_product_agent.execute_sql(gen_prev.get("sql"), data_product_id=dp_id)
+                                prev_exec = await _exec(gen_prev.get("sql"))
                                 m_prev = _as_map(prev_exec)
                                 _tot_prev = _pop_total(m_prev)
                                 _record_dimension_total(level_label, _tot_cur, _tot_prev)
-                                keys = set(m_cur.keys()) | set(m_prev.keys())
-                                for k in keys:
-                                    c = float(m_cur.get(k, 0.0))
-                                    p = float(m_prev.get(k, 0.0))
-                                    d = c - p
-                                    # ratio vs previous
-                                    if p == 0.0:
-                                        r = 0.0 if c == 0.0 else (1.0 if c > 0.0 else -1.0)
-                                    else:
-                                        r = d / abs(p)
-                                    groups.append({"dimension": level_label, "key": k, "current": c, "previous": p, "delta": d, "ratio": r})
-                                return groups
+                                return _compare_groups(level_label, m_cur, m_prev)
                         except Exception:
                             return []
 
+                    async def _maps_for_levels(levels: List[Any], comparator: str) -> Dict[Any, List[Dict[str, Any]]]:
+                        """_maps_for_level for every level at once, keyed by level.
+
+                        Totals first recorded here are moved back into level order, so
+                        _dimension_totals reads the same as after a one-by-one pass.
+                        """
+                        levels = list(dict.fromkeys(levels))
+                        known = set(_dimension_totals)
+                        results = await _fan_out([_maps_for_level(lvl, comparator) for lvl in levels])
+                        for lvl in levels:
+                            if str(lvl) in _dimension_totals and str(lvl) not in known:
+                                _dimension_totals[str(lvl)] = _dimension_totals.pop(str(lvl))
+                        return {lvl: ([] if isinstance(r, Exception) else r) for lvl, r in zip(levels, results)}
+
                     # Helper: classify groups against threshold spec
                     def _classify(groups: List[Dict[str, Any]], spec: Dict[str, Any]) -> (List[Dict[str, Any]], List[Dict[str, Any]]):
                         breaches: List[Dict[str, Any]] = []
@@ -1499,6 +1622,8 @@ class A9_Deep_Analysis_Agent(DeepAnalysisProtocol):
                             lvl for vec in vector_order for lvl in (hmap.get(vec) or [])
                             if lvl not in _denied_dims
                         ]
+                        await _sweep_levels(dimensions_analyzed, comparator)
+                        _level_groups = await _maps_for_levels(dimensions_analyzed, comparator)
                         for vec in vector_order:
                             levels = hmap.get(vec, []) or []
                             for lvl in levels:
@@ -1508,7 +1633,7 @@ class A9_Deep_Analysis_Agent(DeepAnalysisProtocol):
                                 if lvl in _denied_dims:
                                     _dimensions_excluded.append({"dimension": lvl, **_denied_dims[lvl]})
                                     continue
-                                grp = await _maps_for_level(lvl, comparator)
+                                grp = _level_groups.get(lvl)
                                 if not grp:
                                     continue
                                 breaches, within = _classify(grp, spec)
@@ -1605,6 +1730,29 @@ class A9_Deep_Analysis_Agent(DeepAnalysisProtocol):
                         # them, and records nowhere which ones.
                         dimensions_analyzed = list(dims_to_process)
                         self.logger.info(f"[LOOP] Will process {len(dims_to_process)} dimensions: {dims_to_process}")
+                        # Fallback and distribution maps (plain KPI, no ratio bridge) for every dimension
+                        await _sweep_levels(dims_to_process, comp_fb, bridge=False)
+
+                        # TopN breakdowns for every dimension, fetched together and consumed
+                        # in dimension order by the loop below.
+                        # Budget comparator: skip period-over-period TopN (delta_prev is vs prior period,
+                        # not vs budget) — the loop falls through to the dual-query budget path.
+                        async def _topn_for_dim(dim: Any) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+                            req = await self.data_product_agent.generate_sql_for_kpi(
+                                kpi_def,
+                                timeframe=cur_tf,
+                                filters=getattr(plan, "filters", None),
+                                breakdown=True,
+                                override_group_by=[dim],
+                                topn={"type": "top", "n": 50, "metric": "delta_prev"}  # Fetch more for threshold analysis
+                            )
+                            if not req.get("success"):
+                                return req, None
+                            return req, await _exec(req.get("sql"))
+
+                        _topn_by_dim: Dict[Any, Any] = {}
+                        if comp_fb != "budget":
+                            _topn_by_dim = dict(zip(dims_to_process, await _fan_out([_topn_for_dim(d) for d in dims_to_process])))
                         for dim_idx, dim in enumerate(dims_to_process):
                             self.logger.info(f"[LOOP] Processing dimension {dim_idx+1}/{len(dims_to_process)}: {dim}")
                             # Snapshot of the cumulative list BEFORE this dimension's own pass, so the
@@ -1616,23 +1764,16 @@ class A9_Deep_Analysis_Agent(DeepAnalysisProtocol):
                             # permanently False and dims 2..N contribute nothing — 2026-08-16).
                             _where_is_count_before_dim = len(kt.where_is)
                             try:
-                                # Fetch ALL data for this dimension to apply hybrid threshold selection
+                                # ALL data for this dimension to apply hybrid threshold selection
                                 # This gives us richer context for the LLM vs fixed Top 3/Bottom 3
-                                # Budget comparator: skip period-over-period TopN (delta_prev is vs prior period,
-                                # not vs budget) — fall through to the dual-query budget path below.
                                 if comp_fb == "budget":
-                                    all_req = {"success": False}
+                                    all_req, all_exec = {"success": False}, None
                                 else:
-                                    all_req = await self.data_product_agent.generate_sql_for_kpi(
-                                        kpi_def,
-                                        timeframe=cur_tf,
-                                        filters=getattr(plan, "filters", None),
-                                        breakdown=True,
-                                        override_group_by=[dim],
-                                        topn={"type": "top", "n": 50, "metric": "delta_prev"}  # Fetch more for threshold analysis
-                                    )
+                                    _topn = _topn_by_dim.get(dim)
+                                    if isinstance(_topn, Exception):
+                                        raise _topn
+                                    all_req, all_exec = _topn
                                 if all_req.get("success"):
-                                    all_exec = await self.data_product_agent.execute_sql(all_req.get("sql"), data_product_id=dp_id)
                                     queries_executed += 1
                                     rows = all_exec.get("rows") or []
                                     cols = [str(c) for c in (all_exec.get("columns") or [])]
@@ -1720,7 +1861,11 @@ class A9_Deep_Analysis_Agent(DeepAnalysisProtocol):
                                     m_cur: Dict[str, float] = {}
                                     m_prev: Dict[str, float] = {}
                                     _fb_success = False
-                                    if comp_fb == "budget":
+                                    _swept_fb = _swept_maps(dim, comp_fb, ("cur", "prev"))
+                                    if _swept_fb is not None:
+                                        m_cur, m_prev = _swept_fb[0][0], _swept_fb[1][0]
+                                        _fb_success = True
+                                    elif comp_fb == "budget":
                                         # Actual-vs-budget needs a version-substituted proxy KPI, not
                                         # a second time window — mirrors the pattern already proven in
                                         # _maps_for_level / _record_dimension_total (search
@@ -1810,7 +1955,10 @@ class A9_Deep_Analysis_Agent(DeepAnalysisProtocol):
                                     m_bud_h: Dict[str, float] = {}
                                     m_cur_h: Dict[str, float] = {}
                                     m_prev_h: Dict[str, float] = {}
-                                    if comp_fb == "budget":
+                                    _swept_h = _swept_maps(dim, comp_fb, ("cur", "prev"))
+                                    if _swept_h is not None:
+                                        ratios = [g["ratio"] for g in _compare_groups(dim, _swept_h[0][0], _swept_h[1][0])]
+                                    elif comp_fb == "budget":
                                         base_filters = getattr(plan, "filters", None) or {}
                                         # version-substituted proxy — see _budget_variant_kpi (DPA drops filters)
                                         _bud_kpi_h = self._budget_variant_kpi(kpi_def)
@@ -1955,8 +2103,11 @@ class A9_Deep_Analysis_Agent(DeepAnalysisProtocol):
                                 if _dm is not None and _dm not in _primary_dims:
                                     _primary_dims.append(_dm)
                             _sec_delta: Dict[tuple, Any] = {}
-                            for _dm in _primary_dims[: max(1, self.config.max_dimensions)]:
-                                for _g in (await _maps_for_level(_dm, comparator_secondary) or []):
+                            _sec_dims = _primary_dims[: max(1, self.config.max_dimensions)]
+                            await _sweep_levels(_sec_dims, comparator_secondary)
+                            _sec_groups = await _maps_for_levels(_sec_dims, comparator_secondary)
+                            for _dm in _sec_dims:
+                                for _g in (_sec_groups.get(_dm) or []):
                                     _gk = _g.get("key")
                                     if _gk is not None:
                                         _sec_delta[(str(_dm), str(_gk))] = _g.get("delta")
@@ -17,6 +17,8 @@ from typing import Dict, List, Any, Optional, Union
 # Import service layer
 from src.llm_services.claude_service import ClaudeService, create_claude_service, get_claude_model_for_task, ClaudeTaskType
 from src.llm_services.response_parsing import parse_llm_json
+from src.llm_services.response_cache import LLMResponseCache
+from src.llm_services.scheduler import LLMPriority, estimate_tokens, get_llm_scheduler
 from src.llm_services.openai_service import (
     OpenAIService, create_openai_service, TaskType, get_model_for_task
 )
@@ -55,6 +57,17 @@ class A9_LLM_Request(A9AgentBaseRequest):
         None, description="JSON schema (e.g. PydanticModel.model_json_schema()) to force via tool_choice"
     )
     tool_name: Optional[str] = Field(None, description="Tool name for the forced tool_choice call")
+    # Response cache: None follows response_cache_max_temperature, False always
+    # calls the provider (non-deterministic use), True caches regardless.
+    cache: Optional[bool] = Field(None, description="Serve/store this request via the response cache")
+    # Anthropic prompt caching: character offsets into `prompt` ending a shared
+    # prefix to mark with cache_control (e.g. context common to several calls).
+    cache_breakpoints: Optional[List[int]] = Field(
+        None, description="Prompt offsets ending prefixes to prompt-cache (anthropic only)"
+    )
+    # Scheduler priority class: "interactive" (HITL) is admitted ahead of
+    # "standard", which is admitted ahead of "batch" (assessment/enrichment).
+    priority: Optional[str] = Field(None, description="interactive | standard | batch (default standard)")
 
 
 class A9_LLM_TemplateRequest(A9AgentBaseRequest):
@@ -66,6 +79,7 @@ class A9_LLM_TemplateRequest(A9AgentBaseRequest):
     max_tokens: Optional[int] = Field(None, description="Override the default max tokens")
     system_prompt: Optional[str] = Field(None, description="Override the default system prompt")
     operation: str = Field("generate_template", description="The operation to perform")
+    priority: Optional[str] = Field(None, description="Scheduler priority class, see A9_LLM_Request")
 
 
 class A9_LLM_AnalysisRequest(A9AgentBaseRequest):
@@ -81,6 +95,10 @@ class A9_LLM_AnalysisRequest(A9AgentBaseRequest):
         None, description="JSON schema to force via tool_choice (forced structured output)"
     )
     tool_name: Optional[str] = Field(None, description="Tool name for the forced tool_choice call")
+    cache_breakpoints: Optional[List[int]] = Field(
+        None, description="Offsets into `content` ending prefixes to prompt-cache (anthropic only)"
+    )
+    priority: Optional[str] = Field(None, description="Scheduler priority class, see A9_LLM_Request")
 
 
 class A9_LLM_SummaryRequest(A9AgentBaseRequest):
@@ -108,6 +126,7 @@ class A9_LLM_Response(A9AgentBaseResponse):
     usage: Dict[str, Any] = Field(..., description="Token usage information")
     operation: str = Field(..., description="The operation that was performed")
     warnings: Optional[List[str]] = Field(None, description="Any warnings generated")
+    cache_hit: bool = Field(False, description="Served from the response cache without a provider call")
 
 
 class A9_LLM_AnalysisResponse(A9AgentBaseResponse):
@@ -196,6 +215,15 @@ class A9_LLM_Service_Agent:
             self.config = A9_LLM_Service_Agent_Config(**config)
         else:
             self.config = config
+
+        self.response_cache: Optional[LLMResponseCache] = None
+        if self.config.response_cache_enabled:
+            self.response_cache = LLMResponseCache(
+                default_ttl_seconds=self.config.response_cache_ttl_seconds,
+                operation_ttls=self.config.response_cache_operation_ttls,
+                max_entries=self.config.response_cache_max_entries,
+                path=self.config.response_cache_path,
+            )
         
         # Initialize appropriate LLM service based on provider
         self._initialize_llm_service()
@@ -278,6 +306,8 @@ class A9_LLM_Service_Agent:
                 "guardrails_path": self.config.guardrails_path,
                 "prompt_templates_path": self.config.prompt_templates_path,
                 "system_prompt_override": getattr(self.config, 'system_prompt', None),
+                # The scheduler re-queues 429s itself (_scheduled_call)
+                "retry_rate_limits": not self.config.llm_scheduler_enabled,
             }
             
             # Initialize the appropriate service based on provider
@@ -382,6 +412,78 @@ class A9_LLM_Service_Agent:
             logger.error(f"Missing variable in template formatting: {str(e)}")
             return None
     
+    def cache_stats(self) -> Dict[str, Any]:
+        """Response-cache hit/miss and token-savings counters ({} when disabled)."""
+        response_cache = getattr(self, "response_cache", None)
+        return response_cache.stats() if response_cache is not None else {}
+
+    def scheduler_stats(self) -> Dict[str, Any]:
+        """Queue depth, in-flight and rate-limit counters of the shared scheduler ({} when disabled)."""
+        if not self.config.llm_scheduler_enabled:
+            return {}
+        try:
+            return self._scheduler().stats()
+        except RuntimeError:  # no running event loop
+            return {}
+
+    def _scheduler(self):
+        return get_llm_scheduler(self.config.llm_max_concurrency, self.config.llm_rate_limits)
+
+    async def _scheduled_call(
+        self,
+        request: A9_LLM_Request,
+        model: Optional[str],
+        system_prompt: str,
+        call,
+    ) -> Dict[str, Any]:
+        """
+        Run `call` (a zero-argument coroutine factory for one service call) once
+        the shared scheduler admits it, feeding usage and rate-limit headers
+        back to the model's lane. A 429 is re-queued behind the lane's backoff
+        up to llm_rate_limit_retries times.
+        """
+        if not self.config.llm_scheduler_enabled:
+            return await call()
+        scheduler = self._scheduler()
+        lane = model or getattr(getattr(self.llm_service, "config", None), "model_name", None) or self.config.provider
+        est_tokens = estimate_tokens(system_prompt, request.prompt)
+        priority = request.priority or LLMPriority.STANDARD
+        for attempt in range(self.config.llm_rate_limit_retries + 1):
+            async with scheduler.slot(lane, priority, est_tokens) as ticket:
+                result = await call()
+                ticket.observe(result)
+            if not ticket.rate_limited:
+                break
+            logger.warning(
+                f"LLM request {request.request_id} rate limited on {lane} "
+                f"(attempt {attempt + 1}/{self.config.llm_rate_limit_retries + 1})"
+            )
+        return result
+
+    def _response_cache_key(
+        self,
+        request: A9_LLM_Request,
+        system_prompt: str,
+        max_tokens: int,
+        temperature: float,
+        model: Optional[str],
+    ) -> Optional[str]:
+        """Cache key for `request`, or None when it must go to the provider."""
+        if getattr(self, "response_cache", None) is None or request.cache is False:
+            return None
+        if request.cache is None and temperature > self.config.response_cache_max_temperature:
+            return None
+        return LLMResponseCache.make_key(
+            self.config.provider.lower(),
+            model,
+            system_prompt,
+            request.prompt,
+            request.response_schema,
+            request.tool_name,
+            temperature,
+            max_tokens,
+        )
+
     async def generate(self, request: A9_LLM_Request) -> A9_LLM_Response:
         """
         Generate text from LLM based on prompt
@@ -406,6 +508,21 @@ class A9_LLM_Service_Agent:
             # Check if LLM service is available
             if not self.llm_service:
                 raise ValueError(f"No LLM service available for provider {self.config.provider}")
+
+            response_cache = getattr(self, "response_cache", None)
+            cache_key = self._response_cache_key(request, system_prompt, max_tokens, temperature, model)
+            if cache_key is not None:
+                cached = await response_cache.get(cache_key)
+                if cached is not None:
+                    return A9_LLM_Response(
+                        status="success",
+                        request_id=request.request_id,
+                        content=cached["content"],
+                        model_used=cached.get("model_used") or model,
+                        usage=cached.get("usage") or {},
+                        operation=request.operation,
+                        cache_hit=True,
+                    )
             
             # Send request to provider via service layer
             provider = self.config.provider.lower()
@@ -414,7 +531,7 @@ class A9_LLM_Service_Agent:
                     # Phase 15 Stage A: forced tool-use structured output when a
                     # response_schema is provided; otherwise unchanged free-text path.
                     if getattr(request, "response_schema", None):
-                        result = await self.llm_service.generate_structured(
+                        result = await self._scheduled_call(request, model, system_prompt, lambda: self.llm_service.generate_structured(
                             prompt=request.prompt,
                             tool_schema=request.response_schema,
                             tool_name=getattr(request, "tool_name", None) or "emit_response",
@@ -422,16 +539,18 @@ class A9_LLM_Service_Agent:
                             max_tokens=max_tokens,
                             temperature=temperature,
                             model=model,
-                        )
+                            cache_breakpoints=request.cache_breakpoints,
+                        ))
                     else:
                         # Use the service layer to generate the response - await the coroutine
-                        result = await self.llm_service.generate(
+                        result = await self._scheduled_call(request, model, system_prompt, lambda: self.llm_service.generate(
                             prompt=request.prompt,
                             system_prompt=system_prompt,
                             max_tokens=max_tokens,
                             temperature=temperature,
                             model=model,
-                        )
+                            cache_breakpoints=request.cache_breakpoints,
+                        ))
 
                     # Extract response text and usage from service result
                     response_text = result.get("response", "")
@@ -451,13 +570,13 @@ class A9_LLM_Service_Agent:
                     raise e
             elif provider == "openai":
                 try:
-                    # Use the service layer to generate the response - OpenAI service is NOT async
-                    result = self.llm_service.generate(
+                    # Async like the Claude path — never blocks the event loop
+                    result = await self._scheduled_call(request, model, system_prompt, lambda: self.llm_service.generate(
                         prompt=request.prompt,
                         system_prompt=system_prompt,
                         max_tokens=max_tokens,
                         temperature=temperature
-                    )
+                    ))
                     
                     # Extract response text and usage from service result
                     response_text = result.get("response", "")
@@ -480,6 +599,11 @@ class A9_LLM_Service_Agent:
                 logger.warning(f"Using mock response for unsupported provider: {provider}")
                 response_text = f"Mock response for {request.prompt[:50]}..."
                 usage = {"prompt_tokens": 10, "completion_tokens": 20, "total_tokens": 30}
+
+            if cache_key is not None and response_text and provider in ("anthropic", "openai"):
+                await response_cache.put(
+                    cache_key, request.operation, {"content": response_text, "model_used": model, "usage": usage},
+                )
             
             # Create and return response
             return A9_LLM_Response(
@@ -547,13 +671,23 @@ class A9_LLM_Service_Agent:
             # Check if we can use the service layer's template capabilities directly
             if hasattr(self.llm_service, 'generate_with_template') and self.llm_service is not None:
                 try:
-                    # Use the service layer to generate with template
-                    result = await self.llm_service.generate_with_template(
-                        template_id=request.template_id,
-                        template_vars=request.template_variables,
-                        system_prompt=request.system_prompt,
-                        max_tokens=request.max_tokens or self.config.max_tokens,
-                        temperature=request.temperature or self.config.temperature
+                    # Admitted through the scheduler like generate(); the template
+                    # variables only size the call for the lane's token bucket.
+                    sized_request = A9_LLM_Request(
+                        request_id=request.request_id,
+                        principal_id=request.principal_id,
+                        prompt=json.dumps(request.template_variables, default=str),
+                        priority=request.priority,
+                    )
+                    result = await self._scheduled_call(
+                        sized_request, request.model, request.system_prompt or "",
+                        lambda: self.llm_service.generate_with_template(
+                            template_id=request.template_id,
+                            template_vars=request.template_variables,
+                            system_prompt=request.system_prompt,
+                            max_tokens=request.max_tokens or self.config.max_tokens,
+                            temperature=request.temperature or self.config.temperature
+                        ),
                     )
                     
                     # Check if there was an error
@@ -606,7 +740,8 @@ class A9_LLM_Service_Agent:
                 temperature=request.temperature,
                 max_tokens=request.max_tokens,
                 system_prompt=request.system_prompt,
-                operation=request.operation
+                operation=request.operation,
+                priority=request.priority,
             )
             
             # Process using the standard generate method
@@ -652,6 +787,13 @@ class A9_LLM_Service_Agent:
             # Format the prompt
             context = request.context or "Analyze the following content:"
             prompt = prompt_template.format(content=request.content, context=context)
+
+            # Breakpoints are offsets into content; every template ends with it,
+            # so shift them past the instruction text placed in front.
+            cache_breakpoints = None
+            if request.cache_breakpoints and prompt.endswith(request.content):
+                _shift = len(prompt) - len(request.content)
+                cache_breakpoints = [_shift + int(o) for o in request.cache_breakpoints]
             
             # Create a standard request
             standard_request = A9_LLM_Request(
@@ -668,6 +810,8 @@ class A9_LLM_Service_Agent:
                 operation=request.operation,
                 response_schema=getattr(request, "response_schema", None),
                 tool_name=getattr(request, "tool_name", None),
+                cache_breakpoints=cache_breakpoints,
+                priority=request.priority,
             )
 
             # Process using the standard generate method
@@ -1055,6 +1055,7 @@ class A9_Orchestrator_Agent:
         timeframe: Optional[str] = "rolling_12_months",
         max_dimensions_per_kpi: int = 5,
         dry_run: bool = False,
+        refresh_enrichment: bool = False,
     ) -> Dict[str, Any]:
         """
         Orchestrated data product onboarding (MVP):
@@ -1062,6 +1063,7 @@ class A9_Orchestrator_Agent:
         - Register tables & create view via Data Product Agent
         - Validate registry integrity via Data Governance Agent
         - Compute & persist KPI top-dimension enrichment via Data Governance Agent
+          (cached scores are reused unless refresh_enrichment=True)
 
         Returns: { success, steps: [...], artifacts: { view_name, kpi_enrichment_path? } }
         """
@@ -1126,6 +1128,7 @@ class A9_Orchestrator_Agent:
                             "data_product_agent": dp_agent,
                             "timeframe": timeframe,
                             "max_dimensions_per_kpi": max_dimensions_per_kpi,
+                            "refresh": refresh_enrichment,
                         },
                     )
                     steps.append({
@@ -9,6 +9,7 @@ MVP implementation focuses on the Finance KPIs from the FI Star Schema.
 """
 # doc-sync-skip
 
+import asyncio
 import os
 import re
 import json
@@ -52,6 +53,26 @@ from src.agents.utils.data_quality_filter import DataQualityFilter
 
 logger = logging.getLogger(__name__)
 
+# Structured output for _enrich_situation_batch: one entry per situation in the chunk.
+_SITUATION_ENRICHMENT_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "situations": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "situation_id": {"type": "string"},
+                    "observations": {"type": "array", "items": {"type": "string"}},
+                    "trend_note": {"type": ["string", "null"]},
+                },
+                "required": ["situation_id", "observations"],
+            },
+        },
+    },
+    "required": ["situations"],
+}
+
 class A9_Situation_Awareness_Agent:
     """
     Agent9 Situation Awareness Agent
@@ -106,8 +127,13 @@ class A9_Situation_Awareness_Agent:
         # Initialize logging
         self.logger = logging.getLogger(self.__class__.__name__)
         
-        # KPI registry populated during connect() via _load_kpi_registry() from Supabase
+        # KPI registry populated during connect() via _load_kpi_registry() from Supabase.
+        # Versioned snapshot: rebuilt only when the provider's KPI rows change
+        # (see _refresh_kpi_registry_snapshot).
         self.kpi_registry = {}
+        self._kpi_registry_version: Optional[str] = None
+        self._kpi_definition_cache: Dict[str, Optional[KPIDefinition]] = {}
+        self._kpi_registry_lock = asyncio.Lock()
         # Cache for last generated SQL per KPI to avoid regenerating for UI display
         self._last_sql_cache: Dict[str, Dict[str, str]] = {}
 
@@ -118,6 +144,20 @@ class A9_Situation_Awareness_Agent:
         self._opportunity_recovery_min_delta_pct: float = float(
             config.get("opportunity_recovery_min_delta_pct", 5.0)
         )
+
+        # KPI scan concurrency (see _scan_relevant_kpis)
+        self._kpi_scan_concurrency: int = int(config.get("kpi_scan_concurrency", 8))
+        self._kpi_scan_backend_limits: Dict[str, int] = dict(
+            config.get("kpi_scan_backend_limits", {})
+        )
+        _scan_timeout = config.get("kpi_scan_timeout_seconds", 120.0)
+        self._kpi_scan_timeout_seconds: Optional[float] = float(_scan_timeout) if _scan_timeout else None
+
+        # Bundled KPI reads (see _fetch_kpi_bundle)
+        self._kpi_bundle_sql: bool = bool(config.get("kpi_bundle_sql", True))
+
+        # LLM enrichment of detected situations (see _enrich_situations)
+        self._enrichment_batch_size: int = max(1, int(config.get("enrichment_batch_size", 10)))
     
     async def connect(self, orchestrator=None):
         """Initialize connections to dependent services."""
@@ -233,6 +273,7 @@ class A9_Situation_Awareness_Agent:
         """
         Load KPIs from the Supabase-backed registry asynchronously.
         No YAML fallbacks — if the provider returns no data, log an error and return empty.
+        Converted definitions are cached per KPI row; see _refresh_kpi_registry_snapshot.
         """
         try:
             # Prefer the shared, already-initialized registry factory injected via config.
@@ -270,37 +311,91 @@ class A9_Situation_Awareness_Agent:
                 return
 
             target_domains = self.config.get("target_domains", ["Finance"])
-            logger.info(f"Filtering KPIs for domains: {target_domains}")
-            self.kpi_registry = {}
-            templates_skipped = 0
-            for kpi in kpis:
-                # Phase 12A guard: never evaluate template KPIs.
-                # Template rows are research artifacts pending data connection — they have
-                # no data_product_id mapping and would either error or return zero values.
-                kpi_status = getattr(kpi, "status", "active") or "active"
-                if kpi_status != "active":
-                    templates_skipped += 1
-                    continue
-
-                if self._kpi_matches_domains(kpi, target_domains):
-                    kpi_def = self._convert_to_kpi_definition(kpi)
-                    if kpi_def:
-                        # Store under plain name (used by NL-query name lookups, last-write wins).
-                        self.kpi_registry[kpi_def.name] = kpi_def
-                        # Also store under a client-qualified key so multi-tenant scans can
-                        # iterate collision-free even when two clients share a KPI name.
-                        if kpi_def.client_id:
-                            self.kpi_registry[f"{kpi_def.client_id}:{kpi_def.name}"] = kpi_def
-            unique_names = len([k for k in self.kpi_registry if ':' not in k])
-            logger.info(
-                f"Added {unique_names} unique KPI names to registry for domains: {target_domains} "
-                f"(skipped {templates_skipped} template KPIs)"
-            )
-            if not self.kpi_registry:
-                logger.warning("No matching KPIs found in registry for target domains")
+            # getattr: loader tests build the agent via __new__ without __init__
+            lock = getattr(self, "_kpi_registry_lock", None)
+            if lock is None:
+                lock = self._kpi_registry_lock = asyncio.Lock()
+            async with lock:
+                self._refresh_kpi_registry_snapshot(kpis, target_domains)
         except Exception as e:
             logger.error(f"Error loading KPI registry: {str(e)}")
             self.kpi_registry = {}
+            self._kpi_registry_version = None
+
+    @staticmethod
+    def _kpi_fingerprint(kpi: Any) -> str:
+        """Content hash of a registry KPI row, used to detect changed rows between loads."""
+        import hashlib
+        try:
+            if hasattr(kpi, "model_dump_json"):
+                payload = kpi.model_dump_json()
+            elif isinstance(kpi, dict):
+                payload = json.dumps(kpi, sort_keys=True, default=str)
+            else:
+                payload = repr(kpi)
+        except Exception:
+            payload = repr(kpi)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _refresh_kpi_registry_snapshot(self, kpis: List[Any], target_domains: List[str]) -> None:
+        """
+        Rebuild self.kpi_registry from provider rows only when they have changed.
+
+        Each row is fingerprinted by content hash; the snapshot version is the hash
+        of all fingerprints plus the target domains. An unchanged version keeps the
+        current snapshot as-is. Otherwise a new dict is built — reusing the converted
+        KPIDefinition of every row whose fingerprint is unchanged — and swapped in
+        with a single assignment, so a concurrent scan never sees a half-built dict.
+        """
+        import hashlib
+        fingerprints = [self._kpi_fingerprint(kpi) for kpi in kpis]
+        version_src = "|".join(sorted(target_domains)) + "#" + ",".join(fingerprints)
+        version = hashlib.sha256(version_src.encode("utf-8")).hexdigest()[:16]
+        if version == getattr(self, "_kpi_registry_version", None) and self.kpi_registry:
+            logger.debug(f"KPI registry snapshot {version} unchanged — reusing converted definitions")
+            return
+
+        logger.info(f"Filtering KPIs for domains: {target_domains}")
+        previous = getattr(self, "_kpi_definition_cache", None) or {}
+        definition_cache: Dict[str, Optional[KPIDefinition]] = {}
+        registry: Dict[str, KPIDefinition] = {}
+        templates_skipped = 0
+        converted = 0
+        for kpi, fingerprint in zip(kpis, fingerprints):
+            # Phase 12A guard: never evaluate template KPIs.
+            # Template rows are research artifacts pending data connection — they have
+            # no data_product_id mapping and would either error or return zero values.
+            kpi_status = getattr(kpi, "status", "active") or "active"
+            if kpi_status != "active":
+                templates_skipped += 1
+                continue
+
+            if self._kpi_matches_domains(kpi, target_domains):
+                if fingerprint in previous:
+                    kpi_def = previous[fingerprint]
+                else:
+                    kpi_def = self._convert_to_kpi_definition(kpi)
+                    converted += 1
+                definition_cache[fingerprint] = kpi_def
+                if kpi_def:
+                    # Store under plain name (used by NL-query name lookups, last-write wins).
+                    registry[kpi_def.name] = kpi_def
+                    # Also store under a client-qualified key so multi-tenant scans can
+                    # iterate collision-free even when two clients share a KPI name.
+                    if kpi_def.client_id:
+                        registry[f"{kpi_def.client_id}:{kpi_def.name}"] = kpi_def
+
+        # Atomic swap — readers see either the old or the new snapshot, never a mix.
+        self.kpi_registry = registry
+        self._kpi_definition_cache = definition_cache
+        self._kpi_registry_version = version
+        unique_names = len([k for k in registry if ':' not in k])
+        logger.info(
+            f"Added {unique_names} unique KPI names to registry for domains: {target_domains} "
+            f"(snapshot {version}, {converted} converted, skipped {templates_skipped} template KPIs)"
+        )
+        if not registry:
+            logger.warning("No matching KPIs found in registry for target domains")
     
     async def disconnect(self):
         """Disconnect from dependent services."""
@@ -370,7 +465,8 @@ class A9_Situation_Awareness_Agent:
             self.logger.info(f"Detecting situations for {request.principal_context.role}")
 
             # Infra A4-a: refresh KPI registry from Supabase per request so new
-            # clients / new KPIs become visible without a service restart.
+            # clients / new KPIs become visible without a service restart. Only
+            # changed KPI rows are re-converted (versioned snapshot).
             await self._load_kpi_registry()
 
             # Get relevant KPIs based on principal context and business processes.
@@ -434,258 +530,33 @@ class A9_Situation_Awareness_Agent:
             situations = []
             kpi_values = []
             
-            # Process each relevant KPI to fetch actual values from database (no cap)
+            # Process each relevant KPI to fetch actual values from database (no cap).
+            # KPIs may be evaluated concurrently (see _scan_relevant_kpis); results come
+            # back in relevant_kpis order so situation ordering stays deterministic.
             opportunities: List[OpportunitySignal] = []
-            for kpi_name, kpi_definition in relevant_kpis.items():
-                try:
-                    # Get actual KPI value from database using Data Product Agent
-                    kpi_value = await self._get_kpi_value(
-                        kpi_definition,
-                        request.timeframe,
-                        request.comparison_type,
-                        request.filters,
-                        request.principal_context
-                    )
-
-                    if kpi_value:
-                        kpi_values.append(kpi_value)
-                        # Provenance in the log line. Without it, an assessment that
-                        # legitimately reads the same KPI twice (Actual, then Budget via
-                        # _fetch_plan_value) prints two different numbers under one name
-                        # and reads as corruption — observed: "Net Revenue = 94,271,804"
-                        # and "Net Revenue = 107,769,900" seconds apart, both correct.
-                        _ctx = getattr(kpi_value, "context", None)
-                        self.logger.info(
-                            f"Retrieved KPI value: {kpi_name} = {kpi_value.value} "
-                            f"[{_ctx.label() if _ctx else 'unknown provenance'}]"
-                        )
-
-                        # Detect problems based on thresholds, trends, etc.
-                        detected_situations = self._detect_kpi_situations(
-                            kpi_definition,
-                            kpi_value,
-                            request.principal_context
-                        )
-                        self.logger.info(f"Detected {len(detected_situations)} situations for {kpi_name}")
-
-                        # ── 11I-A: tag existing threshold situations ──────────────────────
-                        for s in detected_situations:
-                            if s.alert_type is None:
-                                s.alert_type = "threshold_breach"
-
-                        # ── 11I-A Pattern 4: covenant/regulatory → always critical ────────
-                        _kpi_type = getattr(kpi_definition, 'kpi_type', 'operational')
-                        if _kpi_type in ('covenant', 'regulatory'):
-                            for s in detected_situations:
-                                s.severity = SituationSeverity.CRITICAL
-                                s.alert_type = _kpi_type  # 'covenant' or 'regulatory'
-
-                        # ── 11I-A Pattern 1: plan variance ────────────────────────────────
-                        _budget_val = None  # hoisted for reuse by projected_breach (budget-derived floor)
-                        _plan_version = getattr(kpi_definition, 'plan_version_value', None)
-                        if _plan_version:
-                            try:
-                                plan_val = await self._fetch_plan_value(
-                                    kpi_definition, request.timeframe, request.filters, request.principal_context
-                                )
-                                _budget_val = plan_val
-                                if plan_val is not None and abs(plan_val) > 0:
-                                    variance_pct = (kpi_value.value - plan_val) / abs(plan_val)
-                                    # variance_pct < 0 always means actual < plan (numerically).
-                                    # For revenue KPIs: actual < plan is bad.
-                                    # For cost KPIs stored as negative values: actual < plan numerically
-                                    # means higher absolute costs (more negative) — also bad.
-                                    # inverse_logic is NOT applied here; the sign already encodes direction.
-                                    bad_direction = variance_pct < 0
-
-                                    # Read per-KPI plan_variance tolerance bands from registry thresholds.
-                                    # KPIThreshold entries with comparison_type='plan_variance' store the
-                                    # severity cutoffs as percentage magnitudes: green=min, yellow=medium, red=critical.
-                                    # Fall back to hardcoded 2%/8%/15% bands if not configured.
-                                    _pv_meta = (getattr(kpi_definition, 'metadata', None) or {}).get('variance_thresholds', {})
-                                    _pv_bands = _pv_meta.get('plan_variance', {})
-                                    _pv_min = abs(float(_pv_bands.get('green', 2.0))) / 100.0  # MEDIUM trigger
-                                    _pv_high = abs(float(_pv_bands.get('yellow', 8.0))) / 100.0  # HIGH trigger
-                                    _pv_crit = abs(float(_pv_bands.get('red', 15.0))) / 100.0  # CRITICAL trigger
-
-                                    if abs(variance_pct) >= _pv_min:
-                                        severity = (
-                                            SituationSeverity.CRITICAL if abs(variance_pct) >= _pv_crit else (
-                                                SituationSeverity.HIGH if abs(variance_pct) >= _pv_high
-                                                else SituationSeverity.MEDIUM
-                                            )
-                                        )
-                                        # Wording must reflect the KPI's polarity. For a cost KPI
-                                        # (inverse / negative-stored), bad_direction means spending is
-                                        # OVER budget → "above plan"; an opportunity means UNDER budget →
-                                        # "below plan". For revenue/profit KPIs the mapping is reversed.
-                                        _is_cost = bool(getattr(kpi_value, 'inverse_logic', False))
-                                        if _is_cost:
-                                            direction_word = "above" if bad_direction else "below"
-                                        else:
-                                            direction_word = "below" if bad_direction else "ahead of"
-                                        plan_sit = Situation(
-                                            situation_id=f"plan_{getattr(kpi_definition, 'id', None) or kpi_name}_{int(abs(variance_pct)*100)}",
-                                            kpi_name=kpi_name,
-                                            kpi_id=getattr(kpi_definition, 'id', None),
-                                            kpi_value=kpi_value,
-                                            severity=severity,
-                                            card_type="problem" if bad_direction else "opportunity",
-                                            direction='down' if bad_direction else 'up',
-                                            alert_type="plan_variance",
-                                            plan_value=plan_val,
-                                            description=f"{kpi_name} is {abs(variance_pct)*100:.1f}% {direction_word} plan",
-                                            business_impact=(
-                                                f"{kpi_name} is tracking {abs(variance_pct)*100:.1f}% "
-                                                f"{direction_word} the {_plan_version} baseline."
-                                            ),
-                                            hitl_required=bad_direction and severity == SituationSeverity.CRITICAL,
-                                        )
-                                        detected_situations.append(plan_sit)
-                            except Exception as _pv_err:
-                                self.logger.warning(f"Plan variance detection failed for {kpi_name}: {_pv_err}")
-
-                        # ── 11I-A Patterns 2 & 3: projection and acceleration ─────────────
-                        # Threshold-presence gating (Option A): each pattern runs ONLY if the
-                        # KPI carries a registry threshold row for that comparison_type.
-                        #   projected_breach → variance_thresholds['projected_breach'] (percent-of-budget tolerance)
-                        #   acceleration     → variance_thresholds['acceleration']     (volatility-normalised sensitivity ×)
-                        _monthly = getattr(kpi_value, 'monthly_values', None) or []
-                        _inverse = getattr(kpi_value, 'inverse_logic', False)
-                        _thresholds_meta = (getattr(kpi_definition, 'metadata', None) or {}).get('variance_thresholds', {})
-                        _pb_cfg = _thresholds_meta.get('projected_breach')
-                        _accel_cfg = _thresholds_meta.get('acceleration')
-
-                        # Pattern 2: projected breach (suppress if actual breach already exists).
-                        # Budget-anchored (dominant FP&A practice): the projection floor is derived
-                        # from the plan/budget run-rate, not a static dollar level. _pb_cfg['red'] is a
-                        # percent tolerance (magnitude) against the monthly budget run-rate.
-                        #   monthly_budget = budget / months-in-timeframe
-                        #   floor          = monthly_budget − |monthly_budget| × (tol%/100)
-                        # Breach fires when the projected monthly trend falls below `floor`. This holds for
-                        # BOTH positive-stored KPIs (revenue below budget) and negative-stored costs (more
-                        # negative = over budget) — the sign is already encoded, so inverse_logic is not applied
-                        # (same reasoning as the plan-variance block above).
-                        _has_threshold_breach = any(s.alert_type == "threshold_breach" for s in detected_situations)
-                        if (
-                            not _has_threshold_breach and _monthly and isinstance(_pb_cfg, dict)
-                            and _budget_val is not None and abs(_budget_val) > 0
-                            and _pb_cfg.get('red') is not None
-                        ):
-                            try:
-                                # Additive/flow KPIs ($ revenue, cost, income) accumulate across the
-                                # timeframe → convert the aggregate budget to a monthly run-rate.
-                                # Rate/ratio KPIs (%, e.g. margin, ROCE) do NOT accumulate → the budget
-                                # value is already the monthly-comparable level; do not divide.
-                                _unit = getattr(kpi_definition, 'unit', '') or ''
-                                _is_ratio = ('%' in _unit) or ('ratio' in _unit.lower())
-                                if _is_ratio:
-                                    _monthly_budget = _budget_val
-                                else:
-                                    _n_months = self._timeframe_month_count(request.timeframe)
-                                    _monthly_budget = _budget_val / max(1, _n_months)
-                                _pb_tol = abs(float(_pb_cfg['red'])) / 100.0
-                                _pb_floor = _monthly_budget - abs(_monthly_budget) * _pb_tol
-                                proj = self._project_trend(_monthly, {'red': _pb_floor}, inverse_logic=False)
-                                if proj:
-                                    pb_sit = Situation(
-                                        situation_id=f"proj_{getattr(kpi_definition, 'id', None) or kpi_name}_{proj['periods_until_breach']}",
-                                        kpi_name=kpi_name,
-                                        kpi_id=getattr(kpi_definition, 'id', None),
-                                        kpi_value=kpi_value,
-                                        severity=SituationSeverity.HIGH,
-                                        card_type="problem",
-                                        direction='down',
-                                        alert_type="projected_breach",
-                                        plan_value=_budget_val,
-                                        projected_breach_at_period=proj['projected_breach_at_period'],
-                                        projection_confidence=proj['projection_confidence'],
-                                        periods_until_breach=proj['periods_until_breach'],
-                                        description=f"{kpi_name} on trajectory to breach the {_plan_version} baseline in {proj['periods_until_breach']} period(s)",
-                                        business_impact=(
-                                            f"At current run-rate ({proj['slope']:+.2f}/period), "
-                                            f"{kpi_name} is projected to fall more than {abs(float(_pb_cfg['red'])):.0f}% "
-                                            f"below the {_plan_version} baseline within {proj['periods_until_breach']} period(s). "
-                                            f"Trend confidence: {proj['projection_confidence']:.0%}."
-                                        ),
-                                        hitl_required=proj['periods_until_breach'] <= 2,
-                                    )
-                                    detected_situations.append(pb_sit)
-                            except Exception as _proj_err:
-                                self.logger.warning(f"Projection detection failed for {kpi_name}: {_proj_err}")
-
-                        # Pattern 3: acceleration — gated on presence of an 'acceleration' threshold row.
-                        # yellow = fire floor (× rolling velocity std to trigger); red = HIGH-severity cutoff.
-                        if _monthly and isinstance(_accel_cfg, dict):
-                            try:
-                                _fire_mult = float(_accel_cfg.get('yellow') if _accel_cfg.get('yellow') is not None else 2.0)
-                                _high_mult = float(_accel_cfg.get('red') if _accel_cfg.get('red') is not None else 3.0)
-                                accel_signal = self._compute_acceleration(_monthly, fire_multiplier=_fire_mult)
-                                if accel_signal is not None and accel_signal > 0:
-                                    accel_sit = Situation(
-                                        situation_id=f"accel_{getattr(kpi_definition, 'id', None) or kpi_name}_{int(accel_signal*10)}",
-                                        kpi_name=kpi_name,
-                                        kpi_id=getattr(kpi_definition, 'id', None),
-                                        kpi_value=kpi_value,
-                                        severity=SituationSeverity.HIGH if accel_signal >= _high_mult else SituationSeverity.MEDIUM,
-                                        card_type="problem",
-                                        direction='down',
-                                        alert_type="acceleration",
-                                        acceleration_signal=accel_signal,
-                                        description=f"{kpi_name} deterioration is accelerating ({accel_signal:.1f}× baseline volatility)",
-                                        business_impact=(
-                                            f"The rate of change in {kpi_name} is itself increasing — "
-                                            f"the period-over-period decline is accelerating at {accel_signal:.1f}× the historical pace."
-                                        ),
-                                        hitl_required=False,
-                                    )
-                                    detected_situations.append(accel_sit)
-                            except Exception as _acc_err:
-                                self.logger.warning(f"Acceleration detection failed for {kpi_name}: {_acc_err}")
-
-                        # Commit detected situations before enrichment so detection
-                        # failures in LLM calls can never silently discard situations.
-                        situations.extend(detected_situations)
-                        # Enrich with LLM-generated observations and trend note
-                        for sit in detected_situations:
+            to_enrich: List[Tuple[KPIDefinition, KPIValue, Situation]] = []
+            scan_results = await self._scan_relevant_kpis(relevant_kpis, request)
+            for kpi_name, scan_result in scan_results:
+                if not scan_result:
+                    continue
+                kpi_value, detected_situations, detected_opportunities = scan_result
+                kpi_values.append(kpi_value)
+                situations.extend(detected_situations)
+                to_enrich.extend((relevant_kpis[kpi_name], kpi_value, sit) for sit in detected_situations)
+                opportunities.extend(detected_opportunities)
+                # Convert high-confidence opportunity signals into clickable Situation cards
+                for signal in detected_opportunities:
+                    if signal.confidence >= 0.7:
+                        opp_dedupe_key = f"opp_{signal.kpi_name}_{signal.opportunity_type}"
+                        if not any(s.dedupe_key == opp_dedupe_key for s in situations):
                             try:
-                                sit.key_observations = await self._generate_key_observations(kpi_definition, kpi_value, sit)
-                                sit.trend_note = await self._generate_trend_note(kpi_definition, kpi_value, sit)
-                            except Exception as _enrich_err:
-                                self.logger.warning(f"Enrichment failed for {kpi_name}/{sit.alert_type}: {_enrich_err}")
-
-                        # Detect positive opportunity signals
-                        try:
-                            detected_opportunities = self._detect_opportunities(
-                                kpi_definition,
-                                kpi_value,
-                            )
-                            if detected_opportunities:
-                                self.logger.info(
-                                    f"Detected {len(detected_opportunities)} opportunity signal(s) for {kpi_name}"
+                                opp_situation = Situation.from_opportunity_signal(signal, kpi_value)
+                                opp_situation.dedupe_key = opp_dedupe_key
+                                situations.append(opp_situation)
+                            except Exception as _opp_conv_err:
+                                self.logger.warning(
+                                    f"Could not convert opportunity signal to Situation for {signal.kpi_name}: {_opp_conv_err}"
                                 )
-                            opportunities.extend(detected_opportunities)
-                            # Convert high-confidence opportunity signals into clickable Situation cards
-                            for signal in detected_opportunities:
-                                if signal.confidence >= 0.7:
-                                    opp_dedupe_key = f"opp_{signal.kpi_name}_{signal.opportunity_type}"
-                                    if not any(s.dedupe_key == opp_dedupe_key for s in situations):
-                                        try:
-                                            opp_situation = Situation.from_opportunity_signal(signal, kpi_value)
-                                            opp_situation.dedupe_key = opp_dedupe_key
-                                            situations.append(opp_situation)
-                                        except Exception as _opp_conv_err:
-                                            self.logger.warning(
-                                                f"Could not convert opportunity signal to Situation for {signal.kpi_name}: {_opp_conv_err}"
-                                            )
-                        except Exception as opp_err:
-                            self.logger.warning(
-                                f"Error detecting opportunities for KPI {kpi_name}: {opp_err}"
-                            )
-
-                except Exception as kpi_error:
-                    self.logger.warning(f"Error processing KPI {kpi_name}: {str(kpi_error)}")
-                    # Continue with other KPIs
 
             # ── 11I-B: compound cross-KPI alert detection ─────────────────
             situations = await self._detect_compound_alerts(situations, client_id)
@@ -704,6 +575,12 @@ class A9_Situation_Awareness_Agent:
                         _seen_kpi[_key] = sit
             situations = list(_seen_kpi.values())
 
+            # ── Enrich the scan's surviving situations with LLM observations ──
+            # Runs before consolidation, which folds member observations into the
+            # merged card.
+            _surviving = {id(sit) for sit in situations}
+            await self._enrich_situations([item for item in to_enrich if id(item[2]) in _surviving])
+
             # ── Consolidate multiple problem alert_types for the same KPI ──────
             # A single KPI can legitimately trigger several 11I-A/11I-B patterns in one
             # scan (e.g. threshold_breach + plan_variance + acceleration). Showing each
@@ -780,6 +657,313 @@ class A9_Situation_Awareness_Agent:
                 situations=[]
             )
     
+    async def _scan_relevant_kpis(
+        self,
+        relevant_kpis: Dict[str, KPIDefinition],
+        request: SituationDetectionRequest,
+    ) -> List[Tuple[str, Optional[Tuple[KPIValue, List[Situation], List[OpportunitySignal]]]]]:
+        """
+        Run _scan_kpi for every relevant KPI and return (kpi_name, result) pairs in
+        relevant_kpis order.
+
+        With kpi_scan_concurrency <= 1 KPIs are evaluated one after another. Otherwise
+        up to kpi_scan_concurrency KPIs are in flight at once, optionally capped per
+        backend by kpi_scan_backend_limits (e.g. to protect a small warehouse). Each
+        KPI is bounded by kpi_scan_timeout_seconds; a KPI that times out or raises
+        yields None.
+        """
+        items = list(relevant_kpis.items())
+
+        async def _guarded(kpi_name: str, kpi_definition: KPIDefinition):
+            try:
+                if self._kpi_scan_timeout_seconds:
+                    return await asyncio.wait_for(
+                        self._scan_kpi(kpi_name, kpi_definition, request),
+                        timeout=self._kpi_scan_timeout_seconds,
+                    )
+                return await self._scan_kpi(kpi_name, kpi_definition, request)
+            except asyncio.TimeoutError:
+                self.logger.warning(
+                    f"KPI {kpi_name} timed out after {self._kpi_scan_timeout_seconds}s — skipped"
+                )
+            except Exception as kpi_error:
+                self.logger.warning(f"Error processing KPI {kpi_name}: {str(kpi_error)}")
+            # Continue with other KPIs
+            return None
+
+        if self._kpi_scan_concurrency <= 1 or len(items) <= 1:
+            return [(kpi_name, await _guarded(kpi_name, kpi_def)) for kpi_name, kpi_def in items]
+
+        scan_slots = asyncio.Semaphore(self._kpi_scan_concurrency)
+        backend_slots: Dict[str, asyncio.Semaphore] = {}
+
+        async def _bounded(kpi_name: str, kpi_definition: KPIDefinition):
+            backend = self._resolve_source_system(getattr(kpi_definition, 'data_product_id', None)) or 'duckdb'
+            if backend in ('sql_server', 'mssql'):
+                backend = 'sqlserver'
+            limit = self._kpi_scan_backend_limits.get(backend)
+            if not limit:
+                async with scan_slots:
+                    return await _guarded(kpi_name, kpi_definition)
+            if backend not in backend_slots:
+                backend_slots[backend] = asyncio.Semaphore(limit)
+            # Backend slot first: KPIs queued on a capped backend must not hold
+            # global slots that other backends' KPIs could be using.
+            async with backend_slots[backend]:
+                async with scan_slots:
+                    return await _guarded(kpi_name, kpi_definition)
+
+        self.logger.info(
+            f"Scanning {len(items)} KPIs concurrently (limit={self._kpi_scan_concurrency}, "
+            f"backend limits={self._kpi_scan_backend_limits})"
+        )
+        results = await asyncio.gather(*(_bounded(kpi_name, kpi_def) for kpi_name, kpi_def in items))
+        return [(kpi_name, result) for (kpi_name, _), result in zip(items, results)]
+
+    async def _scan_kpi(
+        self,
+        kpi_name: str,
+        kpi_definition: KPIDefinition,
+        request: SituationDetectionRequest,
+    ) -> Optional[Tuple[KPIValue, List[Situation], List[OpportunitySignal]]]:
+        """
+        Evaluate a single KPI for detect_situations.
+
+        Fetches the KPI value, runs the threshold / plan-variance / projection /
+        acceleration patterns and enriches the detected situations. Opportunity
+        signals are returned raw: turning them into Situation cards needs the whole
+        scan's situations for deduplication, so detect_situations does that.
+
+        Returns:
+            (kpi_value, detected_situations, detected_opportunities), or None when
+            no value could be fetched.
+        """
+        # Get actual KPI value from database using Data Product Agent
+        kpi_value = await self._get_kpi_value(
+            kpi_definition,
+            request.timeframe,
+            request.comparison_type,
+            request.filters,
+            request.principal_context
+        )
+        if not kpi_value:
+            return None
+
+        # Provenance in the log line. Without it, an assessment that
+        # legitimately reads the same KPI twice (Actual, then Budget via
+        # _fetch_plan_value) prints two different numbers under one name
+        # and reads as corruption — observed: "Net Revenue = 94,271,804"
+        # and "Net Revenue = 107,769,900" seconds apart, both correct.
+        _ctx = getattr(kpi_value, "context", None)
+        self.logger.info(
+            f"Retrieved KPI value: {kpi_name} = {kpi_value.value} "
+            f"[{_ctx.label() if _ctx else 'unknown provenance'}]"
+        )
+
+        # Detect problems based on thresholds, trends, etc.
+        detected_situations = self._detect_kpi_situations(
+            kpi_definition,
+            kpi_value,
+            request.principal_context
+        )
+        self.logger.info(f"Detected {len(detected_situations)} situations for {kpi_name}")
+
+        # ── 11I-A: tag existing threshold situations ──────────────────────
+        for s in detected_situations:
+            if s.alert_type is None:
+                s.alert_type = "threshold_breach"
+
+        # ── 11I-A Pattern 4: covenant/regulatory → always critical ────────
+        _kpi_type = getattr(kpi_definition, 'kpi_type', 'operational')
+        if _kpi_type in ('covenant', 'regulatory'):
+            for s in detected_situations:
+                s.severity = SituationSeverity.CRITICAL
+                s.alert_type = _kpi_type  # 'covenant' or 'regulatory'
+
+        # ── 11I-A Pattern 1: plan variance ────────────────────────────────
+        _budget_val = None  # hoisted for reuse by projected_breach (budget-derived floor)
+        _plan_version = getattr(kpi_definition, 'plan_version_value', None)
+        if _plan_version:
+            try:
+                plan_val = await self._fetch_plan_value(
+                    kpi_definition, request.timeframe, request.filters, request.principal_context,
+                    bundled_plan=getattr(kpi_value, "plan_value", None),
+                )
+                _budget_val = plan_val
+                if plan_val is not None and abs(plan_val) > 0:
+                    variance_pct = (kpi_value.value - plan_val) / abs(plan_val)
+                    # variance_pct < 0 always means actual < plan (numerically).
+                    # For revenue KPIs: actual < plan is bad.
+                    # For cost KPIs stored as negative values: actual < plan numerically
+                    # means higher absolute costs (more negative) — also bad.
+                    # inverse_logic is NOT applied here; the sign already encodes direction.
+                    bad_direction = variance_pct < 0
+
+                    # Read per-KPI plan_variance tolerance bands from registry thresholds.
+                    # KPIThreshold entries with comparison_type='plan_variance' store the
+                    # severity cutoffs as percentage magnitudes: green=min, yellow=medium, red=critical.
+                    # Fall back to hardcoded 2%/8%/15% bands if not configured.
+                    _pv_meta = (getattr(kpi_definition, 'metadata', None) or {}).get('variance_thresholds', {})
+                    _pv_bands = _pv_meta.get('plan_variance', {})
+                    _pv_min = abs(float(_pv_bands.get('green', 2.0))) / 100.0  # MEDIUM trigger
+                    _pv_high = abs(float(_pv_bands.get('yellow', 8.0))) / 100.0  # HIGH trigger
+                    _pv_crit = abs(float(_pv_bands.get('red', 15.0))) / 100.0  # CRITICAL trigger
+
+                    if abs(variance_pct) >= _pv_min:
+                        severity = (
+                            SituationSeverity.CRITICAL if abs(variance_pct) >= _pv_crit else (
+                                SituationSeverity.HIGH if abs(variance_pct) >= _pv_high
+                                else SituationSeverity.MEDIUM
+                            )
+                        )
+                        # Wording must reflect the KPI's polarity. For a cost KPI
+                        # (inverse / negative-stored), bad_direction means spending is
+                        # OVER budget → "above plan"; an opportunity means UNDER budget →
+                        # "below plan". For revenue/profit KPIs the mapping is reversed.
+                        _is_cost = bool(getattr(kpi_value, 'inverse_logic', False))
+                        if _is_cost:
+                            direction_word = "above" if bad_direction else "below"
+                        else:
+                            direction_word = "below" if bad_direction else "ahead of"
+                        plan_sit = Situation(
+                            situation_id=f"plan_{getattr(kpi_definition, 'id', None) or kpi_name}_{int(abs(variance_pct)*100)}",
+                            kpi_name=kpi_name,
+                            kpi_id=getattr(kpi_definition, 'id', None),
+                            kpi_value=kpi_value,
+                            severity=severity,
+                            card_type="problem" if bad_direction else "opportunity",
+                            direction='down' if bad_direction else 'up',
+                            alert_type="plan_variance",
+                            plan_value=plan_val,
+                            description=f"{kpi_name} is {abs(variance_pct)*100:.1f}% {direction_word} plan",
+                            business_impact=(
+                                f"{kpi_name} is tracking {abs(variance_pct)*100:.1f}% "
+                                f"{direction_word} the {_plan_version} baseline."
+                            ),
+                            hitl_required=bad_direction and severity == SituationSeverity.CRITICAL,
+                        )
+                        detected_situations.append(plan_sit)
+            except Exception as _pv_err:
+                self.logger.warning(f"Plan variance detection failed for {kpi_name}: {_pv_err}")
+
+        # ── 11I-A Patterns 2 & 3: projection and acceleration ─────────────
+        # Threshold-presence gating (Option A): each pattern runs ONLY if the
+        # KPI carries a registry threshold row for that comparison_type.
+        #   projected_breach → variance_thresholds['projected_breach'] (percent-of-budget tolerance)
+        #   acceleration     → variance_thresholds['acceleration']     (volatility-normalised sensitivity ×)
+        _monthly = getattr(kpi_value, 'monthly_values', None) or []
+        _inverse = getattr(kpi_value, 'inverse_logic', False)
+        _thresholds_meta = (getattr(kpi_definition, 'metadata', None) or {}).get('variance_thresholds', {})
+        _pb_cfg = _thresholds_meta.get('projected_breach')
+        _accel_cfg = _thresholds_meta.get('acceleration')
+
+        # Pattern 2: projected breach (suppress if actual breach already exists).
+        # Budget-anchored (dominant FP&A practice): the projection floor is derived
+        # from the plan/budget run-rate, not a static dollar level. _pb_cfg['red'] is a
+        # percent tolerance (magnitude) against the monthly budget run-rate.
+        #   monthly_budget = budget / months-in-timeframe
+        #   floor          = monthly_budget − |monthly_budget| × (tol%/100)
+        # Breach fires when the projected monthly trend falls below `floor`. This holds for
+        # BOTH positive-stored KPIs (revenue below budget) and negative-stored costs (more
+        # negative = over budget) — the sign is already encoded, so inverse_logic is not applied
+        # (same reasoning as the plan-variance block above).
+        _has_threshold_breach = any(s.alert_type == "threshold_breach" for s in detected_situations)
+        if (
+            not _has_threshold_breach and _monthly and isinstance(_pb_cfg, dict)
+            and _budget_val is not None and abs(_budget_val) > 0
+            and _pb_cfg.get('red') is not None
+        ):
+            try:
+                # Additive/flow KPIs ($ revenue, cost, income) accumulate across the
+                # timeframe → convert the aggregate budget to a monthly run-rate.
+                # Rate/ratio KPIs (%, e.g. margin, ROCE) do NOT accumulate → the budget
+                # value is already the monthly-comparable level; do not divide.
+                _unit = getattr(kpi_definition, 'unit', '') or ''
+                _is_ratio = ('%' in _unit) or ('ratio' in _unit.lower())
+                if _is_ratio:
+                    _monthly_budget = _budget_val
+                else:
+                    _n_months = self._timeframe_month_count(request.timeframe)
+                    _monthly_budget = _budget_val / max(1, _n_months)
+                _pb_tol = abs(float(_pb_cfg['red'])) / 100.0
+                _pb_floor = _monthly_budget - abs(_monthly_budget) * _pb_tol
+                proj = self._project_trend(_monthly, {'red': _pb_floor}, inverse_logic=False)
+                if proj:
+                    pb_sit = Situation(
+                        situation_id=f"proj_{getattr(kpi_definition, 'id', None) or kpi_name}_{proj['periods_until_breach']}",
+                        kpi_name=kpi_name,
+                        kpi_id=getattr(kpi_definition, 'id', None),
+                        kpi_value=kpi_value,
+                        severity=SituationSeverity.HIGH,
+                        card_type="problem",
+                        direction='down',
+                        alert_type="projected_breach",
+                        plan_value=_budget_val,
+                        projected_breach_at_period=proj['projected_breach_at_period'],
+                        projection_confidence=proj['projection_confidence'],
+                        periods_until_breach=proj['periods_until_breach'],
+                        description=f"{kpi_name} on trajectory to breach the {_plan_version} baseline in {proj['periods_until_breach']} period(s)",
+                        business_impact=(
+                            f"At current run-rate ({proj['slope']:+.2f}/period), "
+                            f"{kpi_name} is projected to fall more than {abs(float(_pb_cfg['red'])):.0f}% "
+                            f"below the {_plan_version} baseline within {proj['periods_until_breach']} period(s). "
+                            f"Trend confidence: {proj['projection_confidence']:.0%}."
+                        ),
+                        hitl_required=proj['periods_until_breach'] <= 2,
+                    )
+                    detected_situations.append(pb_sit)
+            except Exception as _proj_err:
+                self.logger.warning(f"Projection detection failed for {kpi_name}: {_proj_err}")
+
+        # Pattern 3: acceleration — gated on presence of an 'acceleration' threshold row.
+        # yellow = fire floor (× rolling velocity std to trigger); red = HIGH-severity cutoff.
+        if _monthly and isinstance(_accel_cfg, dict):
+            try:
+                _fire_mult = float(_accel_cfg.get('yellow') if _accel_cfg.get('yellow') is not None else 2.0)
+                _high_mult = float(_accel_cfg.get('red') if _accel_cfg.get('red') is not None else 3.0)
+                accel_signal = self._compute_acceleration(_monthly, fire_multiplier=_fire_mult)
+                if accel_signal is not None and accel_signal > 0:
+                    accel_sit = Situation(
+                        situation_id=f"accel_{getattr(kpi_definition, 'id', None) or kpi_name}_{int(accel_signal*10)}",
+                        kpi_name=kpi_name,
+                        kpi_id=getattr(kpi_definition, 'id', None),
+                        kpi_value=kpi_value,
+                        severity=SituationSeverity.HIGH if accel_signal >= _high_mult else SituationSeverity.MEDIUM,
+                        card_type="problem",
+                        direction='down',
+                        alert_type="acceleration",
+                        acceleration_signal=accel_signal,
+                        description=f"{kpi_name} deterioration is accelerating ({accel_signal:.1f}× baseline volatility)",
+                        business_impact=(
+                            f"The rate of change in {kpi_name} is itself increasing — "
+                            f"the period-over-period decline is accelerating at {accel_signal:.1f}× the historical pace."
+                        ),
+                        hitl_required=False,
+                    )
+                    detected_situations.append(accel_sit)
+            except Exception as _acc_err:
+                self.logger.warning(f"Acceleration detection failed for {kpi_name}: {_acc_err}")
+        # LLM observations and trend notes are added by detect_situations once the
+        # whole scan is in (_enrich_situations), not here on the per-KPI path.
+
+        # Detect positive opportunity signals
+        detected_opportunities: List[OpportunitySignal] = []
+        try:
+            detected_opportunities = self._detect_opportunities(
+                kpi_definition,
+                kpi_value,
+            )
+            if detected_opportunities:
+                self.logger.info(
+                    f"Detected {len(detected_opportunities)} opportunity signal(s) for {kpi_name}"
+                )
+        except Exception as opp_err:
+            self.logger.warning(
+                f"Error detecting opportunities for KPI {kpi_name}: {opp_err}"
+            )
+
+        return kpi_value, detected_situations, detected_opportunities
+
     async def process_nl_query(
         self,
         request: NLQueryRequest = None, **kwargs
@@ -2466,12 +2650,18 @@ class A9_Situation_Awareness_Agent:
         except Exception:
             return None
 
-    async def _fetch_plan_value(self, kpi_def, timeframe, filters, principal_context):
-        """Execute plan SQL and return the scalar plan value, or None on any error."""
+    async def _fetch_plan_value(self, kpi_def, timeframe, filters, principal_context, bundled_plan=None):
+        """Execute plan SQL and return the scalar plan value, or None on any error.
+
+        `bundled_plan` is the plan value already read with the KPI (KPIValue.plan_value
+        from a bundled read); when given, no query runs.
+        """
         plan_version = getattr(kpi_def, 'plan_version_value', None)
         original_sql = getattr(kpi_def, 'calculation', None) or ''
         if not plan_version or not original_sql:
             return None
+        if bundled_plan is not None:
+            return bundled_plan
         plan_sql = self._derive_plan_sql(original_sql, plan_version)
         if not plan_sql:
             return None
@@ -2596,6 +2786,68 @@ class A9_Situation_Awareness_Agent:
 
     # ─── End Phase 11I-A helpers ─────────────────────────────────────────────
 
+    async def _fetch_kpi_bundle(
+        self,
+        kpi_definition: KPIDefinition,
+        raw_sql: str,
+        dialect: str,
+        date_col: str,
+        timeframe: TimeFrame,
+        comparison_type: Optional[ComparisonType],
+        time_spec: Optional[dict],
+        principal_context: Optional[PrincipalContext],
+        data_product_id: Optional[str],
+    ) -> Optional[Dict[str, Any]]:
+        """Read current, comparison, monthly series and plan for a native-SQL KPI in one query.
+
+        Uses the same period windows and version filter as the separate queries
+        (_bq_apply_period, _derive_plan_sql). When the plan was read, the bundle
+        carries it as "plan_value" for KPIValue.plan_value. Returns the parsed
+        bundle, or None when the KPI can't be bundled or the query fails — the
+        caller then falls back to the per-query path.
+        """
+        dpa = self.data_product_agent
+        kpi_name = kpi_definition.name
+        try:
+            current_window = self._bq_get_period_dates(timeframe)
+            comparison_window = (
+                self._bq_get_period_dates(timeframe, is_comparison=True, comparison_type=comparison_type)
+                if comparison_type else None
+            )
+            plan_version = getattr(kpi_definition, 'plan_version_value', None)
+            plan_sql = self._derive_plan_sql(raw_sql, plan_version) if plan_version else None
+            monthly_spec = (
+                time_spec if (time_spec or {}).get("type") == "fiscal_year_period" else {"type": "date"}
+            )
+            gen = await dpa.generate_kpi_bundle_sql(
+                raw_sql, dialect, date_col, current_window,
+                comparison_window=comparison_window, plan_sql=plan_sql, monthly_spec=monthly_spec,
+            )
+            if not (isinstance(gen, dict) and gen.get('success') and isinstance(gen.get('sql'), str)):
+                return None
+            bundle_sql = gen['sql']
+            resp = await dpa.execute_sql(
+                bundle_sql, parameters=None, principal_context=principal_context, data_product_id=data_product_id
+            )
+            bundle = dpa.parse_kpi_bundle_result(resp, num_months=9)
+            if not isinstance(bundle, dict):
+                self.logger.info(f"[Bundle] {kpi_name}: bundle query unusable — falling back to per-query reads")
+                return None
+        except Exception as e:
+            self.logger.warning(f"[Bundle] {kpi_name}: {e} — falling back to per-query reads")
+            return None
+
+        try:
+            self._last_sql_cache.setdefault(kpi_name, {})['bundle_sql'] = bundle_sql
+        except Exception:
+            pass
+        if plan_sql and "plan" in (gen.get('buckets') or []):
+            # No Budget rows reads as 0.0, exactly as the separate plan query does
+            bundle["plan_value"] = bundle["plan"] if bundle["plan"] is not None else 0.0
+        self.logger.info(f"[Bundle] {kpi_name}: read {', '.join(gen.get('buckets') or [])} in one query")
+        return bundle
+
+
     async def _get_kpi_value(
         self,
         kpi_definition: KPIDefinition,
@@ -2723,45 +2975,67 @@ class A9_Situation_Awareness_Agent:
             except Exception:
                 pass
 
+            _is_native_sql = _is_bq_kpi or _is_ss_kpi or _is_sf_kpi
+            _time_spec: Optional[dict] = None
+            if _is_ss_kpi or _is_sf_kpi:
+                _time_spec = await self._resolve_time_spec_sa(_gen_dp_id)
+
+            # Native-SQL KPIs: read current, comparison, monthly series and plan in
+            # one scan. Any failure falls back to the separate queries below.
+            bundle = None
+            if _is_native_sql and getattr(self, '_kpi_bundle_sql', False):
+                bundle = await self._fetch_kpi_bundle(
+                    kpi_definition, _raw_kpi_sql,
+                    'bigquery' if _is_bq_kpi else 'sqlserver' if _is_ss_kpi else 'snowflake',
+                    _bq_date_col, timeframe, comparison_type, _time_spec,
+                    principal_context, _gen_dp_id,
+                )
+
             # 2) Execute Base SQL via DPA to obtain current KPI value
             current_value = None
-            try:
-                exec_resp = await self.data_product_agent.execute_sql(base_sql, parameters=None, principal_context=principal_context, data_product_id=_gen_dp_id)
-                rows = exec_resp.get('rows') or exec_resp.get('data') or []
-                if rows:
-                    first = rows[0]
-                    if isinstance(first, (list, tuple)) and len(first) > 0:
-                        v = first[0]
-                        current_value = float(v) if v is not None else None
-                    elif isinstance(first, dict):
-                        # Prefer common alias if present
-                        if 'total_value' in first:
-                            v = first['total_value']
-                            current_value = float(v) if v is not None else None
-                        elif len(first.values()) > 0:
-                            v = list(first.values())[0]
-                            current_value = float(v) if v is not None else None
-                if current_value is None:
-                    current_value = 0.0
-                # sql_hash identifies WHICH query produced this, so two readings of the
-                # same KPI name are separable in the log without dumping full SQL.
+            if bundle is not None:
+                current_value = bundle['current'] if bundle['current'] is not None else 0.0
                 _pv = getattr(kpi_definition, "plan_version_value", None)
-                _ver = str(_pv) if (_pv and f"'{_pv}'" in (base_sql or "")) else "Actual"
-                import hashlib as _hl
-                _sh = _hl.sha256((base_sql or "").encode("utf-8")).hexdigest()[:12] if base_sql else "-"
-                self.logger.info(
-                    f"Extracted KPI value for {kpi_name}: {current_value} [{_ver} | sql:{_sh}]"
-                )
-            except Exception as e:
-                self.logger.error(f"Error executing base SQL for {kpi_name}: {e}")
-                return None
+                _ver = str(_pv) if (_pv and f"'{_pv}'" in _raw_kpi_sql) else "Actual"
+                self.logger.info(f"Extracted KPI value for {kpi_name}: {current_value} [{_ver} | bundle]")
+            else:
+                try:
+                    exec_resp = await self.data_product_agent.execute_sql(base_sql, parameters=None, principal_context=principal_context, data_product_id=_gen_dp_id)
+                    rows = exec_resp.get('rows') or exec_resp.get('data') or []
+                    if rows:
+                        first = rows[0]
+                        if isinstance(first, (list, tuple)) and len(first) > 0:
+                            v = first[0]
+                            current_value = float(v) if v is not None else None
+                        elif isinstance(first, dict):
+                            # Prefer common alias if present
+                            if 'total_value' in first:
+                                v = first['total_value']
+                                current_value = float(v) if v is not None else None
+                            elif len(first.values()) > 0:
+                                v = list(first.values())[0]
+                                current_value = float(v) if v is not None else None
+                    if current_value is None:
+                        current_value = 0.0
+                    # sql_hash identifies WHICH query produced this, so two readings of the
+                    # same KPI name are separable in the log without dumping full SQL.
+                    _pv = getattr(kpi_definition, "plan_version_value", None)
+                    _ver = str(_pv) if (_pv and f"'{_pv}'" in (base_sql or "")) else "Actual"
+                    import hashlib as _hl
+                    _sh = _hl.sha256((base_sql or "").encode("utf-8")).hexdigest()[:12] if base_sql else "-"
+                    self.logger.info(
+                        f"Extracted KPI value for {kpi_name}: {current_value} [{_ver} | sql:{_sh}]"
+                    )
+                except Exception as e:
+                    self.logger.error(f"Error executing base SQL for {kpi_name}: {e}")
+                    return None
             # ── Build monthly series SQL (sync, no I/O) ──
             # BQ/SF: use _raw_kpi_sql; SS: T-SQL fiscal period builder; DPA-path: use base_sql
-            monthly_source = _raw_kpi_sql if (_is_bq_kpi or _is_sf_kpi or _is_ss_kpi) else base_sql
+            monthly_source = _raw_kpi_sql if _is_native_sql else base_sql
             monthly_sql = ""
-            if monthly_source:
+            if monthly_source and bundle is None:
                 if _is_ss_kpi or _is_sf_kpi:
-                    _ts = await self._resolve_time_spec_sa(_gen_dp_id)
+                    _ts = _time_spec or {}
                     if _ts.get("type") == "fiscal_year_period":
                         _yr = _ts.get("year_column", "fiscal_year")
                         _pr = _ts.get("period_column", "fiscal_period")
@@ -2891,11 +3165,16 @@ class A9_Situation_Awareness_Agent:
                     self.logger.warning(f"Comparison query failed for {kpi_name}: {_ce}")
                     return None
 
-            # SQL Server ODBC cannot handle concurrent queries on the same connection;
-            # run monthly + comparison sequentially to avoid "Connection is busy" errors.
-            if _is_ss_kpi:
-                monthly_values = await _fetch_monthly()
-                exec_comp_result = await _fetch_comparison()
+            # Every source runs these concurrently — SqlServerManager lends each
+            # query its own pooled connection, so there is no "Connection is busy".
+            if bundle is not None:
+                monthly_values, exec_comp_result = bundle['monthly'] or None, None
+                if bundle['monthly_dropped']:
+                    self.logger.warning(
+                        "[Monthly] %s: %d monthly rows were unparseable and dropped — "
+                        "trend/acceleration signals are computed on the remainder",
+                        kpi_name, bundle['monthly_dropped'],
+                    )
             else:
                 monthly_values, exec_comp_result = await _asyncio.gather(
                     _fetch_monthly(),
@@ -2917,6 +3196,7 @@ class A9_Situation_Awareness_Agent:
                     dimensions=merged_filters,
                     percent_change=None,
                     monthly_values=monthly_values,
+                    plan_value=bundle.get("plan_value") if bundle is not None else None,
                     context=self._build_measurement_context(
                         timeframe=timeframe, comparison_type=None,
                         merged_filters=merged_filters, source_system=_source_system,
@@ -2946,6 +3226,8 @@ class A9_Situation_Awareness_Agent:
             except Exception as comp_error:
                 self.logger.warning(f"Error generating/executing comparison SQL for {kpi_name}: {str(comp_error)}")
                 # Continue without comparison value
+            if bundle is not None and comp_sql:
+                comparison_value = bundle['comparison']
             
             # Calculate percent change if we have both values
             percent_change = None
@@ -2998,6 +3280,7 @@ class A9_Situation_Awareness_Agent:
                 percent_change=percent_change,
                 monthly_values=monthly_values,
                 inverse_logic=_inverse_logic,
+                plan_value=bundle.get("plan_value") if bundle is not None else None,
                 context=self._build_measurement_context(
                     timeframe=timeframe, comparison_type=comparison_type,
                     merged_filters=merged_filters, source_system=_source_system,
@@ -3861,6 +4144,93 @@ class A9_Situation_Awareness_Agent:
     
     # SQL generation methods have been moved to the Data Product Agent
         
+    def _observation_facts(
+        self,
+        kpi_definition: "KPIDefinition",
+        kpi_value: "KPIValue",
+        situation: "Situation",
+    ) -> List[str]:
+        """KPI / value / change / severity / trend lines the observation prompts are built from."""
+        # Build streak description from monthly_values if present
+        streak_description = ""
+        if kpi_value.monthly_values:
+            n = len(kpi_value.monthly_values)
+            # Determine the direction of the most-recent movement
+            if n >= 2:
+                vals = [
+                    m["value"] if isinstance(m, dict) else float(m)
+                    for m in kpi_value.monthly_values
+                ]
+                moves = [vals[i] - vals[i - 1] for i in range(1, n)]
+                # Count consecutive periods at the end moving in the same direction as the last move
+                last_direction = 1 if moves[-1] >= 0 else -1
+                streak = 1
+                for move in reversed(moves[:-1]):
+                    if (1 if move >= 0 else -1) == last_direction:
+                        streak += 1
+                    else:
+                        break
+                direction_word = "up" if last_direction > 0 else "down"
+                streak_description = f"{streak} of last {n} periods trending {direction_word}"
+            else:
+                streak_description = f"{n} period(s) of data available"
+
+        facts = [
+            f"KPI: {kpi_definition.name}",
+            f"Current value: {kpi_value.value} (vs {kpi_value.comparison_value}, {kpi_value.comparison_type})",
+            f"Change: {kpi_value.percent_change:+.1f}%" if kpi_value.percent_change is not None else "Change: N/A",
+            f"Severity: {situation.severity.value if hasattr(situation.severity, 'value') else situation.severity}",
+        ]
+        if streak_description:
+            facts.append(f"Trend (last {len(kpi_value.monthly_values)} periods): {streak_description}")
+        return facts
+
+    def _trend_tension(
+        self,
+        kpi_definition: "KPIDefinition",
+        kpi_value: "KPIValue",
+    ) -> Optional[Dict[str, str]]:
+        """
+        kpi_type / comparison / tension for a trend note, or None when the last three
+        monthly values don't contradict the headline direction (or there are too few).
+        """
+        if not kpi_value.monthly_values or len(kpi_value.monthly_values) < 3:
+            return None
+
+        vals = [
+            m["value"] if isinstance(m, dict) else float(m)
+            for m in kpi_value.monthly_values
+        ]
+        recent = vals[-3:]
+        first, last = recent[0], recent[-1]
+        if first == 0:
+            return None
+        recent_pct = ((last - first) / abs(first)) * 100
+        if abs(recent_pct) < 2:
+            return None
+
+        inverse_logic = getattr(kpi_definition, "inverse_logic", False) or (kpi_value.inverse_logic or False)
+        pct_change = kpi_value.percent_change or 0
+        # headline_good: the YoY comparison is favourable
+        headline_good = (pct_change <= 0) if inverse_logic else (pct_change >= 0)
+        # recent_trend_good: the last 3 periods are moving in the favourable direction
+        recent_up = recent_pct > 0
+        recent_trend_good = (not recent_up) if inverse_logic else recent_up
+
+        # Only generate a note when the directions contradict
+        if headline_good == recent_trend_good:
+            return None
+
+        direction_word = "rising" if recent_up else "falling"
+        return {
+            "kpi_type": "cost" if inverse_logic else "revenue/performance",
+            "comparison": kpi_value.comparison_type or "year-over-year",
+            "tension": (
+                f"Headline is {'favourable' if headline_good else 'unfavourable'} ({pct_change:+.1f}% YoY) "
+                f"but monthly values have been {direction_word} over the last 3 periods ({recent_pct:+.1f}%)"
+            ),
+        }
+
     async def _generate_key_observations(
         self,
         kpi_definition: "KPIDefinition",
@@ -3877,49 +4247,13 @@ class A9_Situation_Awareness_Agent:
         try:
             from src.agents.new.a9_llm_service_agent import A9_LLM_Request
 
-            # Build streak description from monthly_values if present
-            streak_description = ""
-            if kpi_value.monthly_values:
-                n = len(kpi_value.monthly_values)
-                positive_trend_is_good = getattr(kpi_definition, "positive_trend_is_good", True)
-                # Determine the direction of the most-recent movement
-                if n >= 2:
-                    vals = [
-                        m["value"] if isinstance(m, dict) else float(m)
-                        for m in kpi_value.monthly_values
-                    ]
-                    moves = [vals[i] - vals[i - 1] for i in range(1, n)]
-                    # Count consecutive periods at the end moving in the same direction as the last move
-                    last_direction = 1 if moves[-1] >= 0 else -1
-                    streak = 1
-                    for move in reversed(moves[:-1]):
-                        if (1 if move >= 0 else -1) == last_direction:
-                            streak += 1
-                        else:
-                            break
-                    direction_word = "up" if last_direction > 0 else "down"
-                    streak_description = f"{streak} of last {n} periods trending {direction_word}"
-                else:
-                    streak_description = f"{n} period(s) of data available"
-
-            trend_line = (
-                f"Trend (last {len(kpi_value.monthly_values)} periods): {streak_description}"
-                if streak_description
-                else ""
-            )
-
             prompt_lines = [
                 "You are a financial analyst assistant. Given these facts about a KPI, write exactly 2-3 short observations (each under 15 words, plain language, no markdown bullets). Return as a JSON array of strings.",
                 "",
-                f"KPI: {kpi_definition.name}",
-                f"Current value: {kpi_value.value} (vs {kpi_value.comparison_value}, {kpi_value.comparison_type})",
-                f"Change: {kpi_value.percent_change:+.1f}%" if kpi_value.percent_change is not None else "Change: N/A",
-                f"Severity: {situation.severity.value if hasattr(situation.severity, 'value') else situation.severity}",
+                *self._observation_facts(kpi_definition, kpi_value, situation),
+                "",
+                'Return ONLY a JSON array, e.g. ["observation 1", "observation 2", "observation 3"]',
             ]
-            if trend_line:
-                prompt_lines.append(trend_line)
-            prompt_lines.append("")
-            prompt_lines.append('Return ONLY a JSON array, e.g. ["observation 1", "observation 2", "observation 3"]')
 
             prompt = "\n".join(prompt_lines)
 
@@ -3931,6 +4265,8 @@ class A9_Situation_Awareness_Agent:
                 temperature=0.2,
                 # Haiku via routing table — overridable via CLAUDE_MODEL_NLP
                 model=get_claude_model_for_task(ClaudeTaskType.NLP_PARSING),
+                # Assessment-time enrichment queues behind interactive calls
+                priority="batch",
             )
 
             response = await self.llm_service_agent.generate(request)
@@ -3960,50 +4296,20 @@ class A9_Situation_Awareness_Agent:
         if self.llm_service_agent is None:
             return None
         try:
-            if not kpi_value.monthly_values or len(kpi_value.monthly_values) < 3:
-                return None
-
-            vals = [
-                m["value"] if isinstance(m, dict) else float(m)
-                for m in kpi_value.monthly_values
-            ]
-            recent = vals[-3:]
-            first, last = recent[0], recent[-1]
-            if first == 0:
-                return None
-            recent_pct = ((last - first) / abs(first)) * 100
-            if abs(recent_pct) < 2:
-                return None
-
-            inverse_logic = getattr(kpi_definition, "inverse_logic", False) or (kpi_value.inverse_logic or False)
-            pct_change = kpi_value.percent_change or 0
-            # headline_good: the YoY comparison is favourable
-            headline_good = (pct_change <= 0) if inverse_logic else (pct_change >= 0)
-            # recent_trend_good: the last 3 periods are moving in the favourable direction
-            recent_up = recent_pct > 0
-            recent_trend_good = (not recent_up) if inverse_logic else recent_up
-
-            # Only generate a note when the directions contradict
-            if headline_good == recent_trend_good:
+            tension = self._trend_tension(kpi_definition, kpi_value)
+            if tension is None:
                 return None
 
             from src.agents.new.a9_llm_service_agent import A9_LLM_Request
 
-            direction_word = "rising" if recent_up else "falling"
-            kpi_type = "cost" if inverse_logic else "revenue/performance"
-            tension = (
-                f"Headline is {'favourable' if headline_good else 'unfavourable'} ({pct_change:+.1f}% YoY) "
-                f"but monthly values have been {direction_word} over the last 3 periods ({recent_pct:+.1f}%)"
-            )
-
             prompt = "\n".join([
                 "You are a financial analyst briefing a CFO. A KPI has a tension between its headline performance and its recent monthly trajectory.",
                 "Write ONE sentence (max 18 words) in plain business language that names this tension. No markdown, no quotes, no bullet points.",
                 "",
                 f"KPI: {kpi_definition.name}",
-                f"KPI type: {kpi_type}",
-                f"Comparison: {kpi_value.comparison_type or 'year-over-year'}",
-                f"Tension: {tension}",
+                f"KPI type: {tension['kpi_type']}",
+                f"Comparison: {tension['comparison']}",
+                f"Tension: {tension['tension']}",
                 "",
                 "Return only the sentence.",
             ])
@@ -4016,6 +4322,8 @@ class A9_Situation_Awareness_Agent:
                 temperature=0.2,
                 # Haiku via routing table — overridable via CLAUDE_MODEL_NLP
                 model=get_claude_model_for_task(ClaudeTaskType.NLP_PARSING),
+                # Assessment-time enrichment queues behind interactive calls
+                priority="batch",
             )
 
             response = await self.llm_service_agent.generate(request)
@@ -4026,6 +4334,139 @@ class A9_Situation_Awareness_Agent:
             self.logger.warning(f"_generate_trend_note failed for {kpi_definition.name}: {exc}")
             return None
 
+    async def _enrich_situation(
+        self,
+        kpi_definition: "KPIDefinition",
+        kpi_value: "KPIValue",
+        situation: "Situation",
+        observations: bool = True,
+        trend_note: bool = True,
+    ) -> None:
+        """Per-situation enrichment: one observation call and one trend-note call."""
+        try:
+            if observations:
+                situation.key_observations = await self._generate_key_observations(kpi_definition, kpi_value, situation)
+            if trend_note:
+                situation.trend_note = await self._generate_trend_note(kpi_definition, kpi_value, situation)
+        except Exception as exc:
+            self.logger.warning(f"Enrichment failed for {kpi_definition.name}/{situation.alert_type}: {exc}")
+
+    async def _enrich_situations(
+        self,
+        items: List[Tuple["KPIDefinition", "KPIValue", "Situation"]],
+    ) -> None:
+        """
+        Set key_observations and trend_note on every detected situation.
+
+        Runs once after detection instead of two LLM calls per situation inside the
+        scan: situations are chunked by enrichment_batch_size, each chunk is one
+        structured call returning observations (and a trend note where _trend_tension
+        found one) keyed by situation, and chunks run concurrently. Whatever a batch
+        call leaves missing or malformed is filled in by the per-situation methods, so
+        a bad batch response costs calls, never enrichment. Never raises.
+        """
+        if not items:
+            return
+        if self.llm_service_agent is None:
+            for _kpi_definition, _kpi_value, sit in items:
+                sit.key_observations = []
+                sit.trend_note = None
+            return
+        size = self._enrichment_batch_size
+        if size <= 1:
+            await asyncio.gather(*(self._enrich_situation(*item) for item in items))
+            return
+        chunks = [items[i:i + size] for i in range(0, len(items), size)]
+        await asyncio.gather(*(self._enrich_situation_batch(chunk) for chunk in chunks))
+
+    async def _enrich_situation_batch(
+        self,
+        items: List[Tuple["KPIDefinition", "KPIValue", "Situation"]],
+    ) -> None:
+        """One structured LLM call for a chunk of _enrich_situations; see there."""
+        keys: List[str] = []
+        tensions: List[Optional[Dict[str, str]]] = []
+        blocks: List[str] = []
+        for idx, (kpi_definition, kpi_value, sit) in enumerate(items):
+            key = str(sit.situation_id or idx)
+            if key in keys:
+                key = f"{key}#{idx}"
+            keys.append(key)
+            tension = self._trend_tension(kpi_definition, kpi_value)
+            tensions.append(tension)
+            block = [f"[{key}]", *self._observation_facts(kpi_definition, kpi_value, sit)]
+            if tension:
+                block += [
+                    f"KPI type: {tension['kpi_type']}",
+                    f"Comparison: {tension['comparison']}",
+                    f"Tension: {tension['tension']}",
+                ]
+            blocks.append("\n".join(block))
+
+        parsed: Dict[str, Any] = {}
+        try:
+            from src.agents.new.a9_llm_service_agent import A9_LLM_Request
+
+            prompt = "\n".join([
+                "You are a financial analyst assistant briefing a CFO. For EACH KPI situation below:",
+                "- write exactly 2-3 short observations (each under 15 words, plain language, no markdown bullets);",
+                "- if the situation lists a Tension, also write ONE trend_note sentence (max 18 words, plain business "
+                "language) that names the tension between headline performance and recent monthly trajectory; "
+                "otherwise trend_note is null.",
+                "",
+                "\n\n".join(blocks),
+                "",
+                'Return ONLY JSON: {"situations": [{"situation_id": "<id in brackets>", '
+                '"observations": ["..."], "trend_note": "..." or null}]}',
+            ])
+            request = A9_LLM_Request(
+                request_id=str(uuid.uuid4()),
+                principal_id="system",
+                prompt=prompt,
+                operation="generate",
+                temperature=0.2,
+                # Haiku via routing table — overridable via CLAUDE_MODEL_NLP
+                model=get_claude_model_for_task(ClaudeTaskType.NLP_PARSING),
+                response_schema=_SITUATION_ENRICHMENT_SCHEMA,
+                tool_name="emit_situation_enrichment",
+                priority="batch",
+            )
+            response = await self.llm_service_agent.generate(request)
+            content = response.content if hasattr(response, "content") else str(response)
+            object_match = re.search(r'\{[\s\S]*\}', content or "")
+            if object_match:
+                doc = json.loads(object_match.group())
+                for entry in (doc.get("situations") or []) if isinstance(doc, dict) else []:
+                    if isinstance(entry, dict) and entry.get("situation_id") is not None:
+                        parsed[str(entry["situation_id"]).strip("[]")] = entry
+        except Exception as exc:
+            self.logger.warning(f"Batched enrichment failed for {len(items)} situations: {exc}")
+
+        fallbacks = []
+        for (kpi_definition, kpi_value, sit), key, tension in zip(items, keys, tensions):
+            entry = parsed.get(key) or {}
+            observations = entry.get("observations")
+            if isinstance(observations, list) and observations:
+                sit.key_observations = [str(o) for o in observations[:3]]
+                need_observations = False
+            else:
+                need_observations = True
+            note = entry.get("trend_note")
+            if tension is None:
+                sit.trend_note = None
+                need_note = False
+            elif isinstance(note, str) and note.strip().strip('"').strip("'"):
+                sit.trend_note = note.strip().strip('"').strip("'")
+                need_note = False
+            else:
+                need_note = True
+            if need_observations or need_note:
+                fallbacks.append(self._enrich_situation(
+                    kpi_definition, kpi_value, sit, observations=need_observations, trend_note=need_note,
+                ))
+        if fallbacks:
+            await asyncio.gather(*fallbacks)
+
     async def _detect_situations_from_kpi_values(
         self,
         kpi_values: List[KPIValue],
@@ -4048,6 +4489,7 @@ class A9_Situation_Awareness_Agent:
         
         # Store all detected situations
         all_situations = []
+        to_enrich: List[Tuple[KPIDefinition, KPIValue, Situation]] = []
         
         # Process each KPI value
         for kpi_value in kpi_values:
@@ -4066,14 +4508,13 @@ class A9_Situation_Awareness_Agent:
             )
             
             self.logger.info(f"Detected {len(kpi_situations)} situations for KPI {kpi_value.kpi_name}")
-
-            # Enrich each situation with lightweight Haiku observations and trend note
-            for sit in kpi_situations:
-                sit.key_observations = await self._generate_key_observations(kpi_definition, kpi_value, sit)
-                sit.trend_note = await self._generate_trend_note(kpi_definition, kpi_value, sit)
+            to_enrich.extend((kpi_definition, kpi_value, sit) for sit in kpi_situations)
 
             # Add to all situations
             all_situations.extend(kpi_situations)
+
+        # Enrich every situation with lightweight Haiku observations and trend note
+        await self._enrich_situations(to_enrich)
         
         # Sort situations by severity (critical first)
         all_situations.sort(key=lambda s: list(SituationSeverity).index(s.severity) if s.severity in SituationSeverity else 99)
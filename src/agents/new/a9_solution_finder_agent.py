@@ -525,14 +525,20 @@ def _token_usage_event(ledger: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         return []
     _in = sum(r.get("input_tokens") or 0 for r in ledger)
     _out = sum(r.get("output_tokens") or 0 for r in ledger)
-    return [{
+    event = {
         "event": "token_usage",
         "calls": len(ledger),
         "input_tokens": _in,
         "output_tokens": _out,
         "total_tokens": _in + _out,
         "by_call": ledger,
-    }]
+    }
+    # Prompt-cache totals only when some call reported them, so a run without
+    # caching keeps the same event shape.
+    if any("cache_read_input_tokens" in r for r in ledger):
+        event["cache_read_input_tokens"] = sum(r.get("cache_read_input_tokens") or 0 for r in ledger)
+        event["cache_creation_input_tokens"] = sum(r.get("cache_creation_input_tokens") or 0 for r in ledger)
+    return [event]
 
 
 def _parse_impact_estimate(raw: Any) -> Optional[ImpactEstimate]:
@@ -1021,6 +1027,11 @@ class A9_Solution_Finder_Agent(SolutionFinderProtocol):
                     }
                     if budget:
                         _row["max_tokens"] = budget
+                    # Prompt-cache reads/writes (anthropic) — input_tokens above
+                    # excludes them, so they are the rest of the prompt's cost.
+                    if u.get("cache_read_input_tokens") or u.get("cache_creation_input_tokens"):
+                        _row["cache_read_input_tokens"] = u.get("cache_read_input_tokens") or 0
+                        _row["cache_creation_input_tokens"] = u.get("cache_creation_input_tokens") or 0
                     _token_ledger.append(_row)
                 except Exception:
                     pass
@@ -2082,6 +2093,8 @@ class A9_Solution_Finder_Agent(SolutionFinderProtocol):
                         if refinement_result and refinement_result.get("refined_problem_statement"):
                             ps_s1 = f"{ps}\nRefined focus: {refinement_result['refined_problem_statement']}"
 
+                        _prompt_caching = bool(getattr(self.config, "enable_prompt_caching", True))
+
                         async def _run_stage1(p: ConsultingPersona) -> Optional[Dict]:
                             try:
                                 persona_profile = p.to_prompt_context() if hasattr(p, "to_prompt_context") else f"{p.name}"
@@ -2208,9 +2221,11 @@ class A9_Solution_Finder_Agent(SolutionFinderProtocol):
                                         "recovery_range low/high = actual numeric estimates (NEVER 0.0). cost_signal and risk_signal must reflect your mechanism's complexity. "
                                         "Respect any do_not_propose items and constraints from PRINCIPAL CONSTRAINTS — do not propose excluded options.\n\n"
                                     )
-                                s1_prompt = (
-                                    f"## ROLE\nYou are a {p.name} consultant.\n\n"
-                                    f"## PERSONA\n{persona_profile}\n\n"
+                                # Everything every persona sees identically comes FIRST and
+                                # is marked as a prompt-cache prefix; role, persona, task and
+                                # schema follow. With ROLE/PERSONA leading (the old layout)
+                                # no two personas shared a single cacheable token.
+                                s1_shared = (
                                     f"## PROBLEM\n{ps_s1}\n\n"
                                     "## KEY ANALYSIS SIGNALS\n"
                                     f"{_json_s1.dumps(da_compact_s1, indent=2)}\n\n"
@@ -2221,6 +2236,11 @@ class A9_Solution_Finder_Agent(SolutionFinderProtocol):
                                     f"{decision_maker_section}"
                                     f"{causal_context_section_s1}"
                                     f"{principal_constraints_section}"
+                                )
+                                s1_prompt = (
+                                    f"{s1_shared}"
+                                    f"## ROLE\nYou are a {p.name} consultant.\n\n"
+                                    f"## PERSONA\n{persona_profile}\n\n"
                                     "## YOUR TASK\n"
                                     f"{_s1_task}"
                                     f"## OUTPUT (JSON only, no markdown):\n{s1_schema}"
@@ -2236,6 +2256,9 @@ class A9_Solution_Finder_Agent(SolutionFinderProtocol):
                                     # temperature=0 ensures identical inputs always produce the same
                                     # hypothesis — prevents mode drift across repeated runs on the same DA data
                                     temperature=0.0,
+                                    cache_breakpoints=[len(s1_shared)] if _prompt_caching else None,
+                                    # A principal is waiting on the debate (HITL) — admit ahead of batch work
+                                    priority="interactive",
                                 )
                                 if self.orchestrator is not None:
                                     s1_resp = await self.orchestrator.execute_agent_method(
@@ -2267,7 +2290,16 @@ class A9_Solution_Finder_Agent(SolutionFinderProtocol):
                                 self.logger.warning(f"[SF] Stage 1 call failed for {p.id}: {_s1e}")
                             return None
 
-                        s1_raw = await asyncio.gather(*[_run_stage1(p) for p in consulting_personas])
+                        if _prompt_caching and getattr(self.config, "stage1_cache_warmup", False) and len(consulting_personas) > 1:
+                            # The shared prefix is only readable once the call that
+                            # writes it has been answered — warm it with one persona,
+                            # then fan the rest out on the cached prefix.
+                            _s1_first = await _run_stage1(consulting_personas[0])
+                            s1_raw = [_s1_first] + list(
+                                await asyncio.gather(*[_run_stage1(p) for p in consulting_personas[1:]])
+                            )
+                        else:
+                            s1_raw = await asyncio.gather(*[_run_stage1(p) for p in consulting_personas])
                         # Key results by POSITION, not by the LLM echoing its own identity.
                         # gather() preserves input order, so persona attribution is already
                         # known with certainty. The previous loop keyed on _r["persona_id"]
@@ -2387,6 +2419,7 @@ class A9_Solution_Finder_Agent(SolutionFinderProtocol):
                                 # deferred to the offline path, not this interactive one).
                                 model=get_claude_model_for_task(ClaudeTaskType.CRITIC),
                                 max_tokens=2000,
+                                priority="interactive",
                             )
                             if self.orchestrator is not None:
                                 _critic_resp = await self.orchestrator.execute_agent_method(
@@ -2688,6 +2721,13 @@ class A9_Solution_Finder_Agent(SolutionFinderProtocol):
                         # Streaming accepts 64000 (verified); billing is on tokens
                         # GENERATED, so headroom costs nothing until used.
                         max_tokens=_synthesis_budget,
+                        # debate_spec leads the prompt and only changes with the
+                        # council/config, so re-runs read it from the prompt cache.
+                        cache_breakpoints=(
+                            [len(debate_spec) + 2]
+                            if debate_spec and getattr(self.config, "enable_prompt_caching", True) else None
+                        ),
+                        priority="interactive",
                         **_structured_kwargs,
                     )
 
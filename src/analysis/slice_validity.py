@@ -79,6 +79,19 @@ Column identifiers (`measure_column`, each `dim`) are left unquoted across
 all four backends — every dimension name this check has ever been run
 against is snake_case with no spaces, matching the DuckDB double-quoting
 precedent's own stated exception.
+
+BATCHED MODE
+-------------
+`profile()` and `check_completeness()` issue one query per dimension, and a
+caller runs both — 2 x dimensions round trips per KPI, thousands across a
+client's registry. `profile_batched()` answers both checks for every
+dimension from ONE query per KPI: grouped by component, it selects
+`COUNT(*)` plus `COUNT(DISTINCT dim)` and `COUNT(dim)` per dimension. The
+distinct counts are exactly what `profile()` reads; `COUNT(*)` and
+`COUNT(dim)` are additive across the component groups, so summing them
+gives exactly what `check_completeness()` reads. A dimension column missing
+from the view fails the whole statement, so on any failure it falls back to
+the per-dimension functions above, which skip just the bad dimension.
 """
 from __future__ import annotations
 
@@ -86,7 +99,7 @@ import inspect
 import re
 import sys
 from dataclasses import dataclass
-from typing import Any, Callable, Dict, List, Optional, Sequence
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
 
 # Coverage below this fraction of the richest component = the dimension cannot
 # carry the ratio at all. INVALID_BELOW is judgement, not science — set from two
@@ -105,6 +118,10 @@ DEGRADED_BELOW = 1.0
 # the registry happens to use.
 _SQLSERVER_ALIASES = {"sqlserver", "sql_server", "mssql"}
 
+# Backends whose APPROX_COUNT_DISTINCT is always available. SQL Server only has
+# it from 2019 on, so it keeps the exact COUNT(DISTINCT ...).
+_APPROX_DISTINCT_BACKENDS = {"bigquery", "snowflake", "databricks", "duckdb"}
+
 
 @dataclass
 class DimensionVerdict:
@@ -331,3 +348,96 @@ async def check_completeness(
         coverage = (counts["complete_rows"] / counts["total_rows"]) if counts["total_rows"] else 0.0
         out.append(DimensionVerdict(dim, counts, coverage, assess(counts)))
     return out
+
+
+async def profile_batched(
+    run_query: Callable[[str], Any],
+    view: str,
+    measure_column: str,
+    components: Sequence[str],
+    dimensions: Sequence[str],
+    value_column: str = "amount",
+    version_filter: Optional[str] = "Actual",
+    source_system: str = "bigquery",
+    approximate: bool = False,
+) -> Tuple[List[DimensionVerdict], List[DimensionVerdict]]:
+    """Both checks for every dimension in one query.
+
+    Returns `(completeness, cross_component)` verdict lists, the same
+    verdicts `check_completeness()` and `profile()` would return. Cross-
+    component coverage is only computed with 2+ components (nothing to compare
+    otherwise) and is `[]` below that, the same rule the agent applies.
+
+    `approximate=True` uses APPROX_COUNT_DISTINCT on backends that always have
+    it. Off by default: "ok" requires the weakest component to match the
+    richest EXACTLY, and a sketch's error of a percent or two can turn a
+    degraded dimension into "ok". Completeness counts are always exact.
+
+    Falls back to the per-dimension functions when the batched query fails —
+    typically a dimension column this view doesn't have.
+    """
+    cross = len(components) >= 2
+    if not dimensions:
+        return [], []
+
+    where = f"{measure_column} IN ({', '.join(repr(c) for c in components)})"
+    if version_filter:
+        where += f" AND version = {version_filter!r}"
+
+    system = (source_system or "bigquery").strip().lower()
+    distinct = "APPROX_COUNT_DISTINCT({})" if approximate and system in _APPROX_DISTINCT_BACKENDS else "COUNT(DISTINCT {})"
+
+    # Dimensions are aliased by position (n_0, c_0, ...) so the row keys never
+    # depend on a dimension name's length or casing.
+    select = [f"{measure_column} AS component", "COUNT(*) AS total_rows"]
+    for i, dim in enumerate(dimensions):
+        if cross:
+            select.append(f"{distinct.format(dim)} AS n_{i}")
+        select.append(f"COUNT({dim}) AS c_{i}")
+    # GROUP BY the expression, not the alias — see profile().
+    sql = (
+        f"SELECT {', '.join(select)} FROM {_quote_view(view, source_system)} "
+        f"WHERE {where} GROUP BY {measure_column}"
+    )
+
+    try:
+        result = run_query(sql)
+        rows = await result if inspect.isawaitable(result) else result
+        total_rows = 0
+        complete_rows = [0] * len(dimensions)
+        distinct_counts: List[Dict[str, int]] = [{} for _ in dimensions]
+        for r in rows:
+            row = {str(k).lower(): v for k, v in r.items()}
+            total_rows += int(row["total_rows"])
+            for i in range(len(dimensions)):
+                complete_rows[i] += int(row[f"c_{i}"])
+                if cross:
+                    distinct_counts[i][row["component"]] = int(row[f"n_{i}"])
+    except Exception as exc:  # a missing dimension column, or a row-shape surprise
+        print(
+            f"  batched profile failed, checking dimensions one by one — {str(exc).splitlines()[0][:70]}",
+            file=sys.stderr,
+        )
+        completeness = await check_completeness(
+            run_query, view, measure_column, components, dimensions,
+            value_column, version_filter, source_system,
+        )
+        cross_component = await profile(
+            run_query, view, measure_column, components, dimensions, version_filter, source_system,
+        ) if cross else []
+        return completeness, cross_component
+
+    completeness: List[DimensionVerdict] = []
+    cross_component: List[DimensionVerdict] = []
+    for i, dim in enumerate(dimensions):
+        counts = {"total_rows": total_rows, "complete_rows": complete_rows[i]}
+        coverage = (complete_rows[i] / total_rows) if total_rows else 0.0
+        completeness.append(DimensionVerdict(dim, counts, coverage, assess(counts)))
+        if cross:
+            counts = distinct_counts[i]
+            for c in components:            # a component with zero rows still counts
+                counts.setdefault(c, 0)
+            richest = max(counts.values()) if counts else 0
+            coverage = (min(counts.values()) / richest) if richest else 0.0
+            cross_component.append(DimensionVerdict(dim, counts, coverage, assess(counts)))
+    return completeness, cross_component
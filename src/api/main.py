@@ -91,6 +91,11 @@ async def startup_event() -> None:
         logging.getLogger(__name__).exception("Failed to initialize AgentRuntime during startup")
 
 
+@app.on_event("shutdown")
+async def shutdown_event() -> None:
+    await agent_runtime.shutdown()
+
+
 # Feature flags whose state is worth knowing from outside the box. Booleans only —
 # never a value, so this can never leak a credential.
 _REPORTED_FLAGS = (
@@ -2,7 +2,7 @@
 Test fixture injection endpoint — only mounted when APP_ENV=test.
 
 Allows Playwright and integration tests to pre-seed workflow results into the
-in-memory workflow store without running the real agent pipeline. The existing
+workflow store without running the real agent pipeline. The existing
 status endpoints (/workflows/*/status) return these results transparently.
 
 NEVER import or mount this router in production code — it bypasses all agent logic.
@@ -20,9 +20,8 @@ from src.api.routes.workflows import (
     WorkflowRecord,
     Envelope,
     wrap,
-    _workflow_store,
-    _store_lock,
 )
+from src.api.workflow_store import get_workflow_store
 
 router = APIRouter(prefix="/test", tags=["test-fixtures"])
 
@@ -40,7 +39,7 @@ class InjectWorkflowResultRequest(BaseModel):
 @router.post("/inject-workflow-result", response_model=Envelope)
 async def inject_workflow_result(body: InjectWorkflowResultRequest) -> Envelope:
     """
-    Inject a pre-canned workflow result into the in-memory store.
+    Inject a pre-canned workflow result into the workflow store.
 
     After calling this endpoint, any poll to /api/v1/workflows/{type}/{request_id}/status
     will return the injected result immediately with state=completed.
@@ -62,8 +61,7 @@ async def inject_workflow_result(body: InjectWorkflowResultRequest) -> Envelope:
         result=body.result,
         error=body.error,
     )
-    async with _store_lock:
-        _workflow_store[body.request_id] = record
+    await get_workflow_store().put(record)
 
     return wrap({"request_id": body.request_id, "state": body.state, "injected": True})
 
@@ -71,15 +69,12 @@ async def inject_workflow_result(body: InjectWorkflowResultRequest) -> Envelope:
 @router.delete("/clear-workflow-result/{request_id}", response_model=Envelope)
 async def clear_injected_result(request_id: str) -> Envelope:
     """Remove an injected workflow result from the store (test teardown)."""
-    async with _store_lock:
-        removed = _workflow_store.pop(request_id, None)
-    return wrap({"request_id": request_id, "removed": removed is not None})
+    removed = await get_workflow_store().delete(request_id)
+    return wrap({"request_id": request_id, "removed": removed})
 
 
 @router.delete("/clear-all-workflow-results", response_model=Envelope)
 async def clear_all_results() -> Envelope:
-    """Wipe the entire in-memory workflow store (full test reset)."""
-    async with _store_lock:
-        count = len(_workflow_store)
-        _workflow_store.clear()
+    """Wipe the entire workflow store (full test reset)."""
+    count = await get_workflow_store().clear()
     return wrap({"cleared": count})
@@ -2,7 +2,6 @@ from __future__ import annotations
 
 import asyncio
 import uuid
-from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Any, Dict, List, Literal, Optional
 
@@ -10,6 +9,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel, Field
 
 from src.api.runtime import AgentRuntime, get_agent_runtime
+from src.api.workflow_store import WorkflowRecord, get_workflow_store, serialize
 from src.agents.models.deep_analysis_models import (
     DeepAnalysisPlan,
     DeepAnalysisRequest,
@@ -37,59 +37,16 @@ class Envelope(BaseModel):
     data: Any
 
 
-def serialize(value: Any) -> Any:
-    if hasattr(value, "model_dump"):
-        return value.model_dump()
-    if isinstance(value, dict):
-        return {key: serialize(val) for key, val in value.items()}
-    if isinstance(value, list):
-        return [serialize(item) for item in value]
-    if isinstance(value, datetime):
-        return value.isoformat()
-    return value
-
-
 def wrap(data: Any) -> Envelope:
     return Envelope(data=serialize(data))
 
 
-@dataclass
-class WorkflowRecord:
-    request_id: str
-    workflow_type: str
-    state: str
-    payload: Dict[str, Any]
-    created_at: str = field(default_factory=lambda: datetime.utcnow().isoformat())
-    updated_at: str = field(default_factory=lambda: datetime.utcnow().isoformat())
-    result: Optional[Dict[str, Any]] = None
-    error: Optional[str] = None
-    annotations: List[Dict[str, Any]] = field(default_factory=list)
-    actions: List[Dict[str, Any]] = field(default_factory=list)
-
-    def to_dict(self) -> Dict[str, Any]:
-        return {
-            "request_id": self.request_id,
-            "workflow_type": self.workflow_type,
-            "state": self.state,
-            "payload": serialize(self.payload),
-            "created_at": self.created_at,
-            "updated_at": self.updated_at,
-            "result": serialize(self.result) if self.result is not None else None,
-            "error": self.error,
-            "annotations": serialize(self.annotations),
-            "actions": serialize(self.actions),
-        }
-
-
-_workflow_store: Dict[str, WorkflowRecord] = {}
-_store_lock = asyncio.Lock()
-
 _SECRET_KEY_MARKERS = ("password", "secret", "private_key", "token", "api_key", "access_key")
 
 
 def _redact_secrets(value: Any) -> Any:
     """Recursively redact credential-shaped fields before a request payload is
-    cached in the in-memory workflow store.
+    cached in the workflow store.
 
     Without this, data-product-onboarding's `connection_overrides` (Snowflake/
     SQL Server passwords, private keys) was stored verbatim and echoed back in
@@ -121,25 +78,21 @@ async def _create_record(request_id: str, workflow_type: str, payload: Dict[str,
         request_id=request_id, workflow_type=workflow_type, state="pending",
         payload=_redact_secrets(payload),
     )
-    async with _store_lock:
-        _workflow_store[request_id] = record
+    await get_workflow_store().put(record)
     return record
 
 
 async def _get_record(request_id: str) -> Optional[WorkflowRecord]:
-    async with _store_lock:
-        return _workflow_store.get(request_id)
+    return await get_workflow_store().get(request_id)
 
 
 async def _update_record(request_id: str, **updates: Any) -> Optional[WorkflowRecord]:
-    async with _store_lock:
-        record = _workflow_store.get(request_id)
-        if record is None:
-            return None
-        for key, value in updates.items():
-            setattr(record, key, value)
-        record.updated_at = datetime.utcnow().isoformat()
-        return record
+    return await get_workflow_store().update(request_id, **updates)
+
+
+async def _append_to_record(request_id: str, field_name: str, entry: Dict[str, Any]) -> Optional[WorkflowRecord]:
+    """Append to a record's annotations/actions under that record's lock."""
+    return await get_workflow_store().append(request_id, field_name, entry)
 
 
 async def _ensure_record(request_id: str, expected_type: str) -> WorkflowRecord:
@@ -234,7 +187,7 @@ class DataProductOnboardingWorkflowApiRequest(BaseModel):
     database: Optional[str] = Field(None, description="Database or catalog")
     schema: Optional[str] = Field(None, description="Schema or dataset")
     tables: Optional[List[str]] = Field(None, description="Specific tables to profile")
-    inspection_depth: str = Field("standard", description="Profiling depth (basic/standard/extended)")
+    inspection_depth: str = Field("standard", description="Profiling depth (fast/basic/standard/extended)")
     include_samples: bool = Field(False, description="Whether to include sample values during profiling")
     environment: str = Field("dev", description="Target environment (dev/test/prod)")
     connection_overrides: Optional[Dict[str, Any]] = Field(None, description="Per-environment connection overrides")
@@ -434,11 +387,10 @@ async def get_solution_status(request_id: str) -> Envelope:
 @router.post("/situations/{request_id}/annotations", response_model=Envelope)
 async def annotate_situation(request_id: str, request: AnnotationRequest) -> Envelope:
     record = await _ensure_record(request_id, "situations")
-    record.annotations.append({
+    record = await _append_to_record(request_id, "annotations", {
         "note": request.note,
         "timestamp": datetime.utcnow().isoformat(),
-    })
-    await _update_record(request_id, annotations=record.annotations)
+    }) or record
     return wrap({"request_id": request_id, "annotations": record.annotations})
 
 
@@ -451,8 +403,7 @@ async def deep_analysis_request_revision(request_id: str, request: ActionRequest
         "payload": serialize(request.payload) if request.payload else None,
         "timestamp": datetime.utcnow().isoformat(),
     }
-    record.actions.append(action_entry)
-    await _update_record(request_id, actions=record.actions)
+    record = await _append_to_record(request_id, "actions", action_entry) or record
     return wrap({"request_id": request_id, "actions": record.actions})
 
 
@@ -1024,8 +975,7 @@ async def _record_solution_action(
                 "VA register_solution failed (non-fatal): %s", _va_exc,
             )
 
-    record.actions.append(entry)
-    await _update_record(request_id, actions=record.actions)
+    record = await _append_to_record(request_id, "actions", entry) or record
     return wrap({"request_id": request_id, "actions": record.actions})
 
 
@@ -1089,13 +1039,13 @@ async def _run_situations_workflow(request_id: str, runtime: AgentRuntime, reque
             if store.enabled:
                 _situations = response.situations if hasattr(response, "situations") else (response.get("situations") or [])
                 _opportunities = response.opportunities if hasattr(response, "opportunities") else (response.get("opportunities") or [])
-                for situation in _situations:
-                    await store.upsert_situation(situation)
-                for opportunity in _opportunities:
-                    await store.upsert_opportunity(opportunity)
+                _situation_ok = await store.upsert_situations(list(_situations))
+                _opportunity_ok = await store.upsert_opportunities(list(_opportunities))
                 _situations_logger.info(
-                    "Persisted %d situations and %d opportunities to Supabase",
+                    "Persisted %d/%d situations and %d/%d opportunities to Supabase",
+                    sum(_situation_ok),
                     len(_situations),
+                    sum(_opportunity_ok),
                     len(_opportunities),
                 )
         except Exception as e:
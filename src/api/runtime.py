@@ -6,6 +6,8 @@ import logging
 from datetime import datetime, timezone
 from typing import Dict, List, TYPE_CHECKING
 
+from src.database.supabase_rest import close_supabase_client, open_supabase_client
+
 if TYPE_CHECKING:  # pragma: no cover - type checking only
     from src.agents.new.a9_orchestrator_agent import A9_Orchestrator_Agent
     from src.registry.factory import RegistryFactory
@@ -36,6 +38,7 @@ class AgentRuntime:
                 return
 
             self._logger.info("Initializing AgentRuntime orchestrator")
+            await open_supabase_client()
             self._registry_factory = await self._build_registry_factory()
             self._orchestrator = await self._create_orchestrator()
             await self._create_core_agents()
@@ -43,6 +46,14 @@ class AgentRuntime:
             self._initialized_at = datetime.now(timezone.utc)
             self._logger.info("AgentRuntime initialization complete")
 
+    async def shutdown(self) -> None:
+        """Release process-wide resources opened by initialize()."""
+        await close_supabase_client()
+        from src.api.workflow_store import close_workflow_store
+
+        await close_workflow_store()
+        self._logger.info("AgentRuntime shutdown complete")
+
     def get_registry_factory(self) -> "RegistryFactory":
         if self._registry_factory is None:
             raise RuntimeError("Registry factory has not been initialized")
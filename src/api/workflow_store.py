@@ -0,0 +1,433 @@
+"""
+Pluggable store for /workflows run records (situations, deep analysis,
+solutions, data product onboarding).
+
+The routes used to keep every record in a module-level dict behind one global
+asyncio.Lock: nothing was ever evicted, every status poll serialized on the
+same lock, and results vanished on restart or on a second replica. Backends:
+
+- memory   — InMemoryWorkflowStore: LRU + TTL bounded, per-record locks
+- sqlite   — SqliteWorkflowStore: durable single-host store (local dev)
+- postgres — PostgresWorkflowStore: durable store shared by all replicas,
+             using the registry's asyncpg pool and row locks (FOR UPDATE)
+
+Selected with WORKFLOW_STORE_BACKEND (default "memory"). Also read:
+  WORKFLOW_STORE_MAX_RECORDS   memory backend capacity        (default 1000)
+  WORKFLOW_STORE_TTL_SECONDS   record lifetime since update   (default 86400)
+  WORKFLOW_STORE_SQLITE_PATH   sqlite file  (default data/workflow_store.sqlite)
+
+Read-modify-write on a record goes through update()/append(), which hold
+that record's lock only — concurrent polls of other runs never wait. On the
+durable backends an expired record is invisible to reads immediately; the
+rows themselves are swept on every SWEEP_EVERY_PUTS-th write.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import weakref
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def serialize(value: Any) -> Any:
+    if hasattr(value, "model_dump"):
+        return value.model_dump()
+    if isinstance(value, dict):
+        return {key: serialize(val) for key, val in value.items()}
+    if isinstance(value, list):
+        return [serialize(item) for item in value]
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+@dataclass
+class WorkflowRecord:
+    request_id: str
+    workflow_type: str
+    state: str
+    payload: Dict[str, Any]
+    created_at: str = field(default_factory=lambda: datetime.utcnow().isoformat())
+    updated_at: str = field(default_factory=lambda: datetime.utcnow().isoformat())
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    annotations: List[Dict[str, Any]] = field(default_factory=list)
+    actions: List[Dict[str, Any]] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "request_id": self.request_id,
+            "workflow_type": self.workflow_type,
+            "state": self.state,
+            "payload": serialize(self.payload),
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+            "result": serialize(self.result) if self.result is not None else None,
+            "error": self.error,
+            "annotations": serialize(self.annotations),
+            "actions": serialize(self.actions),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "WorkflowRecord":
+        return cls(
+            request_id=data["request_id"],
+            workflow_type=data["workflow_type"],
+            state=data["state"],
+            payload=data.get("payload") or {},
+            created_at=data.get("created_at") or datetime.utcnow().isoformat(),
+            updated_at=data.get("updated_at") or datetime.utcnow().isoformat(),
+            result=data.get("result"),
+            error=data.get("error"),
+            annotations=list(data.get("annotations") or []),
+            actions=list(data.get("actions") or []),
+        )
+
+
+def _apply_updates(record: WorkflowRecord, updates: Dict[str, Any]) -> WorkflowRecord:
+    for key, value in updates.items():
+        setattr(record, key, value)
+    record.updated_at = datetime.utcnow().isoformat()
+    return record
+
+
+class _RecordLocks:
+    """One asyncio.Lock per request_id, dropped once nobody holds or awaits it."""
+
+    def __init__(self) -> None:
+        self._locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
+
+    def get(self, request_id: str) -> asyncio.Lock:
+        lock = self._locks.get(request_id)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._locks[request_id] = lock
+        return lock
+
+
+class WorkflowStore(ABC):
+    """Interface shared by all workflow store backends."""
+
+    @abstractmethod
+    async def put(self, record: WorkflowRecord) -> None:
+        """Insert or replace a record."""
+        pass
+
+    @abstractmethod
+    async def get(self, request_id: str) -> Optional[WorkflowRecord]:
+        """The record, or None if it doesn't exist or has expired."""
+        pass
+
+    @abstractmethod
+    async def update(self, request_id: str, **updates: Any) -> Optional[WorkflowRecord]:
+        """Set fields on a record and bump updated_at; None if it doesn't exist."""
+        pass
+
+    @abstractmethod
+    async def append(self, request_id: str, field_name: str, entry: Dict[str, Any]) -> Optional[WorkflowRecord]:
+        """Atomically append to a list field (annotations, actions)."""
+        pass
+
+    @abstractmethod
+    async def delete(self, request_id: str) -> bool:
+        """Remove a record; True if it existed."""
+        pass
+
+    @abstractmethod
+    async def clear(self) -> int:
+        """Remove every record; returns how many there were."""
+        pass
+
+    async def close(self) -> None:
+        return None
+
+
+class InMemoryWorkflowStore(WorkflowStore):
+    """Process-local store bounded by record count (LRU) and age since last update (TTL)."""
+
+    def __init__(self, max_records: int = 1000, ttl_seconds: float = 86400.0) -> None:
+        self.max_records = max_records
+        self.ttl_seconds = ttl_seconds
+        # request_id -> (record, last update, monotonic)
+        self._records: "OrderedDict[str, Tuple[WorkflowRecord, float]]" = OrderedDict()
+        self._locks = _RecordLocks()
+        self.evictions = 0
+
+    def _live(self, request_id: str) -> Optional[WorkflowRecord]:
+        entry = self._records.get(request_id)
+        if entry is None:
+            return None
+        if self.ttl_seconds and time.monotonic() - entry[1] > self.ttl_seconds:
+            del self._records[request_id]
+            self.evictions += 1
+            return None
+        self._records.move_to_end(request_id)
+        return entry[0]
+
+    def _store(self, record: WorkflowRecord) -> None:
+        self._records[record.request_id] = (record, time.monotonic())
+        self._records.move_to_end(record.request_id)
+        while len(self._records) > self.max_records:
+            self._records.popitem(last=False)
+            self.evictions += 1
+
+    async def put(self, record: WorkflowRecord) -> None:
+        self._store(record)
+
+    async def get(self, request_id: str) -> Optional[WorkflowRecord]:
+        return self._live(request_id)
+
+    async def update(self, request_id: str, **updates: Any) -> Optional[WorkflowRecord]:
+        async with self._locks.get(request_id):
+            record = self._live(request_id)
+            if record is None:
+                return None
+            self._store(_apply_updates(record, updates))
+            return record
+
+    async def append(self, request_id: str, field_name: str, entry: Dict[str, Any]) -> Optional[WorkflowRecord]:
+        async with self._locks.get(request_id):
+            record = self._live(request_id)
+            if record is None:
+                return None
+            values = list(getattr(record, field_name)) + [entry]
+            self._store(_apply_updates(record, {field_name: values}))
+            return record
+
+    async def delete(self, request_id: str) -> bool:
+        return self._records.pop(request_id, None) is not None
+
+    async def clear(self) -> int:
+        count = len(self._records)
+        self._records.clear()
+        return count
+
+
+def _dumps(record: WorkflowRecord) -> str:
+    return json.dumps(record.to_dict(), default=str)
+
+
+# Durable backends delete expired rows on the first write and every Nth one
+# after; reads filter on the record's age, so expiry doesn't wait for a sweep.
+SWEEP_EVERY_PUTS = 100
+
+
+class SqliteWorkflowStore(WorkflowStore):
+    """Durable single-host store; records survive restarts of a local instance."""
+
+    def __init__(self, path: str, ttl_seconds: float = 86400.0) -> None:
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self._locks = _RecordLocks()
+        self._puts = 0
+        self._db_lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS workflow_runs ("
+            " request_id TEXT PRIMARY KEY, workflow_type TEXT NOT NULL,"
+            " record TEXT NOT NULL, touched_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def _run(self, sql: str, params: Tuple[Any, ...] = ()) -> List[Tuple[Any, ...]]:
+        with self._db_lock:
+            rows = self._conn.execute(sql, params).fetchall()
+            self._conn.commit()
+            return rows
+
+    async def _exec(self, sql: str, params: Tuple[Any, ...] = ()) -> List[Tuple[Any, ...]]:
+        return await asyncio.to_thread(self._run, sql, params)
+
+    def _cutoff(self) -> float:
+        return time.time() - self.ttl_seconds if self.ttl_seconds else 0.0
+
+    async def put(self, record: WorkflowRecord) -> None:
+        if self.ttl_seconds and self._puts % SWEEP_EVERY_PUTS == 0:
+            await self._exec("DELETE FROM workflow_runs WHERE touched_at < ?", (self._cutoff(),))
+        self._puts += 1
+        await self._exec(
+            "INSERT OR REPLACE INTO workflow_runs VALUES (?, ?, ?, ?)",
+            (record.request_id, record.workflow_type, _dumps(record), time.time()),
+        )
+
+    async def get(self, request_id: str) -> Optional[WorkflowRecord]:
+        rows = await self._exec(
+            "SELECT record FROM workflow_runs WHERE request_id = ? AND touched_at >= ?",
+            (request_id, self._cutoff()),
+        )
+        return WorkflowRecord.from_dict(json.loads(rows[0][0])) if rows else None
+
+    async def update(self, request_id: str, **updates: Any) -> Optional[WorkflowRecord]:
+        async with self._locks.get(request_id):
+            record = await self.get(request_id)
+            if record is None:
+                return None
+            await self.put(_apply_updates(record, updates))
+            return record
+
+    async def append(self, request_id: str, field_name: str, entry: Dict[str, Any]) -> Optional[WorkflowRecord]:
+        async with self._locks.get(request_id):
+            record = await self.get(request_id)
+            if record is None:
+                return None
+            getattr(record, field_name).append(entry)
+            await self.put(_apply_updates(record, {}))
+            return record
+
+    async def delete(self, request_id: str) -> bool:
+        existed = await self.get(request_id) is not None
+        await self._exec("DELETE FROM workflow_runs WHERE request_id = ?", (request_id,))
+        return existed
+
+    async def clear(self) -> int:
+        count = (await self._exec("SELECT COUNT(*) FROM workflow_runs"))[0][0]
+        await self._exec("DELETE FROM workflow_runs")
+        return count
+
+    async def close(self) -> None:
+        with self._db_lock:
+            self._conn.close()
+
+
+class PostgresWorkflowStore(WorkflowStore):
+    """Durable store shared by every replica (table: public.workflow_runs).
+
+    Uses the registry's asyncpg pool. Updates lock the row with SELECT ... FOR
+    UPDATE, so read-modify-write is safe across replicas, not just tasks.
+    """
+
+    def __init__(self, pool: Any, ttl_seconds: float = 86400.0) -> None:
+        self.pool = pool
+        self.ttl_seconds = ttl_seconds
+        self._puts = 0
+
+    def _select(self, suffix: str = "") -> Tuple[str, Tuple[Any, ...]]:
+        """SELECT of one live record ($1 = request_id) and its extra parameters."""
+        sql = "SELECT record::text FROM workflow_runs WHERE request_id = $1"
+        if not self.ttl_seconds:
+            return sql + suffix, ()
+        return sql + " AND updated_at >= NOW() - make_interval(secs => $2)" + suffix, (float(self.ttl_seconds),)
+
+    async def put(self, record: WorkflowRecord) -> None:
+        sweep = bool(self.ttl_seconds) and self._puts % SWEEP_EVERY_PUTS == 0
+        self._puts += 1
+        async with self.pool.acquire() as conn:
+            await conn.execute(
+                "INSERT INTO workflow_runs (request_id, workflow_type, state, record, updated_at)"
+                " VALUES ($1, $2, $3, $4::jsonb, NOW())"
+                " ON CONFLICT (request_id) DO UPDATE SET workflow_type = EXCLUDED.workflow_type,"
+                " state = EXCLUDED.state, record = EXCLUDED.record, updated_at = NOW()",
+                record.request_id, record.workflow_type, record.state, _dumps(record),
+            )
+            if sweep:
+                await conn.execute(
+                    "DELETE FROM workflow_runs WHERE updated_at < NOW() - make_interval(secs => $1)",
+                    float(self.ttl_seconds),
+                )
+
+    async def get(self, request_id: str) -> Optional[WorkflowRecord]:
+        sql, params = self._select()
+        async with self.pool.acquire() as conn:
+            raw = await conn.fetchval(sql, request_id, *params)
+        return WorkflowRecord.from_dict(json.loads(raw)) if raw else None
+
+    async def _locked_update(self, request_id: str, mutate) -> Optional[WorkflowRecord]:
+        sql, params = self._select(" FOR UPDATE")
+        async with self.pool.acquire() as conn:
+            async with conn.transaction():
+                raw = await conn.fetchval(sql, request_id, *params)
+                if not raw:
+                    return None
+                record = mutate(WorkflowRecord.from_dict(json.loads(raw)))
+                await conn.execute(
+                    "UPDATE workflow_runs SET state = $2, record = $3::jsonb, updated_at = NOW()"
+                    " WHERE request_id = $1",
+                    request_id, record.state, _dumps(record),
+                )
+                return record
+
+    async def update(self, request_id: str, **updates: Any) -> Optional[WorkflowRecord]:
+        return await self._locked_update(request_id, lambda r: _apply_updates(r, updates))
+
+    async def append(self, request_id: str, field_name: str, entry: Dict[str, Any]) -> Optional[WorkflowRecord]:
+        def _mutate(record: WorkflowRecord) -> WorkflowRecord:
+            getattr(record, field_name).append(entry)
+            return _apply_updates(record, {})
+        return await self._locked_update(request_id, _mutate)
+
+    async def delete(self, request_id: str) -> bool:
+        async with self.pool.acquire() as conn:
+            result = await conn.execute("DELETE FROM workflow_runs WHERE request_id = $1", request_id)
+        return result.endswith(" 1")
+
+    async def clear(self) -> int:
+        async with self.pool.acquire() as conn:
+            result = await conn.execute("DELETE FROM workflow_runs")
+        return int(result.split()[-1] or 0)
+
+
+def _registry_pool() -> Any:
+    from src.registry.bootstrap import RegistryBootstrap
+
+    db_manager = RegistryBootstrap._db_manager
+    return getattr(db_manager, "pool", None) if db_manager is not None else None
+
+
+def create_workflow_store(backend: Optional[str] = None) -> WorkflowStore:
+    """Build the configured backend; falls back to memory if a durable one is unavailable."""
+    backend = (backend or os.getenv("WORKFLOW_STORE_BACKEND", "memory")).strip().lower()
+    ttl = float(os.getenv("WORKFLOW_STORE_TTL_SECONDS", "86400"))
+    try:
+        if backend == "sqlite":
+            return SqliteWorkflowStore(
+                os.getenv("WORKFLOW_STORE_SQLITE_PATH", "data/workflow_store.sqlite"), ttl_seconds=ttl
+            )
+        if backend == "postgres":
+            pool = _registry_pool()
+            if pool is not None:
+                return PostgresWorkflowStore(pool, ttl_seconds=ttl)
+            logger.error("WorkflowStore: postgres backend requested but no registry pool — using memory")
+        elif backend != "memory":
+            logger.warning("WorkflowStore: unknown backend %r — using memory", backend)
+    except Exception as exc:
+        logger.error("WorkflowStore: %s backend unavailable (%s) — using memory", backend, exc)
+    return InMemoryWorkflowStore(
+        max_records=int(os.getenv("WORKFLOW_STORE_MAX_RECORDS", "1000")), ttl_seconds=ttl
+    )
+
+
+_store: Optional[WorkflowStore] = None
+
+
+def get_workflow_store() -> WorkflowStore:
+    """Return the process-wide workflow store, creating it on first use."""
+    global _store
+    if _store is None:
+        _store = create_workflow_store()
+    return _store
+
+
+def set_workflow_store(store: Optional[WorkflowStore]) -> None:
+    """Replace the process-wide store (tests, or after the registry pool is up)."""
+    global _store
+    _store = store
+
+
+async def close_workflow_store() -> None:
+    """Close the process-wide store, if one was created."""
+    global _store
+    store, _store = _store, None
+    if store is not None:
+        await store.close()
@@ -16,6 +16,7 @@ try:
 except ImportError:
     httpx = None  # type: ignore
 
+from src.database.supabase_rest import get_supabase_client
 from src.agents.models.assessment_models import (
     AssessmentRun,
     KPIAssessment,
@@ -26,6 +27,26 @@ from src.agents.models.assessment_models import (
 logger = logging.getLogger(__name__)
 
 
+def _kpi_assessment_row(ka: KPIAssessment) -> Dict[str, Any]:
+    """Map a KPIAssessment to a kpi_assessments table row."""
+    return {
+        "id": ka.id,
+        "run_id": ka.run_id,
+        "kpi_id": ka.kpi_id,
+        "kpi_name": ka.kpi_name,
+        "kpi_value": ka.kpi_value,
+        "comparison_value": ka.comparison_value,
+        "severity": ka.severity,
+        "confidence": ka.confidence,
+        "status": ka.status.value,
+        "escalated_to_da": ka.escalated_to_da,
+        "da_result": ka.da_result,
+        "benchmark_segments": ka.benchmark_segments,
+        "error_message": ka.error_message,
+        "created_at": ka.created_at.isoformat(),
+    }
+
+
 class AssessmentStore:
     """Thin async Supabase client for assessment_runs, kpi_assessments, situation_actions."""
 
@@ -83,18 +104,18 @@ class AssessmentStore:
                 "client_id": run.client_id,
                 "config": run.config.model_dump(),
             }
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    self._runs_url,
-                    headers={**self.headers, "Prefer": "resolution=merge-duplicates"},
-                    json=row,
+            client = get_supabase_client()
+            response = await client.post(
+                self._runs_url,
+                headers={**self.headers, "Prefer": "resolution=merge-duplicates"},
+                json=row,
+            )
+            if response.status_code not in (200, 201, 204):
+                logger.warning(
+                    "AssessmentStore.upsert_run: unexpected status %s — %s",
+                    response.status_code, response.text[:200],
                 )
-                if response.status_code not in (200, 201, 204):
-                    logger.warning(
-                        "AssessmentStore.upsert_run: unexpected status %s — %s",
-                        response.status_code, response.text[:200],
-                    )
-                    return False
+                return False
             return True
         except Exception as exc:
             logger.warning("AssessmentStore.upsert_run failed (non-fatal): %s", exc)
@@ -105,21 +126,21 @@ class AssessmentStore:
         if not self.enabled:
             return None
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    self._runs_url,
-                    headers=self.headers,
-                    params={
-                        "client_id": f"eq.{client_id}",
-                        "status": "eq.complete",
-                        "order": "started_at.desc",
-                        "limit": "1",
-                        "select": "*",
-                    },
-                )
-                response.raise_for_status()
-                rows = json.loads(response.content) if response.content else []
-                return rows[0] if rows else None
+            client = get_supabase_client()
+            response = await client.get(
+                self._runs_url,
+                headers=self.headers,
+                params={
+                    "client_id": f"eq.{client_id}",
+                    "status": "eq.complete",
+                    "order": "started_at.desc",
+                    "limit": "1",
+                    "select": "*",
+                },
+            )
+            response.raise_for_status()
+            rows = json.loads(response.content) if response.content else []
+            return rows[0] if rows else None
         except Exception as exc:
             logger.warning("AssessmentStore.get_latest_run failed (non-fatal): %s", exc)
             return None
@@ -133,57 +154,60 @@ class AssessmentStore:
         if not self.enabled:
             return False
         try:
-            row = {
-                "id": ka.id,
-                "run_id": ka.run_id,
-                "kpi_id": ka.kpi_id,
-                "kpi_name": ka.kpi_name,
-                "kpi_value": ka.kpi_value,
-                "comparison_value": ka.comparison_value,
-                "severity": ka.severity,
-                "confidence": ka.confidence,
-                "status": ka.status.value,
-                "escalated_to_da": ka.escalated_to_da,
-                "da_result": ka.da_result,
-                "benchmark_segments": ka.benchmark_segments,
-                "error_message": ka.error_message,
-                "created_at": ka.created_at.isoformat(),
-            }
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    self._assessments_url,
-                    headers={**self.headers, "Prefer": "resolution=merge-duplicates"},
-                    json=row,
+            row = _kpi_assessment_row(ka)
+            client = get_supabase_client()
+            response = await client.post(
+                self._assessments_url,
+                headers={**self.headers, "Prefer": "resolution=merge-duplicates"},
+                json=row,
+            )
+            if response.status_code not in (200, 201, 204):
+                logger.warning(
+                    "AssessmentStore.upsert_kpi_assessment: unexpected status %s — %s",
+                    response.status_code, response.text[:200],
                 )
-                if response.status_code not in (200, 201, 204):
-                    logger.warning(
-                        "AssessmentStore.upsert_kpi_assessment: unexpected status %s — %s",
-                        response.status_code, response.text[:200],
-                    )
-                    return False
+                return False
             return True
         except Exception as exc:
             logger.warning("AssessmentStore.upsert_kpi_assessment failed (non-fatal): %s", exc)
             return False
 
+    async def upsert_kpi_assessments(self, assessments: List[KPIAssessment]) -> List[bool]:
+        """
+        Persist all KPIAssessments of a run in chunked array upserts.
+
+        Returns one flag per input assessment, in order. A rejected chunk is
+        retried row by row so one bad row does not fail its neighbours.
+        """
+        if not self.enabled or not assessments:
+            return [False] * len(assessments)
+        try:
+            rows = [_kpi_assessment_row(ka) for ka in assessments]
+            return await get_supabase_client().bulk_upsert(
+                self._assessments_url, self.headers, rows
+            )
+        except Exception as exc:
+            logger.warning("AssessmentStore.upsert_kpi_assessments failed (non-fatal): %s", exc)
+            return [False] * len(assessments)
+
     async def get_detected_kpi_ids(self, run_id: str) -> List[str]:
         """Return kpi_id list for all DETECTED assessments in a given run."""
         if not self.enabled:
             return []
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    self._assessments_url,
-                    headers=self.headers,
-                    params={
-                        "run_id": f"eq.{run_id}",
-                        "status": f"eq.{KPIAssessmentStatus.DETECTED.value}",
-                        "select": "kpi_id",
-                    },
-                )
-                response.raise_for_status()
-                rows = json.loads(response.content) if response.content else []
-                return [r["kpi_id"] for r in rows]
+            client = get_supabase_client()
+            response = await client.get(
+                self._assessments_url,
+                headers=self.headers,
+                params={
+                    "run_id": f"eq.{run_id}",
+                    "status": f"eq.{KPIAssessmentStatus.DETECTED.value}",
+                    "select": "kpi_id",
+                },
+            )
+            response.raise_for_status()
+            rows = json.loads(response.content) if response.content else []
+            return [r["kpi_id"] for r in rows]
         except Exception as exc:
             logger.warning("AssessmentStore.get_detected_kpi_ids failed (non-fatal): %s", exc)
             return []
@@ -217,18 +241,18 @@ class AssessmentStore:
                 row["snooze_expires_at"] = action.snooze_expires_at.isoformat()
             if action.notes:
                 row["notes"] = action.notes
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    self._actions_url,
-                    headers=self.headers,
-                    json=row,
+            client = get_supabase_client()
+            response = await client.post(
+                self._actions_url,
+                headers=self.headers,
+                json=row,
+            )
+            if response.status_code not in (200, 201, 204):
+                logger.warning(
+                    "AssessmentStore.insert_action: unexpected status %s — %s",
+                    response.status_code, response.text[:200],
                 )
-                if response.status_code not in (200, 201, 204):
-                    logger.warning(
-                        "AssessmentStore.insert_action: unexpected status %s — %s",
-                        response.status_code, response.text[:200],
-                    )
-                    return False
+                return False
             return True
         except Exception as exc:
             logger.warning("AssessmentStore.insert_action failed (non-fatal): %s", exc)
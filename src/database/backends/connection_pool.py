@@ -0,0 +1,183 @@
+"""
+Bounded, thread-safe connection pool for the synchronous warehouse drivers
+(pyodbc for SQL Server, snowflake-connector-python).
+
+Those drivers block, so the managers run them via asyncio.to_thread(); a single
+shared connection then either serializes every query (pyodbc: "Connection is
+busy") or shares one session across threads. ThreadedConnectionPool lets each
+worker-thread hop borrow its own connection for the duration of one query.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def pool_setting(config: Dict[str, Any], key: str, env: str, default: float) -> float:
+    """Read a numeric pool setting from config, then the env var, then the default."""
+    value = config.get(key)
+    if value is None:
+        value = os.getenv(env, default)
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+
+class ThreadedConnectionPool:
+    """Bounded, thread-safe pool of DB-API connections.
+
+    Used from inside asyncio.to_thread() workers. Connections are handed out
+    most-recently-used first; one that sat idle longer than
+    health_check_seconds (or whose last statement raised) is pinged with
+    SELECT 1 before reuse and replaced if dead. Idle connections beyond the
+    first are closed after idle_timeout seconds.
+    """
+
+    def __init__(
+        self,
+        factory: Optional[Callable[[], Any]],
+        max_size: int = 8,
+        idle_timeout: float = 300.0,
+        health_check_seconds: float = 30.0,
+        checkout_timeout: float = 30.0,
+        seed: Optional[Any] = None,
+    ) -> None:
+        self._factory = factory
+        # Without a factory the pool can't open connections, only lend the seed.
+        self.max_size = max(1, max_size) if factory is not None else 1
+        self.idle_timeout = idle_timeout
+        self.health_check_seconds = health_check_seconds
+        self.checkout_timeout = checkout_timeout
+        self._cond = threading.Condition()
+        # (connection, returned_at, needs_check) — the end of the list is the most recent
+        self._idle: List[Tuple[Any, float, bool]] = []
+        self._size = 0
+        self._closed = False
+        if seed is not None:
+            self._idle.append((seed, time.monotonic(), False))
+            self._size = 1
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    @property
+    def idle_count(self) -> int:
+        return len(self._idle)
+
+    def _reap(self, now: float) -> List[Any]:
+        """Drop idle connections past idle_timeout, oldest first; keep at least one."""
+        stale: List[Any] = []
+        while len(self._idle) > 1 and now - self._idle[0][1] > self.idle_timeout:
+            stale.append(self._idle.pop(0)[0])
+            self._size -= 1
+        return stale
+
+    def _checkout(self) -> Tuple[Optional[Any], bool]:
+        """Return (idle connection, needs_check) or (None, _) when a new one may be opened."""
+        deadline = time.monotonic() + self.checkout_timeout
+        stale: List[Any] = []
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise RuntimeError("Connection pool is closed")
+                now = time.monotonic()
+                stale.extend(self._reap(now))
+                if self._idle:
+                    conn, returned_at, needs_check = self._idle.pop()
+                    needs_check = needs_check or now - returned_at > self.health_check_seconds
+                    break
+                if self._size < self.max_size:
+                    self._size += 1
+                    conn, needs_check = None, False
+                    break
+                remaining = deadline - now
+                if remaining <= 0:
+                    raise RuntimeError(
+                        f"Timed out after {self.checkout_timeout:.0f}s waiting for a pooled "
+                        f"connection (pool_size={self.max_size})"
+                    )
+                self._cond.wait(remaining)
+        for old in stale:
+            self._close_quietly(old)
+        return conn, needs_check
+
+    def _release_slot(self) -> None:
+        with self._cond:
+            self._size -= 1
+            self._cond.notify()
+
+    def _open(self) -> Any:
+        try:
+            return self._factory()  # type: ignore[misc]
+        except Exception:
+            self._release_slot()
+            raise
+
+    @staticmethod
+    def _ping(conn: Any) -> bool:
+        try:
+            cursor = conn.cursor()
+            try:
+                cursor.execute("SELECT 1")
+                cursor.fetchall()
+            finally:
+                cursor.close()
+            return True
+        except Exception:
+            return False
+
+    @contextmanager
+    def connection(self) -> Iterator[Any]:
+        """Borrow a connection for the duration of the block."""
+        conn, needs_check = self._checkout()
+        if conn is None:
+            conn = self._open()
+        elif needs_check and not self._ping(conn):
+            logger.info("Connection pool: replacing a dead connection")
+            self._close_quietly(conn)
+            if self._factory is None:
+                self._release_slot()
+                raise RuntimeError("Pooled connection lost")
+            conn = self._open()  # reuses the dead connection's slot
+
+        failed = False
+        try:
+            yield conn
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            with self._cond:
+                if self._closed:
+                    self._size -= 1
+                    closing = True
+                else:
+                    self._idle.append((conn, time.monotonic(), failed))
+                    closing = False
+                self._cond.notify()
+            if closing:
+                self._close_quietly(conn)
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._size -= len(idle)
+            self._cond.notify_all()
+        for conn, _, _ in idle:
+            self._close_quietly(conn)
+
+    @staticmethod
+    def _close_quietly(conn: Any) -> None:
+        try:
+            conn.close()
+        except Exception as exc:
+            logger.debug("Error closing pooled connection: %s", exc)
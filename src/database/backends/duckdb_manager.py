@@ -13,8 +13,10 @@ import os
 import re
 import uuid
 import asyncio
+import threading
 import traceback
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, List, Optional, Tuple, Union
 from pathlib import Path
 
@@ -42,6 +44,17 @@ class DuckDBManager(DatabaseManager):
         self.logger = logger or logging.getLogger(__name__)
         self.duckdb_conn = None
         self.data_product_views = {}
+
+        # Query executor: execute_query runs on a dedicated thread pool so DuckDB work
+        # never blocks the event loop. Each worker thread lazily takes its own cursor
+        # (duckdb_conn.cursor()) so reads from different workers run in parallel.
+        self.max_workers = max(1, int(config.get('max_workers', 4) or 4))
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._worker_state = threading.local()
+        self._cursors: List[Any] = []
+        self._cursor_lock = threading.Lock()
+        # Bumped on every connect/disconnect so workers drop cursors of an old connection
+        self._conn_generation = 0
         
     async def connect(self, connection_params: Dict[str, Any] = None) -> bool:
         """
@@ -80,7 +93,9 @@ class DuckDBManager(DatabaseManager):
                 db_path.parent.mkdir(parents=True, exist_ok=True)
 
             # Create a new DuckDB connection
+            await self._release_query_executor()
             self.duckdb_conn = duckdb.connect(self.database_path)
+            self._conn_generation += 1
 
             # Configure DuckDB settings for proper decimal handling and other optimizations
             # Note: 'format' is not a valid DuckDB configuration parameter
@@ -99,13 +114,62 @@ class DuckDBManager(DatabaseManager):
             True if disconnected successfully, False otherwise
         """
         try:
+            await self._release_query_executor()
             if self.duckdb_conn:
                 self.duckdb_conn.close()
                 self.duckdb_conn = None
+            self._conn_generation += 1
             return True
         except Exception as e:
             self.logger.error(f"Error disconnecting from DuckDB: {str(e)}")
             return False
+
+    def _get_query_executor(self) -> ThreadPoolExecutor:
+        """Return the query thread pool, creating it on first use."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="duckdb-query",
+            )
+        return self._executor
+
+    async def _release_query_executor(self) -> None:
+        """
+        Shut down the query thread pool and close every worker cursor.
+        Waits (off the event loop) for in-flight queries so no cursor is closed
+        mid-execution.
+        """
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            await asyncio.to_thread(executor.shutdown, wait=True)
+        with self._cursor_lock:
+            cursors, self._cursors = self._cursors, []
+        for cursor in cursors:
+            try:
+                cursor.close()
+            except Exception:
+                pass
+
+    def _worker_cursor(self) -> Any:
+        """
+        Return the calling worker thread's cursor on the current connection.
+        Runs on an executor thread only.
+        """
+        state = self._worker_state
+        if getattr(state, 'generation', None) != self._conn_generation or getattr(state, 'cursor', None) is None:
+            with self._cursor_lock:
+                cursor = self.duckdb_conn.cursor()
+                self._cursors.append(cursor)
+            state.cursor = cursor
+            state.generation = self._conn_generation
+        return state.cursor
+
+    def _run_query(self, sql: str, parameters: Optional[Dict[str, Any]]) -> pd.DataFrame:
+        """Execute a query on this worker's cursor. Runs on an executor thread only."""
+        cursor = self._worker_cursor()
+        if parameters:
+            return cursor.execute(sql, parameters).fetchdf()
+        return cursor.execute(sql).fetchdf()
     
     async def execute_query(self, sql: str, parameters: Optional[Dict[str, Any]] = None,
                           transaction_id: Optional[str] = None) -> pd.DataFrame:
@@ -125,11 +189,13 @@ class DuckDBManager(DatabaseManager):
         try:
             self.logger.info(f"[TXN:{tx_id}] Executing SQL: {sql[:100]}...")
             
-            # Execute the query
-            if parameters:
-                result = self.duckdb_conn.execute(sql, parameters).fetchdf()
-            else:
-                result = self.duckdb_conn.execute(sql).fetchdf()
+            # Execute the query on the DuckDB executor so the event loop stays free
+            if self.duckdb_conn is None:
+                raise RuntimeError("DuckDB connection is not established")
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(
+                self._get_query_executor(), self._run_query, sql, parameters
+            )
             
             self.logger.info(f"[TXN:{tx_id}] Query execution successful. Rows: {len(result)}")
             return result
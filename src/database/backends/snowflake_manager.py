@@ -3,16 +3,39 @@ Snowflake Manager - Implementation of the database manager interface for Snowfla
 
 This module implements the DatabaseManager interface for Snowflake, providing
 query execution and metadata helpers via the snowflake-connector-python SDK.
+
+Queries run on connections borrowed from a bounded pool, each query end to end
+(cursor, execute, fetch, close) in a single worker-thread hop. With async
+submission enabled, a query is submitted with cursor.execute_async(), its
+Snowflake query ID is polled from the event loop, and results are fetched with
+get_results_from_sfqid() — so many KPI queries can be in flight against the
+warehouse without each one holding a thread or a connection while it runs.
+
+Settings come from config keys, falling back to env vars:
+
+  pool_size                  SF_POOL_SIZE             max connections      (default 4)
+  pool_idle_timeout          SF_POOL_IDLE_SECONDS     reap idle after      (default 300)
+  pool_health_check_seconds  SF_POOL_HEALTH_SECONDS   ping on checkout
+                                                      when idle longer     (default 300)
+  pool_timeout               SF_POOL_TIMEOUT          checkout wait        (default 60)
+  async_submit               SF_ASYNC_SUBMIT          "1" enables async
+                                                      submission           (default off)
+  max_in_flight              SF_MAX_IN_FLIGHT         async queries
+                                                      running at once      (default 32)
+  async_poll_seconds         SF_ASYNC_POLL_SECONDS    first status poll
+                                                      delay (doubles, ≤2s) (default 0.1)
 """
 
 from __future__ import annotations
 
 import asyncio
 import logging
-from typing import Any, Dict, List, Optional, Tuple
+import os
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
 
 import pandas as pd
 
+from src.database.backends.connection_pool import ThreadedConnectionPool, pool_setting
 from src.database.manager_interface import DatabaseManager
 
 try:  # pragma: no cover
@@ -22,6 +45,10 @@ except Exception:  # pragma: no cover
     snowflake = None  # type: ignore
     ProgrammingError = Exception  # type: ignore
 
+T = TypeVar("T")
+
+_MAX_POLL_SECONDS = 2.0
+
 
 class SnowflakeManager(DatabaseManager):
     """
@@ -32,13 +59,38 @@ class SnowflakeManager(DatabaseManager):
     def __init__(self, config: Dict[str, Any], logger: Optional[logging.Logger] = None):
         self.config = config or {}
         self.logger = logger or logging.getLogger(__name__)
-        self.conn: Optional["snowflake.connector.SnowflakeConnection"] = None  # type: ignore
+        self._conn: Optional["snowflake.connector.SnowflakeConnection"] = None  # type: ignore
+        self._pool: Optional[ThreadedConnectionPool] = None
+        # name -> (loop, semaphore); asyncio primitives are bound to one loop
+        self._semaphores: Dict[str, Tuple[asyncio.AbstractEventLoop, asyncio.Semaphore]] = {}
         self.account: Optional[str] = self.config.get("account")
         self.warehouse: Optional[str] = self.config.get("warehouse")
         self.database: Optional[str] = self.config.get("database")
         self.schema: Optional[str] = self.config.get("schema")
         self.role: Optional[str] = self.config.get("role")
 
+        cfg = self.config
+        self._pool_size = int(pool_setting(cfg, "pool_size", "SF_POOL_SIZE", 4))
+        self._pool_idle_timeout = pool_setting(cfg, "pool_idle_timeout", "SF_POOL_IDLE_SECONDS", 300.0)
+        self._pool_health_check = pool_setting(cfg, "pool_health_check_seconds", "SF_POOL_HEALTH_SECONDS", 300.0)
+        self._pool_timeout = pool_setting(cfg, "pool_timeout", "SF_POOL_TIMEOUT", 60.0)
+        async_submit = cfg.get("async_submit")
+        if async_submit is None:
+            async_submit = os.getenv("SF_ASYNC_SUBMIT", "0").lower() in ("1", "true", "yes")
+        self.async_submit = bool(async_submit)
+        self._max_in_flight = int(pool_setting(cfg, "max_in_flight", "SF_MAX_IN_FLIGHT", 32))
+        self._poll_seconds = pool_setting(cfg, "async_poll_seconds", "SF_ASYNC_POLL_SECONDS", 0.1)
+
+    @property
+    def conn(self) -> Optional["snowflake.connector.SnowflakeConnection"]:  # type: ignore
+        return self._conn
+
+    @conn.setter
+    def conn(self, value: Optional[Any]) -> None:
+        # An externally supplied connection becomes a single-connection pool.
+        self._conn = value
+        self._pool = self._new_pool(None, value) if value is not None else None
+
     async def connect(self, connection_params: Dict[str, Any]) -> bool:
         """
         Establish a Snowflake connection using the provided parameters.
@@ -81,14 +133,21 @@ class SnowflakeManager(DatabaseManager):
             # Remove None values
             conn_kwargs = {k: v for k, v in conn_kwargs.items() if v is not None}
 
-            # Create connection in thread pool
-            self.conn = await asyncio.to_thread(snowflake.connector.connect, **conn_kwargs)
+            def _factory() -> Any:
+                return snowflake.connector.connect(**conn_kwargs)
+
+            # Create connection in thread pool; it validates the credentials
+            # and seeds the pool, which opens more on demand.
+            self._conn = await asyncio.to_thread(_factory)
+            self._pool = self._new_pool(_factory, self._conn)
 
             self.logger.info(
-                "Connected to Snowflake account '%s' (database=%s, schema=%s)",
+                "Connected to Snowflake account '%s' (database=%s, schema=%s, pool_size=%s, async_submit=%s)",
                 self.account,
                 self.database,
                 self.schema,
+                self._pool.max_size,
+                self.async_submit,
             )
             return True
         except Exception as exc:
@@ -98,16 +157,62 @@ class SnowflakeManager(DatabaseManager):
 
     async def disconnect(self) -> bool:
         """
-        Close the Snowflake connection.
+        Close every pooled Snowflake connection.
         """
         try:
-            if self.conn:
-                await asyncio.to_thread(self.conn.close)
-                self.conn = None
+            if self._pool is not None:
+                await asyncio.to_thread(self._pool.close)
             return True
         except Exception as exc:
             self.logger.warning("Error closing Snowflake connection: %s", exc)
             return False
+        finally:
+            self._pool = None
+            self._conn = None
+            self._semaphores.clear()
+
+    # ------------------------------------------------------------------
+    # Connection pool
+    # ------------------------------------------------------------------
+
+    def _new_pool(self, factory: Optional[Callable[[], Any]], seed: Any) -> ThreadedConnectionPool:
+        self._semaphores.clear()
+        return ThreadedConnectionPool(
+            factory,
+            max_size=self._pool_size,
+            idle_timeout=self._pool_idle_timeout,
+            health_check_seconds=self._pool_health_check,
+            checkout_timeout=self._pool_timeout,
+            seed=seed,
+        )
+
+    def _semaphore(self, name: str, size: int) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        entry = self._semaphores.get(name)
+        if entry is None or entry[0] is not loop:
+            entry = (loop, asyncio.Semaphore(max(1, size)))
+            self._semaphores[name] = entry
+        return entry[1]
+
+    async def _run_pooled(self, fn: Callable[[Any], T]) -> T:
+        """Run fn(connection) in one worker-thread hop on a borrowed pooled connection."""
+        pool = self._pool
+        if pool is None:
+            raise RuntimeError("Snowflake connection not established. Call connect() first.")
+
+        def _call() -> T:
+            with pool.connection() as conn:
+                return fn(conn)
+
+        # One permit per pooled connection, so waiting callers don't tie up worker threads
+        async with self._semaphore("pool", pool.max_size):
+            return await asyncio.to_thread(_call)
+
+    def pool_stats(self) -> Dict[str, Any]:
+        pool = self._pool
+        if pool is None:
+            return {"size": 0, "idle": 0, "max_size": self._pool_size}
+        return {"size": pool.size, "idle": pool.idle_count, "max_size": pool.max_size}
 
     async def execute_query(
         self,
@@ -117,20 +222,28 @@ class SnowflakeManager(DatabaseManager):
     ) -> pd.DataFrame:
         """
         Execute a SQL query and return results as a pandas DataFrame.
+
+        Uses async submission (execute_async + query-ID polling) when enabled,
+        otherwise runs the whole query in one worker-thread hop.
         """
-        if not self.conn:
+        if self._pool is None:
             raise RuntimeError("Snowflake connection not established. Call connect() first.")
 
         try:
             self.logger.debug(f"[{transaction_id}] Executing query: {sql[:200]}...")
 
-            # Execute query in thread pool
-            cursor = await asyncio.to_thread(lambda: self.conn.cursor())
-            await asyncio.to_thread(cursor.execute, sql, parameters)
+            if self.async_submit:
+                df = await self._execute_async(sql, parameters, transaction_id)
+            else:
+                def _run(conn: Any) -> pd.DataFrame:
+                    cursor = conn.cursor()
+                    try:
+                        cursor.execute(sql, parameters)
+                        return cursor.fetch_pandas_all()
+                    finally:
+                        cursor.close()
 
-            # Fetch results and convert to DataFrame
-            df = await asyncio.to_thread(cursor.fetch_pandas_all)
-            await asyncio.to_thread(cursor.close)
+                df = await self._run_pooled(_run)
 
             self.logger.debug(f"[{transaction_id}] Query returned {len(df)} rows")
             return df
@@ -138,6 +251,64 @@ class SnowflakeManager(DatabaseManager):
             self.logger.error(f"[{transaction_id}] Query execution failed: {exc}")
             raise
 
+    async def _execute_async(
+        self,
+        sql: str,
+        parameters: Optional[Dict[str, Any]],
+        transaction_id: Optional[str],
+    ) -> pd.DataFrame:
+        """Submit with execute_async, poll the query ID, then fetch its results.
+
+        Connections are only borrowed for the submit, each status check and the
+        final fetch, so up to max_in_flight queries run in the warehouse at
+        once. If the caller is cancelled the Snowflake query is cancelled too.
+        """
+        async with self._semaphore("in_flight", self._max_in_flight):
+            def _submit(conn: Any) -> str:
+                cursor = conn.cursor()
+                try:
+                    cursor.execute_async(sql, parameters)
+                    return cursor.sfqid
+                finally:
+                    cursor.close()
+
+            def _still_running(conn: Any) -> bool:
+                # Raises ProgrammingError if the query failed
+                return conn.is_still_running(conn.get_query_status_throw_if_error(sfqid))
+
+            def _fetch(conn: Any) -> pd.DataFrame:
+                cursor = conn.cursor()
+                try:
+                    cursor.get_results_from_sfqid(sfqid)
+                    return cursor.fetch_pandas_all()
+                finally:
+                    cursor.close()
+
+            sfqid = await self._run_pooled(_submit)
+            self.logger.debug(f"[{transaction_id}] Submitted Snowflake query {sfqid}")
+            delay = self._poll_seconds
+            try:
+                while await self._run_pooled(_still_running):
+                    await asyncio.sleep(delay)
+                    delay = min(delay * 2, _MAX_POLL_SECONDS)
+            except asyncio.CancelledError:
+                asyncio.ensure_future(self._cancel_query(sfqid))
+                raise
+            return await self._run_pooled(_fetch)
+
+    async def _cancel_query(self, sfqid: str) -> None:
+        def _cancel(conn: Any) -> None:
+            cursor = conn.cursor()
+            try:
+                cursor.execute(f"SELECT SYSTEM$CANCEL_QUERY('{sfqid}')")
+            finally:
+                cursor.close()
+
+        try:
+            await self._run_pooled(_cancel)
+        except Exception as exc:
+            self.logger.warning("Failed to cancel Snowflake query %s: %s", sfqid, exc)
+
     async def create_view(
         self,
         view_name: str,
@@ -221,6 +392,8 @@ class SnowflakeManager(DatabaseManager):
             "database": self.database,
             "schema": self.schema,
             "warehouse": self.warehouse,
+            "async_submit": self.async_submit,
+            "pool": self.pool_stats(),
         }
 
     async def register_data_source(
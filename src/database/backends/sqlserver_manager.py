@@ -5,6 +5,17 @@ This module implements the DatabaseManager interface for Microsoft SQL Server
 and Azure SQL Database. It uses pyodbc with asyncio.to_thread() for async
 compatibility, following the same pattern as BigQuery's synchronous SDK wrapper.
 
+A pyodbc connection runs one statement at a time ("Connection is busy with
+results for another command"), so the manager keeps a small bounded pool and
+every asyncio.to_thread() call borrows its own connection. Pool settings come
+from config keys, falling back to env vars:
+
+  pool_size                  SS_POOL_SIZE             max connections   (default 8)
+  pool_idle_timeout          SS_POOL_IDLE_SECONDS     reap idle after   (default 300)
+  pool_health_check_seconds  SS_POOL_HEALTH_SECONDS   ping on checkout
+                                                      when idle longer  (default 30)
+  pool_timeout               SS_POOL_TIMEOUT          checkout wait     (default 30)
+
 Covers the largest ICP segment (~50-60% of target mid-market) running SQL Server
 on-premises or Azure SQL in the cloud.
 """
@@ -12,7 +23,7 @@ on-premises or Azure SQL in the cloud.
 import asyncio
 import logging
 import re
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
 
 import pandas as pd
 
@@ -23,6 +34,7 @@ except ImportError:
     pyodbc = None  # type: ignore
     _PYODBC_AVAILABLE = False
 
+from src.database.backends.connection_pool import ThreadedConnectionPool, pool_setting
 from src.database.manager_interface import DatabaseManager
 
 logger = logging.getLogger(__name__)
@@ -59,6 +71,8 @@ _DEFAULT_DRIVER = "ODBC Driver 18 for SQL Server"
 _DEFAULT_PORT = 1433
 _DEFAULT_SCHEMA = "dbo"
 
+T = TypeVar("T")
+
 
 class SqlServerManager(DatabaseManager):
     """
@@ -72,6 +86,9 @@ class SqlServerManager(DatabaseManager):
 
     Azure SQL-specific options (encrypt, trust_server_certificate) are supported
     via config keys.
+
+    Queries run on connections borrowed from a bounded pool, so concurrent
+    callers (e.g. SA's monthly-series and comparison queries) run in parallel.
     """
 
     def __init__(self, config: Dict[str, Any], logger: Optional[logging.Logger] = None):
@@ -91,13 +108,21 @@ class SqlServerManager(DatabaseManager):
                 - trust_server_certificate (bool, optional): Trust self-signed cert, default False
                 - connection_string (str, optional): Explicit ODBC connection string; overrides
                   all individual component settings when provided
+                - pool_size, pool_idle_timeout, pool_health_check_seconds, pool_timeout
+                  (optional): connection pool tuning, see module docstring
             logger: Optional logger instance
         """
         self.config = config
         self.logger = logger or logging.getLogger(__name__)
         self._connection: Optional[Any] = None
+        self._pool: Optional[ThreadedConnectionPool] = None
+        self._slots: Optional[Tuple[asyncio.AbstractEventLoop, asyncio.Semaphore]] = None
         self._is_connected = False
         self._schema = config.get("schema", _DEFAULT_SCHEMA)
+        self._pool_size = int(pool_setting(config, "pool_size", "SS_POOL_SIZE", 8))
+        self._pool_idle_timeout = pool_setting(config, "pool_idle_timeout", "SS_POOL_IDLE_SECONDS", 300.0)
+        self._pool_health_check = pool_setting(config, "pool_health_check_seconds", "SS_POOL_HEALTH_SECONDS", 30.0)
+        self._pool_timeout = pool_setting(config, "pool_timeout", "SS_POOL_TIMEOUT", 30.0)
 
     # ------------------------------------------------------------------
     # Public property accessors (used by tests and external callers)
@@ -109,7 +134,9 @@ class SqlServerManager(DatabaseManager):
 
     @connection.setter
     def connection(self, value: Optional[Any]) -> None:
+        # An externally supplied connection becomes a single-connection pool.
         self._connection = value
+        self._pool = self._new_pool(None, value) if value is not None else None
 
     @property
     def connected(self) -> bool:
@@ -155,12 +182,17 @@ class SqlServerManager(DatabaseManager):
                 params.get("port", _DEFAULT_PORT),
             )
 
-            # pyodbc.connect is synchronous — offload to a thread
-            self._connection = await asyncio.to_thread(
-                pyodbc.connect, conn_str, autocommit=True
-            )
+            def _factory() -> Any:
+                return pyodbc.connect(conn_str, autocommit=True)
+
+            # pyodbc.connect is synchronous — offload to a thread. The first
+            # connection validates the credentials and seeds the pool.
+            self._connection = await asyncio.to_thread(_factory)
+            self._pool = self._new_pool(_factory, self._connection)
             self._is_connected = True
-            self.logger.info("Successfully connected to SQL Server")
+            self.logger.info(
+                "Successfully connected to SQL Server (pool_size=%s)", self._pool.max_size
+            )
             return True
 
         except Exception as exc:
@@ -169,18 +201,61 @@ class SqlServerManager(DatabaseManager):
             return False
 
     async def disconnect(self) -> bool:
-        """Close the connection to SQL Server."""
-        if self._connection:
+        """Close every pooled connection to SQL Server."""
+        if self._pool is not None:
             try:
-                await asyncio.to_thread(self._connection.close)
+                await asyncio.to_thread(self._pool.close)
             except Exception as exc:
                 self.logger.warning("Error closing SQL Server connection: %s", exc)
             finally:
+                self._pool = None
                 self._connection = None
+                self._slots = None
                 self._is_connected = False
                 self.logger.info("Disconnected from SQL Server")
         return True
 
+    # ------------------------------------------------------------------
+    # Connection pool
+    # ------------------------------------------------------------------
+
+    def _new_pool(self, factory: Optional[Callable[[], Any]], seed: Any) -> ThreadedConnectionPool:
+        self._slots = None
+        return ThreadedConnectionPool(
+            factory,
+            max_size=self._pool_size,
+            idle_timeout=self._pool_idle_timeout,
+            health_check_seconds=self._pool_health_check,
+            checkout_timeout=self._pool_timeout,
+            seed=seed,
+        )
+
+    def _slot_semaphore(self, pool: ThreadedConnectionPool) -> asyncio.Semaphore:
+        """One permit per pooled connection, so waiting callers don't tie up worker threads."""
+        loop = asyncio.get_running_loop()
+        if self._slots is None or self._slots[0] is not loop:
+            self._slots = (loop, asyncio.Semaphore(pool.max_size))
+        return self._slots[1]
+
+    async def _run_pooled(self, fn: Callable[[Any], T]) -> T:
+        """Run fn(connection) in a worker thread on a borrowed pooled connection."""
+        pool = self._pool
+        if pool is None:
+            raise RuntimeError("Not connected to SQL Server database")
+
+        def _call() -> T:
+            with pool.connection() as conn:
+                return fn(conn)
+
+        async with self._slot_semaphore(pool):
+            return await asyncio.to_thread(_call)
+
+    def pool_stats(self) -> Dict[str, Any]:
+        pool = self._pool
+        if pool is None:
+            return {"size": 0, "idle": 0, "max_size": self._pool_size}
+        return {"size": pool.size, "idle": pool.idle_count, "max_size": pool.max_size}
+
     # ------------------------------------------------------------------
     # Query execution
     # ------------------------------------------------------------------
@@ -208,11 +283,11 @@ class SqlServerManager(DatabaseManager):
         Returns:
             DataFrame containing query results (empty DataFrame if no rows)
         """
-        if not self._connection:
+        if self._pool is None:
             raise RuntimeError("Not connected to SQL Server database")
 
-        def _run() -> pd.DataFrame:
-            cursor = self._connection.cursor()
+        def _run(conn: Any) -> pd.DataFrame:
+            cursor = conn.cursor()
             try:
                 if parameters:
                     if isinstance(parameters, dict):
@@ -240,7 +315,7 @@ class SqlServerManager(DatabaseManager):
                 cursor.close()
 
         try:
-            return await asyncio.to_thread(_run)
+            return await self._run_pooled(_run)
         except Exception as exc:
             self.logger.error("Query execution failed: %s", exc)
             raise
@@ -271,7 +346,7 @@ class SqlServerManager(DatabaseManager):
         Returns:
             True if the view was created successfully, False otherwise
         """
-        if not self._connection:
+        if self._pool is None:
             return False
 
         try:
@@ -281,7 +356,7 @@ class SqlServerManager(DatabaseManager):
             else:
                 ddl = f"CREATE VIEW {quoted_name} AS {sql}"
 
-            await asyncio.to_thread(self._execute_non_query, ddl)
+            await self._run_pooled(lambda conn: self._execute_non_query(ddl, conn))
             return True
         except Exception as exc:
             self.logger.error("Create view failed: %s", exc)
@@ -296,7 +371,7 @@ class SqlServerManager(DatabaseManager):
         Returns:
             List of view names
         """
-        if not self._connection:
+        if self._pool is None:
             return []
 
         sql = (
@@ -304,8 +379,8 @@ class SqlServerManager(DatabaseManager):
             "WHERE TABLE_SCHEMA = ?"
         )
 
-        def _run() -> List[str]:
-            cursor = self._connection.cursor()
+        def _run(conn: Any) -> List[str]:
+            cursor = conn.cursor()
             try:
                 cursor.execute(sql, self._schema)
                 return [row[0] for row in cursor.fetchall()]
@@ -313,7 +388,7 @@ class SqlServerManager(DatabaseManager):
                 cursor.close()
 
         try:
-            return await asyncio.to_thread(_run)
+            return await self._run_pooled(_run)
         except Exception as exc:
             self.logger.error("List views failed: %s", exc)
             return []
@@ -396,11 +471,11 @@ class SqlServerManager(DatabaseManager):
         Returns:
             Dictionary with connection state, type, and version
         """
-        if not self._connection:
+        if self._pool is None:
             return {"connected": False}
 
-        def _run() -> str:
-            cursor = self._connection.cursor()
+        def _run(conn: Any) -> str:
+            cursor = conn.cursor()
             try:
                 cursor.execute("SELECT @@VERSION")
                 row = cursor.fetchone()
@@ -409,7 +484,7 @@ class SqlServerManager(DatabaseManager):
                 cursor.close()
 
         try:
-            version = await asyncio.to_thread(_run)
+            version = await self._run_pooled(_run)
             return {
                 "connected": True,
                 "type": "sqlserver",
@@ -445,7 +520,7 @@ class SqlServerManager(DatabaseManager):
         Returns:
             True if the MERGE completed without error, False otherwise
         """
-        if not self._connection:
+        if self._pool is None:
             return False
 
         try:
@@ -498,15 +573,15 @@ class SqlServerManager(DatabaseManager):
                 f"VALUES ({insert_src_cols});"
             )
 
-            def _run():
-                cursor = self._connection.cursor()
+            def _run(conn: Any) -> None:
+                cursor = conn.cursor()
                 try:
                     cursor.execute(merge_sql, values)
-                    cursor.commit() if not self._connection.autocommit else None
+                    cursor.commit() if not conn.autocommit else None
                 finally:
                     cursor.close()
 
-            await asyncio.to_thread(_run)
+            await self._run_pooled(_run)
             return True
 
         except Exception as exc:
@@ -528,15 +603,15 @@ class SqlServerManager(DatabaseManager):
         Returns:
             Dictionary representing the row if found, None otherwise
         """
-        if not self._connection:
+        if self._pool is None:
             return None
 
         quoted_table = self._quote_identifier(table)
         quoted_key = self._quote_identifier(key_field)
         sql = f"SELECT TOP 1 * FROM {quoted_table} WHERE {quoted_key} = ?"
 
-        def _run() -> Optional[Dict[str, Any]]:
-            cursor = self._connection.cursor()
+        def _run(conn: Any) -> Optional[Dict[str, Any]]:
+            cursor = conn.cursor()
             try:
                 cursor.execute(sql, key_value)
                 row = cursor.fetchone()
@@ -548,7 +623,7 @@ class SqlServerManager(DatabaseManager):
                 cursor.close()
 
         try:
-            return await asyncio.to_thread(_run)
+            return await self._run_pooled(_run)
         except Exception as exc:
             self.logger.error("Get record failed for table %s: %s", table, exc)
             return None
@@ -566,22 +641,22 @@ class SqlServerManager(DatabaseManager):
         Returns:
             True if the DELETE executed without error, False on exception
         """
-        if not self._connection:
+        if self._pool is None:
             return False
 
         quoted_table = self._quote_identifier(table)
         quoted_key = self._quote_identifier(key_field)
         sql = f"DELETE FROM {quoted_table} WHERE {quoted_key} = ?"
 
-        def _run():
-            cursor = self._connection.cursor()
+        def _run(conn: Any) -> None:
+            cursor = conn.cursor()
             try:
                 cursor.execute(sql, key_value)
             finally:
                 cursor.close()
 
         try:
-            await asyncio.to_thread(_run)
+            await self._run_pooled(_run)
             return True
         except Exception as exc:
             self.logger.error("Delete record failed for table %s: %s", table, exc)
@@ -601,7 +676,7 @@ class SqlServerManager(DatabaseManager):
         Returns:
             List of row dictionaries; empty list on error or no results
         """
-        if not self._connection:
+        if self._pool is None:
             return []
 
         quoted_table = self._quote_identifier(table)
@@ -615,8 +690,8 @@ class SqlServerManager(DatabaseManager):
             values = list(filters.values())
             sql += " WHERE " + " AND ".join(conditions)
 
-        def _run() -> List[Dict[str, Any]]:
-            cursor = self._connection.cursor()
+        def _run(conn: Any) -> List[Dict[str, Any]]:
+            cursor = conn.cursor()
             try:
                 cursor.execute(sql, values) if values else cursor.execute(sql)
                 rows = cursor.fetchall()
@@ -628,7 +703,7 @@ class SqlServerManager(DatabaseManager):
                 cursor.close()
 
         try:
-            return await asyncio.to_thread(_run)
+            return await self._run_pooled(_run)
         except Exception as exc:
             self.logger.error("Fetch records failed for table %s: %s", table, exc)
             return []
@@ -692,15 +767,16 @@ class SqlServerManager(DatabaseManager):
             quoted_parts.append(f"[{clean}]")
         return ".".join(quoted_parts)
 
-    def _execute_non_query(self, sql: str) -> None:
+    def _execute_non_query(self, sql: str, conn: Any) -> None:
         """
         Execute a non-SELECT statement synchronously (intended for use inside
         asyncio.to_thread calls).
 
         Args:
             sql: SQL statement to execute
+            conn: Pooled connection borrowed by the caller
         """
-        cursor = self._connection.cursor()
+        cursor = conn.cursor()
         try:
             cursor.execute(sql)
         finally:
@@ -16,6 +16,7 @@ try:
 except ImportError:
     httpx = None  # type: ignore
 
+from src.database.supabase_rest import get_supabase_client
 from src.agents.models.pib_models import BriefingRun, BriefingRunStatus, BriefingToken, TokenType
 
 logger = logging.getLogger(__name__)
@@ -72,14 +73,14 @@ class BriefingStore:
                 "error_message": run.error_message,
                 "created_at": run.created_at.isoformat(),
             }
-            async with httpx.AsyncClient() as client:
-                response = await client.post(self._runs_url, headers=self.headers, json=row)
-                if response.status_code not in (200, 201, 204):
-                    logger.warning(
-                        "BriefingStore.insert_run: status %s — %s",
-                        response.status_code, response.text[:200],
-                    )
-                    return False
+            client = get_supabase_client()
+            response = await client.post(self._runs_url, headers=self.headers, json=row)
+            if response.status_code not in (200, 201, 204):
+                logger.warning(
+                    "BriefingStore.insert_run: status %s — %s",
+                    response.status_code, response.text[:200],
+                )
+                return False
             return True
         except Exception as exc:
             logger.warning("BriefingStore.insert_run failed: %s", exc)
@@ -94,14 +95,14 @@ class BriefingStore:
             patch = {"status": status.value}
             if error_message:
                 patch["error_message"] = error_message
-            async with httpx.AsyncClient() as client:
-                response = await client.patch(
-                    self._runs_url,
-                    headers=self.headers,
-                    params={"id": f"eq.{run_id}"},
-                    json=patch,
-                )
-                return response.status_code in (200, 204)
+            client = get_supabase_client()
+            response = await client.patch(
+                self._runs_url,
+                headers=self.headers,
+                params={"id": f"eq.{run_id}"},
+                json=patch,
+            )
+            return response.status_code in (200, 204)
         except Exception as exc:
             logger.warning("BriefingStore.update_run_status failed: %s", exc)
             return False
@@ -125,14 +126,14 @@ class BriefingStore:
                 "expires_at": token.expires_at.isoformat(),
                 "created_at": token.created_at.isoformat(),
             }
-            async with httpx.AsyncClient() as client:
-                response = await client.post(self._tokens_url, headers=self.headers, json=row)
-                if response.status_code not in (200, 201, 204):
-                    logger.warning(
-                        "BriefingStore.insert_token: status %s — %s",
-                        response.status_code, response.text[:200],
-                    )
-                    return False
+            client = get_supabase_client()
+            response = await client.post(self._tokens_url, headers=self.headers, json=row)
+            if response.status_code not in (200, 201, 204):
+                logger.warning(
+                    "BriefingStore.insert_token: status %s — %s",
+                    response.status_code, response.text[:200],
+                )
+                return False
             return True
         except Exception as exc:
             logger.warning("BriefingStore.insert_token failed: %s", exc)
@@ -150,33 +151,33 @@ class BriefingStore:
             return None
         try:
             now_iso = datetime.now(timezone.utc).isoformat()
-            async with httpx.AsyncClient() as client:
-                # Fetch token
-                response = await client.get(
-                    self._tokens_url,
-                    headers=self.headers,
-                    params={
-                        "token": f"eq.{token_str}",
-                        "expires_at": f"gt.{now_iso}",
-                        "used_at": "is.null",
-                        "select": "*",
-                    },
-                )
-                response.raise_for_status()
-                rows = json.loads(response.content) if response.content else []
-                if not rows:
-                    return None
-
-                row = rows[0]
-
-                # Mark as used
-                await client.patch(
-                    self._tokens_url,
-                    headers=self.headers,
-                    params={"id": f"eq.{row['id']}"},
-                    json={"used_at": now_iso},
-                )
-                return row
+            client = get_supabase_client()
+            # Fetch token
+            response = await client.get(
+                self._tokens_url,
+                headers=self.headers,
+                params={
+                    "token": f"eq.{token_str}",
+                    "expires_at": f"gt.{now_iso}",
+                    "used_at": "is.null",
+                    "select": "*",
+                },
+            )
+            response.raise_for_status()
+            rows = json.loads(response.content) if response.content else []
+            if not rows:
+                return None
+
+            row = rows[0]
+
+            # Mark as used
+            await client.patch(
+                self._tokens_url,
+                headers=self.headers,
+                params={"id": f"eq.{row['id']}"},
+                json={"used_at": now_iso},
+            )
+            return row
         except Exception as exc:
             logger.warning("BriefingStore.validate_and_consume_token failed: %s", exc)
             return None
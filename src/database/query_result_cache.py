@@ -0,0 +1,139 @@
+"""
+In-process cache for SELECT results served by A9_Data_Product_Agent.execute_sql.
+
+SA, DA, DGA slice validity and VA frequently issue byte-identical SQL against
+the same data product within seconds of each other (monthly series, comparison
+scalars, DA base queries, slice-validity profiles). QueryResultCache keeps the
+normalized execute_sql response for a short, per-source TTL so repeat views of
+the same briefing do not go back to the warehouse.
+
+Keys are tenant-aware — (normalized SQL, data_product_id, client_id,
+parameters) — and the cache is only consulted after the DGA access gate, so a
+hit never bypasses governance. Memory is bounded by an approximate byte budget
+with LRU eviction.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+# A quoted literal/identifier ('' and "" escapes, BigQuery backticks) or a run
+# of whitespace outside one.
+_QUOTED_OR_WS = re.compile(r"('(?:[^']|'')*'|\"(?:[^\"]|\"\")*\"|`[^`]*`)|\s+")
+
+
+def normalize_sql(sql: str) -> str:
+    """Collapse whitespace outside quotes and drop a trailing semicolon so
+    cosmetic edits share a key; quoted text is kept byte-for-byte, so
+    'A  B' and 'A B' never do."""
+    return _QUOTED_OR_WS.sub(lambda m: m.group(1) or " ", sql).strip().rstrip(";").rstrip()
+
+
+def copy_result(response: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy an execute_sql response so one caller can't mutate another's rows."""
+    # Rows are flat dicts of scalars, so a per-row shallow copy is enough.
+    out = dict(response)
+    rows = [dict(r) if isinstance(r, dict) else r for r in (response.get("rows") or [])]
+    out["rows"] = rows
+    out["data"] = rows
+    out["columns"] = list(response.get("columns") or [])
+    return out
+
+
+class QueryResultCache:
+    """TTL + byte-bounded LRU cache of execute_sql response dicts."""
+
+    def __init__(
+        self,
+        default_ttl_seconds: float = 300.0,
+        source_ttls: Optional[Dict[str, float]] = None,
+        max_bytes: int = 64 * 1024 * 1024,
+    ) -> None:
+        self.default_ttl_seconds = default_ttl_seconds
+        self.source_ttls = {k.lower(): v for k, v in (source_ttls or {}).items()}
+        self.max_bytes = max_bytes
+        # key -> (expires_at, size, response)
+        self._entries: "OrderedDict[str, Tuple[float, int, Dict[str, Any]]]" = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(
+        sql: str,
+        data_product_id: Optional[str],
+        client_id: Optional[str],
+        parameters: Optional[Any],
+    ) -> str:
+        payload = json.dumps(
+            [normalize_sql(sql), data_product_id, client_id, parameters or {}],
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def ttl_for(self, source: Optional[str]) -> float:
+        return self.source_ttls.get((source or "").lower(), self.default_ttl_seconds)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, size, response = entry
+        if expires_at <= time.monotonic():
+            self._drop(key)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return copy_result(response)
+
+    def put(self, key: str, response: Dict[str, Any], source: Optional[str] = None) -> None:
+        ttl = self.ttl_for(source)
+        if ttl <= 0:
+            return
+        size = self._estimate_size(response)
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._drop(key)
+        self._entries[key] = (time.monotonic() + ttl, size, copy_result(response))
+        self._bytes += size
+        while self._bytes > self.max_bytes and self._entries:
+            oldest = next(iter(self._entries))
+            self._drop(oldest)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits / lookups) if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+        }
+
+    def _drop(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[1]
+
+    @staticmethod
+    def _estimate_size(response: Dict[str, Any]) -> int:
+        try:
+            return len(json.dumps(response.get("rows") or [], default=str)) + 256
+        except Exception:
+            return 1024
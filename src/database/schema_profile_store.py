@@ -0,0 +1,110 @@
+"""
+File-backed store of schema-inspection profiles keyed by table fingerprint.
+
+inspect_source_schema re-profiles every table on every run — row counts,
+value samples, FK/view lookups — even when nothing in the source changed.
+SchemaProfileStore keeps the last TableProfile per (source, database, schema,
+table) together with a fingerprint built from catalog metadata the inspection
+already fetches in bulk: column names/types/nullability, the row count and the
+last-modified time where the backend exposes one. A re-run re-profiles only
+the tables whose fingerprint changed. Views have no row count or modification
+time of their own, so a change to their definition or to the tables beneath
+them is invisible to the catalog; they get no fingerprint and are re-profiled
+on every run. The same holds for backends whose catalog does not move on data
+changes (SQL Server: modify_date is DDL-only), marked tracks_changes=False.
+
+The contract fragments _build_contract_dict emits per table (table entry and
+default view) are stored per data product under the same fingerprint so an
+unchanged table's contract section is carried over verbatim.
+
+One JSON document per scope; writes go through a temp file + os.replace so a
+crashed run never leaves a half-written store.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+from typing import Any, Dict, Optional
+
+_UNSAFE = re.compile(r"[^A-Za-z0-9_.-]+")
+
+
+def table_fingerprint(catalog_entry: Optional[Dict[str, Any]]) -> Optional[str]:
+    """Fingerprint of a _prefetch_inspection_catalog entry, or None when the
+    entry has no column metadata, is not a base table, or comes from a catalog
+    that doesn't track data changes."""
+    if not catalog_entry or not catalog_entry.get("columns") or not catalog_entry.get("base_table"):
+        return None
+    if not catalog_entry.get("tracks_changes", True):
+        return None
+    payload = {
+        "columns": [
+            [c.get("column_name"), c.get("data_type"), str(c.get("is_nullable") or "").upper()]
+            for c in catalog_entry["columns"]
+        ],
+        "row_count": catalog_entry.get("row_count"),
+        "last_modified": catalog_entry.get("last_modified"),
+    }
+    blob = json.dumps(payload, sort_keys=True, default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+class SchemaProfileStore:
+    """Per-scope JSON documents under `root_dir`."""
+
+    def __init__(self, root_dir: str) -> None:
+        self.root_dir = root_dir
+
+    def _path(self, kind: str, *parts: Optional[str]) -> str:
+        name = "__".join(_UNSAFE.sub("_", str(p or "default")) for p in parts)
+        return os.path.join(self.root_dir, kind, f"{name}.json")
+
+    def _read(self, path: str) -> Dict[str, Any]:
+        try:
+            with open(path, "r", encoding="utf-8") as fh:
+                doc = json.load(fh)
+            return doc if isinstance(doc, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def _write(self, path: str, doc: Dict[str, Any]) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(doc, fh, sort_keys=True, default=str)
+        os.replace(tmp, path)
+
+    # ------------------------------------------------------------------
+    # Table profiles: {table: {"fingerprint", "inspection_depth", "profile"}}
+    # ------------------------------------------------------------------
+
+    def load_profiles(self, source_system: str, database: Optional[str], schema: Optional[str]) -> Dict[str, Any]:
+        return self._read(self._path("profiles", source_system, database, schema))
+
+    def save_profiles(
+        self,
+        source_system: str,
+        database: Optional[str],
+        schema: Optional[str],
+        entries: Dict[str, Any],
+    ) -> None:
+        """Merge `entries` into the scope's document; tables not in `entries` keep their record."""
+        path = self._path("profiles", source_system, database, schema)
+        doc = self._read(path)
+        doc.update(entries)
+        self._write(path, doc)
+
+    # ------------------------------------------------------------------
+    # Contract fragments: {table: {"fingerprint", "table", "view"}}
+    # ------------------------------------------------------------------
+
+    def load_contract_fragments(self, data_product_id: str) -> Dict[str, Any]:
+        return self._read(self._path("contracts", data_product_id))
+
+    def save_contract_fragments(self, data_product_id: str, fragments: Dict[str, Any]) -> None:
+        path = self._path("contracts", data_product_id)
+        doc = self._read(path)
+        doc.update(fragments)
+        self._write(path, doc)
@@ -0,0 +1,66 @@
+"""
+Single-flight coalescing of concurrent identical queries.
+
+When several principals of the same client open Decision Studio together, SA
+issues the same KPI SQL against the warehouse at the same moment. SingleFlight
+lets the first caller for a key run the query while every concurrent caller
+with the same key awaits that one execution and shares its result. Nothing is
+retained once the flight lands — that is QueryResultCache's job.
+"""
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+
+class SingleFlight:
+    """Coalesce concurrent awaitables that share a key into one execution."""
+
+    def __init__(self) -> None:
+        self._inflight: Dict[str, "asyncio.Future[Any]"] = {}
+        self.executions = 0
+        self.coalesced = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """Run `fn` once per in-flight key; returns (result, shared).
+
+        `shared` is True for callers that joined another caller's execution;
+        they must treat the result as read-only or copy it. If the leading
+        caller is cancelled, a waiting caller retries as the new leader.
+        """
+        fut = self._inflight.get(key)
+        if fut is not None:
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(fut), True
+            except asyncio.CancelledError:
+                if not fut.cancelled():
+                    raise  # this caller was cancelled, not the leader
+                self.coalesced -= 1
+                return await self.do(key, fn)
+
+        fut = asyncio.get_running_loop().create_future()
+        self._inflight[key] = fut
+        self.executions += 1
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            fut.cancel()
+            raise
+        except BaseException as exc:
+            fut.set_exception(exc)
+            fut.exception()  # mark retrieved — there may be no followers
+            raise
+        else:
+            fut.set_result(result)
+            return result, False
+        finally:
+            if self._inflight.get(key) is fut:
+                del self._inflight[key]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._inflight),
+        }
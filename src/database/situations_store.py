@@ -18,6 +18,7 @@ try:
 except ImportError:
     httpx = None  # type: ignore
 
+from src.database.supabase_rest import get_supabase_client
 from src.agents.models.situation_awareness_models import OpportunitySignal, Situation
 
 logger = logging.getLogger(__name__)
@@ -44,6 +45,43 @@ def _safe_json(obj: Any) -> Any:
     return obj
 
 
+def _situation_row(situation: Situation) -> Dict[str, Any]:
+    """Map a problem Situation card to a situations table row."""
+    kpi_value_num: Optional[float] = None
+    if situation.kpi_value is not None:
+        kpi_value_num = getattr(situation.kpi_value, "value", None)
+
+    return {
+        "id": situation.situation_id,
+        "card_type": "problem",
+        "kpi_id": situation.kpi_name,
+        "kpi_name": situation.kpi_name,
+        "severity": situation.severity.value if hasattr(situation.severity, "value") else str(situation.severity),
+        "title": situation.description[:255] if situation.description else situation.kpi_name,
+        "description": situation.description,
+        "kpi_value": kpi_value_num,
+        "status": "OPEN",
+        "full_payload": _safe_json(situation),
+    }
+
+
+def _opportunity_row(opportunity: OpportunitySignal) -> Dict[str, Any]:
+    """Map an OpportunitySignal to a situations table row (stable derived id)."""
+    return {
+        "id": _stable_opportunity_id(opportunity),
+        "card_type": "opportunity",
+        "kpi_id": opportunity.kpi_name,
+        "kpi_name": opportunity.kpi_name,
+        "title": opportunity.headline[:255] if opportunity.headline else opportunity.kpi_name,
+        "description": opportunity.headline,
+        "kpi_value": opportunity.current_value,
+        "deviation_pct": opportunity.delta_pct,
+        "opportunity_type": opportunity.opportunity_type,
+        "status": "OPEN",
+        "full_payload": _safe_json(opportunity),
+    }
+
+
 class SituationsStore:
     """Thin async Supabase client for the situations table."""
 
@@ -90,36 +128,20 @@ class SituationsStore:
         if not self.enabled:
             return False
         try:
-            kpi_value_num: Optional[float] = None
-            if situation.kpi_value is not None:
-                kpi_value_num = getattr(situation.kpi_value, "value", None)
-
-            row = {
-                "id": situation.situation_id,
-                "card_type": "problem",
-                "kpi_id": situation.kpi_name,
-                "kpi_name": situation.kpi_name,
-                "severity": situation.severity.value if hasattr(situation.severity, "value") else str(situation.severity),
-                "title": situation.description[:255] if situation.description else situation.kpi_name,
-                "description": situation.description,
-                "kpi_value": kpi_value_num,
-                "status": "OPEN",
-                "full_payload": _safe_json(situation),
-            }
-
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    self.endpoint,
-                    headers={**self.headers, "Prefer": "resolution=merge-duplicates"},
-                    json=row,
+            row = _situation_row(situation)
+            client = get_supabase_client()
+            response = await client.post(
+                self.endpoint,
+                headers={**self.headers, "Prefer": "resolution=merge-duplicates"},
+                json=row,
+            )
+            if response.status_code not in (200, 201, 204):
+                logger.warning(
+                    "SituationsStore.upsert_situation: unexpected status %s — %s",
+                    response.status_code,
+                    response.text[:200],
                 )
-                if response.status_code not in (200, 201, 204):
-                    logger.warning(
-                        "SituationsStore.upsert_situation: unexpected status %s — %s",
-                        response.status_code,
-                        response.text[:200],
-                    )
-                    return False
+                return False
             return True
         except Exception as exc:
             logger.warning("SituationsStore.upsert_situation failed (non-fatal): %s", exc)
@@ -137,40 +159,59 @@ class SituationsStore:
         if not self.enabled:
             return False
         try:
-            opp_id = _stable_opportunity_id(opportunity)
-
-            row = {
-                "id": opp_id,
-                "card_type": "opportunity",
-                "kpi_id": opportunity.kpi_name,
-                "kpi_name": opportunity.kpi_name,
-                "title": opportunity.headline[:255] if opportunity.headline else opportunity.kpi_name,
-                "description": opportunity.headline,
-                "kpi_value": opportunity.current_value,
-                "deviation_pct": opportunity.delta_pct,
-                "opportunity_type": opportunity.opportunity_type,
-                "status": "OPEN",
-                "full_payload": _safe_json(opportunity),
-            }
-
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    self.endpoint,
-                    headers={**self.headers, "Prefer": "resolution=merge-duplicates"},
-                    json=row,
+            row = _opportunity_row(opportunity)
+            client = get_supabase_client()
+            response = await client.post(
+                self.endpoint,
+                headers={**self.headers, "Prefer": "resolution=merge-duplicates"},
+                json=row,
+            )
+            if response.status_code not in (200, 201, 204):
+                logger.warning(
+                    "SituationsStore.upsert_opportunity: unexpected status %s — %s",
+                    response.status_code,
+                    response.text[:200],
                 )
-                if response.status_code not in (200, 201, 204):
-                    logger.warning(
-                        "SituationsStore.upsert_opportunity: unexpected status %s — %s",
-                        response.status_code,
-                        response.text[:200],
-                    )
-                    return False
+                return False
             return True
         except Exception as exc:
             logger.warning("SituationsStore.upsert_opportunity failed (non-fatal): %s", exc)
             return False
 
+    async def upsert_situations(self, situations: List[Situation]) -> List[bool]:
+        """
+        Persist many Situation cards in chunked array upserts.
+
+        Returns one flag per input situation, in order; a row that cannot be
+        mapped or is rejected by Supabase is False without failing the rest.
+        """
+        return await self._bulk_upsert(situations, _situation_row, "upsert_situations")
+
+    async def upsert_opportunities(self, opportunities: List[OpportunitySignal]) -> List[bool]:
+        """Persist many OpportunitySignals; per-row results as upsert_situations."""
+        return await self._bulk_upsert(opportunities, _opportunity_row, "upsert_opportunities")
+
+    async def _bulk_upsert(self, items: List[Any], to_row, label: str) -> List[bool]:
+        results = [False] * len(items)
+        if not self.enabled or not items:
+            return results
+        rows: List[Dict[str, Any]] = []
+        positions: List[int] = []
+        for i, item in enumerate(items):
+            try:
+                rows.append(to_row(item))
+                positions.append(i)
+            except Exception as exc:
+                logger.warning("SituationsStore.%s: row %d skipped (non-fatal): %s", label, i, exc)
+        try:
+            flags = await get_supabase_client().bulk_upsert(self.endpoint, self.headers, rows)
+        except Exception as exc:
+            logger.warning("SituationsStore.%s failed (non-fatal): %s", label, exc)
+            return results
+        for i, ok in zip(positions, flags):
+            results[i] = ok
+        return results
+
     async def get_situation(self, situation_id: str) -> Optional[Dict[str, Any]]:
         """
         Retrieve a situation or opportunity row by ID.
@@ -181,19 +222,19 @@ class SituationsStore:
         if not self.enabled:
             return None
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    self.endpoint,
-                    headers=self.headers,
-                    params={"id": f"eq.{situation_id}", "select": "*"},
-                )
-                response.raise_for_status()
-                rows = response.content and __import__("json").loads(response.content) or []
-                if not rows:
-                    return None
-                row = rows[0]
-                # Return the full row dict; caller can access full_payload from it
-                return row
+            client = get_supabase_client()
+            response = await client.get(
+                self.endpoint,
+                headers=self.headers,
+                params={"id": f"eq.{situation_id}", "select": "*"},
+            )
+            response.raise_for_status()
+            rows = response.content and __import__("json").loads(response.content) or []
+            if not rows:
+                return None
+            row = rows[0]
+            # Return the full row dict; caller can access full_payload from it
+            return row
         except Exception as exc:
             logger.warning("SituationsStore.get_situation failed (non-fatal): %s", exc)
             return None
@@ -217,20 +258,20 @@ class SituationsStore:
             for key, value in kwargs.items():
                 patch_body[key] = value
 
-            async with httpx.AsyncClient() as client:
-                response = await client.patch(
-                    self.endpoint,
-                    headers=self.headers,
-                    params={"id": f"eq.{situation_id}"},
-                    json=patch_body,
+            client = get_supabase_client()
+            response = await client.patch(
+                self.endpoint,
+                headers=self.headers,
+                params={"id": f"eq.{situation_id}"},
+                json=patch_body,
+            )
+            if response.status_code not in (200, 204):
+                logger.warning(
+                    "SituationsStore.update_status: unexpected status %s — %s",
+                    response.status_code,
+                    response.text[:200],
                 )
-                if response.status_code not in (200, 204):
-                    logger.warning(
-                        "SituationsStore.update_status: unexpected status %s — %s",
-                        response.status_code,
-                        response.text[:200],
-                    )
-                    return False
+                return False
             return True
         except Exception as exc:
             logger.warning("SituationsStore.update_status failed (non-fatal): %s", exc)
@@ -251,14 +292,14 @@ class SituationsStore:
             if principal_id:
                 params["principal_id"] = f"eq.{principal_id}"
 
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    self.endpoint,
-                    headers=self.headers,
-                    params=params,
-                )
-                response.raise_for_status()
-                return __import__("json").loads(response.content) if response.content else []
+            client = get_supabase_client()
+            response = await client.get(
+                self.endpoint,
+                headers=self.headers,
+                params=params,
+            )
+            response.raise_for_status()
+            return __import__("json").loads(response.content) if response.content else []
         except Exception as exc:
             logger.warning("SituationsStore.get_open_situations failed (non-fatal): %s", exc)
             return []
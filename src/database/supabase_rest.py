@@ -0,0 +1,269 @@
+"""
+Shared, pooled HTTP client for the Supabase REST stores.
+
+Every Supabase-backed store (SituationsStore, AssessmentStore, BriefingStore,
+VASolutionsStore, SupabaseBusinessContextProvider) used to open a fresh
+httpx.AsyncClient() per call, paying a TCP + TLS handshake on every read and
+write. They now share one process-wide client with keep-alive pooling:
+
+- get_supabase_client()   — the shared client; created lazily on first use
+- open_supabase_client()  — eager creation (AgentRuntime.initialize)
+- close_supabase_client() — drains the pool (AgentRuntime.shutdown)
+
+The client exposes the same get/post/patch/delete coroutines as httpx, so the
+stores keep their existing request code and non-fatal error handling.
+bulk_upsert() sends many rows as chunked JSON-array POSTs (one round-trip per
+SUPABASE_BULK_CHUNK_SIZE rows) and reports success per row.
+Transient failures (connection errors, 429, 502/503/504) are retried with
+exponential backoff — only for requests that are safe to repeat: reads,
+PATCH/DELETE, and POST upserts sent with "resolution=merge-duplicates".
+
+Tuning (env vars, all optional)
+-------------------------------
+  SUPABASE_HTTP_MAX_CONNECTIONS   pool size                      (default 20)
+  SUPABASE_HTTP_MAX_KEEPALIVE     idle keep-alive connections    (default 10)
+  SUPABASE_HTTP_KEEPALIVE_EXPIRY  idle connection lifetime, sec  (default 30)
+  SUPABASE_HTTP_TIMEOUT           per-request timeout, sec       (default 10)
+  SUPABASE_HTTP_MAX_RETRIES       retries after the first try    (default 2)
+  SUPABASE_HTTP_BACKOFF           first backoff delay, sec       (default 0.25)
+  SUPABASE_HTTP2                  "0" disables HTTP/2            (default on
+                                  when the h2 package is installed)
+  SUPABASE_BULK_CHUNK_SIZE        rows per bulk upsert request   (default 500)
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+from typing import Any, Dict, List, Optional, Sequence
+
+try:
+    import httpx
+except ImportError:
+    httpx = None  # type: ignore
+
+try:
+    import h2  # noqa: F401  (httpx needs it for http2=True)
+    _H2_AVAILABLE = True
+except ImportError:
+    _H2_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+_RETRY_STATUSES = frozenset({429, 502, 503, 504})
+_IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "PATCH", "DELETE"})
+_OK_STATUSES = (200, 201, 204)
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+class SupabaseRestClient:
+    """Process-wide pooled httpx.AsyncClient with retry/backoff for Supabase REST."""
+
+    def __init__(
+        self,
+        max_connections: Optional[int] = None,
+        max_keepalive_connections: Optional[int] = None,
+        keepalive_expiry: Optional[float] = None,
+        timeout: Optional[float] = None,
+        max_retries: Optional[int] = None,
+        backoff_seconds: Optional[float] = None,
+        http2: Optional[bool] = None,
+        transport: Optional["httpx.AsyncBaseTransport"] = None,
+    ) -> None:
+        self.max_connections = max_connections or _env_int("SUPABASE_HTTP_MAX_CONNECTIONS", 20)
+        self.max_keepalive_connections = (
+            max_keepalive_connections or _env_int("SUPABASE_HTTP_MAX_KEEPALIVE", 10)
+        )
+        self.keepalive_expiry = keepalive_expiry or _env_float("SUPABASE_HTTP_KEEPALIVE_EXPIRY", 30.0)
+        self.timeout = timeout or _env_float("SUPABASE_HTTP_TIMEOUT", 10.0)
+        self.max_retries = (
+            max_retries if max_retries is not None else _env_int("SUPABASE_HTTP_MAX_RETRIES", 2)
+        )
+        self.backoff_seconds = (
+            backoff_seconds if backoff_seconds is not None else _env_float("SUPABASE_HTTP_BACKOFF", 0.25)
+        )
+        if http2 is None:
+            http2 = os.getenv("SUPABASE_HTTP2", "1") != "0"
+        if http2 and not _H2_AVAILABLE:
+            logger.warning(
+                "SupabaseRestClient: HTTP/2 requested but the h2 package is missing "
+                "(install httpx[http2]); using HTTP/1.1"
+            )
+        self.http2 = bool(http2) and _H2_AVAILABLE
+        self._transport = transport
+
+        self._client: Optional["httpx.AsyncClient"] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def _get_client(self) -> "httpx.AsyncClient":
+        """Return the pooled client, (re)creating it for the running event loop.
+
+        Pooled connections are bound to the loop that opened them, so a client
+        left over from a finished loop (asyncio.run in a CLI, per-test loops) is
+        dropped rather than reused.
+        """
+        if httpx is None:
+            raise RuntimeError("httpx is not installed")
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._loop is not loop:
+            self._client = httpx.AsyncClient(
+                http2=self.http2,
+                transport=self._transport,
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_keepalive_connections,
+                    keepalive_expiry=self.keepalive_expiry,
+                ),
+            )
+            self._loop = loop
+            logger.debug(
+                "SupabaseRestClient: opened pool (max=%s, keepalive=%s, http2=%s)",
+                self.max_connections, self.max_keepalive_connections, self.http2,
+            )
+        return self._client
+
+    async def open(self) -> None:
+        if httpx is not None:
+            self._get_client()
+
+    async def aclose(self) -> None:
+        client, self._client, self._loop = self._client, None, None
+        if client is not None and not client.is_closed:
+            await client.aclose()
+
+    @property
+    def is_open(self) -> bool:
+        return self._client is not None and not self._client.is_closed
+
+    # ------------------------------------------------------------------
+    # Requests
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _is_retry_safe(method: str, headers: Optional[dict]) -> bool:
+        if method in _IDEMPOTENT_METHODS:
+            return True
+        prefer = (headers or {}).get("Prefer", "")
+        return method == "POST" and "resolution=merge-duplicates" in prefer
+
+    async def request(self, method: str, url: str, **kwargs: Any) -> "httpx.Response":
+        method = method.upper()
+        retries = self.max_retries if self._is_retry_safe(method, kwargs.get("headers")) else 0
+        attempt = 0
+        while True:
+            try:
+                response = await self._get_client().request(method, url, **kwargs)
+            except httpx.TransportError as exc:
+                if attempt >= retries:
+                    raise
+                logger.debug("SupabaseRestClient: %s %s failed (%s) — retrying", method, url, exc)
+            else:
+                if response.status_code not in _RETRY_STATUSES or attempt >= retries:
+                    return response
+                logger.debug(
+                    "SupabaseRestClient: %s %s returned %s — retrying",
+                    method, url, response.status_code,
+                )
+            await asyncio.sleep(self.backoff_seconds * (2 ** attempt))
+            attempt += 1
+
+    async def get(self, url: str, **kwargs: Any) -> "httpx.Response":
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs: Any) -> "httpx.Response":
+        return await self.request("POST", url, **kwargs)
+
+    async def patch(self, url: str, **kwargs: Any) -> "httpx.Response":
+        return await self.request("PATCH", url, **kwargs)
+
+    async def delete(self, url: str, **kwargs: Any) -> "httpx.Response":
+        return await self.request("DELETE", url, **kwargs)
+
+    async def bulk_upsert(
+        self,
+        url: str,
+        headers: Dict[str, str],
+        rows: Sequence[Dict[str, Any]],
+        chunk_size: Optional[int] = None,
+    ) -> List[bool]:
+        """Upsert rows as chunked JSON arrays; return one success flag per row.
+
+        PostgREST applies an array payload atomically, so when a chunk is
+        rejected its rows are re-sent one at a time to tell the bad rows from
+        the good ones. Rows in a chunk must share the same keys.
+        """
+        chunk_size = max(1, chunk_size or _env_int("SUPABASE_BULK_CHUNK_SIZE", 500))
+        upsert_headers = {
+            **headers,
+            "Prefer": "resolution=merge-duplicates,return=minimal",
+        }
+        results: List[bool] = []
+        for start in range(0, len(rows), chunk_size):
+            chunk = list(rows[start:start + chunk_size])
+            if await self._post_rows(url, upsert_headers, chunk):
+                results.extend([True] * len(chunk))
+            elif len(chunk) == 1:
+                results.append(False)
+            else:
+                for row in chunk:
+                    results.append(await self._post_rows(url, upsert_headers, [row]))
+        return results
+
+    async def _post_rows(
+        self, url: str, headers: Dict[str, str], rows: List[Dict[str, Any]]
+    ) -> bool:
+        payload: Any = rows[0] if len(rows) == 1 else rows
+        try:
+            response = await self.post(url, headers=headers, json=payload)
+        except Exception as exc:
+            logger.warning("SupabaseRestClient.bulk_upsert: %d row(s) failed — %s", len(rows), exc)
+            return False
+        if response.status_code not in _OK_STATUSES:
+            logger.warning(
+                "SupabaseRestClient.bulk_upsert: %d row(s) rejected with status %s — %s",
+                len(rows), response.status_code, response.text[:200],
+            )
+            return False
+        return True
+
+
+_shared_client: Optional[SupabaseRestClient] = None
+
+
+def get_supabase_client() -> SupabaseRestClient:
+    """Return the process-wide Supabase REST client."""
+    global _shared_client
+    if _shared_client is None:
+        _shared_client = SupabaseRestClient()
+    return _shared_client
+
+
+async def open_supabase_client() -> SupabaseRestClient:
+    """Create the shared client's connection pool up front."""
+    client = get_supabase_client()
+    await client.open()
+    return client
+
+
+async def close_supabase_client() -> None:
+    """Close the shared client's connection pool, if one is open."""
+    if _shared_client is not None:
+        await _shared_client.aclose()
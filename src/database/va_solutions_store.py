@@ -4,7 +4,7 @@ Supabase persistence layer for Value Assurance solutions and evaluations.
 Follows the same httpx REST pattern as SituationsStore (situations_store.py):
 - env-var gated (SUPABASE_URL + SUPABASE_SERVICE_ROLE_KEY)
 - non-fatal: all failures log a warning and return False / None / []
-- one httpx.AsyncClient() per request (async context manager)
+- shared pooled client from supabase_rest.get_supabase_client()
 - Upsert via POST with "Prefer": "resolution=merge-duplicates"
 - PATCH for updates
 - GET with query-string params for reads
@@ -26,6 +26,7 @@ try:
 except ImportError:
     httpx = None  # type: ignore
 
+from src.database.supabase_rest import get_supabase_client
 from src.agents.models.value_assurance_models import AcceptedSolution, ImpactEvaluation
 
 logger = logging.getLogger(__name__)
@@ -138,19 +139,19 @@ class VASolutionsStore:
                 "expected_impact_lower", "expected_impact_upper",
             }}
 
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    self.solutions_endpoint,
-                    headers={**self.headers, "Prefer": "resolution=merge-duplicates"},
-                    json=row,
+            client = get_supabase_client()
+            response = await client.post(
+                self.solutions_endpoint,
+                headers={**self.headers, "Prefer": "resolution=merge-duplicates"},
+                json=row,
+            )
+            if response.status_code not in (200, 201, 204):
+                logger.warning(
+                    "VASolutionsStore.upsert_solution: unexpected status %s — %s",
+                    response.status_code,
+                    response.text[:200],
                 )
-                if response.status_code not in (200, 201, 204):
-                    logger.warning(
-                        "VASolutionsStore.upsert_solution: unexpected status %s — %s",
-                        response.status_code,
-                        response.text[:200],
-                    )
-                    return False
+                return False
             return True
         except Exception as exc:
             logger.warning("VASolutionsStore.upsert_solution failed (non-fatal): %s", exc)
@@ -165,21 +166,21 @@ class VASolutionsStore:
         if not self.enabled:
             return None
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    self.solutions_endpoint,
-                    headers=self.headers,
-                    params={"id": f"eq.{solution_id}", "select": "*"},
-                )
-                response.raise_for_status()
-                rows = json.loads(response.content) if response.content else []
-                if not rows:
-                    return None
-                row = rows[0]
-                # Remap Supabase 'id' column → Pydantic 'solution_id' field
-                if "id" in row and "solution_id" not in row:
-                    row["solution_id"] = row.pop("id")
-                return row
+            client = get_supabase_client()
+            response = await client.get(
+                self.solutions_endpoint,
+                headers=self.headers,
+                params={"id": f"eq.{solution_id}", "select": "*"},
+            )
+            response.raise_for_status()
+            rows = json.loads(response.content) if response.content else []
+            if not rows:
+                return None
+            row = rows[0]
+            # Remap Supabase 'id' column → Pydantic 'solution_id' field
+            if "id" in row and "solution_id" not in row:
+                row["solution_id"] = row.pop("id")
+            return row
         except Exception as exc:
             logger.warning("VASolutionsStore.get_solution failed (non-fatal): %s", exc)
             return None
@@ -203,19 +204,19 @@ class VASolutionsStore:
             }
             if client_id:
                 params["client_id"] = f"eq.{client_id}"
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    self.solutions_endpoint,
-                    headers=self.headers,
-                    params=params,
-                )
-                response.raise_for_status()
-                rows = json.loads(response.content) if response.content else []
-                # Remap Supabase 'id' column → Pydantic 'solution_id' field
-                for row in rows:
-                    if "id" in row and "solution_id" not in row:
-                        row["solution_id"] = row.pop("id")
-                return rows
+            client = get_supabase_client()
+            response = await client.get(
+                self.solutions_endpoint,
+                headers=self.headers,
+                params=params,
+            )
+            response.raise_for_status()
+            rows = json.loads(response.content) if response.content else []
+            # Remap Supabase 'id' column → Pydantic 'solution_id' field
+            for row in rows:
+                if "id" in row and "solution_id" not in row:
+                    row["solution_id"] = row.pop("id")
+            return rows
         except Exception as exc:
             logger.warning(
                 "VASolutionsStore.get_solutions_by_principal failed (non-fatal): %s", exc
@@ -231,20 +232,20 @@ class VASolutionsStore:
         if not self.enabled:
             return False
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.patch(
-                    self.solutions_endpoint,
-                    headers=self.headers,
-                    params={"id": f"eq.{solution_id}"},
-                    json={"status": status},
+            client = get_supabase_client()
+            response = await client.patch(
+                self.solutions_endpoint,
+                headers=self.headers,
+                params={"id": f"eq.{solution_id}"},
+                json={"status": status},
+            )
+            if response.status_code not in (200, 204):
+                logger.warning(
+                    "VASolutionsStore.update_status: unexpected status %s — %s",
+                    response.status_code,
+                    response.text[:200],
                 )
-                if response.status_code not in (200, 204):
-                    logger.warning(
-                        "VASolutionsStore.update_status: unexpected status %s — %s",
-                        response.status_code,
-                        response.text[:200],
-                    )
-                    return False
+                return False
             return True
         except Exception as exc:
             logger.warning("VASolutionsStore.update_status failed (non-fatal): %s", exc)
@@ -264,20 +265,20 @@ class VASolutionsStore:
                 payload["go_live_at"] = go_live_at
             if completed_at:
                 payload["completed_at"] = completed_at
-            async with httpx.AsyncClient() as client:
-                response = await client.patch(
-                    self.solutions_endpoint,
-                    headers=self.headers,
-                    params={"id": f"eq.{solution_id}"},
-                    json=payload,
+            client = get_supabase_client()
+            response = await client.patch(
+                self.solutions_endpoint,
+                headers=self.headers,
+                params={"id": f"eq.{solution_id}"},
+                json=payload,
+            )
+            if response.status_code not in (200, 204):
+                logger.warning(
+                    "VASolutionsStore.update_phase: unexpected status %s — %s",
+                    response.status_code,
+                    response.text[:200],
                 )
-                if response.status_code not in (200, 204):
-                    logger.warning(
-                        "VASolutionsStore.update_phase: unexpected status %s — %s",
-                        response.status_code,
-                        response.text[:200],
-                    )
-                    return False
+                return False
             return True
         except Exception as exc:
             logger.warning("VASolutionsStore.update_phase failed (non-fatal): %s", exc)
@@ -300,49 +301,49 @@ class VASolutionsStore:
             return False
         try:
             # Step 1: fetch current arrays
-            async with httpx.AsyncClient() as client:
-                get_response = await client.get(
-                    self.solutions_endpoint,
-                    headers=self.headers,
-                    params={
-                        "id": f"eq.{solution_id}",
-                        "select": "actual_trend,actual_trend_dates",
-                    },
+            client = get_supabase_client()
+            get_response = await client.get(
+                self.solutions_endpoint,
+                headers=self.headers,
+                params={
+                    "id": f"eq.{solution_id}",
+                    "select": "actual_trend,actual_trend_dates",
+                },
+            )
+            get_response.raise_for_status()
+            rows = json.loads(get_response.content) if get_response.content else []
+            if not rows:
+                logger.warning(
+                    "VASolutionsStore.append_actual_measurement: solution %s not found.",
+                    solution_id,
                 )
-                get_response.raise_for_status()
-                rows = json.loads(get_response.content) if get_response.content else []
-                if not rows:
-                    logger.warning(
-                        "VASolutionsStore.append_actual_measurement: solution %s not found.",
-                        solution_id,
-                    )
-                    return False
-
-                row = rows[0]
-                actual_trend: List[float] = row.get("actual_trend") or []
-                actual_trend_dates: List[str] = row.get("actual_trend_dates") or []
-
-                # Step 2: append
-                actual_trend.append(value)
-                actual_trend_dates.append(date)
-
-                # Step 3: patch
-                patch_response = await client.patch(
-                    self.solutions_endpoint,
-                    headers=self.headers,
-                    params={"id": f"eq.{solution_id}"},
-                    json={
-                        "actual_trend": actual_trend,
-                        "actual_trend_dates": actual_trend_dates,
-                    },
+                return False
+
+            row = rows[0]
+            actual_trend: List[float] = row.get("actual_trend") or []
+            actual_trend_dates: List[str] = row.get("actual_trend_dates") or []
+
+            # Step 2: append
+            actual_trend.append(value)
+            actual_trend_dates.append(date)
+
+            # Step 3: patch
+            patch_response = await client.patch(
+                self.solutions_endpoint,
+                headers=self.headers,
+                params={"id": f"eq.{solution_id}"},
+                json={
+                    "actual_trend": actual_trend,
+                    "actual_trend_dates": actual_trend_dates,
+                },
+            )
+            if patch_response.status_code not in (200, 204):
+                logger.warning(
+                    "VASolutionsStore.append_actual_measurement: PATCH status %s — %s",
+                    patch_response.status_code,
+                    patch_response.text[:200],
                 )
-                if patch_response.status_code not in (200, 204):
-                    logger.warning(
-                        "VASolutionsStore.append_actual_measurement: PATCH status %s — %s",
-                        patch_response.status_code,
-                        patch_response.text[:200],
-                    )
-                    return False
+                return False
             return True
         except Exception as exc:
             logger.warning(
@@ -355,19 +356,19 @@ class VASolutionsStore:
         if not self.enabled:
             return False
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.patch(
-                    self.solutions_endpoint,
-                    headers=self.headers,
-                    params={"id": f"eq.{solution_id}"},
-                    json={"briefing_snapshot": snapshot},
+            client = get_supabase_client()
+            response = await client.patch(
+                self.solutions_endpoint,
+                headers=self.headers,
+                params={"id": f"eq.{solution_id}"},
+                json={"briefing_snapshot": snapshot},
+            )
+            if response.status_code not in (200, 204):
+                logger.warning(
+                    "VASolutionsStore.store_briefing_snapshot: status %s — %s",
+                    response.status_code, response.text[:200],
                 )
-                if response.status_code not in (200, 204):
-                    logger.warning(
-                        "VASolutionsStore.store_briefing_snapshot: status %s — %s",
-                        response.status_code, response.text[:200],
-                    )
-                    return False
+                return False
             return True
         except Exception as exc:
             logger.warning("VASolutionsStore.store_briefing_snapshot failed: %s", exc)
@@ -378,17 +379,17 @@ class VASolutionsStore:
         if not self.enabled:
             return None
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    self.solutions_endpoint,
-                    headers=self.headers,
-                    params={"id": f"eq.{solution_id}", "select": "briefing_snapshot"},
-                )
-                response.raise_for_status()
-                rows = json.loads(response.content) if response.content else []
-                if not rows or not rows[0].get("briefing_snapshot"):
-                    return None
-                return rows[0]["briefing_snapshot"]
+            client = get_supabase_client()
+            response = await client.get(
+                self.solutions_endpoint,
+                headers=self.headers,
+                params={"id": f"eq.{solution_id}", "select": "briefing_snapshot"},
+            )
+            response.raise_for_status()
+            rows = json.loads(response.content) if response.content else []
+            if not rows or not rows[0].get("briefing_snapshot"):
+                return None
+            return rows[0]["briefing_snapshot"]
         except Exception as exc:
             logger.warning("VASolutionsStore.get_briefing_snapshot failed: %s", exc)
             return None
@@ -446,19 +447,19 @@ class VASolutionsStore:
                 "vs_plan_pct": getattr(evaluation, "vs_plan_pct", None),
             }
 
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    self.evaluations_endpoint,
-                    headers={**self.headers, "Prefer": "resolution=merge-duplicates"},
-                    json=row,
+            client = get_supabase_client()
+            response = await client.post(
+                self.evaluations_endpoint,
+                headers={**self.headers, "Prefer": "resolution=merge-duplicates"},
+                json=row,
+            )
+            if response.status_code not in (200, 201, 204):
+                logger.warning(
+                    "VASolutionsStore.upsert_evaluation: unexpected status %s — %s",
+                    response.status_code,
+                    response.text[:200],
                 )
-                if response.status_code not in (200, 201, 204):
-                    logger.warning(
-                        "VASolutionsStore.upsert_evaluation: unexpected status %s — %s",
-                        response.status_code,
-                        response.text[:200],
-                    )
-                    return False
+                return False
             return True
         except Exception as exc:
             logger.warning("VASolutionsStore.upsert_evaluation failed (non-fatal): %s", exc)
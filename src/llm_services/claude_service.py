@@ -8,6 +8,8 @@ per-call model overrides, and guardrail enforcement.
 
 import os
 import json
+import random
+import asyncio
 import logging
 from typing import Dict, Any, List, Optional, Union
 from datetime import datetime
@@ -16,6 +18,8 @@ import anthropic
 from pydantic import BaseModel, ConfigDict, Field
 from dotenv import load_dotenv
 
+from src.llm_services.scheduler import rate_limit_fields
+
 load_dotenv()
 
 logging.basicConfig(level=logging.INFO)
@@ -169,12 +173,81 @@ def get_model_capabilities(model_id: str) -> ModelCapabilities:
     return MODEL_CAPABILITIES[best]
 
 
+# Anthropic accepts at most four cache_control breakpoints per request.
+_MAX_CACHE_BREAKPOINTS = 4
+
+
+def _apply_cache_breakpoints(
+    messages: List[Dict[str, Any]],
+    cache_breakpoints: Optional[List[int]],
+) -> List[Dict[str, Any]]:
+    """
+    Split the last user message's text at each character offset in
+    `cache_breakpoints` and mark every block ending at an offset with
+    cache_control, so the prompt prefix up to that point is cached and re-read
+    by later calls sharing it. Offsets outside the text are ignored; beyond the
+    API limit, the deepest breakpoints are kept.
+    """
+    if not cache_breakpoints or not messages:
+        return messages
+    last = messages[-1]
+    text = last.get("content")
+    if last.get("role") != "user" or not isinstance(text, str):
+        return messages
+    offsets = sorted({int(o) for o in cache_breakpoints if 0 < int(o) < len(text)})
+    if not offsets:
+        return messages
+    if len(offsets) > _MAX_CACHE_BREAKPOINTS:
+        logger.warning(
+            f"{len(offsets)} cache breakpoints requested; keeping the deepest {_MAX_CACHE_BREAKPOINTS}"
+        )
+        offsets = offsets[-_MAX_CACHE_BREAKPOINTS:]
+    blocks: List[Dict[str, Any]] = []
+    start = 0
+    for offset in offsets:
+        blocks.append({"type": "text", "text": text[start:offset], "cache_control": {"type": "ephemeral"}})
+        start = offset
+    blocks.append({"type": "text", "text": text[start:]})
+    return [*messages[:-1], {**last, "content": blocks}]
+
+
+def _usage_dict(message: Any) -> Dict[str, Any]:
+    """Token usage of a Messages API response, including prompt-cache reads/writes.
+
+    input_tokens excludes cached tokens, so prompt_tokens is the uncached part
+    of the prompt; cache_read_input_tokens are billed at the reduced read rate
+    and cache_creation_input_tokens at the write rate.
+    """
+    u = message.usage
+    usage = {
+        "prompt_tokens": u.input_tokens,
+        "completion_tokens": u.output_tokens,
+        "total_tokens": u.input_tokens + u.output_tokens,
+    }
+    # Older SDKs lack these attributes; treat anything non-integer as absent.
+    cache_read = getattr(u, "cache_read_input_tokens", None)
+    cache_write = getattr(u, "cache_creation_input_tokens", None)
+    cache_read = cache_read if isinstance(cache_read, int) else 0
+    cache_write = cache_write if isinstance(cache_write, int) else 0
+    if cache_read or cache_write:
+        usage["cache_read_input_tokens"] = cache_read
+        usage["cache_creation_input_tokens"] = cache_write
+    return usage
+
+
+def _cache_usage_note(usage: Dict[str, Any]) -> str:
+    if "cache_read_input_tokens" not in usage:
+        return ""
+    return f" (cache read={usage['cache_read_input_tokens']} write={usage['cache_creation_input_tokens']})"
+
+
 def build_messages_kwargs(
     model: str,
     max_tokens: int,
     temperature: Optional[float],
     system: str,
     messages: List[Dict[str, Any]],
+    cache_breakpoints: Optional[List[int]] = None,
 ) -> Dict[str, Any]:
     """
     Build kwargs for client.messages.create() that are valid for the target model.
@@ -187,6 +260,9 @@ def build_messages_kwargs(
     - For Fable 5, opts into server-side refusal fallbacks so classifier false-positives
       are re-served by FABLE_FALLBACK_MODEL instead of failing the request.
     - Clamps max_tokens to the model's output ceiling (warns when clamping).
+    - Marks prompt-cache breakpoints: each offset in `cache_breakpoints` (characters
+      into the final user message) ends a cache_control block — see
+      _apply_cache_breakpoints.
     """
     caps = get_model_capabilities(model)
 
@@ -201,7 +277,7 @@ def build_messages_kwargs(
         "model": model,
         "max_tokens": _max_tokens,
         "system": system,
-        "messages": messages,
+        "messages": _apply_cache_breakpoints(messages, cache_breakpoints),
     }
 
     if caps.accepts_temperature and temperature is not None:
@@ -260,6 +336,44 @@ class ClaudeServiceConfig(BaseModel):
     guardrails_path: str = "docs/cascade_guardrails.yaml"
     prompt_templates_path: str = "docs/cascade_prompt_templates.md"
     system_prompt_override: Optional[str] = None
+    # Retry/backoff for connection errors, 408/409, 5xx and 529 overloaded
+    # (SDK retries are off; see _final_message). 429s are only retried here
+    # with retry_rate_limits — A9_LLM_Service_Agent turns it off when its
+    # scheduler re-queues them, so the two never stack.
+    max_retries: int = 2
+    retry_base_delay_seconds: float = 0.5
+    retry_max_delay_seconds: float = 8.0
+    retry_rate_limits: bool = True
+
+
+_RETRYABLE_STATUS = {408, 409}
+
+
+def _retry_after_seconds(error: Exception) -> Optional[float]:
+    """Server-requested delay from a Retry-After / retry-after-ms header, if any."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000.0
+        if headers.get("retry-after"):
+            return float(headers["retry-after"])
+    except (TypeError, ValueError):
+        return None
+    return None
+
+
+def _is_retryable(error: Exception, retry_rate_limits: bool = True) -> bool:
+    if isinstance(error, anthropic.APIConnectionError):  # includes APITimeoutError
+        return True
+    if isinstance(error, anthropic.APIStatusError):
+        if error.status_code == 429:
+            return retry_rate_limits
+        body = getattr(error, "body", None)
+        if isinstance(body, dict) and (body.get("error") or {}).get("type") == "overloaded_error":
+            return True  # overloaded mid-stream arrives on an HTTP 200
+        return error.status_code in _RETRYABLE_STATUS or error.status_code >= 500
+    return False
 
 
 # ---------------------------------------------------------------------------
@@ -313,7 +427,9 @@ class ClaudeService:
         # in flight. It also makes SF's three "parallel" Stage 1 persona calls
         # (a9_solution_finder_agent.py, asyncio.gather) actually parallel — they were
         # documented as concurrent but ran strictly one after another.
-        self.client = anthropic.AsyncAnthropic(api_key=api_key)
+        # Retries are ours (_final_message), so a 429 can be left to the scheduler
+        # while overloaded/5xx/connection errors are still retried.
+        self.client = anthropic.AsyncAnthropic(api_key=api_key, max_retries=0)
         logger.info(f"Anthropic SDK version: {anthropic.__version__}")
 
         self.guardrails = self._load_guardrails()
@@ -373,6 +489,35 @@ class ClaudeService:
             logger.error(f"Missing variable in template '{template_id}': {e}")
             return None
 
+    async def _final_message(self, request_id: str, kwargs: Dict[str, Any]):
+        """
+        One streamed Messages call, returned as (final message, stream).
+
+        SDK retries are off (max_retries=0) so the retry policy lives here:
+        connection errors, 408/409, 5xx and 529 overloaded back off
+        exponentially with jitter (or for the server's Retry-After) up to
+        config.max_retries times; 429s only with config.retry_rate_limits.
+        """
+        attempt = 0
+        while True:
+            try:
+                async with self.client.messages.stream(**kwargs) as stream:
+                    return await stream.get_final_message(), stream
+            except Exception as e:
+                if attempt >= self.config.max_retries or not _is_retryable(e, self.config.retry_rate_limits):
+                    raise
+                delay = _retry_after_seconds(e)
+                if delay is None:
+                    delay = self.config.retry_base_delay_seconds * (2 ** attempt)
+                    delay = random.uniform(delay / 2, delay)
+                delay = min(delay, self.config.retry_max_delay_seconds)
+                attempt += 1
+                logger.warning(
+                    f"[ClaudeService] {request_id} {type(e).__name__} — "
+                    f"retry {attempt}/{self.config.max_retries} in {delay:.1f}s"
+                )
+                await asyncio.sleep(delay)
+
     # ------------------------------------------------------------------
     # Core generation (Messages API)
     # ------------------------------------------------------------------
@@ -384,6 +529,7 @@ class ClaudeService:
         max_tokens: Optional[int] = None,
         temperature: Optional[float] = None,
         model: Optional[str] = None,
+        cache_breakpoints: Optional[List[int]] = None,
     ) -> Dict[str, Any]:
         """
         Generate a response from Claude using the Messages API.
@@ -394,6 +540,8 @@ class ClaudeService:
             max_tokens:    Override max tokens.
             temperature:   Override temperature.
             model:         Override model (e.g. 'claude-haiku-4-5-20251001' for Stage 1 calls).
+            cache_breakpoints: Character offsets into `prompt` ending prefixes to
+                           prompt-cache (shared context reused across calls).
         """
         try:
             _system = system_prompt or self.get_system_prompt()
@@ -417,16 +565,14 @@ class ClaudeService:
             # That 20000 wall was capping SF synthesis, which generates right at it
             # (measured: exactly 20000 output tokens) and truncates mid-object,
             # yielding the heuristic stub under status="success".
-            async with self.client.messages.stream(
-                **build_messages_kwargs(
-                    model=_model,
-                    max_tokens=_max_tokens,
-                    temperature=_temperature,
-                    system=_system,
-                    messages=[{"role": "user", "content": prompt}],
-                )
-            ) as _stream:
-                message = await _stream.get_final_message()
+            message, _stream = await self._final_message(request_id, build_messages_kwargs(
+                model=_model,
+                max_tokens=_max_tokens,
+                temperature=_temperature,
+                system=_system,
+                messages=[{"role": "user", "content": prompt}],
+                cache_breakpoints=cache_breakpoints,
+            ))
 
             # Safety classifiers (Fable 5) can decline with HTTP 200 + stop_reason="refusal".
             # With server-side fallbacks enabled this only surfaces if the whole chain refused.
@@ -448,15 +594,12 @@ class ClaudeService:
                 (b.text for b in (message.content or []) if getattr(b, "type", None) == "text"),
                 "",
             )
-            usage = {
-                "prompt_tokens": message.usage.input_tokens,
-                "completion_tokens": message.usage.output_tokens,
-                "total_tokens": message.usage.input_tokens + message.usage.output_tokens,
-            }
+            usage = _usage_dict(message)
 
             logger.info(
                 f"[ClaudeService] {request_id} ✓ — "
                 f"in={usage['prompt_tokens']} out={usage['completion_tokens']} tokens"
+                f"{_cache_usage_note(usage)}"
             )
             return {
                 "request_id": request_id,
@@ -466,6 +609,7 @@ class ClaudeService:
                 "response": response_text,
                 "usage": usage,
                 "timestamp": datetime.now().isoformat(),
+                **rate_limit_fields(_stream),
             }
 
         except Exception as e:
@@ -476,6 +620,7 @@ class ClaudeService:
                 "model": model or self.config.model_name,
                 "response": None,
                 "timestamp": datetime.now().isoformat(),
+                **rate_limit_fields(e),
             }
 
     async def generate_structured(
@@ -487,6 +632,7 @@ class ClaudeService:
         max_tokens: Optional[int] = None,
         temperature: Optional[float] = None,
         model: Optional[str] = None,
+        cache_breakpoints: Optional[List[int]] = None,
     ) -> Dict[str, Any]:
         """
         Generate a schema-guaranteed JSON response via forced Anthropic tool-use
@@ -516,6 +662,7 @@ class ClaudeService:
                 temperature=_temperature,
                 system=_system,
                 messages=[{"role": "user", "content": prompt}],
+                cache_breakpoints=cache_breakpoints,
             )
             kwargs["tools"] = [{
                 "name": tool_name,
@@ -527,8 +674,7 @@ class ClaudeService:
             # Streamed for the same reason as the free-text path above (SDK rejects
             # large non-streaming max_tokens). get_final_message() returns the same
             # object shape, so the tool_use block extraction below is untouched.
-            async with self.client.messages.stream(**kwargs) as _stream:
-                message = await _stream.get_final_message()
+            message, _stream = await self._final_message(request_id, kwargs)
 
             if getattr(message, "stop_reason", None) == "refusal":
                 details = getattr(message, "stop_details", None)
@@ -556,15 +702,12 @@ class ClaudeService:
                     "timestamp": datetime.now().isoformat(),
                 }
 
-            usage = {
-                "prompt_tokens": message.usage.input_tokens,
-                "completion_tokens": message.usage.output_tokens,
-                "total_tokens": message.usage.input_tokens + message.usage.output_tokens,
-            }
+            usage = _usage_dict(message)
 
             logger.info(
                 f"[ClaudeService] {request_id} ✓ (structured) — "
                 f"in={usage['prompt_tokens']} out={usage['completion_tokens']} tokens"
+                f"{_cache_usage_note(usage)}"
             )
             return {
                 "request_id": request_id,
@@ -572,6 +715,7 @@ class ClaudeService:
                 "response": json.dumps(tool_use_block.input),
                 "usage": usage,
                 "timestamp": datetime.now().isoformat(),
+                **rate_limit_fields(_stream),
             }
 
         except Exception as e:
@@ -582,6 +726,7 @@ class ClaudeService:
                 "model": model or self.config.model_name,
                 "response": None,
                 "timestamp": datetime.now().isoformat(),
+                **rate_limit_fields(e),
             }
 
     def generate_with_template(
@@ -601,7 +746,6 @@ class ClaudeService:
                 "response": None,
                 "timestamp": datetime.now().isoformat(),
             }
-        import asyncio
         return asyncio.get_event_loop().run_until_complete(
             self.generate(
                 prompt=formatted,
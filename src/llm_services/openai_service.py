@@ -9,18 +9,29 @@ Supports multi-model configuration for different task types:
 - NLP parsing: optimized for extraction
 - Reasoning/Solution finding: optimized for complex analysis
 - General: balanced for most tasks
+
+Calls go through AsyncOpenAI on one pooled HTTP client per event loop, streamed
+and accumulated into the same result dict as before, with retry/backoff on
+rate limits, timeouts and 5xx — the same non-blocking behaviour as ClaudeService.
 """
 
 import os
 import json
+import random
+import asyncio
 import logging
+import weakref
 from typing import Dict, Any, List, Optional, Union
 from datetime import datetime
+import httpx
 import yaml
-from openai import OpenAI
+import openai
+from openai import AsyncOpenAI
 from pydantic import BaseModel, ConfigDict, Field
 from dotenv import load_dotenv
 
+from src.llm_services.scheduler import rate_limit_fields
+
 # Load environment variables from .env file
 load_dotenv()
 
@@ -122,6 +133,61 @@ class OpenAIServiceConfig(BaseModel):
     guardrails_path: str = "docs/cascade_guardrails.yaml"
     prompt_templates_path: str = "docs/cascade_prompt_templates.md"
     system_prompt_override: Optional[str] = None
+    # Transport: connection pool shared per event loop, per-request timeout,
+    # and retry/backoff for 408/409/5xx and connection errors. 429s are only
+    # retried here with retry_rate_limits; A9_LLM_Service_Agent turns it off
+    # when its scheduler re-queues them, so the two never stack.
+    max_connections: int = 20
+    request_timeout_seconds: float = 600.0
+    max_retries: int = 3
+    retry_rate_limits: bool = True
+    retry_base_delay_seconds: float = 1.0
+    retry_max_delay_seconds: float = 30.0
+
+
+# One pooled HTTP client per event loop, shared by every OpenAIService. httpx
+# connections are bound to the loop that opened them, so the pool is keyed by
+# loop rather than being a plain module global. The first service to touch a
+# loop sizes its pool.
+_HTTP_CLIENTS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+
+_RETRYABLE_STATUS = {408, 409}
+
+
+def _shared_http_client(max_connections: int, timeout: float) -> httpx.AsyncClient:
+    loop = asyncio.get_running_loop()
+    client = _HTTP_CLIENTS.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            timeout=httpx.Timeout(timeout, connect=10.0),
+        )
+        _HTTP_CLIENTS[loop] = client
+    return client
+
+
+def _retry_after_seconds(error: Exception) -> Optional[float]:
+    """Server-requested delay from a Retry-After / retry-after-ms header, if any."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000.0
+        if headers.get("retry-after"):
+            return float(headers["retry-after"])
+    except (TypeError, ValueError):
+        return None
+    return None
+
+
+def _is_retryable(error: Exception, retry_rate_limits: bool = True) -> bool:
+    if isinstance(error, openai.APIConnectionError):  # includes APITimeoutError
+        return True
+    if isinstance(error, openai.APIStatusError):
+        if error.status_code == 429:
+            return retry_rate_limits
+        return error.status_code in _RETRYABLE_STATUS or error.status_code >= 500
+    return False
 
 
 class OpenAIService:
@@ -133,7 +199,7 @@ class OpenAIService:
     - Applies system prompts with guardrails
     - Enforces prohibited patterns
     - Provides prompt template integration
-    - Handles API communication with OpenAI
+    - Handles API communication with OpenAI (async, pooled, streamed, retried)
     """
     
     def __init__(self, config: Union[OpenAIServiceConfig, Dict[str, Any]]):
@@ -189,13 +255,12 @@ class OpenAIService:
         masked_key = (api_key[:4] + mask_body) if len(api_key) >= 4 else "****"
         logger.info(f"Initializing OpenAI client with API key: {masked_key}")
         
-        # Initialize OpenAI client
-        try:
-            self.client = OpenAI(api_key=api_key)
-            logger.info(f"OpenAI client initialized successfully")
-        except Exception as e:
-            logger.error(f"Failed to initialize OpenAI client: {str(e)}")
-            raise
+        # ASYNC client, created lazily per event loop on top of the shared
+        # connection pool (see _client). The sync OpenAI client blocked the event
+        # loop for the whole call — every request on the server stalled and
+        # asyncio.gather fan-outs (SF Stage 1 personas) ran one at a time.
+        self._api_key = api_key
+        self._clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncOpenAI]" = weakref.WeakKeyDictionary()
         
         # Load guardrails and prompt templates
         self.guardrails = self._load_guardrails()
@@ -291,11 +356,74 @@ class OpenAIService:
             logger.error(f"Error formatting template '{template_id}': {str(e)}")
             return None
 
-    def generate(self, 
+    def _client(self) -> AsyncOpenAI:
+        """AsyncOpenAI for the running loop, on the shared connection pool.
+
+        SDK retries are off (max_retries=0): _complete retries the whole
+        streamed call itself, so a stream that dies half-way is retried too.
+        """
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None:
+            client = AsyncOpenAI(
+                api_key=self._api_key,
+                max_retries=0,
+                timeout=self.config.request_timeout_seconds,
+                http_client=_shared_http_client(self.config.max_connections, self.config.request_timeout_seconds),
+            )
+            self._clients[loop] = client
+        return client
+
+    async def _complete(self, request_id: str, **kwargs) -> Dict[str, Any]:
+        """
+        One streamed chat completion, accumulated into {"text", "usage", "model",
+        "finish_reason", "rate_limit"}. Retryable failures back off exponentially with jitter
+        (or for the server's Retry-After) up to config.max_retries times.
+        """
+        attempt = 0
+        while True:
+            try:
+                stream = await self._client().chat.completions.create(
+                    stream=True, stream_options={"include_usage": True}, **kwargs
+                )
+                parts: List[str] = []
+                usage = None
+                model = kwargs.get("model")
+                finish_reason = None
+                async for chunk in stream:
+                    model = getattr(chunk, "model", None) or model
+                    if getattr(chunk, "usage", None) is not None:
+                        usage = chunk.usage
+                    for choice in getattr(chunk, "choices", None) or []:
+                        delta = getattr(choice, "delta", None)
+                        if delta is not None and getattr(delta, "content", None):
+                            parts.append(delta.content)
+                        if getattr(choice, "finish_reason", None):
+                            finish_reason = choice.finish_reason
+                return {
+                    "text": "".join(parts), "usage": usage, "model": model, "finish_reason": finish_reason,
+                    **rate_limit_fields(stream),
+                }
+            except Exception as e:
+                if attempt >= self.config.max_retries or not _is_retryable(e, self.config.retry_rate_limits):
+                    raise
+                delay = _retry_after_seconds(e)
+                if delay is None:
+                    delay = self.config.retry_base_delay_seconds * (2 ** attempt)
+                    delay = random.uniform(delay / 2, delay)
+                delay = min(delay, self.config.retry_max_delay_seconds)
+                attempt += 1
+                logger.warning(
+                    f"Request {request_id}: {type(e).__name__} — retry {attempt}/{self.config.max_retries} in {delay:.1f}s"
+                )
+                await asyncio.sleep(delay)
+
+    async def generate(self, 
                 prompt: str, 
                 system_prompt: Optional[str] = None,
                 max_tokens: Optional[int] = None,
-                temperature: Optional[float] = None) -> Dict[str, Any]:
+                temperature: Optional[float] = None,
+                model: Optional[str] = None) -> Dict[str, Any]:
         """
         Generate a response from OpenAI with guardrails applied
         
@@ -304,23 +432,26 @@ class OpenAIService:
             system_prompt: Optional override for system prompt
             max_tokens: Optional override for max tokens
             temperature: Optional override for temperature
+            model: Optional override for the configured model
             
         Returns:
             Dict containing response and metadata
         """
+        _model = model or self.config.model_name
         try:
             # Set up parameters with overrides
             _system_prompt = system_prompt or self.get_system_prompt()
             _max_tokens = max_tokens or self.config.max_tokens
-            _temperature = temperature or self.config.temperature
+            _temperature = temperature if temperature is not None else self.config.temperature
             
             # Log request
-            request_id = f"req_{datetime.now().strftime('%Y%m%d%H%M%S')}"
-            logger.info(f"Request {request_id}: Sending prompt to {self.config.model_name}")
+            request_id = f"req_{datetime.now().strftime('%Y%m%d%H%M%S%f')}"
+            logger.info(f"Request {request_id}: Sending prompt to {_model}")
             
-            # Send request to OpenAI
-            message = self.client.chat.completions.create(
-                model=self.config.model_name,
+            # Streamed and accumulated — see _complete
+            result = await self._complete(
+                request_id,
+                model=_model,
                 messages=[
                     {"role": "system", "content": _system_prompt},
                     {"role": "user", "content": prompt}
@@ -330,22 +461,25 @@ class OpenAIService:
             )
             
             # Log success
-            logger.info(f"Request {request_id}: Received response from {self.config.model_name}")
+            logger.info(f"Request {request_id}: Received response from {_model}")
+            if result["finish_reason"] == "length":
+                logger.warning(f"Request {request_id}: response truncated at max_tokens={_max_tokens}")
             
-            # Extract response text
-            response_text = message.choices[0].message.content
+            # Usage arrives on the final chunk (stream_options.include_usage)
+            usage = result["usage"]
             
             # Return response with metadata
             return {
                 "request_id": request_id,
-                "model": self.config.model_name,
-                "response": response_text,
+                "model": result["model"] or _model,
+                "response": result["text"],
                 "usage": {
-                    "prompt_tokens": message.usage.prompt_tokens,
-                    "completion_tokens": message.usage.completion_tokens,
-                    "total_tokens": message.usage.total_tokens
+                    "prompt_tokens": getattr(usage, "prompt_tokens", None),
+                    "completion_tokens": getattr(usage, "completion_tokens", None),
+                    "total_tokens": getattr(usage, "total_tokens", None)
                 },
-                "timestamp": datetime.now().isoformat()
+                "timestamp": datetime.now().isoformat(),
+                **({"rate_limit": result["rate_limit"]} if result.get("rate_limit") else {}),
             }
         except Exception as e:
             logger.error(f"Error generating response: {str(e)}")
@@ -353,12 +487,13 @@ class OpenAIService:
             return {
                 "request_id": f"err_{datetime.now().strftime('%Y%m%d%H%M%S')}",
                 "error": str(e),
-                "model": self.config.model_name,
+                "model": _model,
                 "response": None,
-                "timestamp": datetime.now().isoformat()
+                "timestamp": datetime.now().isoformat(),
+                **rate_limit_fields(e),
             }
     
-    def generate_with_template(self, 
+    async def generate_with_template(self, 
                               template_id: str, 
                               template_vars: Dict[str, Any],
                               system_prompt: Optional[str] = None,
@@ -385,7 +520,7 @@ class OpenAIService:
                 "timestamp": datetime.now().isoformat()
             }
         
-        return self.generate(
+        return await self.generate(
             prompt=formatted_prompt,
             system_prompt=system_prompt,
             max_tokens=max_tokens,
@@ -0,0 +1,190 @@
+"""
+Content-addressed cache for A9_LLM_Service_Agent.generate responses.
+
+Deterministic prompts — SA key observations and trend notes, SQL generation,
+structured summaries — are re-issued verbatim whenever a principal re-runs a
+workflow on unchanged data. LLMResponseCache keys a response by a hash of
+everything that shapes it (provider, model, system prompt, prompt, tool
+schema/name, temperature, max_tokens) and serves repeats without a provider
+call.
+
+Two tiers:
+- memory — entry-bounded LRU, per process
+- sqlite — optional file shared by every agent instance and across restarts
+
+Entries expire after a per-operation TTL (0 disables caching for that
+operation). Hits are counted together with the prompt/completion tokens they
+avoided, so the savings show up in stats().
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class LLMResponseCache:
+    """TTL-per-operation LRU of generate() results with an optional SQLite tier."""
+
+    def __init__(
+        self,
+        default_ttl_seconds: float = 86400.0,
+        operation_ttls: Optional[Dict[str, float]] = None,
+        max_entries: int = 2048,
+        path: Optional[str] = None,
+    ) -> None:
+        self.default_ttl_seconds = default_ttl_seconds
+        self.operation_ttls = {k.lower(): v for k, v in (operation_ttls or {}).items()}
+        self.max_entries = max_entries
+        self.path = path
+        # key -> (expires_at wall-clock, entry)
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.prompt_tokens_saved = 0
+        self.completion_tokens_saved = 0
+        self._db_lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        if path:
+            try:
+                os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+                self._conn = sqlite3.connect(path, check_same_thread=False)
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS llm_responses ("
+                    " cache_key TEXT PRIMARY KEY, operation TEXT NOT NULL,"
+                    " entry TEXT NOT NULL, expires_at REAL NOT NULL)"
+                )
+                self._conn.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"LLM response cache: disk tier disabled ({path}): {e}")
+                self._conn = None
+
+    @staticmethod
+    def make_key(
+        provider: Optional[str],
+        model: Optional[str],
+        system_prompt: Optional[str],
+        prompt: str,
+        tool_schema: Optional[Dict[str, Any]],
+        tool_name: Optional[str],
+        temperature: Optional[float],
+        max_tokens: Optional[int],
+    ) -> str:
+        payload = json.dumps(
+            [provider, model, system_prompt, prompt, tool_schema, tool_name, temperature, max_tokens],
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def ttl_for(self, operation: Optional[str]) -> float:
+        return self.operation_ttls.get((operation or "").lower(), self.default_ttl_seconds)
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Cached {"content", "model_used", "usage"} for `key`, or None."""
+        now = time.time()
+        cached = self._entries.get(key)
+        if cached is not None:
+            expires_at, entry = cached
+            if expires_at > now:
+                self._entries.move_to_end(key)
+                self._record_hit(entry)
+                return dict(entry)
+            self._entries.pop(key, None)
+        if self._conn is not None:
+            try:
+                row = await asyncio.to_thread(self._disk_get, key, now)
+            except sqlite3.Error as e:
+                logger.warning(f"LLM response cache: disk read failed: {e}")
+                row = None
+            if row is not None:
+                expires_at, entry = row
+                self._remember(key, expires_at, entry)
+                self.disk_hits += 1
+                self._record_hit(entry)
+                return dict(entry)
+        self.misses += 1
+        return None
+
+    async def put(self, key: str, operation: Optional[str], entry: Dict[str, Any]) -> None:
+        ttl = self.ttl_for(operation)
+        if ttl <= 0:
+            return
+        expires_at = time.time() + ttl
+        self._remember(key, expires_at, dict(entry))
+        if self._conn is not None:
+            try:
+                await asyncio.to_thread(self._disk_put, key, operation or "", expires_at, entry)
+            except sqlite3.Error as e:
+                logger.warning(f"LLM response cache: disk write failed: {e}")
+
+    def clear(self) -> None:
+        self._entries.clear()
+        if self._conn is not None:
+            with self._db_lock:
+                self._conn.execute("DELETE FROM llm_responses")
+                self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits / lookups) if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "prompt_tokens_saved": self.prompt_tokens_saved,
+            "completion_tokens_saved": self.completion_tokens_saved,
+            "tokens_saved": self.prompt_tokens_saved + self.completion_tokens_saved,
+            "disk_path": self.path if self._conn is not None else None,
+        }
+
+    def _record_hit(self, entry: Dict[str, Any]) -> None:
+        self.hits += 1
+        usage = entry.get("usage") or {}
+        self.prompt_tokens_saved += int(usage.get("prompt_tokens") or usage.get("input_tokens") or 0)
+        self.completion_tokens_saved += int(usage.get("completion_tokens") or usage.get("output_tokens") or 0)
+
+    def _remember(self, key: str, expires_at: float, entry: Dict[str, Any]) -> None:
+        self._entries.pop(key, None)
+        self._entries[key] = (expires_at, entry)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def _disk_get(self, key: str, now: float) -> Optional[Tuple[float, Dict[str, Any]]]:
+        with self._db_lock:
+            row = self._conn.execute(
+                "SELECT expires_at, entry FROM llm_responses WHERE cache_key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[0] <= now:
+                self._conn.execute("DELETE FROM llm_responses WHERE cache_key = ?", (key,))
+                self._conn.commit()
+                return None
+        try:
+            return row[0], json.loads(row[1])
+        except ValueError:
+            return None
+
+    def _disk_put(self, key: str, operation: str, expires_at: float, entry: Dict[str, Any]) -> None:
+        with self._db_lock:
+            self._conn.execute("DELETE FROM llm_responses WHERE expires_at <= ?", (time.time(),))
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_responses VALUES (?, ?, ?, ?)",
+                (key, operation, json.dumps(entry, default=str), expires_at),
+            )
+            self._conn.commit()
@@ -0,0 +1,430 @@
+"""
+Process-wide admission control for provider calls made by A9_LLM_Service_Agent.
+
+Solution Finder persona fan-outs, SA enrichment, market analysis and the KPI
+assistant all reach the provider independently. Under load that surfaced as
+429s, which the agent returns as status="error" and callers turn into
+heuristic fallbacks. LLMScheduler sits in front of every provider call:
+
+- lanes     — one per model, each with a requests/min and a tokens/min token
+              bucket. Limits come from llm_rate_limits (longest model-prefix
+              match) and are re-learned from the provider's rate-limit
+              headers on every response.
+- priority  — waiters are admitted in (priority, arrival) order:
+              interactive (HITL) ahead of standard ahead of batch
+              (assessment / enrichment), behind a global concurrency cap.
+- backoff   — a 429 pauses the lane for Retry-After (or an exponential
+              backoff when the provider gives none) and the agent re-queues
+              the call instead of failing it.
+- metrics   — queue depth by priority, in-flight, waits and rate-limit hits
+              per lane (stats()).
+
+Scheduling state is bound to the event loop it runs on, so there is one
+scheduler per loop (get_llm_scheduler); in the server that is one per process.
+"""
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+import weakref
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Dict, List, Mapping, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class LLMPriority:
+    """Priority classes for A9_LLM_Request.priority (lower value is admitted first)."""
+    INTERACTIVE = "interactive"
+    STANDARD = "standard"
+    BATCH = "batch"
+
+
+_PRIORITY_RANK = {LLMPriority.INTERACTIVE: 0, LLMPriority.STANDARD: 1, LLMPriority.BATCH: 2}
+
+_BACKOFF_BASE_SECONDS = 1.0
+_BACKOFF_MAX_SECONDS = 60.0
+
+
+def estimate_tokens(*texts: Optional[str]) -> int:
+    """Rough prompt size (~4 characters per token) used to reserve tokens/min up front."""
+    return max(1, sum(len(t) for t in texts if t) // 4)
+
+
+def _reset_seconds(value: Optional[str], now: float) -> Optional[float]:
+    """Seconds until a reset header: RFC 3339 (anthropic), '6m0s'/'1.5s'/'20ms' (openai) or plain seconds."""
+    if not value:
+        return None
+    value = str(value).strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    if "T" in value:
+        try:
+            reset_at = datetime.fromisoformat(value.replace("Z", "+00:00"))
+            return max(0.0, reset_at.timestamp() - datetime.now(timezone.utc).timestamp())
+        except ValueError:
+            return None
+    total, number = 0.0, ""
+    i = 0
+    while i < len(value):
+        ch = value[i]
+        if ch.isdigit() or ch == ".":
+            number += ch
+        elif value.startswith("ms", i):
+            total += float(number or 0) / 1000.0
+            number = ""
+            i += 1
+        elif ch in "hms":
+            total += float(number or 0) * {"h": 3600.0, "m": 60.0, "s": 1.0}[ch]
+            number = ""
+        else:
+            return None
+        i += 1
+    return total
+
+
+def parse_rate_limit_headers(headers: Optional[Mapping[str, str]]) -> Dict[str, float]:
+    """
+    Normalise anthropic-ratelimit-* / x-ratelimit-* / retry-after headers to
+    {requests_limit, requests_remaining, requests_reset_s, tokens_limit,
+    tokens_remaining, tokens_reset_s, retry_after_s} (absent keys omitted).
+    """
+    if not isinstance(headers, Mapping) or not headers:
+        return {}
+    h = {str(k).lower(): v for k, v in headers.items()}
+    now = time.time()
+    out: Dict[str, float] = {}
+
+    def _num(key: str, *names: str) -> None:
+        for name in names:
+            if h.get(name) not in (None, ""):
+                try:
+                    out[key] = float(h[name])
+                    return
+                except (TypeError, ValueError):
+                    continue
+
+    def _reset(key: str, *names: str) -> None:
+        for name in names:
+            seconds = _reset_seconds(h.get(name), now)
+            if seconds is not None:
+                out[key] = seconds
+                return
+
+    _num("requests_limit", "anthropic-ratelimit-requests-limit", "x-ratelimit-limit-requests")
+    _num("requests_remaining", "anthropic-ratelimit-requests-remaining", "x-ratelimit-remaining-requests")
+    _reset("requests_reset_s", "anthropic-ratelimit-requests-reset", "x-ratelimit-reset-requests")
+    _num("tokens_limit", "anthropic-ratelimit-tokens-limit", "anthropic-ratelimit-input-tokens-limit",
+         "x-ratelimit-limit-tokens")
+    _num("tokens_remaining", "anthropic-ratelimit-tokens-remaining", "anthropic-ratelimit-input-tokens-remaining",
+         "x-ratelimit-remaining-tokens")
+    _reset("tokens_reset_s", "anthropic-ratelimit-tokens-reset", "anthropic-ratelimit-input-tokens-reset",
+           "x-ratelimit-reset-tokens")
+    if h.get("retry-after-ms"):
+        _reset("retry_after_s", "retry-after-ms")
+        if "retry_after_s" in out:
+            out["retry_after_s"] /= 1000.0
+    else:
+        _reset("retry_after_s", "retry-after")
+    return out
+
+
+def rate_limit_fields(source: Any) -> Dict[str, Any]:
+    """
+    {"rate_limit", "status_code"} for a service result dict, read from the HTTP
+    response behind `source` — an SDK stream on success, an APIStatusError on
+    failure. Empty when there is no response (connection errors, test doubles).
+    """
+    response = getattr(source, "response", None)
+    fields: Dict[str, Any] = {}
+    rate = parse_rate_limit_headers(getattr(response, "headers", None))
+    if rate:
+        fields["rate_limit"] = rate
+    status_code = getattr(source, "status_code", None)
+    if isinstance(status_code, int):
+        fields["status_code"] = status_code
+    return fields
+
+
+class _Bucket:
+    """Per-minute token bucket; unlimited until it has a limit."""
+
+    def __init__(self, per_minute: Optional[float]) -> None:
+        self.capacity: Optional[float] = None
+        self.level = 0.0
+        self._at = time.monotonic()
+        if per_minute:
+            self.set_limit(per_minute)
+
+    def set_limit(self, per_minute: float) -> None:
+        self._refill()
+        if self.capacity is None:
+            self.level = per_minute
+        self.capacity = float(per_minute)
+        self.level = min(self.level, self.capacity)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        if self.capacity is not None:
+            self.level = min(self.capacity, self.level + (now - self._at) * self.capacity / 60.0)
+        self._at = now
+
+    def wait_seconds(self, amount: float) -> float:
+        if self.capacity is None:
+            return 0.0
+        self._refill()
+        need = min(amount, self.capacity)
+        if self.level >= need:
+            return 0.0
+        return (need - self.level) * 60.0 / self.capacity
+
+    def take(self, amount: float) -> None:
+        if self.capacity is not None:
+            self._refill()
+            self.level -= amount
+
+    def cap_remaining(self, remaining: float) -> None:
+        if self.capacity is not None:
+            self._refill()
+            self.level = min(self.level, remaining)
+
+
+class _Lane:
+    def __init__(self, model: str, rpm: Optional[float], tpm: Optional[float]) -> None:
+        self.model = model
+        self.requests = _Bucket(rpm)
+        self.tokens = _Bucket(tpm)
+        self.paused_until = 0.0
+        self.strikes = 0
+        self.in_flight = 0
+        self.admitted = 0
+        self.rate_limited = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def wait_seconds(self, est_tokens: int) -> float:
+        pause = max(0.0, self.paused_until - time.monotonic())
+        return max(pause, self.requests.wait_seconds(1), self.tokens.wait_seconds(est_tokens))
+
+
+class _Waiter:
+    __slots__ = ("rank", "seq", "priority", "lane", "est_tokens", "future", "enqueued")
+
+    def __init__(self, rank, seq, priority, lane, est_tokens, future) -> None:
+        self.rank = rank
+        self.seq = seq
+        self.priority = priority
+        self.lane = lane
+        self.est_tokens = est_tokens
+        self.future = future
+        self.enqueued = time.monotonic()
+
+    def __lt__(self, other: "_Waiter") -> bool:
+        return (self.rank, self.seq) < (other.rank, other.seq)
+
+
+class SchedulerTicket:
+    """Handed to the caller for one admitted provider call; see LLMScheduler.slot."""
+
+    def __init__(self, scheduler: "LLMScheduler", lane: _Lane, est_tokens: int) -> None:
+        self._scheduler = scheduler
+        self.lane = lane
+        self.est_tokens = est_tokens
+        self.rate_limited = False
+
+    def observe(self, result: Optional[Dict[str, Any]]) -> None:
+        """Feed a service result dict back: usage, rate-limit headers, 429s."""
+        self._scheduler._observe(self, result or {})
+
+
+class LLMScheduler:
+    """Priority-ordered, rate-limit-aware admission of provider calls."""
+
+    def __init__(
+        self,
+        max_concurrency: int = 16,
+        model_limits: Optional[Dict[str, Dict[str, float]]] = None,
+    ) -> None:
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.model_limits = dict(model_limits or {})
+        self._lanes: Dict[str, _Lane] = {}
+        self._waiters: List[_Waiter] = []
+        self._seq = itertools.count()
+        self._in_flight = 0
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    def configure(
+        self,
+        max_concurrency: Optional[int] = None,
+        model_limits: Optional[Dict[str, Dict[str, float]]] = None,
+    ) -> None:
+        """Widen the shared scheduler for another agent's config (limits merge, concurrency takes the max)."""
+        if max_concurrency:
+            self.max_concurrency = max(self.max_concurrency, int(max_concurrency))
+        for prefix, limits in (model_limits or {}).items():
+            self.model_limits.setdefault(prefix, limits)
+        self._pump()
+
+    def _limits_for(self, model: str) -> Dict[str, float]:
+        best = None
+        for prefix in self.model_limits:
+            if model.startswith(prefix) and (best is None or len(prefix) > len(best)):
+                best = prefix
+        return self.model_limits.get(best, {}) if best is not None else {}
+
+    def _lane(self, model: str) -> _Lane:
+        lane = self._lanes.get(model)
+        if lane is None:
+            limits = self._limits_for(model)
+            lane = _Lane(model, limits.get("rpm"), limits.get("tpm"))
+            self._lanes[model] = lane
+        return lane
+
+    @asynccontextmanager
+    async def slot(self, model: str, priority: Optional[str], est_tokens: int) -> AsyncIterator[SchedulerTicket]:
+        """Wait for admission, then hold one in-flight slot for the block."""
+        lane = self._lane(model or "default")
+        priority = priority if priority in _PRIORITY_RANK else LLMPriority.STANDARD
+        waiter = _Waiter(
+            _PRIORITY_RANK[priority], next(self._seq), priority, lane, est_tokens,
+            asyncio.get_running_loop().create_future(),
+        )
+        heapq.heappush(self._waiters, waiter)
+        self._pump()
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                self._release(lane)  # admitted just as we were cancelled
+            else:
+                self._waiters.remove(waiter)
+                heapq.heapify(self._waiters)
+                self._pump()
+            raise
+        try:
+            yield SchedulerTicket(self, lane, est_tokens)
+        finally:
+            self._release(lane)
+
+    def _release(self, lane: _Lane) -> None:
+        self._in_flight -= 1
+        lane.in_flight -= 1
+        self._pump()
+
+    def _pump(self) -> None:
+        """Admit waiters in priority order while slots and lane budgets allow."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        next_wake: Optional[float] = None
+        blocked_lanes = set()
+        admitted: List[_Waiter] = []
+        now = time.monotonic()
+        for waiter in sorted(self._waiters):
+            if self._in_flight >= self.max_concurrency:
+                break
+            if waiter.future.done() or id(waiter.lane) in blocked_lanes:
+                continue
+            wait = waiter.lane.wait_seconds(waiter.est_tokens)
+            if wait > 0:
+                # Lower-priority waiters on this lane must not overtake it.
+                blocked_lanes.add(id(waiter.lane))
+                next_wake = wait if next_wake is None else min(next_wake, wait)
+                continue
+            lane = waiter.lane
+            lane.requests.take(1)
+            lane.tokens.take(waiter.est_tokens)
+            lane.in_flight += 1
+            lane.admitted += 1
+            waited = now - waiter.enqueued
+            lane.total_wait += waited
+            lane.max_wait = max(lane.max_wait, waited)
+            self._in_flight += 1
+            waiter.future.set_result(None)
+            admitted.append(waiter)
+        if admitted:
+            done = {id(w) for w in admitted}
+            self._waiters = [w for w in self._waiters if id(w) not in done]
+            heapq.heapify(self._waiters)
+        if next_wake is not None and self._waiters:
+            self._timer = asyncio.get_running_loop().call_later(next_wake + 0.01, self._pump)
+
+    def _observe(self, ticket: SchedulerTicket, result: Dict[str, Any]) -> None:
+        lane = ticket.lane
+        usage = result.get("usage") or {}
+        actual = (usage.get("prompt_tokens") or 0) + (usage.get("completion_tokens") or 0)
+        if actual:
+            lane.tokens.take(actual - ticket.est_tokens)
+
+        rate = result.get("rate_limit") or {}
+        if rate.get("requests_limit"):
+            lane.requests.set_limit(rate["requests_limit"])
+        if rate.get("tokens_limit"):
+            lane.tokens.set_limit(rate["tokens_limit"])
+        if rate.get("requests_remaining") is not None:
+            lane.requests.cap_remaining(rate["requests_remaining"])
+        if rate.get("tokens_remaining") is not None:
+            lane.tokens.cap_remaining(rate["tokens_remaining"])
+
+        if result.get("status_code") == 429:
+            ticket.rate_limited = True
+            lane.rate_limited += 1
+            delay = rate.get("retry_after_s")
+            if delay is None:
+                delay = min(_BACKOFF_MAX_SECONDS, _BACKOFF_BASE_SECONDS * (2 ** lane.strikes))
+            lane.strikes += 1
+            lane.paused_until = max(lane.paused_until, time.monotonic() + delay)
+            logger.warning(f"[LLMScheduler] {lane.model} rate limited — pausing lane {delay:.1f}s")
+        elif not result.get("error"):
+            lane.strikes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        depth = {p: 0 for p in _PRIORITY_RANK}
+        lane_depth: Dict[str, Dict[str, int]] = {}
+        for w in self._waiters:
+            depth[w.priority] += 1
+            lane_depth.setdefault(w.lane.model, {p: 0 for p in _PRIORITY_RANK})[w.priority] += 1
+        now = time.monotonic()
+        return {
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self._in_flight,
+            "queue_depth": depth,
+            "lanes": {
+                model: {
+                    "in_flight": lane.in_flight,
+                    "queue_depth": lane_depth.get(model, {p: 0 for p in _PRIORITY_RANK}),
+                    "admitted": lane.admitted,
+                    "rate_limited": lane.rate_limited,
+                    "paused_for_s": max(0.0, lane.paused_until - now),
+                    "avg_wait_s": (lane.total_wait / lane.admitted) if lane.admitted else 0.0,
+                    "max_wait_s": lane.max_wait,
+                    "rpm_limit": lane.requests.capacity,
+                    "tpm_limit": lane.tokens.capacity,
+                }
+                for model, lane in self._lanes.items()
+            },
+        }
+
+
+_SCHEDULERS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, LLMScheduler]" = weakref.WeakKeyDictionary()
+
+
+def get_llm_scheduler(
+    max_concurrency: int = 16,
+    model_limits: Optional[Dict[str, Dict[str, float]]] = None,
+) -> LLMScheduler:
+    """The shared scheduler for the running event loop, created on first use."""
+    loop = asyncio.get_running_loop()
+    scheduler = _SCHEDULERS.get(loop)
+    if scheduler is None:
+        scheduler = LLMScheduler(max_concurrency=max_concurrency, model_limits=model_limits)
+        _SCHEDULERS[loop] = scheduler
+    else:
+        scheduler.configure(max_concurrency=max_concurrency, model_limits=model_limits)
+    return scheduler
@@ -15,6 +15,7 @@ try:
 except ImportError:
     httpx = None
 
+from src.database.supabase_rest import get_supabase_client
 from src.agents.shared.a9_debate_protocol_models import A9_PS_BusinessContext
 
 logger = logging.getLogger(__name__)
@@ -73,21 +74,21 @@ class SupabaseBusinessContextProvider:
             A9_PS_BusinessContext instance or None if not found
         """
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    self.endpoint,
-                    headers=self.headers,
-                    params={"id": f"eq.{context_id}", "select": "*"}
-                )
-                response.raise_for_status()
-
-                rows = response.json()  # pydantic-lint: allow - HTTP response object, not Pydantic model
-                if not rows:
-                    logger.warning(f"Business context not found: {context_id}")
-                    return None
-
-                row = rows[0]
-                return self._row_to_model(row)
+            client = get_supabase_client()
+            response = await client.get(
+                self.endpoint,
+                headers=self.headers,
+                params={"id": f"eq.{context_id}", "select": "*"}
+            )
+            response.raise_for_status()
+
+            rows = response.json()  # pydantic-lint: allow - HTTP response object, not Pydantic model
+            if not rows:
+                logger.warning(f"Business context not found: {context_id}")
+                return None
+
+            row = rows[0]
+            return self._row_to_model(row)
 
         except Exception as e:
             logger.error(f"Failed to fetch business context {context_id}: {e}")
@@ -107,14 +108,14 @@ class SupabaseBusinessContextProvider:
             if is_demo is not None:
                 params["is_demo"] = f"eq.{is_demo}"
 
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    self.endpoint,
-                    headers=self.headers,
-                    params=params
-                )
-                response.raise_for_status()
-                return response.json()  # pydantic-lint: allow - HTTP response object, not Pydantic model
+            client = get_supabase_client()
+            response = await client.get(
+                self.endpoint,
+                headers=self.headers,
+                params=params
+            )
+            response.raise_for_status()
+            return response.json()  # pydantic-lint: allow - HTTP response object, not Pydantic model
 
         except Exception as e:
             logger.error(f"Failed to list business contexts: {e}")
@@ -134,15 +135,15 @@ class SupabaseBusinessContextProvider:
             row = self._model_to_row(context)
             row["id"] = context_id
 
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    self.endpoint,
-                    headers={**self.headers, "Prefer": "return=minimal"},
-                    json=row,
-                )
-                response.raise_for_status()
-                logger.info(f"Created business context: {context_id}")
-                return True
+            client = get_supabase_client()
+            response = await client.post(
+                self.endpoint,
+                headers={**self.headers, "Prefer": "return=minimal"},
+                json=row,
+            )
+            response.raise_for_status()
+            logger.info(f"Created business context: {context_id}")
+            return True
 
         except Exception as e:
             logger.error(f"Failed to create business context {context_id}: {e}")
@@ -161,16 +162,16 @@ class SupabaseBusinessContextProvider:
         try:
             row = self._model_to_row(context)
 
-            async with httpx.AsyncClient() as client:
-                response = await client.patch(
-                    self.endpoint,
-                    headers={**self.headers, "Prefer": "return=minimal"},
-                    params={"id": f"eq.{context_id}"},
-                    json=row,
-                )
-                response.raise_for_status()
-                logger.info(f"Updated business context: {context_id}")
-                return True
+            client = get_supabase_client()
+            response = await client.patch(
+                self.endpoint,
+                headers={**self.headers, "Prefer": "return=minimal"},
+                params={"id": f"eq.{context_id}"},
+                json=row,
+            )
+            response.raise_for_status()
+            logger.info(f"Updated business context: {context_id}")
+            return True
 
         except Exception as e:
             logger.error(f"Failed to update business context {context_id}: {e}")
@@ -191,18 +192,18 @@ class SupabaseBusinessContextProvider:
             True on success, False on failure.
         """
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    self.endpoint,
-                    headers={
-                        **self.headers,
-                        "Prefer": "resolution=merge-duplicates,return=minimal",
-                    },
-                    json=row,
-                )
-                response.raise_for_status()
-                logger.info("Upserted business context: %s", row.get("id"))
-                return True
+            client = get_supabase_client()
+            response = await client.post(
+                self.endpoint,
+                headers={
+                    **self.headers,
+                    "Prefer": "resolution=merge-duplicates,return=minimal",
+                },
+                json=row,
+            )
+            response.raise_for_status()
+            logger.info("Upserted business context: %s", row.get("id"))
+            return True
         except Exception as exc:
             logger.error("Failed to upsert business context %s: %s", row.get("id"), exc)
             return False
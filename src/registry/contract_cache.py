@@ -0,0 +1,183 @@
+"""
+Shared cache of parsed data product YAML contracts.
+
+The Data Product Agent and Deep Analysis Agent read the same contract files on
+every SQL generation (column aliases, exposed columns, view SQL, dimension
+semantics, hierarchies). ContractCache parses each file once and hands out a
+pre-indexed ParsedContract, re-reading it only when the file's mtime or size
+changes. The stat check itself is throttled to one per `stat_interval_seconds`
+per path (and directory scans likewise), so a burst of SQL generation touches
+neither the filesystem nor the YAML parser. Setup paths that must see an edit
+made a moment ago (table registration, view creation) pass revalidate=True.
+
+Callers treat ParsedContract as read-only — it is shared across agents.
+"""
+from __future__ import annotations
+
+import glob
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+import yaml
+
+logger = logging.getLogger(__name__)
+
+
+def _strip_quotes(label: Any) -> str:
+    s = str(label).strip()
+    if s.startswith('"') and s.endswith('"') and len(s) > 1:
+        s = s[1:-1]
+    return s
+
+
+@dataclass(frozen=True)
+class ParsedContract:
+    """A parsed contract plus the indexes SQL generation looks up."""
+
+    path: str
+    doc: Dict[str, Any]
+    product_id: Optional[str] = None
+    views: List[Dict[str, Any]] = field(default_factory=list)
+    views_by_name: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    tables: List[Dict[str, Any]] = field(default_factory=list)
+    column_aliases: Dict[str, Any] = field(default_factory=dict)
+    exposed_columns: Dict[str, FrozenSet[str]] = field(default_factory=dict)
+    # First view carrying an llm_profile — the one DA and LLM SQL generation use
+    profile_view: Optional[Dict[str, Any]] = None
+    dimension_semantics: List[str] = field(default_factory=list)
+    hierarchies: Dict[str, List[str]] = field(default_factory=dict)
+
+    def view(self, name: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Case-insensitive view lookup."""
+        if not isinstance(name, str):
+            return None
+        return self.views_by_name.get(name.strip().lower())
+
+    @classmethod
+    def from_doc(cls, path: str, doc: Any) -> "ParsedContract":
+        doc = doc if isinstance(doc, dict) else {}
+        views = [v for v in (doc.get("views") or []) if isinstance(v, dict)]
+        tables = [t for t in (doc.get("tables") or []) if isinstance(t, dict)]
+
+        views_by_name: Dict[str, Dict[str, Any]] = {}
+        exposed: Dict[str, FrozenSet[str]] = {}
+        for v in views:
+            key = str(v.get("name", "")).strip().lower()
+            if not key:
+                continue
+            views_by_name.setdefault(key, v)
+            llm_profile = v.get("llm_profile") or {}
+            cols = llm_profile.get("exposed_columns") if isinstance(llm_profile, dict) else None
+            exposed.setdefault(
+                key, frozenset(s for s in (_strip_quotes(c) for c in (cols or [])) if s)
+            )
+
+        profile_view = next((v for v in views if v.get("llm_profile")), None)
+        llm_profile = (profile_view or {}).get("llm_profile") or {}
+        dims = llm_profile.get("dimension_semantics") if isinstance(llm_profile, dict) else None
+        hier = llm_profile.get("dimension_hierarchies") if isinstance(llm_profile, dict) else None
+        hierarchies: Dict[str, List[str]] = {}
+        if isinstance(hier, dict):
+            for k, levels in hier.items():
+                if isinstance(levels, list):
+                    hierarchies[str(k)] = [str(x) for x in levels if x]
+
+        aliases = doc.get("column_aliases")
+        metadata = doc.get("metadata")
+        return cls(
+            path=path,
+            doc=doc,
+            product_id=metadata.get("id") if isinstance(metadata, dict) else None,
+            views=views,
+            views_by_name=views_by_name,
+            tables=tables,
+            column_aliases=aliases if isinstance(aliases, dict) else {},
+            exposed_columns=exposed,
+            profile_view=profile_view,
+            dimension_semantics=list(dims) if isinstance(dims, list) else [],
+            hierarchies=hierarchies,
+        )
+
+
+class ContractCache:
+    """Path-keyed cache of ParsedContract, invalidated by file mtime/size."""
+
+    def __init__(self, stat_interval_seconds: float = 2.0) -> None:
+        self.stat_interval_seconds = stat_interval_seconds
+        # abspath -> (signature, parsed, last stat time)
+        self._entries: Dict[str, Tuple[Tuple[int, int], ParsedContract, float]] = {}
+        # directory -> (yaml paths, last listing time)
+        self._listings: Dict[str, Tuple[List[str], float]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, path: Optional[str], revalidate: bool = False) -> Optional[ParsedContract]:
+        """Return the parsed contract at `path`, or None if missing/unreadable.
+
+        revalidate=True skips the stat throttle and checks the file right away.
+        """
+        if not path:
+            return None
+        key = os.path.abspath(path)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None and not revalidate and now - entry[2] < self.stat_interval_seconds:
+            return entry[1]
+
+        try:
+            st = os.stat(key)
+        except OSError:
+            with self._lock:
+                self._entries.pop(key, None)
+            return None
+        signature = (st.st_mtime_ns, st.st_size)
+        if entry is not None and entry[0] == signature:
+            with self._lock:
+                self._entries[key] = (signature, entry[1], now)
+            return entry[1]
+
+        try:
+            with open(key, "r", encoding="utf-8") as f:
+                parsed = ParsedContract.from_doc(path, yaml.safe_load(f))
+        except Exception as exc:
+            logger.warning("ContractCache: failed to parse %s: %s", path, exc)
+            return None
+        with self._lock:
+            self._entries[key] = (signature, parsed, now)
+        return parsed
+
+    def find_by_product_id(self, directory: str, product_id: str) -> Optional[str]:
+        """Return the path of the contract in `directory` whose metadata.id matches."""
+        now = time.monotonic()
+        with self._lock:
+            listing = self._listings.get(directory)
+        if listing is None or now - listing[1] >= self.stat_interval_seconds:
+            listing = (sorted(glob.glob(os.path.join(directory, "*.yaml"))), now)
+            with self._lock:
+                self._listings[directory] = listing
+        for fpath in listing[0]:
+            parsed = self.get(fpath)
+            if parsed is not None and parsed.product_id == product_id:
+                return fpath
+        return None
+
+    def invalidate(self, path: Optional[str] = None) -> None:
+        """Drop one cached contract, or all of them when `path` is None."""
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+                self._listings.clear()
+            else:
+                self._entries.pop(os.path.abspath(path), None)
+
+
+_shared_cache = ContractCache()
+
+
+def get_contract_cache() -> ContractCache:
+    """Return the process-wide contract cache."""
+    return _shared_cache
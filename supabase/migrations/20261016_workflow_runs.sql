@@ -0,0 +1,23 @@
+-- ---------------------------------------------------------------------------
+-- Durable store for /workflows run records (WORKFLOW_STORE_BACKEND=postgres).
+--
+-- Until now every situations / deep analysis / solutions / onboarding run was
+-- held in a process-local dict: unbounded, lost on restart, and invisible to
+-- any other API replica polling .../status. src/api/workflow_store.py's
+-- PostgresWorkflowStore keeps the whole WorkflowRecord as JSONB here, locks
+-- the row (SELECT ... FOR UPDATE) for annotation/action appends, and deletes
+-- rows older than WORKFLOW_STORE_TTL_SECONDS on write.
+--
+-- payload is stored already redacted (_redact_secrets in workflows.py).
+-- ---------------------------------------------------------------------------
+
+CREATE TABLE IF NOT EXISTS workflow_runs (
+    request_id    TEXT PRIMARY KEY,
+    workflow_type TEXT NOT NULL,
+    state         TEXT NOT NULL,
+    record        JSONB NOT NULL,
+    created_at    TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    updated_at    TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_workflow_runs_updated_at ON workflow_runs (updated_at);
@@ -8,8 +8,14 @@ Covers:
 - Fable 5 opts into server-side refusal fallbacks (beta header + fallbacks body)
 - A9_LLM_EFFORT applied only where supported
 - stop_reason == "refusal" surfaces as an error dict, never as content
+- cache_breakpoints split the user message into cache_control blocks, and
+  prompt-cache read/write tokens are reported in usage
+- 529 overloaded / 5xx are retried by the service; a 429 is only retried with
+  retry_rate_limits (off when the agent's scheduler re-queues it)
 """
 
+import anthropic
+import httpx
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -94,6 +100,34 @@ def test_max_tokens_clamped_to_model_ceiling():
     assert kw["max_tokens"] == 64000
 
 
+def test_cache_breakpoints_mark_prompt_prefixes():
+    prompt = "shared context|persona A|task"
+    kw = build_messages_kwargs(
+        model="claude-haiku-4-5-20251001", max_tokens=1024, temperature=0.0,
+        system="system prompt", messages=[{"role": "user", "content": prompt}],
+        cache_breakpoints=[15, 0, len(prompt) + 5],
+    )
+    blocks = kw["messages"][0]["content"]
+    assert [b["text"] for b in blocks] == ["shared context|", "persona A|task"]
+    assert blocks[0]["cache_control"] == {"type": "ephemeral"}
+    assert "cache_control" not in blocks[1]
+
+
+def test_cache_breakpoints_capped_at_four_deepest():
+    kw = build_messages_kwargs(
+        model="claude-haiku-4-5-20251001", max_tokens=1024, temperature=0.0,
+        system="s", messages=[{"role": "user", "content": "abcdefghij"}],
+        cache_breakpoints=[1, 2, 3, 4, 5, 6],
+    )
+    blocks = kw["messages"][0]["content"]
+    assert [b["text"] for b in blocks] == ["abc", "d", "e", "f", "ghij"]
+    assert sum("cache_control" in b for b in blocks) == 4
+
+
+def test_no_breakpoints_leaves_messages_untouched():
+    assert _kwargs("claude-haiku-4-5-20251001")["messages"] == _MESSAGES
+
+
 def _stream_mock(message):
     """Mock for client.messages.stream(...) — an async context manager whose
     get_final_message() awaits to `message`.
@@ -152,3 +186,86 @@ async def test_text_extraction_skips_non_text_leading_blocks():
         result = await service.generate(prompt="hello")
     assert result["response"] == "the answer"
     assert result["model"] == "claude-opus-4-8"  # reports the model that served
+
+
+@pytest.mark.asyncio
+async def test_generate_passes_breakpoints_and_reports_cache_usage():
+    text_block = MagicMock()
+    text_block.type = "text"
+    text_block.text = "ok"
+    message = MagicMock()
+    message.stop_reason = "end_turn"
+    message.model = "claude-haiku-4-5-20251001"
+    message.content = [text_block]
+    message.usage.input_tokens = 12
+    message.usage.output_tokens = 5
+    message.usage.cache_read_input_tokens = 3000
+    message.usage.cache_creation_input_tokens = 0
+    with patch("src.llm_services.claude_service.anthropic.AsyncAnthropic") as mock_cls:
+        service = _make_service(mock_cls, message)
+        result = await service.generate(
+            prompt="shared|rest", model="claude-haiku-4-5-20251001", cache_breakpoints=[7],
+        )
+        sent = mock_cls.return_value.messages.stream.call_args.kwargs
+    assert sent["messages"][0]["content"][0] == {
+        "type": "text", "text": "shared|", "cache_control": {"type": "ephemeral"},
+    }
+    assert result["usage"]["prompt_tokens"] == 12
+    assert result["usage"]["cache_read_input_tokens"] == 3000
+    assert result["usage"]["cache_creation_input_tokens"] == 0
+
+
+def _status_error(code):
+    request = httpx.Request("POST", "https://api.anthropic.com/v1/messages")
+    response = httpx.Response(code, request=request, headers={"retry-after": "0"})
+    return anthropic.APIStatusError("boom", response=response, body=None)
+
+
+def _ok_message():
+    text_block = MagicMock()
+    text_block.type = "text"
+    text_block.text = "ok"
+    message = MagicMock()
+    message.stop_reason = "end_turn"
+    message.model = "claude-haiku-4-5-20251001"
+    message.content = [text_block]
+    message.usage.input_tokens = 3
+    message.usage.output_tokens = 1
+    return message
+
+
+def _flaky_stream(errors, message):
+    """client.messages.stream whose first len(errors) calls raise on entry."""
+    ok = _stream_mock(message).return_value
+    pending = list(errors)
+
+    def _call(**kwargs):
+        if pending:
+            ctx = MagicMock()
+            ctx.__aenter__ = AsyncMock(side_effect=pending.pop(0))
+            ctx.__aexit__ = AsyncMock(return_value=False)
+            return ctx
+        return ok
+
+    return MagicMock(side_effect=_call)
+
+
+@pytest.mark.asyncio
+async def test_overloaded_is_retried_by_the_service():
+    with patch("src.llm_services.claude_service.anthropic.AsyncAnthropic") as mock_cls:
+        mock_cls.return_value.messages.stream = _flaky_stream([_status_error(529)], _ok_message())
+        service = ClaudeService({"api_key": "test-key", "retry_rate_limits": False})
+        result = await service.generate(prompt="hello")
+    assert result["response"] == "ok"
+    assert mock_cls.return_value.messages.stream.call_count == 2
+    assert mock_cls.call_args.kwargs["max_retries"] == 0
+
+
+@pytest.mark.asyncio
+async def test_rate_limits_are_left_to_the_scheduler():
+    with patch("src.llm_services.claude_service.anthropic.AsyncAnthropic") as mock_cls:
+        mock_cls.return_value.messages.stream = _flaky_stream([_status_error(429)], _ok_message())
+        service = ClaudeService({"api_key": "test-key", "retry_rate_limits": False})
+        result = await service.generate(prompt="hello")
+    assert result["response"] is None and result["status_code"] == 429
+    assert mock_cls.return_value.messages.stream.call_count == 1
@@ -0,0 +1,76 @@
+"""
+Unit tests for the shared parsed-contract cache.
+
+A contract is parsed once per (mtime, size); repeat lookups within the stat
+interval touch neither the filesystem nor the YAML parser.
+"""
+import os
+from unittest.mock import patch
+
+from src.registry import contract_cache as cc
+from src.registry.contract_cache import ContractCache
+
+CONTRACT = """
+metadata:
+  id: dp_test_001
+column_aliases:
+  measure: '"Transaction Value Amount"'
+tables:
+  - name: Fact
+    data_source_path: data/fact.csv
+views:
+  - name: Test_View
+    sql: SELECT * FROM Fact
+    llm_profile:
+      exposed_columns: ['"Region"', 'Product']
+      dimension_semantics: [Region, Product]
+      dimension_hierarchies:
+        geo: [Region, Country]
+"""
+
+
+def _write(tmp_path, text=CONTRACT, name="contract.yaml"):
+    p = tmp_path / name
+    p.write_text(text, encoding="utf-8")
+    return str(p)
+
+
+def test_parsed_contract_is_indexed(tmp_path):
+    contract = ContractCache().get(_write(tmp_path))
+    assert contract.product_id == "dp_test_001"
+    assert contract.view("test_view")["sql"] == "SELECT * FROM Fact"
+    assert contract.exposed_columns["test_view"] == frozenset({"Region", "Product"})
+    assert contract.column_aliases["measure"] == '"Transaction Value Amount"'
+    assert contract.dimension_semantics == ["Region", "Product"]
+    assert contract.hierarchies == {"geo": ["Region", "Country"]}
+    assert [t["name"] for t in contract.tables] == ["Fact"]
+
+
+def test_repeat_lookups_skip_filesystem_and_parser(tmp_path):
+    cache = ContractCache(stat_interval_seconds=60)
+    path = _write(tmp_path)
+    first = cache.get(path)
+    with patch.object(cc.os, "stat") as stat, patch.object(cc.yaml, "safe_load") as load:
+        assert cache.get(path) is first
+    stat.assert_not_called()
+    load.assert_not_called()
+
+
+def test_changed_file_is_reparsed(tmp_path):
+    cache = ContractCache(stat_interval_seconds=0)
+    path = _write(tmp_path)
+    first = cache.get(path)
+    assert cache.get(path) is first
+
+    _write(tmp_path, CONTRACT.replace("dp_test_001", "dp_test_002"))
+    os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 1_000_000))
+    assert cache.get(path).product_id == "dp_test_002"
+
+
+def test_find_by_product_id(tmp_path):
+    cache = ContractCache()
+    _write(tmp_path, "metadata: {id: other}\n", name="a.yaml")
+    path = _write(tmp_path, name="b.yaml")
+    assert cache.find_by_product_id(str(tmp_path), "dp_test_001") == path
+    assert cache.find_by_product_id(str(tmp_path), "missing") is None
+    assert cache.get(str(tmp_path / "nope.yaml")) is None
@@ -0,0 +1,170 @@
+# arch-allow-direct-agent-construction
+"""
+Unit tests for the Deep Analysis dimension sweep.
+
+Contract under test:
+  1. The GROUPING SETS sweep splits into exactly the per-dimension breakdown
+     maps (ratio KPIs and NULL members included) plus the grand total ROLLUP
+     would give
+  2. Generated (DuckDB-path) SQL is swept as one UNION ALL
+  3. execute_deep_analysis produces the same Is/Is-Not with fewer queries,
+     and dimension_sweep=False restores per-dimension queries
+"""
+import logging
+from datetime import date
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import duckdb
+import pytest
+
+from src.agents.new.a9_data_product_agent import A9_Data_Product_Agent
+from src.agents.new.a9_deep_analysis_agent import A9_Deep_Analysis_Agent
+from src.agents.models.deep_analysis_models import DeepAnalysisPlan
+
+THIS_YEAR = date.today().year
+DIMS = ["region", "product", "channel"]
+SUM_SQL = "SELECT SUM(amount) AS value FROM sales WHERE version = 'Actual'"
+RATIO_SQL = "SELECT SUM(gp) / NULLIF(SUM(amount), 0) AS value FROM sales WHERE version = 'Actual'"
+
+
+@pytest.fixture
+def con():
+    con = duckdb.connect()
+    con.execute(
+        "CREATE TABLE sales (transaction_date DATE, version VARCHAR, region VARCHAR, "
+        "product VARCHAR, channel VARCHAR, amount DOUBLE, gp DOUBLE)"
+    )
+    rows = []
+    for y, scale in ((THIS_YEAR - 1, 1.0), (THIS_YEAR, 1.3)):
+        for i, (region, product, channel) in enumerate(
+            (r, p, c) for r in ("North", "South", "West") for p in ("Oil", "Grease") for c in ("Retail", "Fleet")
+        ):
+            amount = (100.0 + 17 * i) * (scale if region != "West" else 0.6)
+            rows.append((f"{y}-0{1 + i % 9}-10", "Actual", region, product, channel, amount, amount * (0.2 + 0.01 * i)))
+            rows.append((f"{y}-0{1 + i % 9}-12", "Budget", region, product, channel, amount * 1.1, amount * 0.25))
+    con.executemany("INSERT INTO sales VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+    yield con
+    con.close()
+
+
+def _run(con, sql):
+    cur = con.execute(sql)
+    cols = [d[0] for d in cur.description]
+    rows = [dict(zip(cols, r)) for r in cur.fetchall()]
+    return {"success": True, "columns": cols, "rows": rows, "data": rows}
+
+
+def _dpa(con, source="snowflake"):
+    dpa = A9_Data_Product_Agent.__new__(A9_Data_Product_Agent)
+    dpa.logger = logging.getLogger("test")
+    dpa.data_product_provider = None
+    dpa._resolve_source_system = lambda dp_id: source
+    dpa._resolve_time_spec = lambda dp_id: None
+    dpa.executed = []
+
+    async def _execute_sql(sql, *args, **kwargs):
+        dpa.executed.append(sql)
+        return _run(con, sql)
+
+    dpa.execute_sql = _execute_sql
+    return dpa
+
+
+def _kpi(sql=SUM_SQL):
+    return SimpleNamespace(
+        name="Revenue", id="revenue", sql_query=sql, calculation=sql, data_product_id="dp_sales",
+        metadata={}, thresholds=None, unit="$", not_sliceable_by=None,
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("sql", [SUM_SQL, RATIO_SQL])
+@pytest.mark.parametrize("comparison_period", [False, True])
+async def test_grouping_sets_sweep_matches_per_dimension_queries(con, sql, comparison_period):
+    dpa = _dpa(con)
+    gen = await dpa.generate_sql_for_kpi_sweep(_kpi(sql), DIMS, timeframe="current_year", comparison_period=comparison_period)
+    assert gen["success"] and gen["mode"] == "grouping_sets"
+    split = dpa.split_sweep_result(_run(con, gen["sql"]), gen["dimensions"], gen["mode"])
+
+    scalar = await dpa.generate_sql_for_kpi(_kpi(sql), timeframe="current_year", comparison_period=comparison_period)
+    total = con.execute(scalar["sql"]).fetchone()[0]
+    for dim in DIMS:
+        one = await dpa.generate_sql_for_kpi(
+            _kpi(sql), timeframe="current_year", breakdown=True, override_group_by=[dim],
+            comparison_period=comparison_period,
+        )
+        expected = {str(k): float(v) for k, v in con.execute(one["sql"]).fetchall()}
+        assert split[dim]["values"] == pytest.approx(expected)
+        assert split[dim]["total"] == pytest.approx(total)
+
+
+@pytest.mark.asyncio
+async def test_generated_sql_is_swept_as_union_all(con):
+    dpa = _dpa(con, source=None)
+    dpa.generate_sql_for_kpi = AsyncMock(side_effect=lambda kpi, **kw: {
+        "success": True,
+        "sql": f"SELECT {kw['override_group_by'][0]}, SUM(amount) AS total_value FROM sales "
+               f"GROUP BY {kw['override_group_by'][0]} ORDER BY 2 DESC;",
+    })
+    gen = await dpa.generate_sql_for_kpi_sweep(_kpi(), ["region", "channel"])
+    assert gen["mode"] == "union_all" and gen["sql"].count("UNION ALL") == 1
+
+    split = dpa.split_sweep_result(_run(con, gen["sql"]), gen["dimensions"], gen["mode"])
+    by_region = dict(con.execute("SELECT region, SUM(amount) FROM sales GROUP BY region").fetchall())
+    assert split["region"]["values"] == pytest.approx(by_region)
+    assert split["region"]["total"] is None and set(split["channel"]["values"]) == {"Retail", "Fleet"}
+
+
+def test_split_handles_uppercase_keys_and_null_members():
+    rows = [
+        {"A9_D0": "North", "A9_D1": None, "A9_G0": 0, "A9_G1": 1, "VALUE": 5},
+        {"A9_D0": None, "A9_D1": None, "A9_G0": 0, "A9_G1": 1, "VALUE": 2},
+        {"A9_D0": None, "A9_D1": "Oil", "A9_G0": 1, "A9_G1": 0, "VALUE": None},
+        {"A9_D0": None, "A9_D1": None, "A9_G0": 1, "A9_G1": 1, "VALUE": 7},
+    ]
+    split = A9_Data_Product_Agent.split_sweep_result(
+        {"rows": rows}, ["region", "product"], "grouping_sets", null_key="<null>"
+    )
+    # NULL members are kept, as the per-dimension GROUP BY keeps them
+    assert split == {
+        "region": {"values": {"North": 5.0, "<null>": 2.0}, "total": 7.0},
+        "product": {"values": {"Oil": 0.0}, "total": 7.0},
+    }
+    assert A9_Data_Product_Agent.split_sweep_result({"success": False}, ["region"], "grouping_sets") is None
+
+
+def test_expression_dimensions_are_not_swept():
+    dpa = _dpa(None)
+    assert dpa._build_grouping_sets_sql(SUM_SQL, ["region", "YEAR(transaction_date)"], "current_year", False, None, "snowflake") is None
+
+
+async def _analyse(con, sweep):
+    dpa = _dpa(con)
+    agent = A9_Deep_Analysis_Agent({"dimension_sweep": sweep})
+    agent.data_product_agent = dpa
+    agent._lookup_kpi_scoped = lambda kpi_ref, client_id: _kpi()
+    agent._contract_path_for_kpi = lambda *a, **kw: "/nonexistent/contract.yaml"
+    plan = DeepAnalysisPlan(kpi_name="Revenue", timeframe="current_year", dimensions=DIMS)
+    resp = await agent.execute_deep_analysis(plan)
+    return resp, dpa.executed
+
+
+@pytest.mark.asyncio
+async def test_execute_deep_analysis_same_result_fewer_queries(con):
+    swept, swept_sql = await _analyse(con, sweep=True)
+    per_dim, per_dim_sql = await _analyse(con, sweep=False)
+
+    def _where(resp):
+        kt = resp.kt_is_is_not
+        return (
+            sorted((w["dimension"], w["key"], round(w["delta"], 6)) for w in kt.where_is + kt.where_is_not),
+            sorted((e["dimension"], e["total_keys"], e["breach_count"]) for e in kt.extent_is if "total_keys" in e),
+        )
+
+    assert _where(swept) == _where(per_dim)
+    assert sum("GROUPING SETS" in s for s in swept_sql) == 2
+    assert not any("GROUPING SETS" in s for s in per_dim_sql)
+    # per-dimension breakdowns (fallback + distribution maps) are gone; TopN stays per dimension
+    assert not any(s.endswith(f"GROUP BY {d}") for s in swept_sql for d in DIMS)
+    assert len(swept_sql) < len(per_dim_sql)
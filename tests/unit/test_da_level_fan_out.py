@@ -0,0 +1,137 @@
+# arch-allow-direct-agent-construction
+"""
+Unit tests for the Deep Analysis level fan-out.
+
+Contract under test:
+  1. _gather_ordered returns results (and raised exceptions) in input order,
+     concurrently or one after another
+  2. level_concurrency > 1 runs independent level queries together, never more
+     than the limit at once, and level_concurrency=1 keeps them sequential
+  3. The Is/Is-Not, dimension totals and queries_planned are identical either way
+  4. level_backend_limits lowers the limit for the data product's backend
+"""
+import asyncio
+import logging
+from datetime import date
+from types import SimpleNamespace
+
+import duckdb
+import pytest
+
+from src.agents.new.a9_data_product_agent import A9_Data_Product_Agent
+from src.agents.new.a9_deep_analysis_agent import A9_Deep_Analysis_Agent
+from src.agents.models.deep_analysis_models import DeepAnalysisPlan
+
+THIS_YEAR = date.today().year
+DIMS = ["region", "product", "channel"]
+SUM_SQL = "SELECT SUM(amount) AS value FROM sales WHERE version = 'Actual'"
+
+
+@pytest.fixture
+def con():
+    con = duckdb.connect()
+    con.execute(
+        "CREATE TABLE sales (transaction_date DATE, version VARCHAR, region VARCHAR, "
+        "product VARCHAR, channel VARCHAR, amount DOUBLE)"
+    )
+    rows = []
+    for y, scale in ((THIS_YEAR - 1, 1.0), (THIS_YEAR, 1.3)):
+        for i, (region, product, channel) in enumerate(
+            (r, p, c) for r in ("North", "South", "West") for p in ("Oil", "Grease") for c in ("Retail", "Fleet")
+        ):
+            amount = (100.0 + 17 * i) * (scale if region != "West" else 0.6)
+            rows.append((f"{y}-0{1 + i % 9}-10", "Actual", region, product, channel, amount))
+    con.executemany("INSERT INTO sales VALUES (?, ?, ?, ?, ?, ?)", rows)
+    yield con
+    con.close()
+
+
+def _dpa(con):
+    dpa = A9_Data_Product_Agent.__new__(A9_Data_Product_Agent)
+    dpa.logger = logging.getLogger("test")
+    dpa.data_product_provider = None
+    dpa._resolve_source_system = lambda dp_id: "snowflake"
+    dpa._resolve_time_spec = lambda dp_id: None
+    dpa.in_flight = 0
+    dpa.peak = 0
+
+    async def _execute_sql(sql, *args, **kwargs):
+        dpa.in_flight += 1
+        dpa.peak = max(dpa.peak, dpa.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            cur = con.execute(sql)
+            cols = [d[0] for d in cur.description]
+            rows = [dict(zip(cols, r)) for r in cur.fetchall()]
+            return {"success": True, "columns": cols, "rows": rows, "data": rows}
+        finally:
+            dpa.in_flight -= 1
+
+    dpa.execute_sql = _execute_sql
+    return dpa
+
+
+def _kpi():
+    return SimpleNamespace(
+        name="Revenue", id="revenue", sql_query=SUM_SQL, calculation=SUM_SQL, data_product_id="dp_sales",
+        metadata={}, thresholds=None, unit="$", not_sliceable_by=None,
+    )
+
+
+async def _analyse(con, concurrency):
+    dpa = _dpa(con)
+    agent = A9_Deep_Analysis_Agent({"dimension_sweep": False, "level_concurrency": concurrency})
+    agent.data_product_agent = dpa
+    agent._lookup_kpi_scoped = lambda kpi_ref, client_id: _kpi()
+    agent._contract_path_for_kpi = lambda *a, **kw: "/nonexistent/contract.yaml"
+    plan = DeepAnalysisPlan(kpi_name="Revenue", timeframe="current_year", dimensions=DIMS)
+    resp = await agent.execute_deep_analysis(plan)
+    return resp, dpa.peak
+
+
+def _summary(resp):
+    kt = resp.kt_is_is_not
+    return (
+        [(w["dimension"], w["key"], round(w["delta"], 6)) for w in kt.where_is + kt.where_is_not],
+        [(e["dimension"], e["total_keys"], e["breach_count"]) for e in kt.extent_is if "total_keys" in e],
+        [e["queries_planned"] for e in kt.extent_is if "queries_planned" in e],
+        list(kt.dimension_totals or {}),
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("concurrent", [False, True])
+async def test_gather_ordered_keeps_input_order(concurrent):
+    async def _value(v, delay):
+        await asyncio.sleep(delay)
+        if isinstance(v, Exception):
+            raise v
+        return v
+
+    boom = ValueError("boom")
+    out = await A9_Deep_Analysis_Agent._gather_ordered(
+        [_value("a", 0.03), _value(boom, 0.0), _value("c", 0.01)], concurrent
+    )
+    assert out == ["a", boom, "c"]
+
+
+@pytest.mark.asyncio
+async def test_fan_out_matches_sequential_pass_within_limit(con):
+    sequential, seq_peak = await _analyse(con, concurrency=1)
+    fanned, fan_peak = await _analyse(con, concurrency=2)
+
+    assert _summary(fanned) == _summary(sequential)
+    assert seq_peak == 1
+    assert fan_peak == 2
+
+
+def test_backend_limit_lowers_level_concurrency(monkeypatch):
+    import src.registry.factory as factory
+
+    provider = SimpleNamespace(get=lambda dp_id: SimpleNamespace(source_system="SQL_Server", metadata={}))
+    monkeypatch.setattr(factory, "RegistryFactory", lambda: SimpleNamespace(get_provider=lambda kind: provider))
+
+    agent = A9_Deep_Analysis_Agent({"level_concurrency": 6, "level_backend_limits": {"sqlserver": 2}})
+    assert agent._level_query_limit("dp_sales") == 2
+    assert agent._level_query_limit(None) == 6
+    assert A9_Deep_Analysis_Agent({"level_concurrency": 6})._level_query_limit("dp_sales") == 6
@@ -7,6 +7,9 @@ Tests cover:
 - _discover_tables_for_inspection: table/view enumeration per backend
 - _profile_table: dispatching to backend-specific profiling
 - inspect_source_schema: end-to-end inspection workflow
+- concurrent profiling with bulk catalog metadata and one sampling query per table
+- inspection_depth: fast (estimates, TABLESAMPLE, approximate distinct counts) vs extended
+- incremental re-profiling against the schema profile store
 """
 
 import pytest
@@ -443,3 +446,274 @@ class TestInspectSourceSchemaEndToEnd:
         assert len(response.tables) == 0
         assert len(response.warnings) > 0
         assert any("No tables" in w for w in response.warnings)
+
+
+class FakeSnowflakeManager:
+    """Answers the Snowflake inspection queries from an in-memory schema and
+    records every statement plus the peak number of queries in flight."""
+
+    SCHEMA = {
+        "ORDERS": ([("ORDER_ID", "NUMBER"), ("REGION", "TEXT"), ("CHANNEL", "TEXT"), ("AMOUNT", "NUMBER")], 120),
+        "CUSTOMERS": ([("CUSTOMER_ID", "NUMBER"), ("SEGMENT", "TEXT")], 30),
+        "SALES_V": ([("REGION", "TEXT"), ("AMOUNT", "NUMBER")], None),
+    }
+    VALUES = {"REGION": ["North", "South"], "CHANNEL": ["Retail"], "SEGMENT": ["SMB", "Enterprise"]}
+
+    def __init__(self):
+        self.queries: List[str] = []
+        self.in_flight = 0
+        self.peak = 0
+
+    async def connect(self, params):
+        return True
+
+    async def disconnect(self):
+        pass
+
+    async def execute_query(self, sql: str, params: Dict[str, Any]):
+        import asyncio
+        import re
+
+        self.queries.append(sql)
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            if "ORDER BY TABLE_NAME, ORDINAL_POSITION" in sql:
+                rows = [
+                    {"TABLE_NAME": t, "COLUMN_NAME": c, "DATA_TYPE": d, "IS_NULLABLE": "YES"}
+                    for t, (cols, _) in self.SCHEMA.items() for c, d in cols
+                ]
+            elif "ROW_COUNT" in sql:
+                rows = [{"TABLE_NAME": t, "ROW_COUNT": n} for t, (_, n) in self.SCHEMA.items() if n is not None]
+            elif "INFORMATION_SCHEMA.TABLES" in sql:
+                rows = [{"TABLE_NAME": t} for t in self.SCHEMA]
+            elif "COUNT_DISTINCT(" in sql or "COUNT(DISTINCT" in sql:
+                found = re.findall(r'(?:APPROX_COUNT_DISTINCT\(|COUNT\(DISTINCT )"(\w+)"\) AS d(\d+)', sql)
+                rows = [{f"D{idx}": len(self.VALUES[col]) for col, idx in found}]
+            elif "COUNT(1)" in sql:
+                rows = [{"row_count": 7}]
+            elif "SELECT DISTINCT" in sql:
+                rows = []
+                for idx, col in re.findall(r'SELECT (\d+) AS col_idx, sample_value FROM \(SELECT DISTINCT "(\w+)"', sql):
+                    rows += [{"COL_IDX": int(idx), "SAMPLE_VALUE": v} for v in self.VALUES[col]]
+                if "UNION ALL" not in sql:
+                    col = re.search(r'SELECT DISTINCT "(\w+)"', sql).group(1)
+                    rows = [{"SAMPLE_VALUE": v} for v in self.VALUES[col]]
+            else:
+                rows = []
+            return {"rows": rows}
+        finally:
+            self.in_flight -= 1
+
+
+class TestConcurrentBatchedInspection:
+    """inspect_source_schema profiles tables concurrently with bulk catalog metadata."""
+
+    @pytest.mark.asyncio
+    async def test_bulk_catalog_and_batched_sampling(self, data_product_agent):
+        manager = FakeSnowflakeManager()
+        data_product_agent.config.inspection_concurrency = 2
+        request = DataProductSchemaInspectionRequest(
+            request_id="test_inspect_bulk",
+            principal_id="test_user",
+            source_system="snowflake",
+            connection_overrides={"database": "DB", "schema": "SALES", "username": "u", "password": "p"},
+        )
+
+        with patch("src.database.manager_factory.DatabaseManagerFactory.create_manager", return_value=manager):
+            response = await data_product_agent.inspect_source_schema(request)
+
+        assert response.status == "success"
+        assert [t.name for t in response.tables] == ["ORDERS", "CUSTOMERS", "SALES_V"]
+        rows = {t.name: t.row_count for t in response.tables}
+        assert rows == {"ORDERS": 120, "CUSTOMERS": 30, "SALES_V": 7}
+
+        orders = response.tables[0]
+        assert [c.name for c in orders.columns] == ["ORDER_ID", "REGION", "CHANNEL", "AMOUNT"]
+        samples = {c.name: c.sample_values for c in orders.columns}
+        assert samples["REGION"] == ["North", "South"] and samples["CHANNEL"] == ["Retail"]
+
+        # Columns come from one bulk query; only the view needs its own COUNT(1)
+        assert not any("WHERE TABLE_NAME   = " in q and "INFORMATION_SCHEMA.COLUMNS" in q for q in manager.queries)
+        assert sum("COUNT(1)" in q for q in manager.queries) == 1
+        # One sampling query per table with categorical columns, however many columns
+        assert sum("SELECT DISTINCT" in q for q in manager.queries) == 3
+        assert manager.peak <= 2
+
+    @pytest.mark.asyncio
+    async def test_batched_sampling_failure_falls_back_per_column(self, data_product_agent):
+        calls = []
+
+        async def execute_query(sql, params):
+            calls.append(sql)
+            if "UNION ALL" in sql:
+                raise RuntimeError("collation conflict")
+            return {"rows": [{"sample_value": "x"}]}
+
+        manager = MagicMock()
+        manager.execute_query = execute_query
+        profile = TableProfile(
+            name="orders",
+            columns=[
+                TableColumnProfile(name="region", data_type="VARCHAR"),
+                TableColumnProfile(name="channel", data_type="VARCHAR"),
+                TableColumnProfile(name="amount", data_type="DOUBLE", semantic_tags=["measure"]),
+            ],
+        )
+
+        await data_product_agent._populate_categorical_sample_values(
+            manager, "duckdb", profile, {"source_system": "duckdb"}
+        )
+
+        assert [c.sample_values for c in profile.columns] == [["x"], ["x"], []]
+        assert len(calls) == 3
+
+    def test_backend_limit_lowers_inspection_concurrency(self, data_product_agent):
+        data_product_agent.config.inspection_concurrency = 8
+        data_product_agent.config.inspection_backend_limits = {"sqlserver": 3}
+        assert data_product_agent._inspection_concurrency("sql_server") == 3
+        assert data_product_agent._inspection_concurrency("snowflake") == 8
+
+
+class TestInspectionDepth:
+    """fast trades exactness for speed and says so; extended counts exactly."""
+
+    async def _inspect(self, agent, depth, tables=None):
+        manager = FakeSnowflakeManager()
+        request = DataProductSchemaInspectionRequest(
+            request_id=f"test_inspect_{depth}",
+            principal_id="test_user",
+            source_system="snowflake",
+            tables=tables,
+            inspection_depth=depth,
+            connection_overrides={"database": "DB", "schema": "SALES", "username": "u", "password": "p"},
+        )
+        with patch("src.database.manager_factory.DatabaseManagerFactory.create_manager", return_value=manager):
+            response = await agent.inspect_source_schema(request)
+        assert response.status == "success"
+        return response, manager.queries
+
+    @pytest.mark.asyncio
+    async def test_fast_mode_samples_and_approximates(self, data_product_agent):
+        data_product_agent.config.inspection_sample_rows = 60
+        response, queries = await self._inspect(data_product_agent, "fast", tables=["ORDERS"])
+
+        # One table, yet the catalog is prefetched so no COUNT(1) runs
+        assert response.tables[0].row_count == 120
+        assert not any("COUNT(1)" in q for q in queries)
+        sampling = [q for q in queries if "SELECT DISTINCT" in q]
+        assert len(sampling) == 1 and "TABLESAMPLE SYSTEM (50)" in sampling[0]
+
+        region = next(c for c in response.tables[0].columns if c.name == "REGION")
+        assert region.sample_values == ["North", "South"]
+        assert region.statistics["distinct_count"] == 2
+        assert region.error_bounds == {"distinct_count": pytest.approx(0.0162338)}
+        assert any("APPROX_COUNT_DISTINCT" in q for q in queries)
+
+    @pytest.mark.asyncio
+    async def test_failed_approximate_counts_retry_exactly(self, data_product_agent):
+        original = FakeSnowflakeManager.execute_query
+
+        async def _no_approx(manager, sql, params):
+            if "APPROX_COUNT_DISTINCT" in sql:
+                manager.queries.append(sql)
+                raise RuntimeError("'APPROX_COUNT_DISTINCT' is not a recognized built-in function name")
+            return await original(manager, sql, params)
+
+        with patch.object(FakeSnowflakeManager, "execute_query", _no_approx):
+            response, queries = await self._inspect(data_product_agent, "fast", tables=["ORDERS"])
+        region = next(c for c in response.tables[0].columns if c.name == "REGION")
+        assert region.statistics["distinct_count"] == 2 and region.error_bounds == {}
+        assert any("COUNT(DISTINCT" in q for q in queries)
+
+    def test_sqlserver_never_uses_approximate_counts(self):
+        from src.agents.new.a9_data_product_agent import _APPROX_DISTINCT_RELATIVE_ERROR
+        assert "sqlserver" not in _APPROX_DISTINCT_RELATIVE_ERROR
+
+    @pytest.mark.asyncio
+    async def test_extended_mode_counts_exactly_and_standard_not_at_all(self, data_product_agent):
+        response, queries = await self._inspect(data_product_agent, "extended")
+        region = next(c for c in response.tables[0].columns if c.name == "REGION")
+        assert region.statistics["distinct_count"] == 2 and region.error_bounds == {}
+        assert not any("APPROX_COUNT_DISTINCT" in q or "TABLESAMPLE" in q for q in queries)
+
+        response, queries = await self._inspect(data_product_agent, "standard")
+        assert all(c.statistics == {} for t in response.tables for c in t.columns)
+        assert not any("COUNT(DISTINCT" in q for q in queries)
+
+    def test_estimated_row_counts_only_in_fast_mode(self, data_product_agent):
+        entry = {"row_count": 1_000_000, "row_count_exact": False}
+        assert data_product_agent._catalog_row_count(entry, {"inspection_depth": "fast"}) == 1_000_000
+        assert data_product_agent._catalog_row_count(entry, {"inspection_depth": "standard"}) is None
+        exact = {"row_count": 5, "row_count_exact": True}
+        assert data_product_agent._catalog_row_count(exact, {"inspection_depth": "standard"}) == 5
+
+
+class TestIncrementalReprofiling:
+    """With a schema profile store, unchanged tables are reused, not re-profiled."""
+
+    async def _inspect(self, agent, manager, refresh=False):
+        request = DataProductSchemaInspectionRequest(
+            request_id="test_inspect_incremental",
+            principal_id="test_user",
+            source_system="snowflake",
+            refresh_profiles=refresh,
+            connection_overrides={"database": "DB", "schema": "SALES", "username": "u", "password": "p"},
+        )
+        with patch("src.database.manager_factory.DatabaseManagerFactory.create_manager", return_value=manager):
+            response = await agent.inspect_source_schema(request)
+        assert response.status == "success"
+        return response
+
+    @pytest.mark.asyncio
+    async def test_only_changed_tables_are_reprofiled(self, data_product_agent, tmp_path):
+        data_product_agent.config.inspection_profile_store_dir = str(tmp_path)
+        first = await self._inspect(data_product_agent, FakeSnowflakeManager())
+        assert first.inspection_metadata["reprofiled_tables"] == ["ORDERS", "CUSTOMERS", "SALES_V"]
+
+        unchanged = FakeSnowflakeManager()
+        second = await self._inspect(data_product_agent, unchanged)
+        # The view has no catalog row count or modification time to fingerprint
+        assert second.inspection_metadata["reused_tables"] == ["ORDERS", "CUSTOMERS"]
+        assert second.inspection_metadata["reprofiled_tables"] == ["SALES_V"]
+        assert [t.model_dump() for t in second.tables] == [t.model_dump() for t in first.tables]
+        # Beyond discovery and the two bulk catalog queries, only the view was queried
+        assert not any("ORDERS" in q or "CUSTOMERS" in q for q in unchanged.queries[3:])
+
+        changed = FakeSnowflakeManager()
+        changed.SCHEMA = dict(FakeSnowflakeManager.SCHEMA, CUSTOMERS=([("CUSTOMER_ID", "NUMBER"), ("SEGMENT", "TEXT")], 31))
+        third = await self._inspect(data_product_agent, changed)
+        assert third.inspection_metadata["reprofiled_tables"] == ["CUSTOMERS", "SALES_V"]
+        assert next(t for t in third.tables if t.name == "CUSTOMERS").row_count == 31
+
+        refreshed = await self._inspect(data_product_agent, FakeSnowflakeManager(), refresh=True)
+        assert len(refreshed.inspection_metadata["reprofiled_tables"]) == 3
+
+    def test_only_change_tracking_base_tables_are_fingerprinted(self):
+        from src.database.schema_profile_store import table_fingerprint
+
+        entry = {"columns": [{"column_name": "ID", "data_type": "INT"}], "row_count": 5, "base_table": True}
+        assert table_fingerprint(dict(entry, tracks_changes=True))
+        # SQL Server: an in-place UPDATE leaves row count and modify_date unchanged
+        assert table_fingerprint(dict(entry, tracks_changes=False)) is None
+        assert table_fingerprint(dict(entry, base_table=False, tracks_changes=True)) is None
+
+    def test_contract_sections_of_unchanged_tables_carry_over(self, data_product_agent):
+        orders = TableProfile(name="orders", columns=[TableColumnProfile(name="id", data_type="INT")], fingerprint="fp1")
+        stored = {
+            "orders": {
+                "fingerprint": "fp1",
+                "table": {"name": "orders", "columns": [{"name": "id", "data_type": "INT", "semantic_tags": ["curated"]}]},
+                "view": {"name": "dp_orders_view", "sql": "SELECT id FROM orders WHERE active", "source_table": "orders"},
+            }
+        }
+
+        contract = data_product_agent._build_contract_dict("dp", [orders], [], {}, previous_fragments=stored)
+        assert contract["tables"] == [stored["orders"]["table"]]
+        assert contract["views"] == [stored["orders"]["view"]]
+
+        orders.fingerprint = "fp2"
+        rebuilt = data_product_agent._build_contract_dict("dp", [orders], [], {}, previous_fragments=stored)
+        assert rebuilt["views"][0]["sql"] == "SELECT id FROM orders"
+        assert data_product_agent._contract_fragments(rebuilt, [orders])["orders"]["fingerprint"] == "fp2"
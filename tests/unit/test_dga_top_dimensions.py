@@ -0,0 +1,188 @@
+# arch-allow-direct-agent-construction
+"""A9_Data_Governance_Agent.compute_and_persist_top_dimensions().
+
+THINGS UNDER TEST
+------------------
+1. _top3_shares matches the top-3-share definition (top three group totals over
+   the sum of all groups, zero sum counted as 1.0, no groups -> 0.0).
+2. One sweep query per KPI when the DPA offers it, one grouped query per
+   dimension otherwise, with dict rows scored (not silently 0.0).
+3. Scores are cached per (KPI, timeframe, resolved window) in the enrichment
+   file: a re-run queries nothing, a new candidate dimension queries just that
+   dimension, and refresh=True or an expired entry recomputes everything.
+   Expired entries and windows the timeframe has moved past are pruned.
+4. NULL dimension members score the same on the sweep and per-dimension paths.
+"""
+import json
+from datetime import date, datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+import yaml
+
+from src.agents.new.a9_data_governance_agent import A9_Data_Governance_Agent, _top3_shares
+from src.agents.new.a9_data_product_agent import A9_Data_Product_Agent
+
+GROUPS = {
+    "Region": {"North": 50.0, "South": 30.0, "East": 10.0, "West": 10.0},
+    "Product": {"A": 25.0, "B": 25.0, "C": 25.0, "D": 25.0},
+    "Channel": {"Retail": 60.0, "Fleet": 40.0},
+}
+
+
+def test_top3_shares():
+    assert _top3_shares([[50, 30, 10, 10], [25, 25, 25, 25], [60, 40], [], [0.0, 0.0], [-5.0, 10.0]]) == pytest.approx(
+        [0.9, 0.75, 1.0, 0.0, 0.0, 1.0]
+    )
+    assert _top3_shares([]) == []
+
+
+def _dpa(sweep: bool):
+    calls = []
+
+    async def generate_sql_for_kpi(kpi_definition=None, override_group_by=None, **kw):
+        return {"success": True, "sql": f"BY {override_group_by[0]}"}
+
+    async def generate_sql_for_kpi_sweep(kpi, dims, timeframe=None):
+        return {"success": True, "sql": "SWEEP " + ",".join(dims), "dimensions": list(dims), "mode": "grouping_sets"}
+
+    async def execute_sql(sql, data_product_id=None):
+        calls.append(sql)
+        if sql.startswith("SWEEP "):
+            return {"success": True, "dims": sql[6:].split(",")}
+        dim = sql[3:]
+        rows = [{"key": k, "total_value": v} for k, v in GROUPS[dim].items()]
+        return {"success": True, "columns": ["key", "total_value"], "rows": rows}
+
+    def split_sweep_result(resp, dims, mode):
+        return {d: {"values": dict(GROUPS[d]), "total": None} for d in resp["dims"]}
+
+    dpa = SimpleNamespace(
+        generate_sql_for_kpi=generate_sql_for_kpi, execute_sql=execute_sql, calls=calls,
+    )
+    if sweep:
+        dpa.generate_sql_for_kpi_sweep = generate_sql_for_kpi_sweep
+        dpa.split_sweep_result = split_sweep_result
+    return dpa
+
+
+def _agent(kpis):
+    agent = A9_Data_Governance_Agent(config={})
+    agent.kpi_provider = MagicMock()
+    agent.kpi_provider.get_all.return_value = kpis
+    agent._contract_path = lambda: "/nonexistent/contract.yaml"
+    return agent
+
+
+def _kpis(dims=("Region", "Product")):
+    return [
+        SimpleNamespace(id=f"kpi_{i}", name=f"KPI {i}", data_product_id="dp", dimensions=list(dims))
+        for i in range(3)
+    ]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("sweep", [True, False])
+async def test_scores_and_top_dimensions_are_persisted(tmp_path, sweep):
+    out = tmp_path / "kpi_enrichment.yaml"
+    dpa = _dpa(sweep)
+    res = await _agent(_kpis()).compute_and_persist_top_dimensions(
+        dpa, timeframe="current_year", enrichment_output_path=str(out),
+    )
+
+    assert res["success"] and res["kpis_analyzed"] == 3
+    assert len(dpa.calls) == (3 if sweep else 6)
+    doc = yaml.safe_load(out.read_text())
+    assert doc["top_dimensions"]["KPI 0"] == "Region, Product"
+    assert json.loads(doc["dimension_scores"]["KPI 0"]) == {"Region": 0.9, "Product": 0.75}
+    year = date.today().year
+    entry = doc["dimension_score_cache"][f"kpi_0@current_year[{year}-01-01..{year}-12-31]"]
+    assert entry["scores"] == {"Region": 0.9, "Product": 0.75} and entry["computed_at"]
+
+
+@pytest.mark.asyncio
+async def test_reruns_only_query_uncached_dimensions(tmp_path):
+    out = str(tmp_path / "kpi_enrichment.yaml")
+    await _agent(_kpis()).compute_and_persist_top_dimensions(_dpa(True), timeframe="current_year", enrichment_output_path=out)
+
+    again = _dpa(True)
+    res = await _agent(_kpis()).compute_and_persist_top_dimensions(again, timeframe="current_year", enrichment_output_path=out)
+    assert again.calls == [] and res["kpis_from_cache"] == 3
+
+    widened = _dpa(True)
+    await _agent(_kpis(("Region", "Product", "Channel"))).compute_and_persist_top_dimensions(
+        widened, timeframe="current_year", enrichment_output_path=out,
+    )
+    assert widened.calls == ["BY Channel"] * 3
+    assert yaml.safe_load(open(out))["top_dimensions"]["KPI 1"] == "Channel, Region, Product"
+
+    other_timeframe = _dpa(True)
+    await _agent(_kpis()).compute_and_persist_top_dimensions(other_timeframe, timeframe="current_quarter", enrichment_output_path=out)
+    assert len(other_timeframe.calls) == 3
+
+    refreshed = _dpa(True)
+    await _agent(_kpis()).compute_and_persist_top_dimensions(
+        refreshed, timeframe="current_year", enrichment_output_path=out, refresh=True,
+    )
+    assert len(refreshed.calls) == 3
+
+
+@pytest.mark.asyncio
+async def test_expired_scores_are_recomputed(tmp_path):
+    out = str(tmp_path / "kpi_enrichment.yaml")
+    await _agent(_kpis()).compute_and_persist_top_dimensions(_dpa(True), timeframe="current_year", enrichment_output_path=out)
+
+    expired = _dpa(True)
+    res = await _agent(_kpis()).compute_and_persist_top_dimensions(
+        expired, timeframe="current_year", enrichment_output_path=out, score_cache_ttl_hours=0,
+    )
+    assert len(expired.calls) == 3 and res["kpis_from_cache"] == 0
+
+
+@pytest.mark.asyncio
+async def test_expired_and_superseded_entries_are_pruned(tmp_path):
+    out = tmp_path / "kpi_enrichment.yaml"
+    fresh = datetime.now(timezone.utc).isoformat()
+    out.write_text(yaml.safe_dump({"dimension_score_cache": {
+        "kpi_0@current_year[2001-01-01..2001-12-31]": {"computed_at": fresh, "scores": {"Region": 0.1}},
+        "kpi_0@current_quarter[2001-01-01..2001-03-31]": {"computed_at": fresh, "scores": {"Region": 0.1}},
+        "kpi_9@current_quarter[2001-01-01..2001-03-31]": {"computed_at": "2001-01-01T00:00:00", "scores": {"Region": 0.1}},
+        "kpi_9@last_year": {"Region": 0.1},
+    }}))
+
+    await _agent(_kpis()).compute_and_persist_top_dimensions(
+        _dpa(True), timeframe="current_year", enrichment_output_path=str(out),
+    )
+    year = date.today().year
+    assert sorted(yaml.safe_load(out.read_text())["dimension_score_cache"]) == [
+        "kpi_0@current_quarter[2001-01-01..2001-03-31]",
+        *[f"kpi_{i}@current_year[{year}-01-01..{year}-12-31]" for i in range(3)],
+    ]
+
+
+@pytest.mark.asyncio
+async def test_null_members_score_the_same_on_both_paths(tmp_path):
+    groups = {"Region": {"North": 50.0, None: 40.0, "South": 5.0, "East": 5.0}, "Product": GROUPS["Product"]}
+
+    async def execute_sql(sql, data_product_id=None):
+        if sql.startswith("SWEEP "):
+            rows = [
+                {"a9_d0": k if i == 0 else None, "a9_d1": k if i == 1 else None,
+                 "a9_g0": int(i != 0), "a9_g1": int(i != 1), "value": v}
+                for i, dim in enumerate(("Region", "Product")) for k, v in groups[dim].items()
+            ]
+            return {"success": True, "rows": rows}
+        rows = [{"key": k, "total_value": v} for k, v in groups[sql[3:]].items()]
+        return {"success": True, "columns": ["key", "total_value"], "rows": rows}
+
+    scores = []
+    for sweep in (True, False):
+        dpa = _dpa(sweep)
+        dpa.execute_sql = execute_sql
+        if sweep:
+            dpa.split_sweep_result = A9_Data_Product_Agent.split_sweep_result
+        out = tmp_path / f"enrichment_{sweep}.yaml"
+        await _agent(_kpis()).compute_and_persist_top_dimensions(dpa, timeframe="current_year", enrichment_output_path=str(out))
+        scores.append(json.loads(yaml.safe_load(out.read_text())["dimension_scores"]["KPI 0"]))
+    assert scores[0] == scores[1] and scores[0]["Region"] == pytest.approx(0.95)
@@ -0,0 +1,92 @@
+"""
+Unit tests for the opt-in execute_sql result cache in A9_Data_Product_Agent.
+
+Contract under test:
+  1. Identical SQL (modulo whitespace outside quotes) for the same
+     product/client/params hits; whitespace inside a literal is significant
+  2. Keys are tenant-aware — another client_id misses
+  3. Failed results are never cached; expired entries miss
+  4. The byte budget evicts least recently used entries
+"""
+import logging
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.agents.new.a9_data_product_agent import A9_Data_Product_Agent
+from src.database.query_result_cache import QueryResultCache, normalize_sql
+
+SQL = "SELECT SUM(amount) AS v FROM fi_star_view WHERE version = 'Actual'"
+
+
+def _agent(cache=None):
+    agent = A9_Data_Product_Agent.__new__(A9_Data_Product_Agent)
+    agent.logger = logging.getLogger("test")
+    agent.registry_factory = None
+    agent._query_cache = cache or QueryResultCache()
+    agent._dispatch_sql = AsyncMock(
+        return_value={"success": True, "status": "success", "columns": ["v"],
+                      "rows": [{"v": 1.0}], "data": [{"v": 1.0}], "row_count": 1}
+    )
+    return agent
+
+
+@pytest.mark.asyncio
+async def test_repeat_query_is_served_from_cache():
+    agent = _agent()
+    first = await agent.execute_sql(SQL, data_product_id="dp_fi")
+    second = await agent.execute_sql("  " + SQL.replace(" ", "\n", 1) + ";", data_product_id="dp_fi")
+
+    assert agent._dispatch_sql.await_count == 1
+    assert second["cached"] is True and second["rows"] == first["rows"]
+    assert second["transaction_id"]
+    second["rows"][0]["v"] = 99
+    assert (await agent.execute_sql(SQL, data_product_id="dp_fi"))["rows"][0]["v"] == 1.0
+    assert agent.get_query_cache_stats()["hits"] == 2
+
+
+def test_whitespace_inside_literals_is_part_of_the_key():
+    assert normalize_sql("SELECT  a\n FROM t ;") == normalize_sql("SELECT a FROM t")
+    assert normalize_sql("WHERE x = 'A  B'") != normalize_sql("WHERE x = 'A B'")
+    assert normalize_sql('WHERE "my  col" = 1') != normalize_sql('WHERE "my col" = 1')
+    assert normalize_sql("WHERE x = 'it''s  here'  AND y = 1") == "WHERE x = 'it''s  here' AND y = 1"
+
+
+@pytest.mark.asyncio
+async def test_cache_key_is_tenant_aware():
+    agent = _agent()
+    agent.data_governance_agent = SimpleNamespace(
+        validate_data_access=AsyncMock(return_value=SimpleNamespace(allowed=True, reason=""))
+    )
+    await agent.execute_sql(SQL, principal_context={"client_id": "bicycle"}, data_product_id="dp_fi")
+    await agent.execute_sql(SQL, principal_context={"client_id": "lubricants"}, data_product_id="dp_fi")
+    assert agent._dispatch_sql.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_results_are_not_cached():
+    agent = _agent()
+    agent._dispatch_sql.return_value = {"success": False, "status": "error", "rows": []}
+    await agent.execute_sql(SQL)
+    await agent.execute_sql(SQL)
+    assert agent._dispatch_sql.await_count == 2
+
+
+def test_expiry_and_lru_eviction(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("src.database.query_result_cache.time.monotonic", lambda: now[0])
+    cache = QueryResultCache(default_ttl_seconds=10, source_ttls={"duckdb": 0}, max_bytes=800)
+    row = {"rows": [{"v": "x" * 100}], "columns": ["v"]}
+
+    cache.put("a", row)
+    cache.put("b", row)
+    assert cache.get("a") is not None          # a is now most recent
+    cache.put("c", row)                         # over budget → evicts b
+    assert cache.get("b") is None and cache.stats()["evictions"] == 1
+
+    cache.put("d", row, source="duckdb")        # TTL 0 → not cached
+    assert cache.get("d") is None
+
+    now[0] += 11
+    assert cache.get("a") is None
@@ -0,0 +1,96 @@
+"""
+Unit tests for the DuckDBManager query executor.
+
+execute_query must run off the event loop on a bounded thread pool, with each
+worker reading through its own cursor, and disconnect must tear the pool down without blocking the event loop.
+"""
+import asyncio
+import threading
+
+import pytest
+import pytest_asyncio
+
+from src.database.backends.duckdb_manager import DuckDBManager
+
+
+@pytest_asyncio.fixture
+async def manager(tmp_path):
+    mgr = DuckDBManager({"max_workers": 2})
+    await mgr.connect({"database_path": str(tmp_path / "exec.duckdb")})
+    await mgr.execute_query("CREATE TABLE t AS SELECT range AS v FROM range(1000)")
+    yield mgr
+    await mgr.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_query_runs_off_event_loop_thread(manager):
+    threads = []
+    original = manager._run_query
+
+    def _spy(sql, parameters):
+        threads.append(threading.current_thread())
+        return original(sql, parameters)
+
+    manager._run_query = _spy
+    df = await manager.execute_query("SELECT SUM(v) AS total FROM t")
+    assert int(df["total"][0]) == sum(range(1000))
+    assert threads and threads[0] is not threading.main_thread()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_queries_use_separate_cursors(manager):
+    barrier = threading.Barrier(2, timeout=5)
+    original = manager._run_query
+
+    def _rendezvous(sql, parameters):
+        # Both workers must be inside a query at the same time to pass the barrier
+        barrier.wait()
+        return original(sql, parameters)
+
+    manager._run_query = _rendezvous
+    results = await asyncio.gather(
+        manager.execute_query("SELECT COUNT(*) AS n FROM t"),
+        manager.execute_query("SELECT MAX(v) AS m FROM t"),
+    )
+    assert int(results[0]["n"][0]) == 1000
+    assert int(results[1]["m"][0]) == 999
+    assert len(manager._cursors) == 2
+
+
+@pytest.mark.asyncio
+async def test_parameters_are_forwarded(manager):
+    df = await manager.execute_query("SELECT COUNT(*) AS n FROM t WHERE v < ?", [10])
+    assert int(df["n"][0]) == 10
+
+
+@pytest.mark.asyncio
+async def test_disconnect_releases_executor_and_cursors(manager):
+    await manager.execute_query("SELECT 1")
+    assert manager._executor is not None
+    await manager.disconnect()
+    assert manager._executor is None
+    assert manager._cursors == []
+    with pytest.raises(RuntimeError):
+        await manager.execute_query("SELECT 1")
+
+
+@pytest.mark.asyncio
+async def test_disconnect_waits_for_queries_without_blocking_the_loop(manager):
+    started, release = threading.Event(), threading.Event()
+    original = manager._run_query
+
+    def _slow(sql, parameters):
+        started.set()
+        release.wait(timeout=5)
+        return original(sql, parameters)
+
+    manager._run_query = _slow
+    query = asyncio.create_task(manager.execute_query("SELECT COUNT(*) AS n FROM t"))
+    await asyncio.to_thread(started.wait, 5)
+    disconnect = asyncio.create_task(manager.disconnect())
+    await asyncio.sleep(0.05)
+    # The loop is still running while disconnect waits on the in-flight query
+    assert not disconnect.done()
+    release.set()
+    assert int((await query)["n"][0]) == 1000
+    assert await disconnect is True
@@ -0,0 +1,123 @@
+"""
+Unit tests for the batch mode of EnterpriseAssessmentEngine.
+
+Batch mode must run Situation Awareness once per (client, timeframe, filters)
+group and fan the situations out into one KPIAssessment per KPI, in KPI order,
+with a single bulk persist call per run.
+"""
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from run_enterprise_assessment import EnterpriseAssessmentEngine
+from src.agents.models.assessment_models import AssessmentConfig, KPIAssessmentStatus
+from src.agents.models.situation_awareness_models import SituationSeverity
+
+
+def _kpi(kpi_id, name, bps=("finance_profitability_analysis",)):
+    return SimpleNamespace(
+        id=kpi_id, name=name, client_id="lubricants",
+        business_process_ids=list(bps), filters=None, monitoring_profile=None,
+    )
+
+
+def _engine(kpis, situations, batch=True):
+    provider = MagicMock()
+    provider.get_all.return_value = kpis
+    factory = MagicMock()
+    factory.get_provider.return_value = provider
+    orchestrator = MagicMock()
+    orchestrator.orchestrate_situation_detection = AsyncMock(
+        return_value={"status": "success", "situations": situations}
+    )
+    engine = EnterpriseAssessmentEngine(
+        orchestrator, factory, AssessmentConfig(client_id="lubricants", batch=batch)
+    )
+    engine._persist_kpi_assessments = AsyncMock()
+    engine._persist_run = AsyncMock()
+    return engine, orchestrator
+
+
+def _situation(kpi_name, severity):
+    return SimpleNamespace(kpi_name=kpi_name, severity=severity, confidence=0.9)
+
+
+@pytest.mark.asyncio
+async def test_batch_runs_one_sa_pass_and_fans_out():
+    kpis = [
+        _kpi("net_revenue", "Net Revenue"),
+        _kpi("gross_margin", "Gross Margin", bps=("finance_cost_management",)),
+        _kpi("opex", "Operating Expenses"),
+    ]
+    engine, orchestrator = _engine(kpis, [
+        _situation("Gross Margin", SituationSeverity.CRITICAL),
+        _situation("Operating Expenses", SituationSeverity.LOW),
+    ])
+
+    run = await engine.run()
+
+    assert orchestrator.orchestrate_situation_detection.await_count == 1
+    request = orchestrator.orchestrate_situation_detection.await_args.args[0]
+    assert request.business_processes == ["finance_cost_management", "finance_profitability_analysis"]
+    assert [ka.kpi_id for ka in engine.kpi_assessments] == ["net_revenue", "gross_margin", "opex"]
+    assert [ka.status for ka in engine.kpi_assessments] == [
+        KPIAssessmentStatus.BELOW_THRESHOLD,
+        KPIAssessmentStatus.DETECTED,
+        KPIAssessmentStatus.BELOW_THRESHOLD,
+    ]
+    assert run.kpis_escalated == 1 and run.kpis_below_threshold == 2
+    engine._persist_kpi_assessments.assert_awaited_once_with(engine.kpi_assessments)
+
+
+@pytest.mark.asyncio
+async def test_kpi_without_business_process_scans_full_client_set():
+    kpis = [_kpi("net_revenue", "Net Revenue"), _kpi("cash", "Cash", bps=())]
+    engine, orchestrator = _engine(kpis, [])
+
+    await engine.run()
+
+    request = orchestrator.orchestrate_situation_detection.await_args.args[0]
+    assert request.business_processes == []
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_pass_marks_group_errored():
+    kpis = [_kpi("net_revenue", "Net Revenue"), _kpi("opex", "Operating Expenses")]
+    engine, orchestrator = _engine(kpis, [])
+    orchestrator.orchestrate_situation_detection.side_effect = RuntimeError("warehouse down")
+
+    run = await engine.run()
+
+    assert run.kpis_errored == 2
+    assert all(ka.error_message == "warehouse down" for ka in engine.kpi_assessments)
+
+
+@pytest.mark.asyncio
+async def test_legacy_mode_runs_one_pass_per_kpi():
+    kpis = [_kpi("net_revenue", "Net Revenue"), _kpi("opex", "Operating Expenses")]
+    engine, orchestrator = _engine(kpis, [], batch=False)
+
+    await engine.run()
+
+    assert orchestrator.orchestrate_situation_detection.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_assessments_are_bulk_upserted_after_run_row():
+    kpis = [_kpi("net_revenue", "Net Revenue"), _kpi("opex", "Operating Expenses")]
+    engine, _ = _engine(kpis, [])
+    del engine._persist_kpi_assessments, engine._persist_run
+    store = MagicMock(enabled=True)
+    calls = []
+    store.upsert_run = AsyncMock(side_effect=lambda run: calls.append("run"))
+    store.upsert_kpi_assessments = AsyncMock(
+        side_effect=lambda rows: calls.append("assessments") or [True] * len(rows)
+    )
+    engine._store = store
+
+    run = await engine.run()
+
+    store.upsert_kpi_assessments.assert_awaited_once_with(engine.kpi_assessments)
+    assert calls == ["run", "assessments", "run"]
+    assert all(ka.run_id == run.id for ka in engine.kpi_assessments)
@@ -0,0 +1,197 @@
+# arch-allow-direct-agent-construction
+"""
+Unit tests for the single-scan KPI bundle (DPA.build_kpi_bundle_sql) and its
+use in SA._get_kpi_value.
+
+Contract under test:
+  1. On DuckDB the bundle returns exactly what the separate current, comparison,
+     plan and monthly queries return — ratio KPIs included
+  2. Shapes the bundle can't fold (JOIN, GROUP BY, subqueries) are rejected
+  3. parse_kpi_bundle_result handles uppercase keys, list rows and missing buckets
+  4. SA reads a native-SQL KPI with one execute_sql call and returns the plan
+     value on the KPIValue for _fetch_plan_value; a failed bundle falls back to
+     separate queries and carries no plan value
+"""
+import logging
+from unittest.mock import AsyncMock
+
+import duckdb
+import pytest
+
+from src.agents.new.a9_data_product_agent import A9_Data_Product_Agent
+from src.agents.new.a9_situation_awareness_agent import A9_Situation_Awareness_Agent
+from src.agents.models.situation_awareness_models import (
+    ComparisonType,
+    KPIDefinition,
+    TimeFrame,
+)
+
+CURRENT = ("2025-04-01", "2025-06-30")
+PRIOR = ("2025-01-01", "2025-03-31")
+ACTUAL_SQL = "SELECT SUM(amount) AS total_value FROM fi WHERE version = 'Actual' AND account = 'Revenue'"
+PLAN_SQL = "SELECT SUM(amount) AS total_value FROM fi WHERE version = 'Budget' AND account = 'Revenue'"
+
+
+def _dpa():
+    agent = A9_Data_Product_Agent.__new__(A9_Data_Product_Agent)
+    agent.logger = logging.getLogger("test")
+    return agent
+
+
+@pytest.fixture
+def con():
+    con = duckdb.connect()
+    con.execute("CREATE TABLE fi (transaction_date DATE, version VARCHAR, account VARCHAR, amount DOUBLE, qty DOUBLE)")
+    rows = []
+    for month in range(1, 10):
+        for version, scale in (("Actual", 1.0), ("Budget", 1.1)):
+            for account in ("Revenue", "Cost"):
+                rows.append((f"2025-{month:02d}-15", version, account, 100.0 * month * scale, float(month)))
+                rows.append((f"2025-{month:02d}-20", version, account, 7.0 * scale, 2.0))
+    con.executemany("INSERT INTO fi VALUES (?, ?, ?, ?, ?)", rows)
+    yield con
+    con.close()
+
+
+def _scalar(con, sql, window):
+    return con.execute(f"{sql} AND transaction_date BETWEEN '{window[0]}' AND '{window[1]}'").fetchone()[0]
+
+
+def _run(con, sql):
+    cur = con.execute(sql)
+    cols = [d[0] for d in cur.description]
+    return {"success": True, "rows": [dict(zip(cols, r)) for r in cur.fetchall()]}
+
+
+@pytest.mark.parametrize("agg", ["SUM(amount)", "SUM(amount) / NULLIF(SUM(qty), 0)"])
+def test_bundle_matches_separate_queries_on_duckdb(con, agg):
+    actual = ACTUAL_SQL.replace("SUM(amount)", agg)
+    plan = PLAN_SQL.replace("SUM(amount)", agg)
+    dpa = _dpa()
+    sql = dpa.build_kpi_bundle_sql(
+        actual, "duckdb", "transaction_date", CURRENT,
+        comparison_window=PRIOR, plan_sql=plan, monthly_spec={"type": "date"},
+    )
+    bundle = dpa.parse_kpi_bundle_result(_run(con, sql), num_months=6)
+
+    assert bundle["current"] == pytest.approx(_scalar(con, actual, CURRENT))
+    assert bundle["comparison"] == pytest.approx(_scalar(con, actual, PRIOR))
+    assert bundle["plan"] == pytest.approx(_scalar(con, plan, CURRENT))
+    monthly = con.execute(
+        f"SELECT LEFT(CAST(transaction_date AS VARCHAR), 7) AS p, {agg} FROM fi "
+        "WHERE version = 'Actual' AND account = 'Revenue' GROUP BY p ORDER BY p"
+    ).fetchall()[-6:]
+    assert [m["period"] for m in bundle["monthly"]] == [p for p, _ in monthly]
+    assert [m["value"] for m in bundle["monthly"]] == pytest.approx([v for _, v in monthly])
+
+
+def test_empty_window_comes_back_as_none(con):
+    dpa = _dpa()
+    sql = dpa.build_kpi_bundle_sql(ACTUAL_SQL, "duckdb", "transaction_date", ("2030-01-01", "2030-03-31"))
+    bundle = dpa.parse_kpi_bundle_result(_run(con, sql))
+    assert bundle["current"] is None and bundle["monthly"] == []
+
+
+@pytest.mark.parametrize("sql", [
+    "SELECT SUM(f.amount) AS v FROM fi f JOIN dim d ON f.k = d.k",
+    "SELECT SUM(amount) AS v FROM fi GROUP BY account",
+    "SELECT SUM(amount) AS v FROM fi WHERE account IN (SELECT account FROM accts)",
+    "SELECT amount FROM fi",
+])
+def test_unsupported_shapes_are_rejected(sql):
+    assert _dpa().build_kpi_bundle_sql(sql, "snowflake", "transaction_date", CURRENT) is None
+
+
+def test_dialect_specific_sql():
+    dpa = _dpa()
+    bq = dpa.build_kpi_bundle_sql(
+        "SELECT SUM(amount) AS v FROM `p.d.fi` WHERE version = 'Actual'", "bigquery",
+        "transaction_date", CURRENT, monthly_spec={"type": "date"},
+    )
+    assert "UNNEST(['current', 'monthly'])" in bq
+    ss = dpa.build_kpi_bundle_sql(
+        "SELECT SUM([amount]) AS v FROM [dbo].[fi] WHERE [version] = 'Actual'", "sqlserver", "[posting_date]",
+        CURRENT, monthly_spec={"type": "fiscal_year_period", "year_column": "fy", "period_column": "fp"},
+    )
+    assert "RIGHT('0' + CAST([fp] AS VARCHAR(2)), 2)" in ss and "VALUES ('current'), ('monthly')" in ss
+    assert dpa.build_kpi_bundle_sql(ACTUAL_SQL, "oracle", "transaction_date", CURRENT) is None
+
+
+def test_parse_handles_uppercase_keys_and_list_rows():
+    parse = A9_Data_Product_Agent.parse_kpi_bundle_result
+    upper = parse({"rows": [
+        {"BUCKET": "current", "PERIOD": None, "VALUE": "12.5"},
+        {"BUCKET": "monthly", "PERIOD": "2025-02", "VALUE": 2},
+        {"BUCKET": "monthly", "PERIOD": "2025-01", "VALUE": 1},
+        {"BUCKET": "monthly", "PERIOD": "2025-03", "VALUE": "n/a"},
+    ]})
+    assert upper["current"] == 12.5 and upper["comparison"] is None
+    assert upper["monthly"] == [{"period": "2025-01", "value": 1.0}, {"period": "2025-02", "value": 2.0}]
+    assert upper["monthly_dropped"] == 1
+    assert parse({"rows": [("plan", None, 3)]})["plan"] == 3.0
+    assert parse({"rows": [{"total_value": 1}]}) is None
+    assert parse({"success": False, "rows": []}) is None
+
+
+def _sa(dpa, **config):
+    agent = A9_Situation_Awareness_Agent(config=config)
+    agent.data_product_agent = dpa
+    agent._resolve_source_system = lambda dp_id: "snowflake"
+    agent._resolve_time_spec_sa = AsyncMock(return_value={"type": "date"})
+    return agent
+
+
+def _kpi():
+    return KPIDefinition(
+        id="rev", name="Revenue", description="", unit="$", data_product_id="dp_sf",
+        calculation=ACTUAL_SQL, plan_version_value="Budget",
+    )
+
+
+def _bundle_dpa(rows):
+    dpa = _dpa()
+    dpa.execute_sql = AsyncMock(return_value={"success": True, "rows": rows})
+    return dpa
+
+
+@pytest.mark.asyncio
+async def test_sa_reads_kpi_and_plan_in_one_query():
+    dpa = _bundle_dpa([
+        {"BUCKET": "current", "PERIOD": None, "VALUE": 120.0},
+        {"BUCKET": "comparison", "PERIOD": None, "VALUE": 100.0},
+        {"BUCKET": "plan", "PERIOD": None, "VALUE": 150.0},
+        {"BUCKET": "monthly", "PERIOD": "2025-05", "VALUE": 40.0},
+        {"BUCKET": "monthly", "PERIOD": "2025-04", "VALUE": 35.0},
+    ])
+    agent = _sa(dpa)
+    kpi = _kpi()
+
+    value = await agent._get_kpi_value(kpi, TimeFrame.CURRENT_QUARTER, ComparisonType.QUARTER_OVER_QUARTER, None)
+    plan = await agent._fetch_plan_value(kpi, TimeFrame.CURRENT_QUARTER, None, None, bundled_plan=value.plan_value)
+
+    assert dpa.execute_sql.await_count == 1
+    assert "a9_bucket" in dpa.execute_sql.await_args.args[0]
+    assert (value.value, value.comparison_value, plan) == (120.0, 100.0, 150.0)
+    assert value.percent_change == pytest.approx(20.0)
+    assert [m["period"] for m in value.monthly_values] == ["2025-04", "2025-05"]
+    assert value.plan_value == 150.0
+
+
+@pytest.mark.asyncio
+async def test_sa_falls_back_to_separate_queries():
+    dpa = _bundle_dpa([{"total_value": 120.0}])
+    agent = _sa(dpa)
+
+    value = await agent._get_kpi_value(_kpi(), TimeFrame.CURRENT_QUARTER, ComparisonType.QUARTER_OVER_QUARTER, None)
+
+    # bundle (unusable) + base + monthly + comparison
+    assert dpa.execute_sql.await_count == 4
+    assert value.value == 120.0 and value.plan_value is None
+
+
+@pytest.mark.asyncio
+async def test_bundle_can_be_disabled():
+    dpa = _bundle_dpa([{"total_value": 5.0}])
+    agent = _sa(dpa, kpi_bundle_sql=False)
+    await agent._get_kpi_value(_kpi(), TimeFrame.CURRENT_QUARTER, None, None)
+    assert all("a9_bucket" not in c.args[0] for c in dpa.execute_sql.await_args_list)
@@ -0,0 +1,123 @@
+# arch-allow-direct-agent-construction
+"""
+LLMResponseCache and its use in A9_LLM_Service_Agent.generate().
+
+Contract under test:
+  1. Identical deterministic requests hit the provider once; the repeat is a
+     cache_hit and its usage is counted as tokens saved
+  2. Anything in the key (prompt, model, tool schema, temperature) misses
+  3. Requests above response_cache_max_temperature and cache=False bypass it;
+     cache=True opts a high-temperature request back in
+  4. Per-operation TTLs expire entries; a TTL of 0 never stores
+  5. The SQLite tier serves a fresh cache instance (restart / another agent)
+"""
+from __future__ import annotations
+
+import pytest
+
+from src.agents.new.a9_llm_service_agent import A9_LLM_Request, A9_LLM_Service_Agent
+from src.llm_services import response_cache as response_cache_module
+from src.llm_services.response_cache import LLMResponseCache
+
+
+class _FakeService:
+    def __init__(self):
+        self.calls = []
+
+    async def generate(self, **kwargs):
+        self.calls.append(kwargs)
+        return {"response": f"answer {len(self.calls)}", "usage": {"prompt_tokens": 100, "completion_tokens": 20}}
+
+    async def generate_structured(self, **kwargs):
+        self.calls.append(kwargs)
+        return {"response": '{"ok": true}', "usage": {"prompt_tokens": 50, "completion_tokens": 5}}
+
+
+async def _agent(monkeypatch, **config):
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test_1234567890")
+    monkeypatch.delenv("LLM_RESPONSE_CACHE_PATH", raising=False)
+    agent = await A9_LLM_Service_Agent.create({"provider": "anthropic", **config})
+    agent.llm_service = _FakeService()
+    return agent
+
+
+def _request(prompt="Summarise revenue", **kw) -> A9_LLM_Request:
+    kw.setdefault("temperature", 0.2)
+    return A9_LLM_Request(request_id="req", principal_id="system", prompt=prompt, model="m-1", **kw)
+
+
+@pytest.mark.asyncio
+async def test_repeat_request_is_served_from_cache(monkeypatch):
+    agent = await _agent(monkeypatch)
+    first = await agent.generate(_request())
+    again = await agent.generate(_request())
+
+    assert len(agent.llm_service.calls) == 1
+    assert not first.cache_hit and again.cache_hit
+    assert again.content == first.content == "answer 1"
+    stats = agent.cache_stats()
+    assert stats["hits"] == 1 and stats["tokens_saved"] == 120
+
+
+@pytest.mark.asyncio
+async def test_key_covers_prompt_model_schema_and_temperature(monkeypatch):
+    agent = await _agent(monkeypatch)
+    await agent.generate(_request())
+    await agent.generate(_request(prompt="Summarise cost"))
+    await agent.generate(_request(temperature=0.1))
+    await agent.generate(_request(response_schema={"type": "object"}, tool_name="emit"))
+    await agent.generate(_request(response_schema={"type": "object"}, tool_name="emit"))
+    other_model = _request()
+    other_model.model = "m-2"
+    await agent.generate(other_model)
+
+    assert len(agent.llm_service.calls) == 5
+
+
+@pytest.mark.asyncio
+async def test_non_deterministic_requests_bypass_the_cache(monkeypatch):
+    agent = await _agent(monkeypatch)
+    for _ in range(2):
+        await agent.generate(_request(temperature=0.9))
+        await agent.generate(_request(cache=False))
+    assert len(agent.llm_service.calls) == 4
+
+    await agent.generate(_request(temperature=0.9, cache=True))
+    hit = await agent.generate(_request(temperature=0.9, cache=True))
+    assert hit.cache_hit and len(agent.llm_service.calls) == 5
+
+
+@pytest.mark.asyncio
+async def test_disabled_cache_always_calls_the_provider(monkeypatch):
+    agent = await _agent(monkeypatch, response_cache_enabled=False)
+    await agent.generate(_request())
+    await agent.generate(_request())
+    assert len(agent.llm_service.calls) == 2 and agent.cache_stats() == {}
+
+
+@pytest.mark.asyncio
+async def test_operation_ttls(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(response_cache_module.time, "time", lambda: clock[0])
+    cache = LLMResponseCache(default_ttl_seconds=60, operation_ttls={"analyze": 0})
+    entry = {"content": "x", "usage": {}}
+
+    await cache.put("k", "generate", entry)
+    await cache.put("a", "analyze", entry)
+    assert await cache.get("k") == entry
+    assert await cache.get("a") is None
+
+    clock[0] += 61
+    assert await cache.get("k") is None
+
+
+@pytest.mark.asyncio
+async def test_sqlite_tier_survives_a_new_instance(tmp_path):
+    path = str(tmp_path / "llm_cache.sqlite")
+    entry = {"content": "x", "model_used": "m-1", "usage": {"input_tokens": 7, "output_tokens": 3}}
+    await LLMResponseCache(path=path).put("k", "generate", entry)
+
+    fresh = LLMResponseCache(path=path)
+    assert await fresh.get("k") == entry
+    stats = fresh.stats()
+    assert stats["disk_hits"] == 1 and stats["tokens_saved"] == 10
@@ -0,0 +1,178 @@
+# arch-allow-direct-agent-construction
+"""
+LLMScheduler and its use in A9_LLM_Service_Agent.generate().
+
+Contract under test:
+  1. Under the concurrency cap, waiting interactive calls are admitted before
+     batch calls regardless of arrival order
+  2. A lane's requests/min bucket holds calls back until it refills
+  3. Rate-limit headers (anthropic-* and x-ratelimit-*) are parsed; remaining=0
+     and a 429 pause the lane
+  4. A 429 from the provider is re-queued by the agent instead of returned as
+     an error, up to llm_rate_limit_retries — for generate() and
+     generate_with_template() alike — and the provider client does not retry
+     it a second time underneath
+  5. stats() reports queue depth per priority and lane
+"""
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from src.agents.new.a9_llm_service_agent import A9_LLM_Request, A9_LLM_Service_Agent, A9_LLM_TemplateRequest
+from src.llm_services.scheduler import LLMScheduler, parse_rate_limit_headers
+
+
+async def _hold(scheduler, model, priority, log, release):
+    async with scheduler.slot(model, priority, 10):
+        log.append(priority)
+        await release.wait()
+
+
+@pytest.mark.asyncio
+async def test_interactive_is_admitted_before_batch():
+    scheduler = LLMScheduler(max_concurrency=1)
+    log, release = [], asyncio.Event()
+    first = asyncio.create_task(_hold(scheduler, "m", "standard", log, release))
+    await asyncio.sleep(0)
+    waiting = [asyncio.create_task(_hold(scheduler, "m", p, log, release)) for p in ("batch", "batch", "interactive")]
+    await asyncio.sleep(0)
+
+    stats = scheduler.stats()
+    assert stats["in_flight"] == 1
+    assert stats["queue_depth"] == {"interactive": 1, "standard": 0, "batch": 2}
+    assert stats["lanes"]["m"]["queue_depth"]["batch"] == 2
+
+    release.set()
+    await asyncio.gather(first, *waiting)
+    assert log == ["standard", "interactive", "batch", "batch"]
+    assert scheduler.stats()["queue_depth"] == {"interactive": 0, "standard": 0, "batch": 0}
+
+
+@pytest.mark.asyncio
+async def test_requests_per_minute_bucket_throttles_a_lane():
+    scheduler = LLMScheduler(model_limits={"claude-haiku": {"rpm": 2}})
+    admitted = []
+
+    async def call(i):
+        async with scheduler.slot("claude-haiku-4", "standard", 1):
+            admitted.append(i)
+
+    tasks = [asyncio.create_task(call(i)) for i in range(3)]
+    await asyncio.sleep(0.05)
+    assert admitted == [0, 1]
+    assert scheduler.stats()["lanes"]["claude-haiku-4"]["rpm_limit"] == 2
+
+    # Other models are not limited by the haiku lane
+    async with scheduler.slot("gpt-test", "standard", 1):
+        pass
+    for t in tasks:
+        t.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    assert scheduler.stats()["queue_depth"]["standard"] == 0
+
+
+def test_rate_limit_headers_are_normalised():
+    anthropic = parse_rate_limit_headers({
+        "anthropic-ratelimit-requests-limit": "50",
+        "anthropic-ratelimit-requests-remaining": "0",
+        "anthropic-ratelimit-tokens-limit": "40000",
+        "retry-after": "3",
+    })
+    assert anthropic["requests_limit"] == 50 and anthropic["requests_remaining"] == 0
+    assert anthropic["tokens_limit"] == 40000 and anthropic["retry_after_s"] == 3
+
+    openai = parse_rate_limit_headers({
+        "x-ratelimit-limit-tokens": "90000",
+        "x-ratelimit-remaining-tokens": "120",
+        "x-ratelimit-reset-requests": "6m0s",
+        "x-ratelimit-reset-tokens": "20ms",
+    })
+    assert openai["tokens_remaining"] == 120
+    assert openai["requests_reset_s"] == 360 and openai["tokens_reset_s"] == pytest.approx(0.02)
+    assert parse_rate_limit_headers(None) == {}
+
+
+@pytest.mark.asyncio
+async def test_429_pauses_the_lane():
+    scheduler = LLMScheduler()
+    async with scheduler.slot("m", "interactive", 10) as ticket:
+        ticket.observe({"error": "rate limited", "status_code": 429, "rate_limit": {"retry_after_s": 30}})
+    assert ticket.rate_limited
+
+    blocked = asyncio.create_task(scheduler.slot("m", "interactive", 10).__aenter__())
+    await asyncio.sleep(0.05)
+    lane = scheduler.stats()["lanes"]["m"]
+    assert not blocked.done() and lane["rate_limited"] == 1 and lane["paused_for_s"] > 25
+    blocked.cancel()
+    await asyncio.gather(blocked, return_exceptions=True)
+
+
+class _RateLimitedService:
+    def __init__(self, failures):
+        self.failures = failures
+        self.calls = 0
+
+    async def generate(self, **kwargs):
+        self.calls += 1
+        if self.calls <= self.failures:
+            return {"error": "429 Too Many Requests", "status_code": 429, "rate_limit": {"retry_after_s": 0}}
+        return {"response": "ok", "usage": {"prompt_tokens": 5, "completion_tokens": 1}}
+
+    generate_with_template = generate
+
+
+async def _agent(monkeypatch, failures, **config):
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test_1234567890")
+    agent = await A9_LLM_Service_Agent.create({"provider": "anthropic", "response_cache_enabled": False, **config})
+    agent.llm_service = _RateLimitedService(failures)
+    return agent
+
+
+def _request() -> A9_LLM_Request:
+    return A9_LLM_Request(request_id="req", principal_id="system", prompt="hi", model="m-429", priority="batch")
+
+
+@pytest.mark.asyncio
+async def test_agent_requeues_rate_limited_calls(monkeypatch):
+    agent = await _agent(monkeypatch, failures=2, llm_rate_limit_retries=2)
+    response = await agent.generate(_request())
+
+    assert response.status == "success" and response.content == "ok"
+    assert agent.llm_service.calls == 3
+    assert agent.scheduler_stats()["lanes"]["m-429"]["rate_limited"] == 2
+
+
+@pytest.mark.asyncio
+async def test_agent_returns_error_when_retries_run_out(monkeypatch):
+    agent = await _agent(monkeypatch, failures=5, llm_rate_limit_retries=1)
+    response = await agent.generate(_request())
+
+    assert response.status == "error" and "429" in response.error_message
+    assert agent.llm_service.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_template_calls_are_scheduled(monkeypatch):
+    agent = await _agent(monkeypatch, failures=1, llm_rate_limit_retries=2)
+    response = await agent.generate_with_template(A9_LLM_TemplateRequest(
+        request_id="tpl", principal_id="system", template_id="t", template_variables={"x": 1},
+        model="m-tpl", priority="batch",
+    ))
+
+    assert response.status == "success" and response.content == "ok"
+    assert agent.llm_service.calls == 2
+    assert agent.scheduler_stats()["lanes"]["m-tpl"]["rate_limited"] == 1
+
+
+@pytest.mark.asyncio
+async def test_provider_client_leaves_429s_to_the_scheduler(monkeypatch):
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test_1234567890")
+    scheduled = await A9_LLM_Service_Agent.create({"provider": "anthropic", "response_cache_enabled": False})
+    assert scheduled.llm_service.config.retry_rate_limits is False
+
+    unscheduled = await A9_LLM_Service_Agent.create(
+        {"provider": "anthropic", "response_cache_enabled": False, "llm_scheduler_enabled": False}
+    )
+    assert unscheduled.llm_service.config.retry_rate_limits is True
@@ -0,0 +1,154 @@
+"""
+OpenAIService on AsyncOpenAI — src/llm_services/openai_service.py.
+
+Contract under test:
+  1. generate() is a coroutine that streams and accumulates the completion into
+     the same {"response", "usage", "model"} dict the sync client returned
+  2. Concurrent calls overlap instead of running one after another
+  3. Connection errors / 429 / 5xx are retried with backoff; other errors and
+     exhausted retries come back as an error dict, never raised. With
+     retry_rate_limits=False a 429 is returned at once for the scheduler
+  4. Services on the same event loop share one HTTP connection pool
+"""
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import httpx
+import openai
+import pytest
+
+from src.llm_services import openai_service
+from src.llm_services.openai_service import OpenAIService
+
+
+def _chunk(content=None, finish_reason=None, usage=None):
+    choices = [] if content is None and finish_reason is None else [
+        SimpleNamespace(delta=SimpleNamespace(content=content), finish_reason=finish_reason)
+    ]
+    return SimpleNamespace(model="gpt-test", choices=choices, usage=usage)
+
+
+async def _stream(chunks):
+    for c in chunks:
+        await asyncio.sleep(0)
+        yield c
+
+
+class _FakeAsyncOpenAI:
+    """Stands in for AsyncOpenAI; `script` is a list of exceptions/None consumed per call."""
+
+    instances = []
+    script = []
+    delay = 0.0
+    in_flight = 0
+    max_in_flight = 0
+
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+        self.calls = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+        _FakeAsyncOpenAI.instances.append(self)
+
+    async def _create(self, **kwargs):
+        self.calls.append(kwargs)
+        cls = _FakeAsyncOpenAI
+        if cls.script:
+            err = cls.script.pop(0)
+            if err is not None:
+                raise err
+        cls.in_flight += 1
+        cls.max_in_flight = max(cls.max_in_flight, cls.in_flight)
+        try:
+            await asyncio.sleep(cls.delay)
+        finally:
+            cls.in_flight -= 1
+        return _stream([
+            _chunk("Hello, "), _chunk("world"), _chunk(finish_reason="stop"),
+            _chunk(usage=SimpleNamespace(prompt_tokens=11, completion_tokens=2, total_tokens=13)),
+        ])
+
+
+@pytest.fixture
+def fake_openai():
+    _FakeAsyncOpenAI.instances = []
+    _FakeAsyncOpenAI.script = []
+    _FakeAsyncOpenAI.delay = 0.0
+    _FakeAsyncOpenAI.in_flight = 0
+    _FakeAsyncOpenAI.max_in_flight = 0
+    with patch.object(openai_service, "AsyncOpenAI", _FakeAsyncOpenAI):
+        yield _FakeAsyncOpenAI
+
+
+def _service(**config):
+    return OpenAIService({"model_name": "gpt-test", "api_key": "sk-test-1234", "retry_base_delay_seconds": 0, **config})
+
+
+def _status_error(code):
+    request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+    response = httpx.Response(code, request=request, headers={"retry-after": "0"})
+    return openai.APIStatusError("boom", response=response, body=None)
+
+
+@pytest.mark.asyncio
+async def test_streamed_response_is_accumulated(fake_openai):
+    result = await _service().generate("hi", system_prompt="sys", max_tokens=50, temperature=0.0)
+
+    assert result["response"] == "Hello, world"
+    assert result["usage"] == {"prompt_tokens": 11, "completion_tokens": 2, "total_tokens": 13}
+    assert result["model"] == "gpt-test"
+    sent = fake_openai.instances[0].calls[0]
+    assert sent["stream"] is True and sent["temperature"] == 0.0
+    assert sent["messages"][0] == {"role": "system", "content": "sys"}
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_overlap(fake_openai):
+    fake_openai.delay = 0.05
+    service = _service()
+    results = await asyncio.gather(*(service.generate(f"q{i}") for i in range(3)))
+
+    assert all(r["response"] == "Hello, world" for r in results)
+    assert fake_openai.max_in_flight == 3
+
+
+@pytest.mark.asyncio
+async def test_retryable_errors_are_retried(fake_openai):
+    request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+    fake_openai.script = [openai.APIConnectionError(request=request), _status_error(429), _status_error(503)]
+    result = await _service(max_retries=3).generate("hi")
+
+    assert result["response"] == "Hello, world"
+    assert len(fake_openai.instances[0].calls) == 4
+
+
+@pytest.mark.asyncio
+async def test_rate_limits_can_be_left_to_the_scheduler(fake_openai):
+    fake_openai.script = [_status_error(429)]
+    result = await _service(retry_rate_limits=False).generate("hi")
+
+    assert result["response"] is None and result["status_code"] == 429
+    assert len(fake_openai.instances[0].calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_non_retryable_and_exhausted_errors_return_error_dict(fake_openai):
+    fake_openai.script = [_status_error(400)]
+    bad_request = await _service().generate("hi")
+    assert bad_request["response"] is None and "boom" in bad_request["error"]
+    assert len(fake_openai.instances[0].calls) == 1
+
+    fake_openai.script = [_status_error(500)] * 3
+    exhausted = await _service(max_retries=2).generate("hi")
+    assert exhausted["response"] is None
+    assert len(fake_openai.instances[1].calls) == 3
+
+
+@pytest.mark.asyncio
+async def test_services_share_one_connection_pool(fake_openai):
+    await _service().generate("a")
+    await _service().generate("b")
+
+    first, second = fake_openai.instances
+    assert first.kwargs["http_client"] is second.kwargs["http_client"]
+    assert first.kwargs["max_retries"] == 0
@@ -170,6 +170,80 @@ class TestSnowflakeManager:
             assert isinstance(result, pd.DataFrame)
             assert len(result) == 2
 
+    @pytest.mark.asyncio
+    async def test_execute_query_runs_in_a_single_thread_hop(self, manager):
+        """Cursor, execute, fetch and close happen in one worker-thread hop."""
+        mock_cursor = MagicMock()
+        mock_cursor.fetch_pandas_all.return_value = pd.DataFrame({"n": [1]})
+        mock_conn = MagicMock()
+        mock_conn.cursor.return_value = mock_cursor
+        manager.conn = mock_conn
+
+        with patch("asyncio.to_thread") as mock_thread:
+            mock_thread.side_effect = lambda f, *args: f(*args)
+            await manager.execute_query("SELECT 1")
+
+        assert mock_thread.await_count == 1
+        mock_cursor.close.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_pool_opens_extra_connections_for_concurrent_queries(self, manager):
+        """Concurrent queries each borrow a pooled connection, up to pool_size."""
+        import asyncio
+        import time
+
+        opened = []
+
+        def factory():
+            cursor = MagicMock()
+            cursor.fetch_pandas_all.side_effect = lambda: (time.sleep(0.05), pd.DataFrame({"n": [1]}))[1]
+            conn = MagicMock()
+            conn.cursor.return_value = cursor
+            opened.append(conn)
+            return conn
+
+        manager._pool_size = 3
+        manager._conn = factory()
+        manager._pool = manager._new_pool(factory, manager._conn)
+
+        frames = await asyncio.gather(*(manager.execute_query("SELECT 1") for _ in range(6)))
+
+        assert all(len(df) == 1 for df in frames)
+        assert len(opened) == 3
+        assert manager.pool_stats()["idle"] == 3
+
+    @pytest.mark.asyncio
+    async def test_async_submit_polls_query_id_then_fetches(self, manager):
+        """Async submission polls the query ID until done, then fetches by sfqid."""
+        mock_cursor = MagicMock()
+        mock_cursor.sfqid = "01b2-query"
+        mock_cursor.fetch_pandas_all.return_value = pd.DataFrame({"n": [1, 2]})
+        mock_conn = MagicMock()
+        mock_conn.cursor.return_value = mock_cursor
+        mock_conn.is_still_running.side_effect = [True, True, False]
+        manager.conn = mock_conn
+        manager.async_submit = True
+        manager._poll_seconds = 0.001
+
+        df = await manager.execute_query("SELECT n FROM t")
+
+        assert len(df) == 2
+        mock_cursor.execute_async.assert_called_once_with("SELECT n FROM t", None)
+        assert mock_conn.get_query_status_throw_if_error.call_count == 3
+        mock_cursor.get_results_from_sfqid.assert_called_once_with("01b2-query")
+
+    @pytest.mark.asyncio
+    async def test_async_submit_surfaces_query_errors(self, manager):
+        """A failed async query raises instead of returning an empty frame."""
+        mock_conn = MagicMock()
+        mock_conn.cursor.return_value.sfqid = "01b2-bad"
+        mock_conn.get_query_status_throw_if_error.side_effect = Exception("SQL compilation error")
+        manager.conn = mock_conn
+        manager.async_submit = True
+
+        with pytest.raises(Exception, match="SQL compilation error"):
+            await manager.execute_query("SELECT bad")
+
     @pytest.mark.asyncio
     async def test_list_views(self, manager):
         """List views queries INFORMATION_SCHEMA."""
@@ -0,0 +1,123 @@
+# arch-allow-direct-agent-construction
+"""
+Unit tests for the post-detection LLM enrichment stage in SA (_enrich_situations).
+
+Contract under test:
+  1. Situations are enriched in chunks of enrichment_batch_size — one structured
+     call per chunk instead of two calls per situation
+  2. A trend note is only requested / kept where _trend_tension finds one
+  3. Situations a batch response leaves out (or a failed batch) fall back to the
+     per-situation observation / trend-note calls
+  4. enrichment_batch_size=1 keeps the per-situation calls
+"""
+import json
+import re
+from types import SimpleNamespace
+
+import pytest
+
+from src.agents.new.a9_situation_awareness_agent import A9_Situation_Awareness_Agent
+from src.agents.models.situation_awareness_models import (
+    KPIDefinition,
+    KPIValue,
+    Situation,
+    SituationSeverity,
+    TimeFrame,
+)
+
+
+class _FakeLLM:
+    """generate() double: answers batch (response_schema) and per-situation prompts."""
+
+    def __init__(self, drop_ids=(), fail_batches=False):
+        self.drop_ids = set(drop_ids)
+        self.fail_batches = fail_batches
+        self.requests = []
+
+    async def generate(self, request):
+        self.requests.append(request)
+        if request.response_schema:
+            if self.fail_batches:
+                raise RuntimeError("rate limited")
+            entries = []
+            for key in re.findall(r"^\[(.+)\]$", request.prompt, flags=re.M):
+                if key in self.drop_ids:
+                    continue
+                block = request.prompt.split(f"[{key}]", 1)[1].split("\n\n", 1)[0]
+                entries.append({
+                    "situation_id": key,
+                    "observations": [f"batch obs {key}"],
+                    "trend_note": f"batch note {key}" if "Tension:" in block else None,
+                })
+            return SimpleNamespace(content=json.dumps({"situations": entries}))
+        if "JSON array" in request.prompt:
+            return SimpleNamespace(content='["single obs"]')
+        return SimpleNamespace(content="Single note.")
+
+
+def _item(i: int, tension: bool):
+    kpi = KPIDefinition(id=f"kpi_{i}", name=f"KPI {i}", description="", unit="$", data_product_id="dp")
+    monthly = [100.0, 95.0, 90.0] if tension else [90.0, 95.0, 100.0]
+    value = KPIValue(
+        kpi_name=kpi.name, value=100.0, comparison_value=95.0, percent_change=5.0,
+        timeframe=TimeFrame.YEAR_TO_DATE,
+        monthly_values=[{"period": f"2026-0{m + 1}", "value": v} for m, v in enumerate(monthly)],
+    )
+    sit = Situation(
+        situation_id=f"sit-{i}", kpi_name=kpi.name, kpi_value=value,
+        severity=SituationSeverity.HIGH, description="", business_impact="",
+    )
+    return kpi, value, sit
+
+
+def _agent(llm, **config) -> A9_Situation_Awareness_Agent:
+    agent = A9_Situation_Awareness_Agent(config=config)
+    agent.llm_service_agent = llm
+    return agent
+
+
+@pytest.mark.asyncio
+async def test_situations_are_enriched_in_batches():
+    llm = _FakeLLM()
+    items = [_item(i, tension=(i % 2 == 0)) for i in range(15)]
+    await _agent(llm, enrichment_batch_size=10)._enrich_situations(items)
+
+    assert len(llm.requests) == 2
+    assert all(r.tool_name == "emit_situation_enrichment" for r in llm.requests)
+    for i, (_kpi, _value, sit) in enumerate(items):
+        assert sit.key_observations == [f"batch obs sit-{i}"]
+        assert sit.trend_note == (f"batch note sit-{i}" if i % 2 == 0 else None)
+
+
+@pytest.mark.asyncio
+async def test_missing_entries_fall_back_per_situation():
+    llm = _FakeLLM(drop_ids={"sit-0", "sit-1"})
+    items = [_item(i, tension=(i == 0)) for i in range(4)]
+    await _agent(llm, enrichment_batch_size=10)._enrich_situations(items)
+
+    # one batch + observations and trend note for sit-0 + observations for sit-1
+    assert len(llm.requests) == 4
+    assert items[0][2].key_observations == ["single obs"] and items[0][2].trend_note == "Single note."
+    assert items[1][2].key_observations == ["single obs"] and items[1][2].trend_note is None
+    assert items[2][2].key_observations == ["batch obs sit-2"]
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_falls_back_for_every_situation():
+    llm = _FakeLLM(fail_batches=True)
+    items = [_item(i, tension=False) for i in range(3)]
+    await _agent(llm, enrichment_batch_size=10)._enrich_situations(items)
+
+    assert len(llm.requests) == 1 + 3
+    assert all(sit.key_observations == ["single obs"] for _k, _v, sit in items)
+
+
+@pytest.mark.asyncio
+async def test_batch_size_one_keeps_per_situation_calls():
+    llm = _FakeLLM()
+    items = [_item(i, tension=True) for i in range(3)]
+    await _agent(llm, enrichment_batch_size=1)._enrich_situations(items)
+
+    assert len(llm.requests) == 6
+    assert not any(r.response_schema for r in llm.requests)
+    assert all(sit.trend_note == "Single note." for _k, _v, sit in items)
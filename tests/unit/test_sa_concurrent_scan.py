@@ -0,0 +1,151 @@
+# arch-allow-direct-agent-construction
+"""
+Unit tests for the bounded-concurrency KPI scan in SA.detect_situations.
+
+Contract under test:
+  1. Results come back in relevant_kpis order regardless of completion order
+  2. KPIs overlap up to kpi_scan_concurrency
+  3. A per-backend limit (e.g. sqlserver=1) serializes that backend's KPIs;
+     SQL Server is not capped by default now that its connections are pooled,
+     and KPIs queued on a capped backend do not block other backends
+  4. A KPI exceeding kpi_scan_timeout_seconds is skipped, others still return
+  5. kpi_scan_concurrency=1 keeps the sequential scan
+"""
+import asyncio
+
+import pytest
+
+from src.agents.new.a9_situation_awareness_agent import A9_Situation_Awareness_Agent
+from src.agents.models.situation_awareness_models import (
+    KPIDefinition,
+    KPIValue,
+    PrincipalContext,
+    SituationDetectionRequest,
+    TimeFrame,
+)
+
+
+def _request() -> SituationDetectionRequest:
+    return SituationDetectionRequest(
+        request_id="test-scan-001",
+        principal_context=PrincipalContext(
+            role="CFO",
+            principal_id="cfo_001",
+            client_id="lubricants",
+            business_processes=["Finance"],
+            default_filters={},
+            decision_style="analytical",
+            communication_style="direct",
+            preferred_timeframes=[],
+        ),
+        business_processes=[],
+        timeframe=TimeFrame.YEAR_TO_DATE,
+    )
+
+
+def _kpis(n: int, dp_id: str = "dp_sf") -> dict:
+    return {
+        f"KPI {i}": KPIDefinition(
+            id=f"kpi_{i}", name=f"KPI {i}", description="", unit="$",
+            data_product_id=dp_id, calculation="SELECT 1",
+        )
+        for i in range(n)
+    }
+
+
+class _ScanProbe:
+    """Replacement for _scan_kpi that records how many KPIs are in flight."""
+
+    def __init__(self, delays: dict = None, default_delay: float = 0.02):
+        self.delays = delays or {}
+        self.default_delay = default_delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def __call__(self, kpi_name, kpi_definition, request):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delays.get(kpi_name, self.default_delay))
+        finally:
+            self.in_flight -= 1
+        return KPIValue(kpi_name=kpi_name, value=1.0, timeframe=TimeFrame.YEAR_TO_DATE), [], []
+
+
+def _agent(source_system: str = "snowflake", **config) -> tuple:
+    agent = A9_Situation_Awareness_Agent(config=config)
+    agent._resolve_source_system = lambda dp_id: source_system
+    probe = _ScanProbe()
+    agent._scan_kpi = probe
+    return agent, probe
+
+
+@pytest.mark.asyncio
+async def test_results_keep_relevant_kpi_order():
+    agent, probe = _agent(kpi_scan_concurrency=4)
+    # Earlier KPIs finish last
+    probe.delays = {f"KPI {i}": 0.05 - i * 0.01 for i in range(4)}
+    results = await agent._scan_relevant_kpis(_kpis(4), _request())
+    assert [name for name, _ in results] == ["KPI 0", "KPI 1", "KPI 2", "KPI 3"]
+    assert [r[0].kpi_name for _, r in results] == ["KPI 0", "KPI 1", "KPI 2", "KPI 3"]
+
+
+@pytest.mark.asyncio
+async def test_concurrency_is_bounded():
+    agent, probe = _agent(kpi_scan_concurrency=3)
+    await agent._scan_relevant_kpis(_kpis(10), _request())
+    assert probe.max_in_flight == 3
+
+
+@pytest.mark.asyncio
+async def test_backend_limit_serializes_that_backend():
+    agent, probe = _agent(
+        source_system="sql_server", kpi_scan_concurrency=8, kpi_scan_backend_limits={"sqlserver": 1}
+    )
+    results = await agent._scan_relevant_kpis(_kpis(5), _request())
+    assert probe.max_in_flight == 1
+    assert all(r is not None for _, r in results)
+
+
+@pytest.mark.asyncio
+async def test_sqlserver_backend_runs_concurrently_by_default():
+    agent, probe = _agent(source_system="sql_server", kpi_scan_concurrency=8)
+    await agent._scan_relevant_kpis(_kpis(5), _request())
+    assert probe.max_in_flight == 5
+
+
+@pytest.mark.asyncio
+async def test_capped_backend_does_not_block_other_backends():
+    agent, probe = _agent(kpi_scan_concurrency=2, kpi_scan_backend_limits={"sqlserver": 1})
+    kpis = {**_kpis(4, dp_id="dp_ss"), **{f"SF {k}": v for k, v in _kpis(2, dp_id="dp_sf").items()}}
+    agent._resolve_source_system = lambda dp_id: "sql_server" if dp_id == "dp_ss" else "snowflake"
+    probe.delays = {f"KPI {i}": 0.2 for i in range(4)}
+    probe.default_delay = 0.01
+    order = []
+    inner = agent._scan_kpi
+
+    async def _recording(kpi_name, kpi_definition, request):
+        result = await inner(kpi_name, kpi_definition, request)
+        order.append(kpi_name)
+        return result
+
+    agent._scan_kpi = _recording
+    await agent._scan_relevant_kpis(kpis, _request())
+    # Snowflake KPIs finish while SQL Server KPIs are still queued on their cap
+    assert order[:2] == ["SF KPI 0", "SF KPI 1"]
+
+
+@pytest.mark.asyncio
+async def test_timed_out_kpi_is_skipped():
+    agent, probe = _agent(kpi_scan_concurrency=4, kpi_scan_timeout_seconds=0.1)
+    probe.delays = {"KPI 1": 5.0}
+    results = dict(await agent._scan_relevant_kpis(_kpis(3), _request()))
+    assert results["KPI 1"] is None
+    assert results["KPI 0"] is not None and results["KPI 2"] is not None
+
+
+@pytest.mark.asyncio
+async def test_concurrency_one_scans_sequentially():
+    agent, probe = _agent(kpi_scan_concurrency=1)
+    await agent._scan_relevant_kpis(_kpis(4), _request())
+    assert probe.max_in_flight == 1
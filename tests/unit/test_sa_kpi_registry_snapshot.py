@@ -0,0 +1,74 @@
+# arch-allow-direct-agent-construction
+"""
+Unit tests for the versioned KPI registry snapshot in SA._load_kpi_registry.
+
+Contract under test:
+  1. Unchanged provider rows → no re-conversion, same dict object kept
+  2. One changed row → only that row is re-converted
+  3. A rebuild swaps in a new dict; a reference taken before it is untouched
+"""
+import copy
+from unittest import mock
+
+import pytest
+
+from src.agents.new.a9_situation_awareness_agent import A9_Situation_Awareness_Agent
+from tests.mocks.mock_agents import MockKPIProvider, TEST_KPIS
+
+
+def _agent(kpis):
+    factory = mock.MagicMock()
+    provider = MockKPIProvider(kpis)
+    factory.get_kpi_provider.return_value = provider
+    factory.get_provider.return_value = provider
+    agent = A9_Situation_Awareness_Agent({"target_domains": ["Finance"], "registry_factory": factory})
+    return agent, provider
+
+
+def _spy_conversions(agent):
+    calls = []
+    original = agent._convert_to_kpi_definition
+
+    def _spy(kpi):
+        calls.append(kpi)
+        return original(kpi)
+
+    agent._convert_to_kpi_definition = _spy
+    return calls
+
+
+@pytest.mark.asyncio
+async def test_unchanged_rows_reuse_snapshot():
+    agent, _ = _agent(copy.deepcopy(TEST_KPIS))
+    calls = _spy_conversions(agent)
+
+    await agent._load_kpi_registry()
+    first = agent.kpi_registry
+    first_count = len(calls)
+    assert first and first_count > 0
+
+    await agent._load_kpi_registry()
+    assert agent.kpi_registry is first
+    assert len(calls) == first_count
+
+
+@pytest.mark.asyncio
+async def test_changed_row_is_the_only_one_reconverted():
+    kpis = copy.deepcopy(TEST_KPIS)
+    agent, provider = _agent(kpis)
+    await agent._load_kpi_registry()
+    before = agent.kpi_registry
+    calls = _spy_conversions(agent)
+
+    changed = provider.kpis[0]
+    changed["description"] = "Edited in the registry"
+    await agent._load_kpi_registry()
+
+    assert [c["id"] for c in calls] == [changed["id"]]
+    assert agent.kpi_registry is not before
+    # Snapshot taken before the rebuild still holds the previous definition
+    assert before[changed["name"]].description != "Edited in the registry"
+    assert agent.kpi_registry[changed["name"]].description == "Edited in the registry"
+    # Unchanged rows share the converted definition across snapshots
+    untouched = provider.kpis[1]["name"]
+    assert agent.kpi_registry[untouched] is before[untouched]
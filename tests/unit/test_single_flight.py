@@ -0,0 +1,94 @@
+"""
+Unit tests for single-flight coalescing of concurrent identical execute_sql calls.
+"""
+import asyncio
+import logging
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.agents.new.a9_data_product_agent import A9_Data_Product_Agent
+from src.database.single_flight import SingleFlight
+
+SQL = "SELECT SUM(amount) AS v FROM fi_star_view"
+
+
+def _agent():
+    agent = A9_Data_Product_Agent.__new__(A9_Data_Product_Agent)
+    agent.logger = logging.getLogger("test")
+    agent.registry_factory = None
+    agent._single_flight = SingleFlight()
+    release = asyncio.Event()
+
+    async def _dispatch(sql, parameters, dp_id, txn):
+        await release.wait()
+        return {"success": True, "transaction_id": txn, "columns": ["v"],
+                "rows": [{"v": 1.0}], "data": [{"v": 1.0}]}
+
+    agent._dispatch_sql = AsyncMock(side_effect=_dispatch)
+    return agent, release
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_queries_share_one_execution():
+    agent, release = _agent()
+    calls = [asyncio.create_task(agent.execute_sql(SQL, data_product_id="dp_fi")) for _ in range(5)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*calls)
+
+    assert agent._dispatch_sql.await_count == 1
+    assert sum(1 for r in results if r.get("coalesced")) == 4
+    assert len({r["transaction_id"] for r in results}) == 5
+    results[1]["rows"][0]["v"] = 42
+    assert results[0]["rows"][0]["v"] == 1.0
+    assert agent.get_single_flight_stats() == {
+        "enabled": True, "executions": 1, "coalesced": 4, "in_flight": 0,
+    }
+
+
+@pytest.mark.asyncio
+async def test_different_products_are_not_coalesced():
+    agent, release = _agent()
+    release.set()
+    await asyncio.gather(
+        agent.execute_sql(SQL, data_product_id="dp_a"),
+        agent.execute_sql(SQL, data_product_id="dp_b"),
+    )
+    assert agent._dispatch_sql.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_leader_error_reaches_followers_and_clears_flight():
+    flight = SingleFlight()
+    gate = asyncio.Event()
+
+    async def _boom():
+        await gate.wait()
+        raise RuntimeError("warehouse down")
+
+    tasks = [asyncio.create_task(flight.do("k", _boom)) for _ in range(3)]
+    await asyncio.sleep(0)
+    gate.set()
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert flight.stats()["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_follower_takes_over_when_leader_is_cancelled():
+    flight = SingleFlight()
+    runs = []
+
+    async def _slow():
+        runs.append(1)
+        await asyncio.sleep(0.01 if len(runs) > 1 else 10)
+        return "ok"
+
+    leader = asyncio.create_task(flight.do("k", _slow))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(flight.do("k", _slow))
+    await asyncio.sleep(0)
+    leader.cancel()
+    assert await follower == ("ok", False)
+    assert len(runs) == 2
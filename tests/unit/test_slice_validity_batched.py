@@ -0,0 +1,91 @@
+"""profile_batched() — src/analysis/slice_validity.py.
+
+One query per KPI must give exactly the verdicts profile() and
+check_completeness() give with one query per dimension each, and a dimension
+the view doesn't have must fall back to those per-dimension checks rather than
+failing the KPI.
+"""
+import duckdb
+import pytest
+
+from src.analysis.slice_validity import check_completeness, profile, profile_batched
+
+
+@pytest.fixture
+def run_query():
+    con = duckdb.connect()
+    con.execute(
+        "CREATE TABLE v (account_type VARCHAR, version VARCHAR, customer_name VARCHAR, "
+        "product_name VARCHAR, amount DOUBLE)"
+    )
+    rows = [("Revenue", "Actual", f"c{i}", f"p{i % 3}", 10.0) for i in range(20)]
+    rows += [("COGS", "Actual", "c0", f"p{i % 3}", 4.0) for i in range(6)]        # COGS on one customer
+    rows += [("Revenue", "Actual", None, "p0", 5.0), ("Revenue", "Budget", "c99", "p9", 1.0)]
+    con.executemany("INSERT INTO v VALUES (?, ?, ?, ?, ?)", rows)
+    seen = []
+
+    def _run(sql):
+        seen.append(sql)
+        cur = con.execute(sql)
+        cols = [d[0] for d in cur.description]
+        return [dict(zip(cols, r)) for r in cur.fetchall()]
+
+    _run.seen = seen
+    yield _run
+    con.close()
+
+
+def _as_tuples(verdicts):
+    return [(v.dimension, v.counts, round(v.coverage, 6), v.verdict) for v in verdicts]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("components", [["Revenue", "COGS"], ["Revenue"]])
+async def test_one_query_matches_the_per_dimension_checks(run_query, components):
+    dims = ["customer_name", "product_name"]
+    completeness, cross = await profile_batched(
+        run_query, "v", "account_type", components, dims, source_system="duckdb",
+    )
+    assert len(run_query.seen) == 1
+
+    expected_completeness = await check_completeness(
+        run_query, "v", "account_type", components, dims, source_system="duckdb",
+    )
+    assert _as_tuples(completeness) == _as_tuples(expected_completeness)
+    if len(components) >= 2:
+        expected_cross = await profile(run_query, "v", "account_type", components, dims, source_system="duckdb")
+        assert _as_tuples(cross) == _as_tuples(expected_cross)
+        assert cross[0].verdict == "INVALID"
+    else:
+        assert cross == []
+        assert "COUNT(DISTINCT" not in run_query.seen[0]
+
+
+@pytest.mark.asyncio
+async def test_missing_column_falls_back_to_per_dimension_queries(run_query):
+    completeness, cross = await profile_batched(
+        run_query, "v", "account_type", ["Revenue", "COGS"], ["customer_name", "region"],
+        source_system="duckdb",
+    )
+    assert [v.dimension for v in completeness] == ["customer_name"]
+    assert [v.dimension for v in cross] == ["customer_name"]
+    assert len(run_query.seen) == 1 + 2 + 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("source_system, expect_approx", [("snowflake", True), ("sqlserver", False)])
+async def test_approximate_distinct_only_where_the_backend_always_has_it(source_system, expect_approx):
+    seen = []
+
+    def run_query(sql):
+        seen.append(sql)
+        return [{"COMPONENT": "Revenue", "TOTAL_ROWS": 4, "N_0": 2, "C_0": 4},
+                {"COMPONENT": "COGS", "TOTAL_ROWS": 2, "N_0": 2, "C_0": 1}]
+
+    completeness, cross = await profile_batched(
+        run_query, "dbo.v", "account_type", ["Revenue", "COGS"], ["customer_name"],
+        source_system=source_system, approximate=True,
+    )
+    assert ("APPROX_COUNT_DISTINCT(customer_name)" in seen[0]) is expect_approx
+    assert completeness[0].counts == {"total_rows": 6, "complete_rows": 5}
+    assert cross[0].verdict == "ok"
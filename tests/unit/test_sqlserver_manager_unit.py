@@ -5,10 +5,14 @@ Tests SqlServerManager, which wraps pyodbc for SQL Server connectivity.
 Follows the exact pattern as test_phase_10d_mcp.py for consistency.
 """
 
+import asyncio
+import time
+
 import pandas as pd
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 
+from src.database.backends.connection_pool import ThreadedConnectionPool
 from src.database.backends.sqlserver_manager import SqlServerManager
 from src.database.manager_factory import DatabaseManagerFactory
 
@@ -578,6 +582,87 @@ class TestSqlServerManagerMetadata:
         assert metadata["connected"] is False
 
 
+class TestSqlServerManagerConnectionPool:
+    """Tests for the pooled connections behind concurrent queries."""
+
+    @staticmethod
+    def _connection(rows=((1,),), delay=0.0):
+        cursor = MagicMock()
+        cursor.description = [("n",)]
+
+        def _fetchall():
+            time.sleep(delay)
+            return list(rows)
+
+        cursor.fetchall.side_effect = _fetchall
+        conn = MagicMock()
+        conn.cursor.return_value = cursor
+        return conn
+
+    @pytest.mark.asyncio
+    async def test_concurrent_queries_borrow_separate_connections(self):
+        opened = []
+
+        def factory():
+            conn = self._connection(delay=0.05)
+            opened.append(conn)
+            return conn
+
+        manager = SqlServerManager({"pool_size": 3})
+        manager._pool = manager._new_pool(factory, factory())
+
+        frames = await asyncio.gather(*(manager.execute_query("SELECT 1") for _ in range(6)))
+
+        assert all(len(df) == 1 for df in frames)
+        assert len(opened) == 3  # bounded by pool_size, not by concurrency
+        assert manager.pool_stats() == {"size": 3, "idle": 3, "max_size": 3}
+
+    @pytest.mark.asyncio
+    async def test_dead_connection_is_replaced_on_checkout(self):
+        dead = self._connection()
+        dead.cursor.side_effect = Exception("Communication link failure")
+        fresh = self._connection(rows=[(7,)])
+
+        manager = SqlServerManager({"pool_size": 2, "pool_health_check_seconds": 0})
+        manager._pool = manager._new_pool(lambda: fresh, dead)
+        time.sleep(0.01)
+
+        df = await manager.execute_query("SELECT 7")
+
+        assert df.iloc[0]["n"] == 7
+        dead.close.assert_called_once()
+        assert manager.pool_stats()["size"] == 1
+
+    def test_idle_connections_beyond_one_are_reaped(self):
+        conns = [self._connection() for _ in range(2)]
+        pool = ThreadedConnectionPool(lambda: conns.pop(), max_size=2, idle_timeout=0.01)
+
+        with pool.connection():
+            with pool.connection():
+                pass
+        assert pool.size == 2
+        time.sleep(0.02)
+        with pool.connection():
+            pass
+
+        assert pool.size == 1
+
+    @pytest.mark.asyncio
+    async def test_disconnect_closes_every_pooled_connection(self):
+        conns = [self._connection(delay=0.02) for _ in range(2)]
+        pending = list(conns)
+        manager = SqlServerManager({"pool_size": 2})
+        manager._pool = manager._new_pool(lambda: pending.pop(), pending.pop(0))
+        await asyncio.gather(manager.execute_query("SELECT 1"), manager.execute_query("SELECT 1"))
+
+        await manager.disconnect()
+
+        for conn in conns:
+            conn.close.assert_called_once()
+        with pytest.raises(RuntimeError, match="Not connected"):
+            await manager.execute_query("SELECT 1")
+
+
 class TestSqlServerManagerFactoryRegistration:
     """Tests for factory registration of SqlServerManager."""
 
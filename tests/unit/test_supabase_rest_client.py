@@ -0,0 +1,123 @@
+"""
+Unit tests for the shared Supabase REST client.
+
+Stores must reuse one pooled connection across calls, and transient failures
+are retried only for requests that are safe to repeat. Bulk upserts go out in
+chunks and report success per row. HTTP/2 without the h2 package falls back
+to HTTP/1.1 with a warning rather than silently.
+"""
+import json
+
+import httpx
+import pytest
+
+from src.database import supabase_rest
+from src.database.situations_store import SituationsStore
+from src.database.supabase_rest import SupabaseRestClient
+
+
+def _client(handler, **kwargs):
+    return SupabaseRestClient(
+        transport=httpx.MockTransport(handler), backoff_seconds=0, max_retries=2, **kwargs
+    )
+
+
+@pytest.mark.asyncio
+async def test_pool_is_reused_across_requests():
+    client = _client(lambda request: httpx.Response(200, json=[]))
+    await client.get("https://example.supabase.co/rest/v1/situations")
+    first = client._client
+    await client.get("https://example.supabase.co/rest/v1/situations")
+    assert client._client is first
+    await client.aclose()
+    assert not client.is_open
+
+
+def test_missing_h2_warns_and_falls_back(monkeypatch, caplog):
+    monkeypatch.setattr(supabase_rest, "_H2_AVAILABLE", False)
+    with caplog.at_level("WARNING", logger=supabase_rest.__name__):
+        client = SupabaseRestClient(http2=True)
+    assert client.http2 is False
+    assert "httpx[http2]" in caplog.text
+
+    caplog.clear()
+    with caplog.at_level("WARNING", logger=supabase_rest.__name__):
+        SupabaseRestClient(http2=False)
+    assert caplog.text == ""
+
+
+@pytest.mark.asyncio
+async def test_upsert_is_retried_on_transient_status():
+    statuses = iter([503, 429, 201])
+    client = _client(lambda request: httpx.Response(next(statuses)))
+    response = await client.post(
+        "https://example.supabase.co/rest/v1/situations",
+        headers={"Prefer": "resolution=merge-duplicates"},
+        json={},
+    )
+    assert response.status_code == 201
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_plain_insert_is_not_retried():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(503)
+
+    client = _client(handler)
+    response = await client.post("https://example.supabase.co/rest/v1/actions", json={})
+    assert response.status_code == 503
+    assert len(calls) == 1
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_store_reads_through_shared_client(monkeypatch):
+    monkeypatch.setenv("SUPABASE_URL", "https://example.supabase.co")
+    monkeypatch.setenv("SUPABASE_SERVICE_ROLE_KEY", "test-key")
+    seen = []
+
+    def handler(request):
+        seen.append(request.url.path)
+        return httpx.Response(200, json=[{"situation_id": "s1", "status": "open"}])
+
+    monkeypatch.setattr(supabase_rest, "_shared_client", _client(handler))
+    store = SituationsStore()
+    row = await store.get_situation("s1")
+    assert row["situation_id"] == "s1"
+    assert seen == ["/rest/v1/situations"]
+    await supabase_rest.close_supabase_client()
+
+
+@pytest.mark.asyncio
+async def test_bulk_upsert_sends_chunked_arrays():
+    payload_sizes = []
+
+    def handler(request):
+        payload_sizes.append(len(json.loads(request.content)))
+        assert "resolution=merge-duplicates" in request.headers["Prefer"]
+        return httpx.Response(201)
+
+    client = _client(handler)
+    rows = [{"id": str(i)} for i in range(1200)]
+    results = await client.bulk_upsert("https://example.supabase.co/rest/v1/situations", {}, rows)
+    assert results == [True] * 1200
+    assert payload_sizes == [500, 500, 200]
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_bulk_upsert_isolates_rejected_rows():
+    def handler(request):
+        body = json.loads(request.content)
+        rows = body if isinstance(body, list) else [body]
+        return httpx.Response(400 if any(r["id"] == "bad" for r in rows) else 201)
+
+    client = _client(handler)
+    rows = [{"id": "a"}, {"id": "bad"}, {"id": "c"}]
+    results = await client.bulk_upsert("https://example.supabase.co/rest/v1/situations", {}, rows)
+    assert results == [True, False, True]
+    await client.aclose()
@@ -0,0 +1,102 @@
+"""
+Unit tests for the /workflows record store (src/api/workflow_store.py):
+LRU + TTL bounds on the in-memory backend, lost-update-free appends, and the
+SQLite backend surviving a reopen and hiding expired records from reads
+before any sweep has deleted them.
+"""
+import asyncio
+
+import pytest
+
+from src.api.workflow_store import (
+    InMemoryWorkflowStore,
+    SqliteWorkflowStore,
+    WorkflowRecord,
+    create_workflow_store,
+)
+
+
+def _record(request_id: str) -> WorkflowRecord:
+    return WorkflowRecord(request_id=request_id, workflow_type="situations", state="pending", payload={})
+
+
+@pytest.mark.asyncio
+async def test_memory_store_evicts_least_recently_used():
+    store = InMemoryWorkflowStore(max_records=2, ttl_seconds=0)
+    await store.put(_record("a"))
+    await store.put(_record("b"))
+    assert await store.get("a") is not None  # touch "a" so "b" is oldest
+    await store.put(_record("c"))
+
+    assert await store.get("b") is None
+    assert await store.get("a") is not None
+    assert await store.get("c") is not None
+    assert store.evictions == 1
+
+
+@pytest.mark.asyncio
+async def test_memory_store_expires_records_after_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("src.api.workflow_store.time.monotonic", lambda: now[0])
+    store = InMemoryWorkflowStore(max_records=10, ttl_seconds=60)
+    await store.put(_record("a"))
+
+    now[0] += 30
+    assert (await store.update("a", state="running")).state == "running"
+    now[0] += 45  # 45s since the update, 75s since creation
+    assert await store.get("a") is not None
+    now[0] += 61
+    assert await store.get("a") is None
+
+
+@pytest.mark.asyncio
+async def test_concurrent_appends_are_not_lost():
+    store = InMemoryWorkflowStore()
+    await store.put(_record("a"))
+
+    await asyncio.gather(*(store.append("a", "actions", {"n": i}) for i in range(50)))
+
+    record = await store.get("a")
+    assert sorted(entry["n"] for entry in record.actions) == list(range(50))
+    assert await store.append("missing", "actions", {"n": 0}) is None
+
+
+@pytest.mark.asyncio
+async def test_sqlite_store_round_trips_across_reopen(tmp_path):
+    path = str(tmp_path / "wf.sqlite")
+    store = SqliteWorkflowStore(path)
+    await store.put(_record("a"))
+    await store.update("a", state="completed", result={"situations": [{"id": 1}]})
+    await store.append("a", "annotations", {"note": "checked"})
+    await store.close()
+
+    reopened = SqliteWorkflowStore(path)
+    record = await reopened.get("a")
+    assert record.state == "completed"
+    assert record.result == {"situations": [{"id": 1}]}
+    assert record.annotations == [{"note": "checked"}]
+    assert await reopened.clear() == 1
+    assert await reopened.get("a") is None
+    await reopened.close()
+
+
+@pytest.mark.asyncio
+async def test_sqlite_store_hides_expired_records_between_sweeps(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("src.api.workflow_store.time.time", lambda: now[0])
+    store = SqliteWorkflowStore(str(tmp_path / "wf.sqlite"), ttl_seconds=60)
+    await store.put(_record("a"))
+    await store.put(_record("b"))  # not a sweep write
+
+    now[0] += 61
+    assert await store.get("a") is None
+    assert await store.update("a", state="running") is None
+    assert await store.append("a", "actions", {"n": 0}) is None
+    # The row itself is still there until the next sweep write
+    assert (await store._exec("SELECT COUNT(*) FROM workflow_runs"))[0][0] == 2
+    await store.close()
+
+
+def test_postgres_backend_falls_back_to_memory_without_pool(monkeypatch):
+    monkeypatch.setattr("src.api.workflow_store._registry_pool", lambda: None)
+    assert isinstance(create_workflow_store("postgres"), InMemoryWorkflowStore)